@@ -1,7 +1,6 @@
 import os
 import json
 import time
-from web3 import Web3
 from eth_account import Account
 from decimal import Decimal
 import logging
@@ -12,6 +11,8 @@ from config.config import (
     ALCHEMY_PROJECT_ID,
     GAS_AMOUNT
 )
+from dashboard.token_registry import get_token_registry
+from dashboard.provider_registry import get_shared_web3
 
 class BlockchainConnector:
     """
@@ -38,6 +39,7 @@ class BlockchainConnector:
         self.web3 = self.connect_to_blockchain()
         self.private_key = self.get_valid_private_key()
         self.public_address = self.derive_public_address()
+        self.token_registry = get_token_registry()
         self.token_addresses = self.load_token_addresses()
         self.pools_information = self.load_pools_information() 
     
@@ -64,7 +66,7 @@ class BlockchainConnector:
                 raise ValueError(f"Unsupported provider '{PROVIDER}' specified in .env.")
 
             # Attempt to connect to the blockchain
-            web3 = Web3(Web3.HTTPProvider(url))
+            web3 = get_shared_web3('base', [url])
             if not web3.is_connected():
                 self.logger.error("Failed to connect to the Base blockchain.")
                 raise RuntimeError("Failed to connect to the Base blockchain.")
@@ -159,6 +161,7 @@ class BlockchainConnector:
 
             # Create a reverse mapping for address-to-name lookup
             self.token_name_mapping = {v: k for k, v in token_addresses.items()}
+            self.token_registry.load_token_addresses(token_addresses)
 
             self.logger.info("Token addresses loaded successfully.")
             return token_addresses
@@ -180,6 +183,7 @@ class BlockchainConnector:
             pools_path = os.path.join("config", "pools_information.json")
             with open(pools_path, 'r') as pools_file:
                 pools_information = json.load(pools_file)
+            self.token_registry.load_pools_information(pools_information, dex='aerodrome')
 
             self.logger.info("Pools information loaded successfully.")
             return pools_information
@@ -305,9 +309,9 @@ class BlockchainConnector:
             # Get token name for logging
             token_name = self.token_name_mapping.get(token_address, "Unknown Token")
 
-            # Fetch the balance and decimals
+            # Fetch the balance; decimals come from the registry cache
             balance = token_contract.functions.balanceOf(wallet_address).call()
-            decimals = token_contract.functions.decimals().call()
+            decimals = self.token_registry.get_decimals(token_address, self.web3)
 
             # Convert balance to human-readable format
             readable_balance = self.to_human_readable(balance, decimals)
@@ -460,7 +464,7 @@ class BlockchainConnector:
             token_name = self.token_name_mapping.get(token_address, "Unknown Token")
 
             # Convert the amount to Wei (based on token decimals)
-            decimals = erc20_contract.functions.decimals().call()
+            decimals = self.token_registry.get_decimals(token_address, self.web3)
             amount_in_units = self.to_blockchain_unit(amount, decimals)
 
             # Set the transaction function
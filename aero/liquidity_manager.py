@@ -48,9 +48,11 @@ class LiquidityManager:
         self.token0_contract = self.blockchain_connector.load_contract(self.token0_address, "erc20_abi.json")
         self.token1_contract = self.blockchain_connector.load_contract(self.token1_address, "erc20_abi.json")
         
-        # Store decimals
-        self.token0_decimals = self.token0_contract.functions.decimals().call()
-        self.token1_decimals = self.token1_contract.functions.decimals().call()
+        # Store decimals (cached by the token registry after the first fetch)
+        token_registry = self.blockchain_connector.token_registry
+        web3 = self.blockchain_connector.web3
+        self.token0_decimals = token_registry.get_decimals(self.token0_address, web3)
+        self.token1_decimals = token_registry.get_decimals(self.token1_address, web3)
 
         # Parameters for liquidity position
         self.token0_max = token0_max
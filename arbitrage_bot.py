@@ -10,7 +10,8 @@ from typing import Dict, Optional, Tuple
 
 from dotenv import load_dotenv
 from eth_account import Account
-from web3 import Web3
+
+from dashboard.provider_registry import get_shared_web3
 
 # Load environment variables from .env.mainnet
 load_dotenv('.env.mainnet')
@@ -31,7 +32,7 @@ class ArbitrageBot:
         """Initialize the arbitrage bot"""
         # Connect to Base
         rpc_url = os.getenv('BASE_RPC_URL', 'https://mainnet.base.org')
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.w3 = get_shared_web3('base', [rpc_url])
         logger.info(f"Connected to Base: {self.w3.is_connected()}")
         
         # Load configurations
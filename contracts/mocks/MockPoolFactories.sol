@@ -0,0 +1,123 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/// @notice Minimal pool/factory mocks emitting the same creation events as the
+/// Uniswap V3, Aerodrome (v2 and Slipstream) and Uniswap V2 style factories.
+/// Used to exercise the Python pool indexer against a local chain.
+
+contract MockConcentratedPool {
+    address public immutable token0;
+    address public immutable token1;
+    uint128 public liquidity;
+
+    constructor(address _token0, address _token1) {
+        token0 = _token0;
+        token1 = _token1;
+    }
+
+    function setLiquidity(uint128 _liquidity) external {
+        liquidity = _liquidity;
+    }
+}
+
+contract MockConstantProductPool {
+    address public immutable token0;
+    address public immutable token1;
+    uint256 private reserve0;
+    uint256 private reserve1;
+
+    constructor(address _token0, address _token1) {
+        token0 = _token0;
+        token1 = _token1;
+    }
+
+    function setReserves(uint256 _reserve0, uint256 _reserve1) external {
+        reserve0 = _reserve0;
+        reserve1 = _reserve1;
+    }
+
+    function getReserves() external view returns (uint256, uint256, uint256) {
+        return (reserve0, reserve1, block.timestamp);
+    }
+}
+
+library MockFactoryUtils {
+    error IdenticalAddresses();
+
+    function sortTokens(address tokenA, address tokenB) internal pure returns (address, address) {
+        if (tokenA == tokenB) revert IdenticalAddresses();
+        return tokenA < tokenB ? (tokenA, tokenB) : (tokenB, tokenA);
+    }
+}
+
+contract MockUniswapV3Factory {
+    event PoolCreated(
+        address indexed token0,
+        address indexed token1,
+        uint24 indexed fee,
+        int24 tickSpacing,
+        address pool
+    );
+
+    mapping(uint24 => int24) public feeAmountTickSpacing;
+
+    constructor() {
+        feeAmountTickSpacing[100] = 1;
+        feeAmountTickSpacing[500] = 10;
+        feeAmountTickSpacing[3000] = 60;
+        feeAmountTickSpacing[10000] = 200;
+    }
+
+    function createPool(address tokenA, address tokenB, uint24 fee) external returns (address pool) {
+        (address token0, address token1) = MockFactoryUtils.sortTokens(tokenA, tokenB);
+        pool = address(new MockConcentratedPool(token0, token1));
+        emit PoolCreated(token0, token1, fee, feeAmountTickSpacing[fee], pool);
+    }
+}
+
+contract MockAerodromeFactory {
+    event PoolCreated(
+        address indexed token0,
+        address indexed token1,
+        bool indexed stable,
+        address pool,
+        uint256
+    );
+
+    address[] public allPools;
+
+    function createPool(address tokenA, address tokenB, bool stable) external returns (address pool) {
+        (address token0, address token1) = MockFactoryUtils.sortTokens(tokenA, tokenB);
+        pool = address(new MockConstantProductPool(token0, token1));
+        allPools.push(pool);
+        emit PoolCreated(token0, token1, stable, pool, allPools.length);
+    }
+}
+
+contract MockAerodromeCLFactory {
+    event PoolCreated(
+        address indexed token0,
+        address indexed token1,
+        int24 indexed tickSpacing,
+        address pool
+    );
+
+    function createPool(address tokenA, address tokenB, int24 tickSpacing) external returns (address pool) {
+        (address token0, address token1) = MockFactoryUtils.sortTokens(tokenA, tokenB);
+        pool = address(new MockConcentratedPool(token0, token1));
+        emit PoolCreated(token0, token1, tickSpacing, pool);
+    }
+}
+
+contract MockUniswapV2Factory {
+    event PairCreated(address indexed token0, address indexed token1, address pair, uint256);
+
+    address[] public allPairs;
+
+    function createPair(address tokenA, address tokenB) external returns (address pair) {
+        (address token0, address token1) = MockFactoryUtils.sortTokens(tokenA, tokenB);
+        pair = address(new MockConstantProductPool(token0, token1));
+        allPairs.push(pair);
+        emit PairCreated(token0, token1, pair, allPairs.length);
+    }
+}
@@ -3,8 +3,5 @@
 from .price_analysis import PriceAnalyzer
 from .token_optimizer import TokenOptimizer
 
-<<<<<<< HEAD
 __version__ = '1.0.0'
-=======
 __all__ = ['PriceAnalyzer', 'TokenOptimizer']
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
@@ -3,7 +3,18 @@ from typing import Dict, List, Union, TypeVar, Any, Optional, cast
 from web3 import Web3
 from web3.types import Wei
 import json
+import threading
+from dataclasses import replace
+from decimal import Decimal
 from time import time
+from .opportunity_queue import OpportunityQueue, ScheduledOpportunity
+from .pool_indexer import PoolIndexer
+from .provider_registry import get_provider_registry, normalize_chain
+from .route_search import (
+    DEFAULT_SWAP_GAS, POOL_STATE_PREFIX, ArbitrageRoute, IncrementalRouteDetector, PoolReserves, RouteGraph
+)
+from .state_cache import VersionedStateCache
+from .token_registry import TokenRegistry, get_token_registry
 
 logger = logging.getLogger(__name__)
 
@@ -13,10 +24,25 @@ logger.setLevel(logging.INFO)
 T = TypeVar('T')
 Opportunity = Dict[str, Union[str, float, bool]]
 
+BASE_WETH_ADDRESS = '0x4200000000000000000000000000000000000006'
+# Trade sizes probed per start token, in whole tokens of that token
+PROBE_SIZES = [Decimal('0.001'), Decimal('0.002'), Decimal('0.005')]
+
 
 class AdvancedArbitrageDetector:
-    def __init__(self, networks: List[str], w3_connections: Dict[str, Web3], config: Dict[str, Any]) -> None:
+    def __init__(
+        self,
+        networks: List[str],
+        w3_connections: Optional[Dict[str, Web3]],
+        config: Dict[str, Any],
+        pool_state: Optional[VersionedStateCache] = None,
+        pool_indexer: Optional[PoolIndexer] = None,
+        token_registry: Optional[TokenRegistry] = None
+    ) -> None:
         self.networks = networks
+        # Default to the process-wide shared connections for each network
+        if w3_connections is None:
+            w3_connections = get_provider_registry().get_w3_connections(networks)
         self.w3_connections = w3_connections
         self.config = config
         self.min_profit_threshold = float(config.get('MIN_PROFIT_THRESHOLD', 0.01))
@@ -25,6 +51,31 @@ class AdvancedArbitrageDetector:
         self.no_path_count = 0  # Track count of no paths found
         self.last_token_check: Dict[str, float] = dict()  # Track last check time per token
         self.check_interval = 30  # Minimum seconds between checks per token
+        # Cached pool reserves; when populated, routes are searched locally
+        # instead of through PathFinder.findBestPath eth_calls
+        self.pool_state = pool_state
+        self.max_route_hops = int(config.get('MAX_ROUTE_HOPS', 3))
+        self.route_detector: Optional[IncrementalRouteDetector] = None
+        # Decimals scale the probe sizes; route profit is valued in WETH so it
+        # is comparable with gas and across start tokens
+        self.token_registry = token_registry or get_token_registry()
+        self.weth_address = Web3.to_checksum_address(config.get('WETH_ADDRESS', BASE_WETH_ADDRESS))
+        # Detected opportunities wait here, best expected value per gas first
+        self.opportunity_queue = OpportunityQueue(
+            default_ttl_blocks=int(config.get('OPPORTUNITY_TTL_BLOCKS', 2))
+        )
+        self._seen_pools: Dict[Any, PoolReserves] = {}
+        # Cached pools and their gas are on Base
+        self.w3_base: Optional[Web3] = next(
+            (w3 for name, w3 in w3_connections.items() if normalize_chain(name) == 'base'), None
+        )
+        # Factory logs keep growing the pool universe in the background once
+        # start() is called, and each indexing round reloads the top pools'
+        # reserves into pool_state
+        self.pool_indexer = pool_indexer or self._create_pool_indexer()
+        self.indexer_thread: Optional[threading.Thread] = None
+        if self.pool_indexer is not None and self.pool_state is None:
+            self.pool_state = self.pool_indexer.create_state_cache()
 
         # Initialize PathFinder contract
         self.w3_sepolia: Optional[Web3] = w3_connections.get('Ethereum Sepolia')
@@ -43,6 +94,40 @@ class AdvancedArbitrageDetector:
             except Exception as e:
                 logger.error(f"Error initializing PathFinder contract: {e}")
 
+    def start(self) -> None:
+        """Load the top pools' reserves and start the background pool indexer"""
+        if self.pool_indexer is None or self.indexer_thread is not None:
+            return
+        assert self.pool_state is not None
+        pool_state_size = int(self.config.get('POOL_STATE_SIZE', 200))
+        try:
+            self.pool_indexer.load_pool_state(self.pool_state, limit=pool_state_size)
+        except Exception as e:
+            logger.error(f"Error loading pool state: {e}")
+        self.indexer_thread = self.pool_indexer.start(
+            float(self.config.get('POOL_INDEXER_INTERVAL', 60)),
+            registry=self.token_registry,
+            registry_limit=int(self.config.get('POOL_UNIVERSE_SIZE', 50)),
+            cache=self.pool_state,
+            cache_limit=pool_state_size
+        )
+
+    def _create_pool_indexer(self) -> Optional[PoolIndexer]:
+        """Indexer over the Base factories in dex_config.json, when a Base connection is available"""
+        if self.w3_base is None:
+            return None
+        try:
+            with open(self.config.get('DEX_CONFIG_PATH', 'configs/dex_config.json'), 'r') as f:
+                dex_config = json.load(f)
+            if not dex_config.get('factories'):
+                return None
+            return PoolIndexer.from_config(
+                self.w3_base, dex_config, db_path=self.config.get('DB_PATH', 'arbitrage_bot.db')
+            )
+        except Exception as e:
+            logger.error(f"Error initializing pool indexer: {e}")
+            return None
+
     def _get_gas_price(self) -> Wei:
         """Get current gas price with type checking"""
         assert self.w3_sepolia is not None, "Web3 connection not initialized"
@@ -50,11 +135,45 @@ class AdvancedArbitrageDetector:
         # Use a much lower gas price for Sepolia testing
         return Wei(int(base_gas_price * 0.5))  # 50% of current gas price
 
+    def _get_base_gas_price(self) -> Wei:
+        """Current Base gas price, for routes over the cached Base pools"""
+        if self.w3_base is None:
+            return Wei(0)
+        return Wei(self.w3_base.eth.gas_price)
+
     def _get_block_timestamp(self) -> float:
         """Get latest block timestamp with type checking"""
         assert self.w3_sepolia is not None, "Web3 connection not initialized"
         return float(self.w3_sepolia.eth.get_block('latest')['timestamp'])
 
+    @staticmethod
+    def _test_amounts() -> List[Wei]:
+        """Trade sizes probed per token; small amounts for Sepolia testing"""
+        return [
+            Wei(Web3.to_wei(0.001, 'ether')),  # 0.001 ETH
+            Wei(Web3.to_wei(0.002, 'ether')),  # 0.002 ETH
+            Wei(Web3.to_wei(0.005, 'ether'))   # 0.005 ETH
+        ]
+
+    def _token_decimals(self, token: str) -> Optional[int]:
+        return self.token_registry.get_decimals(token, self.w3_base)
+
+    def _probe_amounts(self, tokens: List[str]) -> Dict[str, List[int]]:
+        """Probe sizes per start token in its base units, skipping tokens of unknown decimals"""
+        amounts: Dict[str, List[int]] = {}
+        for token in tokens:
+            decimals = self._token_decimals(token)
+            if decimals is None:
+                logger.warning(f"Unknown decimals for {token}; not probing it")
+                continue
+            amounts[token] = [int(size.scaleb(decimals)) for size in PROBE_SIZES]
+        return amounts
+
+    def _value_in_eth(self, graph: RouteGraph, token: str, amount: int) -> Optional[float]:
+        """ETH value of a start-token amount at the cached WETH pool mid price"""
+        value = graph.mid_value(token, amount, self.weth_address)
+        return float(Web3.from_wei(value, 'ether')) if value is not None else None
+
     def _should_check_token(self, token: str) -> bool:
         """Determine if enough time has passed to check this token again"""
         current_time = time()
@@ -76,11 +195,135 @@ class AdvancedArbitrageDetector:
             self.last_no_path_log = current_time
             self.no_path_count = 0
 
+    def _changed_pools(self) -> List[PoolReserves]:
+        """Pools whose cached state differs from the last evaluation"""
+        assert self.pool_state is not None
+        current: Dict[Any, PoolReserves] = {}
+        changed: List[PoolReserves] = []
+        for key, value in self.pool_state.items():
+            if isinstance(key, tuple) and key[0] == POOL_STATE_PREFIX and isinstance(value, PoolReserves):
+                current[key] = value
+                # Cache entries are replaced on write, so identity marks a change
+                if self._seen_pools.get(key) is not value:
+                    changed.append(value)
+        for key, value in self._seen_pools.items():
+            if key not in current:
+                # Rolled back by a reorg; zero reserves drop it from the graph
+                changed.append(replace(value, reserve0=0, reserve1=0))
+        self._seen_pools = current
+        return changed
+
+    def _get_route_graph(self) -> Optional[RouteGraph]:
+        """Route graph over the cached pool reserves, updated for pools that changed"""
+        if self.pool_state is None or len(self.pool_state) == 0:
+            return None
+        if self.route_detector is None:
+            tokens = [Web3.to_checksum_address(t) for t in self.config.get('SUPPORTED_TOKENS', [])]
+            self.route_detector = IncrementalRouteDetector(
+                tokens, self._probe_amounts(tokens), max_hops=self.max_route_hops
+            )
+        self.route_detector.update(self._changed_pools())
+        return self.route_detector.graph
+
+    @staticmethod
+    def route_key(opportunity: Opportunity) -> str:
+        """Identity of the route an opportunity trades, independent of size"""
+        return f"{opportunity.get('pools') or opportunity['dexes']}|{opportunity['path']}"
+
+    def _current_block(self, chain: str) -> Optional[int]:
+        if chain == 'sepolia':
+            return self.w3_sepolia.eth.block_number if self.w3_sepolia is not None else None
+        head = self.pool_state.head if self.pool_state is not None else None
+        if head is not None:
+            return head.number
+        if self.w3_base is not None:
+            return self.w3_base.eth.block_number
+        return None
+
+    def schedule_opportunities(self, opportunities: List[Opportunity], chain: str = 'base') -> int:
+        """Queue opportunities for execution, keeping the best size per route"""
+        block_number = self._current_block(chain)
+        if block_number is None:
+            return 0
+        self.opportunity_queue.on_block(block_number, chain=chain)
+        best: Dict[str, Opportunity] = {}
+        for opportunity in opportunities:
+            key = self.route_key(opportunity)
+            if key not in best or float(opportunity['profit']) > float(best[key]['profit']):
+                best[key] = opportunity
+        return sum(
+            self.opportunity_queue.push(
+                key,
+                opportunity,
+                expected_profit=float(opportunity['profit']),
+                gas_cost=float(opportunity['gas_cost']),
+                success_probability=float(opportunity.get('success_probability', 1.0)),
+                block_number=block_number,
+                chain=chain
+            )
+            for key, opportunity in best.items()
+        )
+
+    def next_opportunity(self, timeout: Optional[float] = None) -> Optional[ScheduledOpportunity]:
+        """Best live opportunity for an execution worker"""
+        return self.opportunity_queue.pop(timeout=timeout)
+
+    def _route_to_opportunity(self, route: ArbitrageRoute, gas_price: Wei) -> Optional[Opportunity]:
+        """Amount in whole start tokens; profit and gas cost in ETH"""
+        assert self.route_detector is not None
+        start = route.tokens[0]
+        decimals = self._token_decimals(start)
+        profit = self._value_in_eth(self.route_detector.graph, start, route.profit)
+        if decimals is None or profit is None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cannot value route {route.route_key} in ETH; skipping")
+            return None
+        return {
+            'type': 'Cross-Network',
+            'path': ','.join([t.lower() for t in route.tokens]),
+            'dexes': ','.join([d.lower() for d in route.dexes]),
+            'pools': ','.join([p.lower() for p in route.pools]),
+            'amount': float(Decimal(route.amount_in).scaleb(-decimals)),
+            'token_profit': float(Decimal(route.profit).scaleb(-decimals)),
+            'profit': profit,
+            'gas_cost': float(Web3.from_wei(route.gas_estimate * gas_price, 'ether')),
+            'timestamp': time(),
+            'flash_loan': False
+        }
+
+    def _detect_offchain(self, tokens: List[str], gas_price: Wei) -> List[Opportunity]:
+        """Read profitable cycles from the incremental detector for each probe size"""
+        assert self.route_detector is not None
+        opportunities: List[Opportunity] = []
+        for token in tokens:
+            if not self._should_check_token(token):
+                continue
+            token_addr = Web3.to_checksum_address(token)
+            routes = self.route_detector.get_best_routes(token_addr)
+            for amount in self.route_detector.amounts.get(token_addr.lower(), []):
+                route = routes.get(amount)
+                if route is None:
+                    self._log_no_path_found(token, Wei(amount))
+                    continue
+                opportunity = self._route_to_opportunity(route, gas_price)
+                if opportunity is None:
+                    continue
+                opportunities.append(opportunity)
+                logger.info(f"Found profitable opportunity: {opportunity}")
+        return sorted(opportunities, key=lambda x: float(x['profit']), reverse=True)
+
     def detect_arbitrage(self, token_prices: Dict[str, Dict[str, float]], gas_prices: Dict[str, float]) -> List[Opportunity]:
-        """Detect arbitrage opportunities using the PathFinder contract"""
+        """Detect arbitrage opportunities from cached pool state, falling back to the PathFinder contract"""
         opportunities: List[Opportunity] = []
 
         try:
+            if self._get_route_graph() is not None:
+                tokens = list(self.config.get('SUPPORTED_TOKENS', []))
+                gas_price = self._get_base_gas_price()
+                opportunities = self._detect_offchain(tokens, gas_price)
+                self.schedule_opportunities(opportunities, chain='base')
+                return opportunities
+
             if not self.pathfinder or not self.w3_sepolia:
                 logger.error("PathFinder contract not initialized")
                 return []
@@ -101,12 +344,7 @@ class AdvancedArbitrageDetector:
             if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Checking paths for tokens: {tokens}")
 
-            # Try smaller amounts for Sepolia testing
-            test_amounts = [
-                Wei(Web3.to_wei(0.001, 'ether')),  # 0.001 ETH
-                Wei(Web3.to_wei(0.002, 'ether')),  # 0.002 ETH
-                Wei(Web3.to_wei(0.005, 'ether'))   # 0.005 ETH
-            ]
+            test_amounts = self._test_amounts()
 
             wallet_address = Web3.to_checksum_address(self.config.get('WALLET_ADDRESS', ''))
 
@@ -154,6 +392,7 @@ class AdvancedArbitrageDetector:
                             logger.error(f"Unexpected error finding path for token {token} with amount {Web3.from_wei(amount, 'ether')} ETH: {error_str}")
                         continue
 
+            self.schedule_opportunities(opportunities, chain='sepolia')
             return sorted(opportunities, key=lambda x: float(x['profit']), reverse=True)
 
         except Exception as e:
@@ -163,6 +402,25 @@ class AdvancedArbitrageDetector:
     def validate_opportunity(self, opportunity: Opportunity) -> bool:
         """Validate if an arbitrage opportunity is still valid"""
         try:
+            graph = self._get_route_graph()
+            if graph is not None and opportunity.get('pools'):
+                tokens = [Web3.to_checksum_address(t) for t in cast(str, opportunity['path']).split(',')]
+                decimals = self._token_decimals(tokens[0])
+                if decimals is None:
+                    return False
+                amount_in = int(Decimal(str(opportunity['amount'])).scaleb(decimals))
+                amount_out = graph.quote_pools(
+                    tokens,
+                    [Web3.to_checksum_address(p) for p in cast(str, opportunity['pools']).split(',')],
+                    amount_in
+                )
+                if amount_out is None:
+                    return False
+                current_profit = self._value_in_eth(graph, tokens[0], amount_out - amount_in)
+                if current_profit is None:
+                    return False
+                return current_profit >= float(opportunity['profit']) * (1 - self.max_slippage)
+
             if not self.pathfinder or not self.w3_sepolia:
                 return False
 
@@ -202,6 +460,10 @@ class AdvancedArbitrageDetector:
     def estimate_execution_cost(self, opportunity: Opportunity) -> float:
         """Estimate the total cost of executing an arbitrage opportunity"""
         try:
+            if opportunity.get('pools'):
+                hops = len(cast(str, opportunity['pools']).split(','))
+                return float(Web3.from_wei(hops * DEFAULT_SWAP_GAS * self._get_base_gas_price(), 'ether'))
+
             if not self.pathfinder or not self.w3_sepolia:
                 return float('inf')
 
@@ -3,8 +3,11 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from dashboard.db_pool import get_database_pool
+
 def get_db_connection() -> sqlite3.Connection:
-    return sqlite3.connect('arbitrage_bot.db')
+    # Read-only pooled connection, so dashboard queries never hold the writer
+    return get_database_pool('arbitrage_bot.db').reader()
 
 def get_total_profit() -> float:
     conn = get_db_connection()
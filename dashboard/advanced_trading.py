@@ -1,16 +1,145 @@
 """Advanced Trading Strategies Module with Flash Loans and MEV Detection"""
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 from decimal import Decimal
-from web3 import Web3
+import numpy as np
 from eth_typing import HexStr
 from web3.types import TxParams, TxReceipt
+from .mempool_decoder import PendingSwapStream, SwapIntent
+from .provider_registry import get_shared_web3
+from .subscription_hub import SubscriptionHub, get_subscription_hub
+
+
+def calculate_confidence_score(profit_percentage: Decimal, price_impact: Decimal) -> float:
+    """Calculate confidence score for opportunity"""
+    base_score = Decimal('1.0')
+
+    # Adjust based on profit percentage
+    if profit_percentage < Decimal('0.5'):
+        base_score *= Decimal('0.7')
+    elif profit_percentage > Decimal('2.0'):
+        base_score *= Decimal('0.8')  # Too good might be risky
+
+    # Adjust based on price impact
+    if price_impact > Decimal('0.02'):  # 2%
+        base_score *= Decimal('0.8')
+
+    return float(min(base_score, Decimal('1.0')))
+
+
+def evaluate_flash_loan(
+    token_in: str,
+    token_out: str,
+    amount: Decimal,
+    current_price: Decimal,
+    price_impact: Decimal,
+    flash_loan_fee_rate: Decimal,
+    min_profit_threshold: Decimal
+) -> Optional[Dict]:
+    """Flash loan profit math without strategy state, so it can run in worker processes"""
+    # Calculate flash loan fee
+    flash_loan_fee = amount * flash_loan_fee_rate
+
+    # Calculate potential profit considering price impact
+    trade_amount = amount + flash_loan_fee
+    expected_output = trade_amount * current_price * (1 - price_impact)
+    potential_profit = expected_output - trade_amount
+
+    # Calculate profit percentage
+    profit_percentage = (potential_profit / trade_amount) * 100
+
+    if profit_percentage > min_profit_threshold:
+        return {
+            'token_in': token_in,
+            'token_out': token_out,
+            'flash_loan_amount': float(amount),
+            'expected_profit': float(potential_profit),
+            'profit_percentage': float(profit_percentage),
+            'flash_loan_fee': float(flash_loan_fee),
+            'confidence_score': calculate_confidence_score(profit_percentage, price_impact)
+        }
+    return None
+
+
+@dataclass
+class FlashLoanSweep:
+    """Net profit for every candidate loan size, in token_in units"""
+    sizes: np.ndarray
+    outputs: np.ndarray
+    profits: np.ndarray
+    price_impacts: np.ndarray
+    best_index: int
+
+    @property
+    def best_size(self) -> float:
+        return float(self.sizes[self.best_index])
+
+    @property
+    def best_profit(self) -> float:
+        return float(self.profits[self.best_index])
+
+
+def amm_output_curve(amounts: np.ndarray, reserve_in: float, reserve_out: float, fee_bps: float) -> np.ndarray:
+    """Constant-product output for an array of input amounts"""
+    amounts_with_fee = amounts * (1 - fee_bps / 10000)
+    return amounts_with_fee * reserve_out / (reserve_in + amounts_with_fee)
+
+
+def sweep_flash_loan_sizes(
+    sizes: Sequence[float],
+    buy_reserves: Tuple[float, float],
+    sell_reserves: Tuple[float, float],
+    buy_fee_bps: float = 30,
+    sell_fee_bps: float = 30,
+    flash_loan_fee_rate: float = 0.0009,
+    gas_cost: float = 0.0
+) -> FlashLoanSweep:
+    """Profit curve for borrowing each size, swapping through two pools and repaying
+
+    buy_reserves are (token_in, token_out) reserves of the pool that sells
+    token_out cheaply; sell_reserves are (token_out, token_in) reserves of
+    the pool it is sold back into. Both swaps, the flash loan fee and a
+    fixed gas cost (in token_in) are applied to every size in one pass.
+    """
+    amounts = np.asarray(sizes, dtype=float)
+    bought = amm_output_curve(amounts, buy_reserves[0], buy_reserves[1], buy_fee_bps)
+    outputs = amm_output_curve(bought, sell_reserves[0], sell_reserves[1], sell_fee_bps)
+    profits = outputs - amounts * (1 + flash_loan_fee_rate) - gas_cost
+
+    # Slippage against the round trip at the marginal (infinitesimal) rate
+    spot = (buy_reserves[1] / buy_reserves[0]) * (sell_reserves[1] / sell_reserves[0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_impacts = np.where(amounts > 0, 1 - outputs / (amounts * spot), 0.0)
+
+    return FlashLoanSweep(
+        sizes=amounts,
+        outputs=outputs,
+        profits=profits,
+        price_impacts=price_impacts,
+        best_index=int(np.argmax(profits))
+    )
+
 
 class AdvancedTradingStrategy:
-    def __init__(self, web3_provider: str = 'https://base-mainnet.infura.io/v3/863c326dab1a444dba3f41ae7a07ccce'):
+    def __init__(
+        self,
+        web3_provider: str = 'https://base-mainnet.infura.io/v3/863c326dab1a444dba3f41ae7a07ccce',
+        subscription_hub: Optional[SubscriptionHub] = None
+    ):
         self.logger = logging.getLogger(__name__)
-        self.w3 = Web3(Web3.HTTPProvider(web3_provider))
+        self.w3 = get_shared_web3('base', [web3_provider])
+        
+        # New heads are pushed over the shared WebSocket hub when one is configured
+        self.subscription_hub = subscription_hub or get_subscription_hub('base')
+        self.head_subscription = (
+            self.subscription_hub.subscribe_heads(maxsize=64) if self.subscription_hub else None
+        )
+        
+        # Pending router swaps decoded from the hub's pending-transaction stream;
+        # subscribed on the first poll so idle strategies do not buffer the mempool
+        self.pending_swaps: Optional[PendingSwapStream] = None
         
         # Flash loan configuration
         self.FLASH_LOAN_FEE = Decimal('0.0009')  # 0.09% fee
@@ -22,7 +151,7 @@ class AdvancedTradingStrategy:
         
         # Track last block for monitoring
         self.last_block_number = None
-        self.last_block_txs = []
+        self.last_block_tx_hashes = set()
         
         self.logger.info("Advanced Trading Strategy initialized")
         
@@ -37,42 +166,83 @@ class AdvancedTradingStrategy:
         """Analyze potential flash loan arbitrage opportunity"""
         try:
             self.logger.debug(f"Analyzing flash loan opportunity for {amount} {token_in}")
-            
-            # Calculate flash loan fee
-            flash_loan_fee = amount * self.FLASH_LOAN_FEE
-            
-            # Calculate potential profit considering price impact
-            trade_amount = amount + flash_loan_fee
-            expected_output = trade_amount * current_price * (1 - price_impact)
-            potential_profit = expected_output - trade_amount
-            
-            # Calculate profit percentage
-            profit_percentage = (potential_profit / trade_amount) * 100
-            
-            if profit_percentage > self.MIN_PROFIT_THRESHOLD:
-                opportunity = {
-                    'token_in': token_in,
-                    'token_out': token_out,
-                    'flash_loan_amount': float(amount),
-                    'expected_profit': float(potential_profit),
-                    'profit_percentage': float(profit_percentage),
-                    'flash_loan_fee': float(flash_loan_fee),
-                    'confidence_score': self._calculate_confidence_score(
-                        profit_percentage, price_impact
-                    )
-                }
+            opportunity = evaluate_flash_loan(
+                token_in, token_out, amount, current_price, price_impact,
+                self.FLASH_LOAN_FEE, self.MIN_PROFIT_THRESHOLD
+            )
+            if opportunity:
                 self.logger.info(f"Flash loan opportunity found: {opportunity}")
-                return opportunity
-            return None
-            
+            return opportunity
+
         except Exception as e:
             self.logger.error(f"Error analyzing flash loan opportunity: {str(e)}")
             return None
-            
+
+    def sweep_flash_loan_opportunity(
+        self,
+        token_in: str,
+        token_out: str,
+        sizes: Sequence[float],
+        buy_reserves: Tuple[float, float],
+        sell_reserves: Tuple[float, float],
+        buy_fee_bps: float = 30,
+        sell_fee_bps: float = 30,
+        gas_cost: float = 0.0
+    ) -> Optional[Dict]:
+        """Evaluate many flash loan sizes at once and report the most profitable one
+
+        Unlike analyze_flash_loan_opportunity, price impact comes from the
+        pools' output curves rather than a fixed estimate, so profit peaks
+        at a finite size. The full curve is returned for inspection.
+        """
+        try:
+            sweep = sweep_flash_loan_sizes(
+                sizes, buy_reserves, sell_reserves, buy_fee_bps, sell_fee_bps,
+                float(self.FLASH_LOAN_FEE), gas_cost
+            )
+            best_size = Decimal(str(sweep.best_size))
+            best_profit = Decimal(str(sweep.best_profit))
+            trade_amount = best_size * (1 + self.FLASH_LOAN_FEE)
+            profit_percentage = best_profit / trade_amount * 100 if trade_amount > 0 else Decimal('0')
+            price_impact = Decimal(str(float(sweep.price_impacts[sweep.best_index])))
+
+            opportunity = {
+                'token_in': token_in,
+                'token_out': token_out,
+                'flash_loan_amount': sweep.best_size,
+                'expected_profit': sweep.best_profit,
+                'profit_percentage': float(profit_percentage),
+                'flash_loan_fee': float(best_size * self.FLASH_LOAN_FEE),
+                'gas_cost': gas_cost,
+                'price_impact': float(price_impact),
+                'profitable': profit_percentage > self.MIN_PROFIT_THRESHOLD,
+                'confidence_score': calculate_confidence_score(profit_percentage, price_impact),
+                'profit_curve': {
+                    'sizes': sweep.sizes,
+                    'profits': sweep.profits
+                },
+                'best_index': sweep.best_index
+            }
+            if opportunity['profitable']:
+                self.logger.info(
+                    f"Flash loan sweep: best {sweep.best_size} {token_in} -> profit {sweep.best_profit:.6f}"
+                )
+            return opportunity
+
+        except Exception as e:
+            self.logger.error(f"Error sweeping flash loan sizes: {str(e)}")
+            return None
+
     def monitor_mempool(self) -> List[Dict]:
         """Monitor block changes for potential MEV opportunities"""
         try:
-            current_block = self.w3.eth.block_number
+            if self.head_subscription is not None:
+                heads = self.head_subscription.drain()
+                if not heads:
+                    return []
+                current_block = int(heads[-1]['number'], 16)
+            else:
+                current_block = self.w3.eth.block_number
             self.logger.debug(f"Current block number: {current_block}")
             
             opportunities = []
@@ -88,7 +258,7 @@ class AdvancedTradingStrategy:
                     
                     # Analyze new transactions
                     for tx in current_txs:
-                        if tx not in self.last_block_txs:
+                        if tx['hash'] not in self.last_block_tx_hashes:
                             if self._is_dex_transaction(tx):
                                 self.logger.debug(f"Found DEX transaction: {tx['hash'].hex()}")
                                 opportunity = self._analyze_transaction_for_mev(tx)
@@ -96,7 +266,7 @@ class AdvancedTradingStrategy:
                                     opportunities.append(opportunity)
                     
                     self.last_block_number = current_block
-                    self.last_block_txs = current_txs
+                    self.last_block_tx_hashes = {tx['hash'] for tx in current_txs}
                     
                 except Exception as e:
                     self.logger.debug(f"Error retrieving block data: {str(e)}")
@@ -110,6 +280,18 @@ class AdvancedTradingStrategy:
             self.logger.debug(f"Block monitoring: {str(e)}")
             return []
             
+    def poll_pending_swaps(self) -> List[SwapIntent]:
+        """Decode router swaps pending since the last poll"""
+        if self.pending_swaps is None:
+            if self.subscription_hub is None:
+                return []
+            self.pending_swaps = PendingSwapStream(self.w3, self.subscription_hub.subscribe_pending(maxsize=4096))
+        try:
+            return self.pending_swaps.poll()
+        except Exception as e:
+            self.logger.debug(f"Pending swap polling: {str(e)}")
+            return []
+            
     def analyze_sandwich_opportunity(
         self,
         tx_data: Dict,
@@ -235,16 +417,4 @@ class AdvancedTradingStrategy:
         price_impact: Decimal
     ) -> float:
         """Calculate confidence score for opportunity"""
-        base_score = Decimal('1.0')
-        
-        # Adjust based on profit percentage
-        if profit_percentage < Decimal('0.5'):
-            base_score *= Decimal('0.7')
-        elif profit_percentage > Decimal('2.0'):
-            base_score *= Decimal('0.8')  # Too good might be risky
-            
-        # Adjust based on price impact
-        if price_impact > Decimal('0.02'):  # 2%
-            base_score *= Decimal('0.8')
-            
-        return float(min(base_score, Decimal('1.0')))
+        return calculate_confidence_score(profit_percentage, price_impact)
@@ -6,13 +6,13 @@ import json
 from flask import Flask, render_template
 from flask_socketio import SocketIO
 from flask_cors import CORS
-from web3 import Web3
 import threading
 import time
 
 from dashboard.monitoring import ArbitragePlatformMonitor, init_monitoring
 from dashboard.price_analysis import PriceAnalyzer
 from dashboard.trading_strategies import ArbitrageStrategy, NetworkName
+from dashboard.provider_registry import get_shared_web3
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -50,12 +50,11 @@ strategy = ArbitrageStrategy(
     exchanges=['baseswap', 'aerodrome']
 )
 
-# Initialize Web3 connection
-if strategy.web3_client and hasattr(strategy.web3_client.provider, 'endpoint_uri'):
-    provider_uri = str(strategy.web3_client.provider.endpoint_uri)
-else:
-    provider_uri = "https://base-mainnet.infura.io/v3/863c326dab1a444dba3f41ae7a07ccce"
-w3 = Web3(Web3.HTTPProvider(provider_uri))
+# Reuse the strategy's shared Base connection rather than opening another pool
+w3 = strategy.web3_client or get_shared_web3(
+    'base',
+    ["https://base-mainnet.infura.io/v3/863c326dab1a444dba3f41ae7a07ccce"]
+)
 
 def background_task() -> None:
     """Background task to emit updates periodically"""
@@ -0,0 +1,154 @@
+"""HTTP provider that coalesces concurrent JSON-RPC requests into batch arrays"""
+
+import itertools
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from web3 import Web3
+from web3._utils.encoding import Web3JsonEncoder
+from web3.types import RPCEndpoint, RPCResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Same fallbacks web3 uses for bytes and AttributeDict params
+_web3_json_default = Web3JsonEncoder().default
+
+
+def encode_json(payload: Any) -> bytes:
+    """Serialize a JSON-RPC payload with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=_web3_json_default)
+    return json.dumps(payload, cls=Web3JsonEncoder, separators=(',', ':')).encode()
+
+
+def decode_json(raw: bytes) -> Any:
+    """Parse a JSON-RPC response with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class BatchingHTTPProvider(Web3.HTTPProvider):
+    """HTTP provider that sends concurrent calls as JSON-RPC batches
+
+    Each make_request enqueues the call and blocks on a future. A dispatcher
+    thread waits up to `linger` seconds after the first queued call for
+    others to arrive, then posts up to `max_batch_size` calls in one array
+    and matches the responses back by id. A lone call is posted on its own,
+    so single-threaded callers only pay the linger delay.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        session: Optional[requests.Session] = None,
+        max_batch_size: int = 50,
+        linger: float = 0.002,
+        max_in_flight: int = 8,
+        **kwargs: Any
+    ) -> None:
+        kwargs.setdefault('exception_retry_configuration', None)
+        super().__init__(endpoint_uri, **kwargs)
+        self.session = session or requests.Session()
+        self.max_batch_size = max_batch_size
+        self.linger = linger
+        self.batches_sent = 0
+        self.requests_sent = 0
+        self.decode_time = 0.0
+        self._ids = itertools.count(1)
+        self._queue: List[Tuple[Dict[str, Any], Future]] = []
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='rpc-batch')
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request = {'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params}
+        future: Future = Future()
+        with self._condition:
+            self._queue.append((request, future))
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name='rpc-batcher', daemon=True)
+                self._dispatcher.start()
+            self._condition.notify()
+        return future.result()
+
+    def make_batch_request(self, batch_requests: List[Tuple[RPCEndpoint, Any]]) -> List[RPCResponse]:
+        requests_ = [
+            {'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params}
+            for method, params in batch_requests
+        ]
+        by_id = self._post(requests_)
+        return [by_id[request['id']] for request in requests_]
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    if not self._condition.wait(timeout=60):
+                        # Idle: let the thread exit; the next request restarts it
+                        if not self._queue:
+                            self._dispatcher = None
+                            return
+                deadline = time.monotonic() + self.linger
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+            self._executor.submit(self._send_batch, batch)
+
+    def _send_batch(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        try:
+            by_id = self._post([request for request, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for request, future in batch:
+            response = by_id.get(request['id'])
+            if response is None:
+                future.set_exception(ValueError(f"No response for request id {request['id']}"))
+            else:
+                future.set_result(response)
+
+    def _post(self, batch: List[Dict[str, Any]]) -> Dict[int, RPCResponse]:
+        payload = batch[0] if len(batch) == 1 else batch
+        kwargs = dict(self.get_request_kwargs())
+        kwargs.setdefault('timeout', 30)
+        with self.session.post(self.endpoint_uri, data=encode_json(payload), **kwargs) as response:
+            response.raise_for_status()
+            raw = response.content
+        start = time.perf_counter()
+        decoded = decode_json(raw)
+        self.decode_time += time.perf_counter() - start
+        self.batches_sent += 1
+        self.requests_sent += len(batch)
+        if isinstance(decoded, dict):
+            if len(batch) > 1:
+                # Nodes that reject batches answer with a single error object
+                raise ValueError(f"Batch rejected by {self.endpoint_uri}: {decoded.get('error')}")
+            decoded = [decoded]
+        return {item.get('id'): item for item in decoded}
+
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Get batches posted, requests carried and average batch size"""
+        return {
+            'batches': self.batches_sent,
+            'requests': self.requests_sent,
+            'avg_batch_size': self.requests_sent / self.batches_sent if self.batches_sent else 0.0,
+            'decode_time': self.decode_time,
+            'codec': 'orjson' if ORJSON_AVAILABLE else 'json'
+        }
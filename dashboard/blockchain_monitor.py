@@ -1,18 +1,33 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from web3 import Web3
 from eth_typing import ChecksumAddress
 import json
+from .state_cache import BlockRef, VersionedStateCache
+from .subscription_hub import SubscriptionHub
 
 logger = logging.getLogger(__name__)
 
 
 class BlockchainMonitor:
-    def __init__(self, w3: Web3, contract_address: str) -> None:
+    def __init__(
+        self,
+        w3: Web3,
+        contract_address: str,
+        subscription_hub: Optional[SubscriptionHub] = None
+    ) -> None:
         self.w3 = w3
         self.contract_address = Web3.to_checksum_address(contract_address)
         self.last_block = 0
         self.transactions: List[Dict[str, Any]] = []
+        # With a hub, new heads are pushed instead of polling eth_blockNumber
+        self.head_subscription = subscription_hub.subscribe_heads(maxsize=64) if subscription_hub else None
+        # Transactions keyed by hash and versioned by block, so reorgs can be undone
+        self.state = VersionedStateCache(
+            fetch_block=self._fetch_block_ref,
+            load_updates=self._load_block_transactions,
+            max_depth=64
+        )
 
         # Initialize MultiPathArbitrage contract
         try:
@@ -27,73 +42,102 @@ class BlockchainMonitor:
             logger.error(f"Error initializing contract: {e}")
             self.contract = None
 
+    def _fetch_block_ref(self, number: int) -> Optional[BlockRef]:
+        """Canonical hash and parent hash for a block number"""
+        try:
+            return BlockRef.from_block(self.w3.eth.get_block(number))
+        except Exception as e:
+            logger.error(f"Error fetching block {number}: {e}")
+            return None
+
+    def _load_block_transactions(self, block_ref: BlockRef) -> Dict[str, Dict[str, Any]]:
+        """Rescan a block that replaced an orphaned one"""
+        block = self.w3.eth.get_block(block_ref.hash, full_transactions=True)
+        return self._scan_block(block)
+
+    def _scan_block(self, block: Any) -> Dict[str, Dict[str, Any]]:
+        """Transactions in a block that involve the monitored contract, keyed by hash"""
+        found: Dict[str, Dict[str, Any]] = {}
+        block_timestamp = block['timestamp']
+
+        # Filter transactions involving our contract
+        for tx in block['transactions']:
+            if isinstance(tx, dict):  # Full transaction object
+                to_addr = Web3.to_checksum_address(tx.get('to', '0x0')) if tx.get('to') else '0x0'
+                from_addr = Web3.to_checksum_address(tx.get('from', '0x0'))
+
+                # Check if transaction involves our contract
+                if to_addr == self.contract_address or from_addr == self.contract_address:
+                    # Get transaction receipt for gas used
+                    receipt = self.w3.eth.get_transaction_receipt(tx['hash'])
+
+                    # Calculate actual cost
+                    gas_used = receipt['gasUsed']
+                    gas_price = tx['gasPrice']
+                    cost = Web3.from_wei(gas_used * gas_price, 'ether')
+
+                    # Check if this was an arbitrage execution
+                    is_arbitrage = False
+                    profit = 0.0
+                    try:
+                        # Look for ArbitrageExecuted event
+                        for log in receipt['logs']:
+                            if log['address'].lower() == self.contract_address.lower():
+                                event = self.contract.events.ArbitrageExecuted().process_log(log)
+                                if event:
+                                    is_arbitrage = True
+                                    profit = Web3.from_wei(event['args']['profit'], 'ether')
+                                    break
+                    except Exception as e:
+                        logger.error(f"Error processing logs: {e}")
+
+                    transaction = {
+                        'hash': tx['hash'].hex(),
+                        'from': from_addr,
+                        'to': to_addr,
+                        'value': Web3.from_wei(tx['value'], 'ether'),
+                        'gas_used': gas_used,
+                        'gas_price': Web3.from_wei(gas_price, 'gwei'),
+                        'cost': cost,
+                        'timestamp': block_timestamp,
+                        'block': block['number'],
+                        'success': receipt['status'] == 1,
+                        'is_arbitrage': is_arbitrage,
+                        'profit': profit
+                    }
+
+                    if is_arbitrage and self.state.get(transaction['hash']) is None:
+                        logger.info(f"New arbitrage transaction detected! Profit: {profit} ETH")
+                    found[transaction['hash']] = transaction
+
+        return found
+
     def get_transactions(self) -> List[Dict[str, Any]]:
         """Get real transactions from the blockchain"""
         try:
-            current_block = self.w3.eth.block_number
+            if self.head_subscription is not None and self.last_block != 0:
+                heads = self.head_subscription.drain()
+                if not heads:
+                    return sorted(self.transactions, key=lambda x: x['timestamp'], reverse=True)
+                current_block = int(heads[-1]['number'], 16)
+            else:
+                current_block = self.w3.eth.block_number
 
             if self.last_block == 0:
                 self.last_block = current_block - 1000  # Start from last 1000 blocks
 
-            # Get new blocks
+            # Get new blocks; the state cache rewinds transactions from orphaned blocks
             for block_num in range(self.last_block + 1, current_block + 1):
                 block = self.w3.eth.get_block(block_num, full_transactions=True)
-
-                # Filter transactions involving our contract
-                for tx in block['transactions']:
-                    if isinstance(tx, dict):  # Full transaction object
-                        to_addr = Web3.to_checksum_address(tx.get('to', '0x0')) if tx.get('to') else '0x0'
-                        from_addr = Web3.to_checksum_address(tx.get('from', '0x0'))
-
-                        # Check if transaction involves our contract
-                        if to_addr == self.contract_address or from_addr == self.contract_address:
-                            # Get transaction receipt for gas used
-                            receipt = self.w3.eth.get_transaction_receipt(tx['hash'])
-
-                            # Calculate actual cost
-                            gas_used = receipt['gasUsed']
-                            gas_price = tx['gasPrice']
-                            cost = Web3.from_wei(gas_used * gas_price, 'ether')
-
-                            # Get timestamp
-                            block_timestamp = block['timestamp']
-
-                            # Check if this was an arbitrage execution
-                            is_arbitrage = False
-                            profit = 0.0
-                            try:
-                                # Look for ArbitrageExecuted event
-                                for log in receipt['logs']:
-                                    if log['address'].lower() == self.contract_address.lower():
-                                        event = self.contract.events.ArbitrageExecuted().process_log(log)
-                                        if event:
-                                            is_arbitrage = True
-                                            profit = Web3.from_wei(event['args']['profit'], 'ether')
-                                            break
-                            except Exception as e:
-                                logger.error(f"Error processing logs: {e}")
-
-                            transaction = {
-                                'hash': tx['hash'].hex(),
-                                'from': from_addr,
-                                'to': to_addr,
-                                'value': Web3.from_wei(tx['value'], 'ether'),
-                                'gas_used': gas_used,
-                                'gas_price': Web3.from_wei(gas_price, 'gwei'),
-                                'cost': cost,
-                                'timestamp': block_timestamp,
-                                'block': block_num,
-                                'success': receipt['status'] == 1,
-                                'is_arbitrage': is_arbitrage,
-                                'profit': profit
-                            }
-
-                            if transaction not in self.transactions:
-                                self.transactions.append(transaction)
-                                if is_arbitrage:
-                                    logger.info(f"New arbitrage transaction detected! Profit: {profit} ETH")
+                reorg = self.state.advance(BlockRef.from_block(block), self._scan_block(block))
+                if reorg:
+                    logger.warning(
+                        f"Reorg of depth {reorg.depth} at block {reorg.fork_block}; "
+                        f"{reorg.rolled_back} transactions rolled back"
+                    )
 
             self.last_block = current_block
+            self.transactions = [tx for _, tx in self.state.items()]
             return sorted(self.transactions, key=lambda x: x['timestamp'], reverse=True)
 
         except Exception as e:
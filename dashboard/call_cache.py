@@ -0,0 +1,212 @@
+"""Block-scoped eth_call memoization middleware with in-flight call coalescing"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from eth_utils.toolz import curry
+from web3.middleware.base import Web3Middleware
+from web3.types import RPCEndpoint, RPCResponse
+
+logger = logging.getLogger(__name__)
+
+# Block tags whose result can change within a block and are never memoized
+UNCACHEABLE_BLOCK_TAGS = frozenset({'pending', 'safe', 'finalized', 'earliest'})
+
+# Parameterless reads that are memoized per head alongside eth_call. Keeping
+# the gas price fixed within a block also keeps calldata that embeds it
+# (e.g. PathFinder.findBestPath) identical, so those calls dedupe too.
+BLOCK_SCOPED_METHODS = frozenset({'eth_gasPrice', 'eth_maxPriorityFeePerGas'})
+
+
+@dataclass
+class CallCacheMetrics:
+    """Counters for memoized eth_call traffic"""
+    calls: int = 0
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    uncacheable: int = 0
+    invalidations: int = 0
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if isinstance(value, str):
+        return value.lower()
+    return value
+
+
+class BlockCallCache:
+    """Memoizes eth_call responses for the lifetime of the current block
+
+    Calls are keyed by (to, data, from, value, block). Calls against
+    'latest' are pinned to the current head, both in the key and in the
+    request sent upstream, so a memoized result always belongs to the block
+    it is keyed by. The head is refreshed with an eth_blockNumber at most
+    once every `head_ttl` seconds or pushed in via `on_new_head`; any head
+    advance drops every entry. Identical calls in flight at the same time
+    share one upstream request.
+    """
+
+    def __init__(self, head_ttl: float = 1.0, max_entries: int = 4096) -> None:
+        self.head_ttl = head_ttl
+        self.max_entries = max_entries
+        self.head: Optional[int] = None
+        self.last_head_check = 0.0
+        self.metrics = CallCacheMetrics()
+        self._entries: 'OrderedDict[Tuple, RPCResponse]' = OrderedDict()
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def on_new_head(self, block_number: int) -> None:
+        """Advance the head; drops every memoized call if the head moved"""
+        with self._lock:
+            self.last_head_check = time.time()
+            if self.head is not None and block_number <= self.head:
+                return
+            self.head = block_number
+            if self._entries:
+                self._entries.clear()
+                self.metrics.invalidations += 1
+            self._generation += 1
+
+    def _current_head(self, make_request: Callable[[RPCEndpoint, Any], RPCResponse]) -> Optional[int]:
+        if self.head is None or time.time() - self.last_head_check >= self.head_ttl:
+            self.last_head_check = time.time()
+            response = make_request(RPCEndpoint('eth_blockNumber'), [])
+            if 'result' in response:
+                self.on_new_head(int(response['result'], 16))
+        with self._lock:
+            return self.head
+
+    def _key(self, params: Any, block: Any) -> Tuple:
+        tx = params[0] if params else {}
+        return (
+            _hashable(tx.get('to')),
+            _hashable(tx.get('data') or tx.get('input')),
+            _hashable(tx.get('from')),
+            _hashable(tx.get('value')),
+            block
+        )
+
+    def call(
+        self,
+        make_request: Callable[[RPCEndpoint, Any], RPCResponse],
+        method: RPCEndpoint,
+        params: Any
+    ) -> RPCResponse:
+        """Serve a call from the cache, an in-flight twin or upstream"""
+        with self._lock:
+            self.metrics.calls += 1
+        if method in BLOCK_SCOPED_METHODS:
+            block = 'latest'
+        else:
+            block = params[1] if len(params) > 1 else 'latest'
+        if (isinstance(block, str) and block in UNCACHEABLE_BLOCK_TAGS) or len(params) > 2:
+            # State overrides (third param) and moving tags bypass the cache
+            with self._lock:
+                self.metrics.uncacheable += 1
+            return make_request(method, params)
+        if block is None or block == 'latest':
+            block = self._current_head(make_request)
+            if block is None:
+                with self._lock:
+                    self.metrics.uncacheable += 1
+                return make_request(method, params)
+            if method not in BLOCK_SCOPED_METHODS:
+                # Ask for the block the result is cached under, not whatever is latest upstream
+                params = [params[0], hex(block)]
+        if isinstance(block, int):
+            block = hex(block)
+        if method in BLOCK_SCOPED_METHODS:
+            key: Tuple = (method, block)
+        else:
+            key = self._key(params, _hashable(block))
+
+        with self._lock:
+            if key in self._entries:
+                self.metrics.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            waiting = self._in_flight.get(key)
+            if waiting is not None:
+                self.metrics.coalesced += 1
+            else:
+                self.metrics.misses += 1
+                future: Future = Future()
+                self._in_flight[key] = future
+                generation = self._generation
+        if waiting is not None:
+            return waiting.result()
+
+        try:
+            response = make_request(method, params)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._in_flight.pop(key, None)
+            # Errors (reverts, bad params) are returned but not memoized
+            if 'result' in response and generation == self._generation:
+                self._entries[key] = response
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(response)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get call counters and the share of calls served without an upstream request"""
+        with self._lock:
+            metrics = self.metrics.__dict__.copy()
+            metrics['head'] = self.head
+            metrics['size'] = len(self._entries)
+        served = metrics['hits'] + metrics['coalesced']
+        metrics['dedupe_ratio'] = served / metrics['calls'] if metrics['calls'] else 0.0
+        return metrics
+
+
+class BlockCallCacheMiddleware(Web3Middleware):
+    """Routes eth_call and gas price reads through a BlockCallCache
+
+    eth_blockNumber responses passing through also advance the head.
+
+    Install with::
+
+        w3.middleware_onion.add(BlockCallCacheMiddleware.build(cache), 'block_call_cache')
+    """
+
+    cache: BlockCallCache
+
+    @staticmethod
+    @curry
+    def build(cache: BlockCallCache, w3: Any) -> 'BlockCallCacheMiddleware':
+        middleware = BlockCallCacheMiddleware(w3)
+        middleware.cache = cache
+        return middleware
+
+    def wrap_make_request(
+        self,
+        make_request: Callable[[RPCEndpoint, Any], RPCResponse]
+    ) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            if method == 'eth_call' or method in BLOCK_SCOPED_METHODS:
+                return self.cache.call(make_request, method, params)
+            response = make_request(method, params)
+            if method == 'eth_blockNumber' and 'result' in response:
+                self.cache.on_new_head(int(response['result'], 16))
+            return response
+
+        return middleware
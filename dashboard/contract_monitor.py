@@ -6,6 +6,7 @@ import json
 import threading
 import time
 from dashboard.blockchain_monitor import BlockchainMonitor
+from dashboard.subscription_hub import get_subscription_hub
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +20,13 @@ class ContractMonitor:
         self.contract_address = Web3.to_checksum_address(contract_address)
         self.trades: List[Dict[str, Any]] = []
         self.start_time = datetime.now()
+        # Hourly profit buckets and the trades list they were built from
+        self.hourly_profits: Dict[int, float] = {}
+        self._rolled_up: Optional[List[Dict[str, Any]]] = None
         self.contract = self.load_contract()
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
-        self.blockchain_monitor = BlockchainMonitor(w3, contract_address)
+        self.blockchain_monitor = BlockchainMonitor(w3, contract_address, get_subscription_hub('base'))
         logger.info(f"Contract monitor initialized for {contract_address}")
 
     def load_contract(self) -> Optional[Contract]:
@@ -121,31 +125,35 @@ class ContractMonitor:
         stats = self.blockchain_monitor.get_profit_stats()
         return stats['net_profit']
 
+    def _rollup_profits(self) -> None:
+        """Bucket successful profit by hour since start_time in one pass over the trades"""
+        trades = self.trades
+        start_ts = int(self.start_time.timestamp())
+        one_hour = 3600  # seconds in an hour
+        buckets: Dict[int, float] = {}
+        for trade in trades:
+            if trade['timestamp'] < start_ts:
+                continue
+            bucket = start_ts + (trade['timestamp'] - start_ts) // one_hour * one_hour
+            profit = trade['value'] - trade['cost'] if trade['success'] else 0
+            buckets[bucket] = buckets.get(bucket, 0) + profit
+        self.hourly_profits = buckets
+        self._rolled_up = trades
+
     def get_profit_history(self) -> List[Dict[str, Any]]:
         """Get historical profit data"""
         if not self.trades:
             return []
 
-        # Group trades by hour
-        history = []
-        current_time = self.start_time
-        one_hour = 3600  # seconds in an hour
-
-        while current_time <= datetime.now():
-            current_ts = int(current_time.timestamp())
-            next_ts = current_ts + one_hour
-
-            hour_trades = [t for t in self.trades if t['timestamp'] >= current_ts and t['timestamp'] < next_ts]
-
-            if hour_trades:
-                profit = sum(t['value'] - t['cost'] for t in hour_trades if t['success'])
-                history.append({
-                    'timestamp': current_ts,
-                    'profit': profit
-                })
-            current_time = datetime.fromtimestamp(next_ts)
-
-        return history
+        # The rollup is rebuilt only when the monitor loop swaps in a new trades list
+        if self._rolled_up is not self.trades:
+            self._rollup_profits()
+        now_ts = datetime.now().timestamp()
+        return [
+            {'timestamp': bucket, 'profit': profit}
+            for bucket, profit in sorted(self.hourly_profits.items())
+            if bucket <= now_ts
+        ]
 
 
 def init_contract_monitoring(w3: Optional[Web3], contract_address: Optional[str]) -> Optional[ContractMonitor]:
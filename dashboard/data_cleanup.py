@@ -2,113 +2,64 @@
 
 import logging
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from typing import Dict, Optional
+
+from .db_pool import get_database_pool
+from .retention import RetentionManager, RetentionPolicy, RetentionReport
 
 logger = logging.getLogger(__name__)
 
 class DatabaseCleaner:
     """Handles cleanup of old data from the database"""
     
-    def __init__(self, db_path: str = 'arbitrage_bot.db'):
+    def __init__(self, db_path: str = 'arbitrage_bot.db', partitions: Optional[Dict[str, float]] = None):
         self.db_path = db_path
+        self.db_pool = get_database_pool(db_path)
+        self.retention = RetentionManager(db_path)
+        # Day-partitioned tables (<base>_YYYYMMDD) to rotate, with their retention in days
+        self.partitions = partitions or {}
         
     def get_db_connection(self) -> sqlite3.Connection:
-        """Get database connection"""
-        conn = sqlite3.Connection(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled read-only connection; writes go through db_pool.write()"""
+        return self.db_pool.reader()
         
     def cleanup_old_data(self, 
                         price_retention_days: int = 7,
                         metrics_retention_days: int = 30,
-                        logs_retention_days: int = 14) -> None:
-        """Clean up old data from various tables"""
-        conn = None
+                        logs_retention_days: int = 14) -> Optional[RetentionReport]:
+        """Clean up old data from various tables in small batches"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Calculate cutoff timestamps
-            price_cutoff = datetime.now() - timedelta(days=price_retention_days)
-            metrics_cutoff = datetime.now() - timedelta(days=metrics_retention_days)
-            logs_cutoff = datetime.now() - timedelta(days=logs_retention_days)
-            
-            # Clean up price data
-            cursor.execute('''
-                DELETE FROM dex_prices 
-                WHERE timestamp < ?
-            ''', (price_cutoff,))
-            
-            cursor.execute('''
-                DELETE FROM price_history 
-                WHERE timestamp < ?
-            ''', (int(price_cutoff.timestamp()),))
-            
-            # Clean up metrics
-            cursor.execute('''
-                DELETE FROM system_metrics 
-                WHERE timestamp < ?
-            ''', (metrics_cutoff,))
-            
-            cursor.execute('''
-                DELETE FROM model_metrics 
-                WHERE timestamp < ?
-            ''', (metrics_cutoff,))
-            
-            cursor.execute('''
-                DELETE FROM risk_metrics 
-                WHERE timestamp < ?
-            ''', (metrics_cutoff,))
-            
-            # Clean up logs
-            cursor.execute('''
-                DELETE FROM system_logs 
-                WHERE timestamp < ?
-            ''', (logs_cutoff,))
-            
-            # Clean up opportunity data
-            cursor.execute('''
-                DELETE FROM opportunity_scores 
-                WHERE timestamp < ?
-            ''', (price_cutoff,))
-            
-            cursor.execute('''
-                DELETE FROM opportunity_history 
-                WHERE timestamp < ?
-            ''', (int(price_cutoff.timestamp()),))
-            
-            # Clean up correlation data
-            cursor.execute('''
-                DELETE FROM dex_correlations 
-                WHERE timestamp < ?
-            ''', (metrics_cutoff,))
-            
-            # Clean up prediction data
-            cursor.execute('''
-                DELETE FROM prediction_confidence 
-                WHERE timestamp < ?
-            ''', (metrics_cutoff,))
-            
-            # Optimize database
-            cursor.execute('VACUUM')
-            
-            # Commit changes
-            conn.commit()
+            policies = [
+                # Price data
+                RetentionPolicy('dex_prices', price_retention_days),
+                RetentionPolicy('price_history', price_retention_days),
+                # Metrics
+                RetentionPolicy('system_metrics', metrics_retention_days),
+                RetentionPolicy('model_metrics', metrics_retention_days),
+                RetentionPolicy('risk_metrics', metrics_retention_days),
+                # Logs
+                RetentionPolicy('system_logs', logs_retention_days),
+                # Opportunity data
+                RetentionPolicy('opportunity_scores', price_retention_days),
+                RetentionPolicy('opportunity_history', price_retention_days),
+                # Correlation and prediction data
+                RetentionPolicy('dex_correlations', metrics_retention_days),
+                RetentionPolicy('prediction_confidence', metrics_retention_days)
+            ]
+            report = self.retention.run(policies, partitions=self.partitions)
             
             logger.info(f"""Cleanup completed:
                 - Removed price data older than {price_retention_days} days
                 - Removed metrics older than {metrics_retention_days} days
                 - Removed logs older than {logs_retention_days} days
+                - Max writer stall {report.max_stall_ms:.1f} ms over {report.batches} batches
             """)
+            return report
             
         except Exception as e:
             logger.error(f"Error during database cleanup: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
+            return None
     
     def analyze_database_size(self) -> dict:
         """Analyze database table sizes and row counts"""
@@ -147,30 +98,39 @@ class DatabaseCleaner:
             if conn:
                 conn.close()
     
-    def optimize_database(self) -> None:
-        """Optimize database by rebuilding indices and vacuuming"""
-        conn = None
+    def optimize_database(self, full: bool = False) -> None:
+        """Refresh planner statistics and reclaim free pages
+
+        By default only steps that hold the writer briefly run: PRAGMA
+        optimize (ANALYZE where it is stale) and incremental vacuum. full
+        adds REINDEX and VACUUM, which lock the file for as long as they
+        take to rewrite it; use it offline.
+        """
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Reindex
-            cursor.execute("REINDEX")
-            
-            # Vacuum to reclaim space and defragment
-            cursor.execute("VACUUM")
-            
-            # Analyze to update statistics
-            cursor.execute("ANALYZE")
+            if full:
+                with self.db_pool.write() as conn:
+                    cursor = conn.cursor()
+                    
+                    # Reindex
+                    cursor.execute("REINDEX")
+                    
+                    # Vacuum to reclaim space and defragment; also converts to incremental vacuum
+                    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    cursor.execute("VACUUM")
+                    
+                    # Analyze to update statistics
+                    cursor.execute("ANALYZE")
+            else:
+                with self.db_pool.write() as conn:
+                    conn.execute("PRAGMA optimize")
+                
+                while self.retention.vacuum_step():
+                    time.sleep(self.retention.pause)
             
-            conn.commit()
             logger.info("Database optimization completed")
             
         except Exception as e:
             logger.error(f"Error optimizing database: {e}")
-        finally:
-            if conn:
-                conn.close()
 
 def main():
     """Run database maintenance"""
@@ -186,8 +146,8 @@ def main():
         # Perform cleanup
         cleaner.cleanup_old_data()
         
-        # Optimize
-        cleaner.optimize_database()
+        # Optimize; main() runs offline, so the full rebuild is fine here
+        cleaner.optimize_database(full=True)
         
         # Analyze after cleanup
         analysis = cleaner.analyze_database_size()
@@ -7,10 +7,13 @@ Data providers package initialization
 
 from .base_provider import BaseDataProvider, PairConfig, ExchangeConfig
 from .live_provider import LiveDataProvider
+from .cache import StaleWhileRevalidateCache, CacheMetrics
 
 __all__ = [
     'BaseDataProvider',
     'PairConfig',
     'ExchangeConfig',
-    'LiveDataProvider'
+    'LiveDataProvider',
+    'StaleWhileRevalidateCache',
+    'CacheMetrics'
 ]
@@ -0,0 +1,212 @@
+"""
+Bounded stale-while-revalidate cache for data providers
+
+@CONTEXT: Shared price/quote cache with LRU bound, per-key TTLs and request coalescing
+@LAST_POINT: 2026-10-18 - Initial cache implementation
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheMetrics:
+    """Cache counters"""
+    hits: int = 0
+    misses: int = 0
+    stale_serves: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    evictions: int = 0
+    stale_evictions: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires_at: float
+
+
+class StaleWhileRevalidateCache:
+    """LRU cache that serves expired entries while refreshing them in the background
+
+    - Entries past their TTL are returned immediately by get_or_load and a
+      single background refresh is started for the key.
+    - Entries more than max_stale seconds past their TTL, e.g. because every
+      refresh has been failing, are evicted and treated as misses.
+    - Concurrent misses on the same key share one loader call.
+    - The cache never holds more than max_size entries; the least recently
+      used entry is evicted first.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: float = 30.0,
+        max_refresh_workers: int = 4,
+        max_stale: Optional[float] = 60.0
+    ) -> None:
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self.metrics = CacheMetrics()
+        self._entries: 'OrderedDict[Hashable, _CacheEntry]' = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_refresh_workers,
+            thread_name_prefix='cache-refresh'
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Optional[Any]:
+        """Get a cached value without loading; expired entries only if allow_stale"""
+        now = time.time()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is None:
+                self.metrics.misses += 1
+                return None
+            if entry.expires_at <= now:
+                if not allow_stale:
+                    self.metrics.misses += 1
+                    return None
+                self.metrics.stale_serves += 1
+            else:
+                self.metrics.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value with an optional per-key TTL in seconds"""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Get a value, loading it on a miss and revalidating it when stale
+
+        None results from the loader are returned but not cached. Loader
+        exceptions propagate to every caller waiting on a miss; failed
+        background refreshes are logged and the stale value kept.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.expires_at > now:
+                    self.metrics.hits += 1
+                    return entry.value
+                self.metrics.stale_serves += 1
+                if key not in self._in_flight:
+                    self._in_flight[key] = self._executor.submit(self._refresh, key, loader, ttl)
+                return entry.value
+
+            self.metrics.misses += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.metrics.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._load(key, loader, ttl)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a key from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache counters and derived hit ratio"""
+        with self._lock:
+            metrics = asdict(self.metrics)
+            metrics['size'] = len(self._entries)
+        lookups = metrics['hits'] + metrics['misses'] + metrics['stale_serves']
+        metrics['hit_ratio'] = (
+            (metrics['hits'] + metrics['stale_serves']) / lookups if lookups else 0.0
+        )
+        return metrics
+
+    def shutdown(self) -> None:
+        """Stop the background refresh workers"""
+        self._executor.shutdown(wait=False)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._store(key, value, ttl)
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        try:
+            value = self._load(key, loader, ttl)
+            with self._lock:
+                self.metrics.refreshes += 1
+            return value
+        except Exception as e:
+            with self._lock:
+                self.metrics.refresh_errors += 1
+            logger.warning(f"Background refresh failed for {key}: {e}")
+            # Surfaces to any miss that coalesced onto this refresh
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _live_entry(self, key: Hashable, now: float) -> Optional[_CacheEntry]:
+        """Entry for key, evicting it if it is past the stale bound; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is not None and self.max_stale is not None and entry.expires_at + self.max_stale <= now:
+            del self._entries[key]
+            self.metrics.stale_evictions += 1
+            return None
+        return entry
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        """Store an entry and enforce the size bound; caller holds the lock"""
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = _CacheEntry(value=value, expires_at=expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.metrics.evictions += 1
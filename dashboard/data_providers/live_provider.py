@@ -1,9 +1,12 @@
 import logging
 from web3 import Web3
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from ..token_registry import TokenRegistry, get_token_registry
+from .cache import StaleWhileRevalidateCache
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +17,33 @@ class PriceValidationError(Exception):
 
 
 class LiveDataProvider:
-    def __init__(self, web3: Web3, config: dict) -> None:
+    def __init__(self, web3: Web3, config: dict, token_registry: Optional[TokenRegistry] = None) -> None:
         self.web3 = web3
         self.config = config
-        self.price_cache: Dict[str, int] = {}
-        self.cache_timeout = 30  # 30 seconds
-        self.last_update: Dict[str, float] = {}
+        self.token_registry = token_registry or get_token_registry()
+        self.cache_timeout = config.get('cache_timeout', 30)  # 30 seconds
+        self.price_cache = StaleWhileRevalidateCache(
+            max_size=config.get('cache_size', 1024),
+            default_ttl=self.cache_timeout,
+            max_stale=config.get('cache_max_stale', 60)
+        )
+
+        # Fee tier search state: winning tier per pair and last full scan time
+        self.best_fee_tiers: Dict[str, int] = {}
+        self.last_fee_tier_scan: Dict[str, float] = {}
+        self.fee_tier_rescan_interval = config.get('fee_tier_rescan_interval', 300)
+        self.refresh_latency: Dict[str, float] = {}
+        fee_tiers = config.get('exchanges', {}).get('uniswap_v3', {}).get('fee_tiers', [])
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(len(fee_tiers), 1),
+            thread_name_prefix='v3-quote'
+        )
+
+        # Index configured pairs by (base, quote) address for O(1) validation lookups
+        self.pair_index: Dict[Tuple[str, str], str] = {
+            self._pair_key(pair_config['base_token'], pair_config['quote_token']): pair_name
+            for pair_name, pair_config in config.get('pairs', {}).items()
+        }
 
         # Load UniswapV3 Quoter ABI
         with open('abi/IUniswapV3QuoterV2.json', 'r') as f:
@@ -36,56 +60,89 @@ class LiveDataProvider:
             logger.error("Missing Uniswap V3 configuration")
             raise ValueError("Missing Uniswap V3 configuration")
 
+    def _quote_fee_tier(self, token_in: str, token_out: str, amount_in: int, fee_tier: int) -> int:
+        """Quote a single fee tier, returning 0 if the tier has no usable pool"""
+        try:
+            params = {
+                'tokenIn': self.token_registry.intern(token_in),
+                'tokenOut': self.token_registry.intern(token_out),
+                'amountIn': amount_in,
+                'fee': fee_tier,
+                'sqrtPriceLimitX96': 0
+            }
+
+            quote = self.quoter.functions.quoteExactInputSingle(params).call()
+
+            # QuoterV2 returns (amountOut, sqrtPriceX96After, ticksCrossed, gasEstimate)
+            return int(quote[0] if isinstance(quote, (list, tuple)) else quote)
+
+        except Exception as e:
+            logger.debug(f"Failed to get quote for fee tier {fee_tier}: {str(e)}")
+            return 0
+
     def get_v3_quote(self, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
-        """Get quote from Uniswap V3"""
+        """Get quote from Uniswap V3
+
+        Steady-state refreshes quote only the pair's last winning fee tier.
+        All tiers are quoted concurrently on the first call, when the cached
+        tier stops returning a quote, and every fee_tier_rescan_interval seconds.
+        """
+        pair_key = f"{token_in}-{token_out}"
+        start_time = time.time()
         try:
             # Get fee tiers from config
             fee_tiers = self.config['exchanges']['uniswap_v3']['fee_tiers']
             best_quote = 0
 
-            for fee_tier in fee_tiers:
-                try:
-                    params = {
-                        'tokenIn': Web3.to_checksum_address(token_in),
-                        'tokenOut': Web3.to_checksum_address(token_out),
-                        'amountIn': amount_in,
-                        'fee': fee_tier,
-                        'sqrtPriceLimitX96': 0
-                    }
-
-                    quote = self.quoter.functions.quoteExactInputSingle(params).call()
-
-                    if quote > best_quote:
-                        best_quote = quote
-
-                except Exception as e:
-                    logger.debug(f"Failed to get quote for fee tier {fee_tier}: {str(e)}")
-                    continue
+            best_tier = self.best_fee_tiers.get(pair_key)
+            rescan_due = start_time - self.last_fee_tier_scan.get(pair_key, 0) >= self.fee_tier_rescan_interval
+            if best_tier is not None and not rescan_due:
+                best_quote = self._quote_fee_tier(token_in, token_out, amount_in, best_tier)
+
+            if best_quote == 0:
+                quotes = list(self.executor.map(
+                    lambda fee_tier: self._quote_fee_tier(token_in, token_out, amount_in, fee_tier),
+                    fee_tiers
+                ))
+                self.last_fee_tier_scan[pair_key] = start_time
+                best_quote = max(quotes, default=0)
+                if best_quote > 0:
+                    self.best_fee_tiers[pair_key] = fee_tiers[quotes.index(best_quote)]
+                else:
+                    self.best_fee_tiers.pop(pair_key, None)
 
             return best_quote if best_quote > 0 else None
 
         except Exception as e:
             logger.debug(f"Failed to get V3 quote: {str(e)}")
             return None
+        finally:
+            self.refresh_latency[pair_key] = time.time() - start_time
+
+    def get_refresh_latency(self) -> Dict[str, float]:
+        """Get the latest quote refresh latency in seconds per token pair"""
+        return dict(self.refresh_latency)
 
     def get_price(self, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
-        """Get the best price for a token pair"""
-        cache_key = f"{token_in}-{token_out}-{amount_in}"
+        """Get the best price for a token pair
 
-        # Check cache
-        if cache_key in self.price_cache:
-            last_update = self.last_update.get(cache_key, 0)
-            if time.time() - last_update < self.cache_timeout:
-                return self.price_cache[cache_key]
+        Cached prices past cache_timeout are served while a background
+        refresh runs; concurrent misses for the same key share one quote.
+        """
+        cache_key = f"{token_in}-{token_out}-{amount_in}"
+        return self.price_cache.get_or_load(
+            cache_key,
+            lambda: self._fetch_price(token_in, token_out, amount_in)
+        )
 
+    def _fetch_price(self, token_in: str, token_out: str, amount_in: int) -> Optional[int]:
+        """Quote and validate a price without consulting the cache"""
         # Get V3 quote
         amount_out = self.get_v3_quote(token_in, token_out, amount_in)
 
         if amount_out and amount_out > 0:
             # Validate price before caching
             if self._validate_price(token_in, token_out, amount_in, amount_out):
-                self.price_cache[cache_key] = amount_out
-                self.last_update[cache_key] = time.time()
                 return amount_out
             else:
                 raise PriceValidationError(f"Price validation failed for {token_in}/{token_out}")
@@ -96,12 +153,7 @@ class LiveDataProvider:
         """Validate price against configured thresholds"""
         try:
             # Get token pair config
-            pair_key = None
-            for pair_name, pair_config in self.config['pairs'].items():
-                if (pair_config['base_token'].lower() == token_in.lower() and
-                    pair_config['quote_token'].lower() == token_out.lower()):
-                    pair_key = pair_name
-                    break
+            pair_key = self.pair_index.get(self._pair_key(token_in, token_out))
 
             if not pair_key:
                 logger.warning(f"No configuration found for pair {token_in}/{token_out}")
@@ -123,6 +175,13 @@ class LiveDataProvider:
             logger.error(f"Price validation error: {str(e)}")
             return False
 
+    def _pair_key(self, token_in: str, token_out: str) -> Tuple[str, str]:
+        """Normalize a token pair to registry addresses for indexing"""
+        return (
+            self.token_registry.resolve(token_in) or token_in.lower(),
+            self.token_registry.resolve(token_out) or token_out.lower()
+        )
+
     def get_all_prices(self) -> Dict[str, int]:
         """Get all configured token pair prices"""
         prices = {}
@@ -146,4 +205,7 @@ class LiveDataProvider:
     def clear_cache(self) -> None:
         """Clear the price cache"""
         self.price_cache.clear()
-        self.last_update.clear()
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Get price cache hit, miss and stale-serve counters"""
+        return self.price_cache.get_metrics()
@@ -0,0 +1,203 @@
+"""Shared SQLite access layer: one WAL writer connection plus per-thread read-only connections"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Applied to every connection; journal_mode is set once by the writer
+CONNECTION_PRAGMAS: Dict[str, Any] = {
+    'busy_timeout': 5000,
+    'cache_size': -65536,      # 64 MiB page cache (negative = KiB)
+    'mmap_size': 268435456,    # 256 MiB memory-mapped reads
+    'temp_store': 'MEMORY'
+}
+WRITER_PRAGMAS: Dict[str, Any] = {
+    'auto_vacuum': 'INCREMENTAL',  # only takes effect on new files; must precede WAL
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL'
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection owned by the pool
+
+    close() is a no-op so existing connect / use / close() call sites keep
+    working; the connection and its prepared statement cache stay open.
+    The pool closes readers when their thread exits and everything in
+    DatabasePool.close().
+    """
+
+    def close(self) -> None:
+        pass
+
+    def close_for_real(self) -> None:
+        super().close()
+
+
+class _ReaderSlot:
+    """Holds a thread's reader in the pool's thread-local; its finalizer closes the reader"""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: PooledConnection) -> None:
+        self.conn = conn
+
+
+class DatabasePool:
+    """Connections to one SQLite file shared by every component in the process
+
+    All writes go through a single connection leased with write(), a
+    context manager around a re-entrant lock, so writers queue in-process
+    instead of contending on the file lock and the lease is released even
+    when the block raises. Each thread reads through its own read-only
+    connection, closed when the thread exits. In WAL
+    mode readers see the last committed state without blocking the
+    writer, so dashboard queries never stall the bot's inserts. Every
+    connection keeps sqlite3's prepared statement cache warm across
+    calls.
+    """
+
+    def __init__(self, db_path: str, cached_statements: int = 256) -> None:
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._writer: Optional[PooledConnection] = None
+        self._writer_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers: List[PooledConnection] = []
+        self._readers_lock = threading.Lock()
+        self.writer_leases = 0
+        self.readers_opened = 0
+
+    def _apply_pragmas(self, conn: sqlite3.Connection, pragmas: Dict[str, Any]) -> None:
+        for name, value in pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+
+    def _open_writer(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=PooledConnection,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn, WRITER_PRAGMAS)
+        self._apply_pragmas(conn, CONNECTION_PRAGMAS)
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[PooledConnection]:
+        """Lease the writer connection for the block
+
+        Commits when the block exits normally, rolls back when it raises,
+        and always lets the next writer in. Leases nest on one thread.
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            self.writer_leases += 1
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            else:
+                if conn.in_transaction:
+                    conn.commit()
+
+    def _discard_reader(self, conn: PooledConnection) -> None:
+        with self._readers_lock:
+            if conn in self._readers:
+                self._readers.remove(conn)
+        conn.close_for_real()
+
+    def reader(self) -> PooledConnection:
+        """This thread's read-only connection"""
+        slot = getattr(self._local, 'reader', None)
+        if slot is not None:
+            return slot.conn
+        if self._writer is None:
+            # Creates the file and switches it to WAL before the first read-only open
+            with self.write():
+                pass
+        conn = sqlite3.connect(
+            f"file:{os.path.abspath(self.db_path)}?mode=ro",
+            uri=True,
+            factory=PooledConnection,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn, CONNECTION_PRAGMAS)
+        conn.execute("PRAGMA query_only=1")
+        # Thread-locals are dropped when their thread ends, which closes the reader
+        slot = _ReaderSlot(conn)
+        weakref.finalize(slot, self._discard_reader, conn)
+        self._local.reader = slot
+        with self._readers_lock:
+            self._readers.append(conn)
+            self.readers_opened += 1
+        return conn
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Close every connection; the pool reopens them on next use
+
+        Waits up to timeout seconds (forever if None) for a writer lease
+        to end; if it does not, the writer is left open and False returned.
+        """
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close_for_real()
+        self._local = threading.local()
+        if not self._writer_lock.acquire(timeout=-1 if timeout is None else timeout):
+            logger.warning(f"Writer for {self.db_path} still leased; leaving it open")
+            return False
+        try:
+            if self._writer is not None:
+                self._writer.close_for_real()
+                self._writer = None
+        finally:
+            self._writer_lock.release()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._readers_lock:
+            return {
+                'db_path': self.db_path,
+                'writer_open': self._writer is not None,
+                'writer_leases': self.writer_leases,
+                'readers': len(self._readers),
+                'readers_opened': self.readers_opened
+            }
+
+
+_pools: Dict[str, DatabasePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_database_pool(db_path: str = 'arbitrage_bot.db') -> DatabasePool:
+    """Get the shared pool for a database file (keyed by absolute path)"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = DatabasePool(key)
+        return pool
+
+
+@atexit.register
+def close_all_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        # Never hang interpreter exit on a lease held by a stuck thread
+        pool.close(timeout=1.0)
@@ -5,8 +5,9 @@ import logging
 from typing import Dict, Any, Optional, Tuple
 from decimal import Decimal
 from web3.contract import Contract
-from web3 import Web3
 from .web3_utils import Web3Manager, get_web3_manager
+from .token_registry import get_token_registry
+from .spread_matrix import SpreadMatrix
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,7 @@ class DexInterface:
     def __init__(self):
         self.web3_manager = get_web3_manager()
         self.dex_config = self._load_config()
+        self.token_registry = get_token_registry()
         self.contracts: Dict[str, Dict[str, Contract]] = {}
         self._initialize_contracts()
     
@@ -80,8 +82,11 @@ class DexInterface:
                 fee = pool_info['fee']
                 
                 # Get token decimals
-                token0_decimals = self.dex_config['tokens'][pool_info['token0_symbol']]['decimals']
-                token1_decimals = self.dex_config['tokens'][pool_info['token1_symbol']]['decimals']
+                token0_decimals = self.token_registry.get_decimals(token0, self.web3_manager.w3)
+                token1_decimals = self.token_registry.get_decimals(token1, self.web3_manager.w3)
+                if token0_decimals is None or token1_decimals is None:
+                    logger.error(f"Could not find token decimals for {pair_name}")
+                    return None
                 
                 # Use 1 token0 as input amount
                 amount_in = 10 ** token0_decimals
@@ -158,19 +163,14 @@ class DexInterface:
                     token0 = pool_info['token0']
                     token1 = pool_info['token1']
                     
-                    # Find token info in the tokens section
-                    token0_info = next((info for symbol, info in self.dex_config['tokens'].items() 
-                                      if info['address'].lower() == token0.lower()), None)
-                    token1_info = next((info for symbol, info in self.dex_config['tokens'].items() 
-                                      if info['address'].lower() == token1.lower()), None)
+                    # Look up token decimals in the registry
+                    token0_decimals = self.token_registry.get_decimals(token0, self.web3_manager.w3)
+                    token1_decimals = self.token_registry.get_decimals(token1, self.web3_manager.w3)
                     
-                    if not token0_info or not token1_info:
+                    if token0_decimals is None or token1_decimals is None:
                         logger.error(f"Could not find token info for {pair_name}")
                         return None
                     
-                    token0_decimals = token0_info['decimals']
-                    token1_decimals = token1_info['decimals']
-                    
                     # Calculate price accounting for decimals
                     decimal_adjustment = Decimal(10 ** (token1_decimals - token0_decimals))
                     price = Decimal(reserve1) / Decimal(reserve0) * decimal_adjustment
@@ -240,27 +240,53 @@ class DexInterface:
             )
             return None
     
+    def _swap_fee(self, dex_name: str, pair_name: str) -> float:
+        """Swap fee of a DEX's pool for a pair, as a fraction of the amount traded"""
+        dex_info = self.dex_config['dexes'].get(dex_name, {})
+        pool_info = dex_info.get('pools', {}).get(pair_name, {})
+        if 'fee' in pool_info:
+            # Concentrated liquidity fee tiers are in hundredths of a basis point
+            return pool_info['fee'] / 1_000_000
+        if pool_info.get('stable'):
+            return 0.0005
+        return dex_info.get('fee_bps', 30) / 10_000
+
     def check_arbitrage_opportunities(self) -> Dict[str, Dict[str, Any]]:
-        """Check for arbitrage opportunities across all pairs"""
-        opportunities = {}
-        
-        for pair in self.dex_config['pairs']:
-            pair_name = pair['name']
-            min_profit = Decimal(pair['min_profit_threshold'])
-            
-            price_info = self.calculate_price_difference(pair_name)
-            if price_info:
-                base_price, quote_price, price_diff_percent = price_info
-                
-                if abs(price_diff_percent) > min_profit:
-                    opportunities[pair_name] = {
-                        'base_price': float(base_price),
-                        'quote_price': float(quote_price),
-                        'price_difference_percent': float(price_diff_percent),
-                        'profitable': True,
-                        'direction': 'buy' if quote_price > base_price else 'sell'
-                    }
-        
+        """Check for arbitrage opportunities across all pairs
+
+        Prices from every DEX go into one spread matrix, with each pool's
+        swap fee, and are screened in a single vectorized pass; the best
+        venue pair per token pair is reported if its spread after fees
+        clears that pair's min_profit_threshold (a fraction, 0.002 = 0.2%).
+        """
+        opportunities: Dict[str, Dict[str, Any]] = {}
+        thresholds = {pair['name']: Decimal(pair['min_profit_threshold']) for pair in self.dex_config['pairs']}
+        if not thresholds:
+            return opportunities
+
+        matrix = SpreadMatrix(initial_tokens=len(thresholds))
+        for dex_name, dex_prices in self.get_all_prices().items():
+            for pair_name, price in dex_prices.items():
+                if price is not None and pair_name in thresholds:
+                    matrix.update(pair_name, dex_name, float(price), fee=self._swap_fee(dex_name, pair_name))
+
+        # Candidates come back best first, so the first hit per pair wins
+        for candidate in matrix.screen(float(min(thresholds.values())) * 100):
+            pair_name = candidate.token
+            if pair_name in opportunities:
+                continue
+            if Decimal(str(candidate.spread_percent)) / 100 <= thresholds[pair_name]:
+                continue
+            opportunities[pair_name] = {
+                'base_price': candidate.buy_price,
+                'quote_price': candidate.sell_price,
+                'price_difference_percent': candidate.spread_percent,
+                'profitable': True,
+                'direction': 'buy',
+                'buy_dex': candidate.buy_venue,
+                'sell_dex': candidate.sell_venue
+            }
+
         return opportunities
 
 def get_dex_interface() -> DexInterface:
@@ -1,12 +1,17 @@
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from web3 import Web3
+from .provider_registry import get_provider_registry
 
 logger = logging.getLogger(__name__)
 
 
 class GasPriceFetcher:
-    def __init__(self, w3_connections: Dict[str, Web3], config: Dict) -> None:
+    def __init__(self, w3_connections: Optional[Dict[str, Web3]], config: Dict) -> None:
+        # Default to the process-wide shared connections for the configured networks
+        if w3_connections is None:
+            networks: List[str] = config.get('NETWORKS', ['base'])
+            w3_connections = get_provider_registry().get_w3_connections(networks)
         self.w3_connections = w3_connections
         self.config = config
 
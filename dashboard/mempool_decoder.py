@@ -0,0 +1,461 @@
+"""Streaming decoder turning pending transaction hashes into typed swap intents"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from eth_abi import decode
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+logger = logging.getLogger(__name__)
+
+# ABI type of each named argument in the router call layouts below
+FIELD_TYPES: Dict[str, str] = {
+    'amount_in': 'uint256',
+    'amount_out': 'uint256',
+    'deadline': 'uint256',
+    'recipient': 'address',
+    'path': 'address[]',
+    'routes': '(address,address,bool,address)[]',
+    'encoded_path': 'bytes',
+    'token_in': 'address',
+    'token_out': 'address',
+    'fee': 'uint24',
+    'sqrt_price_limit': 'uint160',
+    'calls': 'bytes[]',
+    'previous_blockhash': 'bytes32'
+}
+
+_V2_EXACT_IN = ['amount_in', 'amount_out', 'path', 'recipient', 'deadline']
+_V2_EXACT_OUT = ['amount_out', 'amount_in', 'path', 'recipient', 'deadline']
+_V2_ETH_EXACT_IN = ['amount_out', 'path', 'recipient', 'deadline']
+_AERO_EXACT_IN = ['amount_in', 'amount_out', 'routes', 'recipient', 'deadline']
+_AERO_ETH_EXACT_IN = ['amount_out', 'routes', 'recipient', 'deadline']
+
+# Router swap layouts: (protocol, method, argument fields, exact input, fields wrapped in one params struct)
+SWAP_CALLS: List[Tuple[str, str, List[str], bool, bool]] = [
+    # Uniswap V2 Router02 (and forks)
+    ('uniswap_v2', 'swapExactTokensForTokens', _V2_EXACT_IN, True, False),
+    ('uniswap_v2', 'swapExactTokensForTokensSupportingFeeOnTransferTokens', _V2_EXACT_IN, True, False),
+    ('uniswap_v2', 'swapTokensForExactTokens', _V2_EXACT_OUT, False, False),
+    ('uniswap_v2', 'swapExactETHForTokens', _V2_ETH_EXACT_IN, True, False),
+    ('uniswap_v2', 'swapExactETHForTokensSupportingFeeOnTransferTokens', _V2_ETH_EXACT_IN, True, False),
+    ('uniswap_v2', 'swapETHForExactTokens', ['amount_out', 'path', 'recipient', 'deadline'], False, False),
+    ('uniswap_v2', 'swapExactTokensForETH', _V2_EXACT_IN, True, False),
+    ('uniswap_v2', 'swapExactTokensForETHSupportingFeeOnTransferTokens', _V2_EXACT_IN, True, False),
+    ('uniswap_v2', 'swapTokensForExactETH', _V2_EXACT_OUT, False, False),
+    # V2 legs on SwapRouter02 take no deadline
+    ('uniswap_v2', 'swapExactTokensForTokens', ['amount_in', 'amount_out', 'path', 'recipient'], True, False),
+    ('uniswap_v2', 'swapTokensForExactTokens', ['amount_out', 'amount_in', 'path', 'recipient'], False, False),
+    # Uniswap V3 SwapRouter
+    ('uniswap_v3', 'exactInputSingle', [
+        'token_in', 'token_out', 'fee', 'recipient', 'deadline', 'amount_in', 'amount_out', 'sqrt_price_limit'
+    ], True, True),
+    ('uniswap_v3', 'exactInput', ['encoded_path', 'recipient', 'deadline', 'amount_in', 'amount_out'], True, True),
+    ('uniswap_v3', 'exactOutputSingle', [
+        'token_in', 'token_out', 'fee', 'recipient', 'deadline', 'amount_out', 'amount_in', 'sqrt_price_limit'
+    ], False, True),
+    ('uniswap_v3', 'exactOutput', ['encoded_path', 'recipient', 'deadline', 'amount_out', 'amount_in'], False, True),
+    # Uniswap V3 SwapRouter02 (no deadline in the params struct)
+    ('uniswap_v3', 'exactInputSingle', [
+        'token_in', 'token_out', 'fee', 'recipient', 'amount_in', 'amount_out', 'sqrt_price_limit'
+    ], True, True),
+    ('uniswap_v3', 'exactInput', ['encoded_path', 'recipient', 'amount_in', 'amount_out'], True, True),
+    ('uniswap_v3', 'exactOutputSingle', [
+        'token_in', 'token_out', 'fee', 'recipient', 'amount_out', 'amount_in', 'sqrt_price_limit'
+    ], False, True),
+    ('uniswap_v3', 'exactOutput', ['encoded_path', 'recipient', 'amount_out', 'amount_in'], False, True),
+    # Aerodrome Router (Route = from, to, stable, factory)
+    ('aerodrome', 'swapExactTokensForTokens', _AERO_EXACT_IN, True, False),
+    ('aerodrome', 'swapExactTokensForTokensSupportingFeeOnTransferTokens', _AERO_EXACT_IN, True, False),
+    ('aerodrome', 'swapExactETHForTokens', _AERO_ETH_EXACT_IN, True, False),
+    ('aerodrome', 'swapExactETHForTokensSupportingFeeOnTransferTokens', _AERO_ETH_EXACT_IN, True, False),
+    ('aerodrome', 'swapExactTokensForETH', _AERO_EXACT_IN, True, False),
+    ('aerodrome', 'swapExactTokensForETHSupportingFeeOnTransferTokens', _AERO_EXACT_IN, True, False),
+    # Router multicalls wrapping any of the above
+    ('multicall', 'multicall', ['calls'], True, False),
+    ('multicall', 'multicall', ['deadline', 'calls'], True, False),
+    ('multicall', 'multicall', ['previous_blockhash', 'calls'], True, False),
+]
+
+
+@dataclass(frozen=True)
+class SwapCall:
+    """Decoder for one router method selector"""
+    protocol: str
+    method: str
+    fields: Tuple[str, ...]
+    types: Tuple[str, ...]
+    exact_input: bool
+    params_struct: bool
+
+    @property
+    def signature(self) -> str:
+        return f"{self.method}({','.join(self.types)})"
+
+    def decode_args(self, data: bytes) -> Dict[str, Any]:
+        values = decode(list(self.types), data)
+        if self.params_struct:
+            values = values[0]
+        return dict(zip(self.fields, values))
+
+
+def _build_swap_call(protocol: str, method: str, fields: List[str], exact_input: bool, params_struct: bool) -> SwapCall:
+    field_types = [FIELD_TYPES[name] for name in fields]
+    types = (f"({','.join(field_types)})",) if params_struct else tuple(field_types)
+    return SwapCall(protocol, method, tuple(fields), types, exact_input, params_struct)
+
+
+# 4-byte selector -> decoder, built once from SWAP_CALLS
+SELECTOR_DECODERS: Dict[bytes, SwapCall] = {}
+for _layout in SWAP_CALLS:
+    _call = _build_swap_call(*_layout)
+    _selector = bytes(Web3.keccak(text=_call.signature)[:4])
+    # Same method on two routers (e.g. V2 and Aerodrome swapExactTokensForTokens)
+    # always differs in argument types, so selectors never collide
+    SELECTOR_DECODERS[_selector] = _call
+
+
+@dataclass
+class SwapIntent:
+    """Swap decoded from a pending router transaction
+
+    tokens is the full hop path from token_in to token_out. For exact input
+    swaps amount_in is exact and amount_out the minimum accepted; for exact
+    output swaps amount_out is exact and amount_in the maximum spent.
+    """
+    tx_hash: str
+    protocol: str
+    method: str
+    router: str
+    sender: str
+    tokens: List[str]
+    amount_in: int
+    amount_out: int
+    exact_input: bool
+    gas_price: int
+    value: int = 0
+    fees: List[int] = field(default_factory=list)
+    stable: List[bool] = field(default_factory=list)
+    recipient: Optional[str] = None
+    deadline: Optional[int] = None
+    seen_at: float = field(default_factory=time.time)
+
+    @property
+    def token_in(self) -> str:
+        return self.tokens[0]
+
+    @property
+    def token_out(self) -> str:
+        return self.tokens[-1]
+
+
+def decode_v3_path(path: bytes) -> Tuple[List[str], List[int]]:
+    """Split a packed V3 path (token, uint24 fee, token, ...) into tokens and fees"""
+    tokens = ['0x' + path[0:20].hex()]
+    fees = []
+    for offset in range(20, len(path) - 20 + 1, 23):
+        fees.append(int.from_bytes(path[offset:offset + 3], 'big'))
+        tokens.append('0x' + path[offset + 3:offset + 23].hex())
+    return tokens, fees
+
+
+def _to_int(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value)
+
+
+def _to_bytes(value: Any) -> bytes:
+    if value is None:
+        return b''
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    return bytes(value)
+
+
+def _to_hex(value: Any) -> str:
+    if isinstance(value, str):
+        return value.lower()
+    return '0x' + bytes(value).hex()
+
+
+def normalize_transaction(tx: Dict[str, Any]) -> Dict[str, Any]:
+    """Uniform view of a transaction from raw JSON-RPC or web3's formatted result
+
+    Integers are ints, input is bytes, hash and addresses are lowercase hex.
+    Gas price falls back to maxFeePerGas for type-2 transactions.
+    """
+    gas_price = tx.get('gasPrice')
+    if gas_price is None:
+        gas_price = tx.get('maxFeePerGas')
+    return {
+        'hash': _to_hex(tx.get('hash', b'')),
+        'from': (tx.get('from') or '').lower(),
+        'to': (tx.get('to') or '').lower() or None,
+        'input': _to_bytes(tx.get('input', tx.get('data'))),
+        'value': _to_int(tx.get('value')),
+        'gasPrice': _to_int(gas_price),
+        'nonce': _to_int(tx.get('nonce'))
+    }
+
+
+def decode_swap_calldata(data: bytes, value: int = 0) -> List[Dict[str, Any]]:
+    """Decode router calldata into swap fields; multicalls yield one entry per inner swap"""
+    call = SELECTOR_DECODERS.get(bytes(data[:4]))
+    if call is None:
+        return []
+    args = call.decode_args(data[4:])
+
+    if call.protocol == 'multicall':
+        swaps = []
+        for inner in args['calls']:
+            swaps.extend(decode_swap_calldata(inner, value))
+        return swaps
+
+    fees: List[int] = []
+    stable: List[bool] = []
+    if 'path' in args:
+        tokens = [token.lower() for token in args['path']]
+    elif 'routes' in args:
+        tokens = [args['routes'][0][0].lower()] + [route[1].lower() for route in args['routes']]
+        stable = [route[2] for route in args['routes']]
+    elif 'encoded_path' in args:
+        tokens, fees = decode_v3_path(args['encoded_path'])
+        if not call.exact_input:
+            # Exact output paths are encoded from token_out back to token_in
+            tokens.reverse()
+            fees.reverse()
+    else:
+        tokens = [args['token_in'].lower(), args['token_out'].lower()]
+        fees = [args['fee']]
+
+    return [{
+        'protocol': call.protocol,
+        'method': call.method,
+        'tokens': tokens,
+        # ETH-in V2/Aerodrome swaps carry the input amount as msg.value
+        'amount_in': args.get('amount_in', value),
+        'amount_out': args['amount_out'],
+        'exact_input': call.exact_input,
+        'fees': fees,
+        'stable': stable,
+        'recipient': args['recipient'].lower() if 'recipient' in args else None,
+        'deadline': args.get('deadline')
+    }]
+
+
+def decode_swap_transaction(tx: Dict[str, Any]) -> List[SwapIntent]:
+    """Swap intents in a normalized transaction (see normalize_transaction)"""
+    try:
+        swaps = decode_swap_calldata(tx['input'], tx['value'])
+    except Exception as e:
+        logger.debug(f"Undecodable router call in {tx['hash']}: {str(e)}")
+        return []
+    return [
+        SwapIntent(
+            tx_hash=tx['hash'],
+            router=tx['to'] or '',
+            sender=tx['from'],
+            gas_price=tx['gasPrice'],
+            value=tx['value'],
+            **swap
+        )
+        for swap in swaps
+    ]
+
+
+class PendingSwapStream:
+    """Dedupes pending transaction hashes, batch-fetches bodies and publishes swap intents
+
+    Items come from a pending-transaction source (a SubscriptionHub
+    subscription or a web3 'pending' filter) and may be hashes or, for
+    nodes that push full bodies, transaction dicts. Hashes already seen
+    are skipped through a bounded set that forgets the oldest entries
+    first. Bodies are fetched with one JSON-RPC batch per batch_size
+    hashes when the provider supports batching, and only transactions
+    sent to a known router selector are ABI-decoded. Every decoded
+    SwapIntent is passed to the subscribed callbacks.
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        source: Any = None,
+        routers: Optional[Iterable[str]] = None,
+        batch_size: int = 100,
+        dedupe_size: int = 50000
+    ) -> None:
+        self.w3 = w3
+        self.source = source
+        self.routers: Optional[Set[str]] = {r.lower() for r in routers} if routers else None
+        self.batch_size = batch_size
+        self.subscribers: List[Callable[[SwapIntent], None]] = []
+        self._recent: Deque[str] = deque(maxlen=dedupe_size)
+        self._recent_set: Set[str] = set()
+        self.received = 0
+        self.duplicates = 0
+        self.fetched = 0
+        self.missing = 0
+        self.batches = 0
+        self.intents = 0
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[SwapIntent], None]) -> None:
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[SwapIntent], None]) -> None:
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def _is_seen(self, tx_hash: str) -> bool:
+        if tx_hash in self._recent_set:
+            self.duplicates += 1
+            return True
+        return False
+
+    def _is_new(self, tx_hash: str) -> bool:
+        """Remember a hash, returning False if it was already seen"""
+        if self._is_seen(tx_hash):
+            return False
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_set.discard(self._recent[0])
+        self._recent.append(tx_hash)
+        self._recent_set.add(tx_hash)
+        return True
+
+    def _fetch_batch(self, hashes: List[str]) -> List[Dict[str, Any]]:
+        make_batch_request = getattr(self.w3.provider, 'make_batch_request', None)
+        if make_batch_request is not None and len(hashes) > 1:
+            try:
+                responses = make_batch_request([('eth_getTransactionByHash', [h]) for h in hashes])
+                self.batches += 1
+                return [response['result'] for response in responses if response.get('result')]
+            except Exception as e:
+                logger.debug(f"Batch transaction fetch failed, fetching one by one: {str(e)}")
+
+        transactions = []
+        for tx_hash in hashes:
+            try:
+                transactions.append(self.w3.eth.get_transaction(tx_hash))
+            except TransactionNotFound:
+                continue
+        return transactions
+
+    def fetch_transactions(self, items: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Normalized bodies for the items not seen before; dropped transactions are skipped"""
+        transactions = []
+        hashes: Dict[str, None] = {}
+        for item in items:
+            self.received += 1
+            if isinstance(item, dict):
+                tx = normalize_transaction(item)
+                if self._is_new(tx['hash']):
+                    transactions.append(tx)
+                continue
+            tx_hash = _to_hex(item)
+            if tx_hash in hashes:
+                self.duplicates += 1
+            elif not self._is_seen(tx_hash):
+                hashes[tx_hash] = None
+
+        # Hashes are only remembered once their body arrives, so one the node
+        # could not return yet is fetched again when it is announced again
+        pending = list(hashes)
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            bodies = self._fetch_batch(chunk)
+            self.fetched += len(bodies)
+            self.missing += len(chunk) - len(bodies)
+            for body in bodies:
+                tx = normalize_transaction(body)
+                if self._is_new(tx['hash']):
+                    transactions.append(tx)
+        return transactions
+
+    def process(self, transactions: Iterable[Dict[str, Any]]) -> List[SwapIntent]:
+        """Decode normalized transactions and publish their swap intents"""
+        intents = []
+        for tx in transactions:
+            if self.routers is not None and tx['to'] not in self.routers:
+                continue
+            if bytes(tx['input'][:4]) not in SELECTOR_DECODERS:
+                continue
+            intents.extend(decode_swap_transaction(tx))
+
+        self.intents += len(intents)
+        for intent in intents:
+            for callback in list(self.subscribers):
+                try:
+                    callback(intent)
+                except Exception as e:
+                    logger.error(f"Swap intent subscriber failed: {str(e)}")
+        return intents
+
+    def ingest(self, items: Iterable[Any]) -> List[SwapIntent]:
+        """Dedupe, fetch, decode and publish a batch of pending hashes or bodies"""
+        return self.process(self.fetch_transactions(items))
+
+    def poll(self) -> List[SwapIntent]:
+        """Ingest everything the source has queued since the last poll"""
+        if self.source is None:
+            return []
+        if hasattr(self.source, 'drain'):
+            items = self.source.drain()
+        else:
+            items = self.source.get_new_entries()
+        return self.ingest(items) if items else []
+
+    def _run(self, poll_interval: float) -> None:
+        while self._running.is_set():
+            try:
+                if hasattr(self.source, 'get'):
+                    # Block on the subscription queue, then take whatever else arrived
+                    first = self.source.get(timeout=poll_interval)
+                    if first is not None:
+                        self.ingest([first] + self.source.drain())
+                elif not self.poll():
+                    time.sleep(poll_interval)
+            except Exception as e:
+                logger.error(f"Pending swap stream error: {str(e)}")
+                time.sleep(poll_interval)
+
+    def start(self, poll_interval: float = 0.5) -> 'PendingSwapStream':
+        """Consume the source continuously on a daemon thread"""
+        if self.source is None:
+            raise ValueError("PendingSwapStream has no source to consume")
+        if self._thread is None or not self._thread.is_alive():
+            self._running.set()
+            self._thread = threading.Thread(
+                target=self._run, args=(poll_interval,), name='pending-swaps', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'received': self.received,
+            'duplicates': self.duplicates,
+            'fetched': self.fetched,
+            'missing': self.missing,
+            'batches': self.batches,
+            'intents': self.intents,
+            'tracked_hashes': len(self._recent_set)
+        }
@@ -0,0 +1,238 @@
+"""Rolling per-pair view of competing pending swaps for MEV risk checks"""
+
+import logging
+import math
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from .mempool_decoder import SwapIntent
+
+logger = logging.getLogger(__name__)
+
+# Gas prices are histogrammed in 5% wide log buckets
+GAS_BUCKET_RATIO = 1.05
+_LOG_GAS_BUCKET_RATIO = math.log(GAS_BUCKET_RATIO)
+
+# Competing pending swaps on one pair per window; every swap on the pair counts,
+# so these sit well above the old per-transaction similarity levels of 5/10/20
+DEFAULT_COMPETING_SWAP_LEVELS = {'low': 25, 'medium': 50, 'high': 100}
+
+# How often (in recorded swaps) idle pairs are swept out of memory
+PRUNE_EVERY = 1024
+
+
+class RollingCounter:
+    """Event count over a sliding time window kept in fixed-width buckets
+
+    Adding and reading are amortized O(1): expired buckets are dropped off
+    the left of a deque and subtracted from a running total.
+    """
+
+    def __init__(self, window: float, resolution: float = 1.0) -> None:
+        self.window = window
+        self.resolution = resolution
+        self.total = 0
+        self._buckets: Deque[List[float]] = deque()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            self.total -= self._buckets.popleft()[1]
+
+    def add(self, now: float, count: int = 1) -> None:
+        self._expire(now)
+        start = now - now % self.resolution
+        if self._buckets and self._buckets[-1][0] == start:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([start, count])
+        self.total += count
+
+    def count(self, now: float) -> int:
+        self._expire(now)
+        return self.total
+
+
+class RollingHistogram:
+    """Log-bucketed gas price histogram over a sliding time window"""
+
+    def __init__(self, window: float, resolution: float = 1.0) -> None:
+        self.window = window
+        self.resolution = resolution
+        self.counts: Counter = Counter()
+        self.size = 0
+        self._slices: Deque[Tuple[float, Counter]] = deque()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        expired_any = False
+        while self._slices and self._slices[0][0] <= cutoff:
+            _, expired = self._slices.popleft()
+            self.counts.subtract(expired)
+            self.size -= sum(expired.values())
+            expired_any = True
+        if expired_any:
+            # Drop buckets that fell to zero
+            self.counts = +self.counts
+
+    def add(self, value: int, now: float) -> None:
+        if value <= 0:
+            return
+        self._expire(now)
+        start = now - now % self.resolution
+        if not self._slices or self._slices[-1][0] != start:
+            self._slices.append((start, Counter()))
+        bucket = int(math.log(value) / _LOG_GAS_BUCKET_RATIO)
+        self._slices[-1][1][bucket] += 1
+        self.counts[bucket] += 1
+        self.size += 1
+
+    def percentile(self, q: float, now: float) -> Optional[int]:
+        """Lower edge of the bucket holding the q-th percentile (0-100)"""
+        self._expire(now)
+        if self.size == 0:
+            return None
+        rank = q / 100 * self.size
+        seen = 0
+        # Bounded by the number of distinct 5% buckets, not by mempool size
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return int(GAS_BUCKET_RATIO ** bucket)
+        return None
+
+
+@dataclass
+class PairActivity:
+    """Competing swap counters for one token pair"""
+    swaps: RollingCounter
+    searcher_swaps: RollingCounter
+    last_seen: float = 0.0
+
+
+@dataclass
+class MevRiskAssessment:
+    """MEV risk for a pair or route at one point in time
+
+    score counts competing pending swaps on the busiest pair of the route
+    in the window, with swaps from known searchers counted twice.
+    """
+    level: str
+    score: int
+    competing_swaps: int
+    searcher_swaps: int
+    gas_p50: Optional[int] = None
+    gas_p90: Optional[int] = None
+    pairs: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def allowed(self) -> bool:
+        return self.level in ('none', 'low')
+
+
+class MevRiskView:
+    """Continuously maintained MEV risk per token pair
+
+    Subscribe record() to a PendingSwapStream: every decoded swap bumps
+    rolling counters for each pair it trades through (and a searcher
+    counter when the sender is a known searcher) and adds its gas price to
+    a rolling histogram. Risk for a pair or route is then read from those
+    counters without touching the node.
+    """
+
+    def __init__(
+        self,
+        window: float = 60,
+        risk_levels: Optional[Dict[str, int]] = None,
+        searchers: Optional[Iterable[str]] = None,
+        resolution: float = 1.0
+    ) -> None:
+        self.window = window
+        self.resolution = resolution
+        self.risk_levels = risk_levels or dict(DEFAULT_COMPETING_SWAP_LEVELS)
+        self.searchers = {address.lower() for address in searchers or []}
+        self.pairs: Dict[Tuple[str, str], PairActivity] = {}
+        self.gas_prices = RollingHistogram(window, resolution)
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def pair_key(token_a: str, token_b: str) -> Tuple[str, str]:
+        a, b = token_a.lower(), token_b.lower()
+        return (a, b) if a <= b else (b, a)
+
+    def add_searcher(self, address: str) -> None:
+        with self._lock:
+            self.searchers.add(address.lower())
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window
+        for key in [key for key, activity in self.pairs.items() if activity.last_seen <= cutoff]:
+            del self.pairs[key]
+
+    def record(self, intent: SwapIntent, now: Optional[float] = None) -> None:
+        """Account one pending swap; usable directly as a PendingSwapStream callback"""
+        now = time.time() if now is None else now
+        is_searcher = intent.sender.lower() in self.searchers
+        with self._lock:
+            for token_a, token_b in zip(intent.tokens, intent.tokens[1:]):
+                key = self.pair_key(token_a, token_b)
+                activity = self.pairs.get(key)
+                if activity is None:
+                    activity = self.pairs[key] = PairActivity(
+                        RollingCounter(self.window, self.resolution),
+                        RollingCounter(self.window, self.resolution)
+                    )
+                activity.swaps.add(now)
+                if is_searcher:
+                    activity.searcher_swaps.add(now)
+                activity.last_seen = now
+            self.gas_prices.add(intent.gas_price, now)
+            self.recorded += 1
+            if self.recorded % PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def _level(self, score: int) -> str:
+        for level in ('high', 'medium', 'low'):
+            if score >= self.risk_levels[level]:
+                return level
+        return 'none'
+
+    def assess_route(self, tokens: List[str], now: Optional[float] = None) -> MevRiskAssessment:
+        """Risk for trading along tokens, driven by its busiest pair"""
+        now = time.time() if now is None else now
+        keys = [self.pair_key(a, b) for a, b in zip(tokens, tokens[1:])]
+        with self._lock:
+            competing = searcher = score = 0
+            for key in keys:
+                activity = self.pairs.get(key)
+                if activity is None:
+                    continue
+                swaps = activity.swaps.count(now)
+                searcher_swaps = activity.searcher_swaps.count(now)
+                if swaps + searcher_swaps > score:
+                    competing, searcher, score = swaps, searcher_swaps, swaps + searcher_swaps
+            return MevRiskAssessment(
+                level=self._level(score),
+                score=score,
+                competing_swaps=competing,
+                searcher_swaps=searcher,
+                gas_p50=self.gas_prices.percentile(50, now),
+                gas_p90=self.gas_prices.percentile(90, now),
+                pairs=keys
+            )
+
+    def assess_pair(self, token_a: str, token_b: str, now: Optional[float] = None) -> MevRiskAssessment:
+        return self.assess_route([token_a, token_b], now)
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'recorded': self.recorded,
+                'tracked_pairs': len(self.pairs),
+                'searchers': len(self.searchers),
+                'gas_samples': self.gas_prices.size
+            }
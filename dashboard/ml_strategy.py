@@ -3,6 +3,8 @@ import logging
 import numpy as np
 from typing import Dict, Optional, List
 
+from .rolling_stats import WindowedStats
+
 try:
     from sklearn.ensemble import RandomForestClassifier
     from sklearn.preprocessing import StandardScaler
@@ -24,25 +26,60 @@ class TokenVolumeTracker:
         return entry['volume'] if entry else None
 
 class NetworkVolatilityTracker:
-    def __init__(self):
+    """Volatility of simple returns per token and network
+
+    calculate_volatility rescans a full price list. update_price folds in
+    one price at a time and keeps only the returns from the last `window`
+    seconds in a WindowedStats, so it costs O(1) amortized per price and
+    reports std(returns) * sqrt(n) over that window.
+    """
+
+    def __init__(self, window: float = 3600.0):
+        self.window = window
         self._volatility_cache = {}
+        # Per key: last price seen and the windowed moments of returns since
+        self._last_prices = {}
+        self._return_stats = {}
     
-    def calculate_volatility(self, token, network, prices):
-        if len(prices) < 2:
-            return 0.0
-        returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-        volatility = np.std(returns) * np.sqrt(len(returns))
-        self._volatility_cache[f"{token}_{network}"] = {
+    def _store(self, key, volatility):
+        self._volatility_cache[key] = {
             'volatility': volatility,
             'timestamp': datetime.now().timestamp()
         }
         return volatility
 
+    def calculate_volatility(self, token, network, prices):
+        if len(prices) < 2:
+            return 0.0
+        values = np.asarray(prices, dtype=float)
+        returns = np.diff(values) / values[:-1]
+        return self._store(f"{token}_{network}", float(np.std(returns) * np.sqrt(len(returns))))
+
+    def update_price(self, token, network, price, timestamp: Optional[float] = None):
+        """Fold one new price in and return the volatility over the last window seconds"""
+        key = f"{token}_{network}"
+        now = datetime.now().timestamp() if timestamp is None else timestamp
+        stats = self._return_stats.get(key)
+        if stats is None:
+            stats = self._return_stats[key] = WindowedStats(self.window)
+        last_price = self._last_prices.get(key)
+        self._last_prices[key] = float(price)
+        if last_price:
+            stats.add((price - last_price) / last_price, now)
+        else:
+            stats.evict(now)
+        # std(returns) * sqrt(n) with population std reduces to sqrt(m2)
+        return self._store(key, float(np.sqrt(stats.m2)))
+
+    def get_volatility(self, token, network):
+        entry = self._volatility_cache.get(f"{token}_{network}")
+        return entry['volatility'] if entry else 0.0
+
 class MLOpportunityScorer:
-    def __init__(self):
+    def __init__(self, volatility_window: float = 3600.0):
         self.logger = logging.getLogger(__name__)
         self.volume_tracker = TokenVolumeTracker()
-        self.volatility_tracker = NetworkVolatilityTracker()
+        self.volatility_tracker = NetworkVolatilityTracker(window=volatility_window)
         self.model = RandomForestClassifier(n_estimators=100) if SKLEARN_AVAILABLE else None
         self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
         self._is_trained = False
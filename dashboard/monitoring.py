@@ -36,11 +36,16 @@ class ArbitragePlatformMonitor:
         networks: List[str] = ['base'],
         monitoring_interval: int = 60,
         db_path: str = 'arbitrage_bot.db',
-        metrics_retention: int = 3600  # Keep 1 hour of metrics in memory
+        metrics_retention: int = 3600,  # Keep 1 hour of metrics in memory
+        cleanup_interval: int = 3600
     ):
         self.networks = networks
         self.monitoring_interval = monitoring_interval
         self.metrics_retention = metrics_retention
+        # Retention runs in small batches, so it can run often instead of one long daily pass
+        self.cleanup_interval = cleanup_interval
+        self.last_optimize = 0.0
+        self._stop_event = threading.Event()
         self.logger = logging.getLogger('ArbitragePlatformMonitor')
         self.monitor_thread = None
         self.cleanup_thread = None
@@ -80,6 +85,7 @@ class ArbitragePlatformMonitor:
             return
         
         self.is_monitoring = True
+        self._stop_event.clear()
         
         # Start monitoring thread
         self.monitor_thread = threading.Thread(
@@ -115,12 +121,23 @@ class ArbitragePlatformMonitor:
         """Database cleanup loop"""
         while self.is_monitoring:
             try:
-                self.db_cleaner.cleanup_old_data()
-                self.db_cleaner.optimize_database()
-                time.sleep(86400)  # Daily cleanup
+                report = self.db_cleaner.cleanup_old_data()
+                if report is not None:
+                    self.performance_data['retention'] = {
+                        'rows_deleted': sum(report.rows_deleted.values()),
+                        'batches': report.batches,
+                        'pages_vacuumed': report.pages_vacuumed,
+                        'max_writer_stall_ms': report.max_stall_ms,
+                        'duration_s': report.duration_s,
+                        'timestamp': time.time()
+                    }
+                if time.time() - self.last_optimize > 86400:
+                    self.db_cleaner.optimize_database()
+                    self.last_optimize = time.time()
+                self._stop_event.wait(self.cleanup_interval)
             except Exception as e:
                 self.logger.error(f"Cleanup error: {e}")
-                time.sleep(3600)  # Retry in 1 hour
+                self._stop_event.wait(3600)  # Retry in 1 hour
 
     def _track_error(self, error_source: str) -> None:
         """Track error occurrences"""
@@ -195,6 +212,7 @@ class ArbitragePlatformMonitor:
     def stop_monitoring(self) -> None:
         """Stop monitoring"""
         self.is_monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         if self.cleanup_thread:
@@ -273,6 +291,7 @@ class ArbitragePlatformMonitor:
             'memory_usage': metrics.memory_percent,
             'error_rate': metrics.error_rate,
             'warnings': warnings,
+            'retention': self.performance_data.get('retention', {}),
             'trading_metrics': {
                 'opportunities': perf_data['total_opportunities'],
                 'executed_trades': perf_data['executed_trades'],
@@ -0,0 +1,179 @@
+"""Priority queue of arbitrage opportunities with block-based expiry"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Floor for the gas cost divisor so free (or unknown) gas cannot dominate
+MIN_GAS_COST = 1e-9
+
+
+@dataclass
+class ScheduledOpportunity:
+    """Opportunity waiting for execution"""
+    route_key: str
+    opportunity: Dict[str, Any]
+    expected_profit: float
+    gas_cost: float
+    success_probability: float
+    chain: str
+    expires_block: int
+    seq: int = 0
+    queued_at: float = field(default_factory=time.time)
+
+    @property
+    def priority(self) -> float:
+        """Expected value per unit of gas spent"""
+        return self.expected_profit * self.success_probability / max(self.gas_cost, MIN_GAS_COST)
+
+
+class OpportunityQueue:
+    """Best-first opportunity queue with route dedupe and per-chain block TTLs
+
+    Entries are ordered by (expected profit x success probability) / gas
+    cost. Pushing a route key that is already queued replaces the older
+    entry, so a route is only ever executed on its freshest numbers. Each
+    entry lives until its chain's head passes expires_block; on_block pops
+    expired entries off a per-chain min-heap in O(log n) each. Replaced
+    and expired entries are dropped lazily from the priority heap, which
+    is compacted when stale items outnumber live ones.
+    """
+
+    def __init__(self, default_ttl_blocks: int = 2) -> None:
+        self.default_ttl_blocks = default_ttl_blocks
+        self.pushed = 0
+        self.replaced = 0
+        self.expired = 0
+        self.popped = 0
+        self._entries: Dict[str, ScheduledOpportunity] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._expiry: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._heads: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_current(self, seq: int, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.seq == seq
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(-e.priority, e.seq, e.route_key) for e in self._entries.values()]
+            heapq.heapify(self._heap)
+
+    def on_block(self, block_number: int, chain: str = 'base') -> int:
+        """Advance a chain's head and drop its expired entries"""
+        with self._condition:
+            self._heads[chain] = max(block_number, self._heads.get(chain, block_number))
+            expiry = self._expiry.get(chain, [])
+            dropped = 0
+            while expiry and expiry[0][0] < self._heads[chain]:
+                _, seq, key = heapq.heappop(expiry)
+                if self._is_current(seq, key):
+                    del self._entries[key]
+                    dropped += 1
+            self.expired += dropped
+            self._compact()
+            return dropped
+
+    def push(
+        self,
+        route_key: str,
+        opportunity: Dict[str, Any],
+        expected_profit: float,
+        gas_cost: float,
+        success_probability: float = 1.0,
+        block_number: Optional[int] = None,
+        chain: str = 'base',
+        ttl_blocks: Optional[int] = None
+    ) -> bool:
+        """Queue an opportunity seen at block_number (default: the chain's head)
+
+        Returns False if it has no expected value or is already expired.
+        """
+        if expected_profit <= 0 or success_probability <= 0:
+            return False
+        with self._condition:
+            head = self._heads.get(chain)
+            seen_at = block_number if block_number is not None else head
+            if seen_at is None:
+                logger.debug(f"No head known for {chain}; dropping {route_key}")
+                return False
+            expires_block = seen_at + (self.default_ttl_blocks if ttl_blocks is None else ttl_blocks)
+            if head is not None and expires_block < head:
+                return False
+
+            entry = ScheduledOpportunity(
+                route_key=route_key,
+                opportunity=opportunity,
+                expected_profit=expected_profit,
+                gas_cost=gas_cost,
+                success_probability=success_probability,
+                chain=chain,
+                expires_block=expires_block,
+                seq=next(self._seq)
+            )
+            if route_key in self._entries:
+                self.replaced += 1
+            self._entries[route_key] = entry
+            heapq.heappush(self._heap, (-entry.priority, entry.seq, route_key))
+            heapq.heappush(self._expiry.setdefault(chain, []), (expires_block, entry.seq, route_key))
+            self.pushed += 1
+            self._condition.notify()
+            return True
+
+    def _pop_best(self) -> Optional[ScheduledOpportunity]:
+        while self._heap:
+            _, seq, key = heapq.heappop(self._heap)
+            if self._is_current(seq, key):
+                return self._entries.pop(key)
+        return None
+
+    def pop(self, timeout: Optional[float] = None) -> Optional[ScheduledOpportunity]:
+        """Remove and return the best live opportunity
+
+        With a timeout, block up to that many seconds for one to arrive.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                entry = self._pop_best()
+                if entry is not None:
+                    self.popped += 1
+                    return entry
+                if deadline is None:
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def peek(self) -> Optional[ScheduledOpportunity]:
+        with self._condition:
+            while self._heap and not self._is_current(self._heap[0][1], self._heap[0][2]):
+                heapq.heappop(self._heap)
+            return self._entries[self._heap[0][2]] if self._heap else None
+
+    def discard(self, route_key: str) -> bool:
+        with self._condition:
+            return self._entries.pop(route_key, None) is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'queued': len(self._entries),
+                'pushed': self.pushed,
+                'replaced': self.replaced,
+                'expired': self.expired,
+                'popped': self.popped,
+                'heads': dict(self._heads)
+            }
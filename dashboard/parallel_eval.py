@@ -0,0 +1,126 @@
+"""Sharded evaluation of CPU-bound work across a persistent process pool"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Read-only state installed once per worker by the pool initializer
+_worker_state: Any = None
+
+
+def set_worker_state(state: Any) -> None:
+    global _worker_state
+    _worker_state = state
+
+
+def get_worker_state() -> Any:
+    """State passed to ParallelEvaluator(worker_state=...), inside a worker"""
+    return _worker_state
+
+
+@dataclass
+class ShardTiming:
+    """Wall time one worker spent on one shard"""
+    shard: int
+    tasks: int
+    seconds: float
+    pid: int
+
+
+def _run_shard(fn: Callable[..., Any], shard: int, tasks: Sequence[Tuple]) -> Tuple[int, List[Any], ShardTiming]:
+    start = time.perf_counter()
+    results = [fn(*task) for task in tasks]
+    return shard, results, ShardTiming(shard, len(tasks), time.perf_counter() - start, os.getpid())
+
+
+class ParallelEvaluator:
+    """Splits a task list into contiguous shards and evaluates them in worker processes
+
+    The executor is created once and reused for every sweep, so worker
+    start-up and the worker_state copy are paid only on the first call.
+    Shards are contiguous slices of the task list and results are
+    reassembled by shard index, so the output order (and therefore the
+    result) never depends on which worker finished first. With a single
+    worker everything runs in-process.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        worker_state: Any = None,
+        shards_per_worker: int = 1
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.worker_state = worker_state
+        self.shards_per_worker = shards_per_worker
+        self.last_timings: List[ShardTiming] = []
+        self.last_elapsed = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=set_worker_state,
+                initargs=(self.worker_state,)
+            )
+        return self._executor
+
+    @staticmethod
+    def shard(tasks: Sequence[Tuple], count: int) -> List[Sequence[Tuple]]:
+        """Split tasks into at most count contiguous, near-equal slices"""
+        count = max(1, min(count, len(tasks)))
+        size, extra = divmod(len(tasks), count)
+        shards = []
+        start = 0
+        for i in range(count):
+            end = start + size + (1 if i < extra else 0)
+            shards.append(tasks[start:end])
+            start = end
+        return shards
+
+    def map(self, fn: Callable[..., Any], tasks: Sequence[Tuple]) -> List[Any]:
+        """Evaluate fn(*task) for every task; fn must be a module-level function"""
+        start = time.perf_counter()
+        tasks = list(tasks)
+        if not tasks:
+            self.last_timings = []
+            self.last_elapsed = 0.0
+            return []
+
+        if self.max_workers <= 1:
+            set_worker_state(self.worker_state)
+            outputs = [_run_shard(fn, 0, tasks)]
+        else:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_run_shard, fn, index, shard)
+                for index, shard in enumerate(self.shard(tasks, self.max_workers * self.shards_per_worker))
+            ]
+            outputs = sorted((future.result() for future in futures), key=lambda output: output[0])
+
+        self.last_timings = [timing for _, _, timing in outputs]
+        self.last_elapsed = time.perf_counter() - start
+        return [result for _, results, _ in outputs for result in results]
+
+    def get_timing_summary(self) -> str:
+        shards = ', '.join(
+            f"#{t.shard}: {t.tasks} tasks {t.seconds * 1000:.1f} ms (pid {t.pid})" for t in self.last_timings
+        )
+        return f"{sum(t.tasks for t in self.last_timings)} tasks in {self.last_elapsed * 1000:.1f} ms [{shards}]"
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> 'ParallelEvaluator':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
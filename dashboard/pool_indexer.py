@@ -0,0 +1,600 @@
+"""Pool discovery from factory PoolCreated/PairCreated logs"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_abi import decode
+from web3 import Web3
+
+from .db_pool import get_database_pool
+from .provider_registry import get_shared_web3
+from .route_search import POOL_STATE_PREFIX, PoolReserves
+from .state_cache import BlockRef, VersionedStateCache
+from .token_registry import TokenRegistry, get_token_registry
+
+logger = logging.getLogger(__name__)
+
+# Factory event layouts: signature, indexed topic after the two tokens, data fields
+FACTORY_EVENTS: Dict[str, Dict[str, Any]] = {
+    'uniswap_v3': {
+        'signature': 'PoolCreated(address,address,uint24,int24,address)',
+        'topic3': 'fee',
+        'data': ['int24', 'address'],
+        'fields': ['tick_spacing', 'pool']
+    },
+    'aerodrome': {
+        'signature': 'PoolCreated(address,address,bool,address,uint256)',
+        'topic3': 'stable',
+        'data': ['address', 'uint256'],
+        'fields': ['pool', None]
+    },
+    'aerodrome_cl': {
+        'signature': 'PoolCreated(address,address,int24,address)',
+        'topic3': 'tick_spacing',
+        'data': ['address'],
+        'fields': ['pool']
+    },
+    'uniswap_v2': {
+        'signature': 'PairCreated(address,address,address,uint256)',
+        'topic3': None,
+        'data': ['address', 'uint256'],
+        'fields': ['pool', None]
+    }
+}
+
+# Pool kinds whose liquidity is read from liquidity() rather than getReserves()
+CONCENTRATED_KINDS = ('uniswap_v3', 'aerodrome_cl')
+
+# USD per whole token for the quote assets depth is measured in; other
+# tokens are priced from their deepest pool against an already priced token
+DEFAULT_QUOTE_PRICES: Dict[str, float] = {
+    '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913': 1.0,  # USDC
+    '0xd9aAEc86B65D86f6A7B5B1b0c42FFA531710b6CA': 1.0,  # USDbC
+    '0x50c5725949A6F0c72E6C4a641F24049A917DB0Cb': 1.0   # DAI
+}
+
+Q96 = 2 ** 96
+
+# Swap fee in basis points for pools whose creation event carries no fee
+# tier; a factory's 'fee_bps' in dex_config.json overrides it (BaseSwap: 25)
+DEFAULT_FEE_BPS: Dict[str, int] = {'uniswap_v2': 30, 'aerodrome': 30}
+STABLE_FEE_BPS = 5
+
+POOL_STATE_ABI = [
+    {
+        "inputs": [],
+        "name": "liquidity",
+        "outputs": [{"name": "", "type": "uint128"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "getReserves",
+        "outputs": [
+            {"name": "reserve0", "type": "uint256"},
+            {"name": "reserve1", "type": "uint256"},
+            {"name": "blockTimestampLast", "type": "uint256"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "slot0",
+        "outputs": [
+            {"name": "sqrtPriceX96", "type": "uint160"},
+            {"name": "tick", "type": "int24"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+
+@dataclass
+class FactoryConfig:
+    """Factory to index"""
+    dex: str
+    address: str
+    kind: str
+    start_block: int = 0
+    fee_bps: Optional[int] = None
+
+
+@dataclass
+class IndexedPool:
+    """Pool discovered from a factory creation event"""
+    address: str
+    dex: str
+    kind: str
+    token0: str
+    token1: str
+    fee: Optional[int]
+    tick_spacing: Optional[int]
+    stable: Optional[bool]
+    created_block: int
+    liquidity: float = 0.0
+    liquidity_block: Optional[int] = None
+    # Raw token units; virtual reserves at the current price for concentrated pools
+    reserve0: float = 0.0
+    reserve1: float = 0.0
+    depth_usd: float = 0.0
+
+
+def _topic_to_int(topic: bytes, signed: bool = False) -> int:
+    value = int.from_bytes(topic, 'big')
+    if signed and value >= 2 ** 255:
+        value -= 2 ** 256
+    return value
+
+
+def _topic_to_address(topic: bytes) -> str:
+    return Web3.to_checksum_address(topic[-20:])
+
+
+def decode_creation_log(log: Dict[str, Any], factory: FactoryConfig) -> IndexedPool:
+    """Decode a factory creation log into an IndexedPool"""
+    layout = FACTORY_EVENTS[factory.kind]
+    topics = [bytes(t) for t in log['topics']]
+    data = log['data']
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data.startswith('0x') else data)
+
+    values: Dict[str, Any] = {'fee': None, 'tick_spacing': None, 'stable': None}
+    decoded = decode(layout['data'], bytes(data))
+    for field, value in zip(layout['fields'], decoded):
+        if field:
+            values[field] = value
+    if layout['topic3'] == 'fee':
+        values['fee'] = _topic_to_int(topics[3])
+    elif layout['topic3'] == 'tick_spacing':
+        values['tick_spacing'] = _topic_to_int(topics[3], signed=True)
+    elif layout['topic3'] == 'stable':
+        values['stable'] = bool(_topic_to_int(topics[3]))
+
+    return IndexedPool(
+        address=Web3.to_checksum_address(values['pool']),
+        dex=factory.dex,
+        kind=factory.kind,
+        token0=_topic_to_address(topics[1]),
+        token1=_topic_to_address(topics[2]),
+        fee=values['fee'],
+        tick_spacing=values['tick_spacing'],
+        stable=values['stable'],
+        created_block=log['blockNumber']
+    )
+
+
+class PoolIndexer:
+    """Incrementally indexes pools created by DEX factories
+
+    Each factory has a persisted block cursor, so every scan only requests
+    logs for blocks it has not seen. Scans stop `confirmations` blocks
+    behind the head to stay clear of reorgs. Pool reserves are refreshed
+    on demand and the universe is ranked by depth in USD, which compares
+    across pairs where raw liquidity() or sqrt(r0*r1) token units do not.
+    """
+
+    def __init__(
+        self,
+        web3: Web3,
+        factories: List[FactoryConfig],
+        db_path: str = 'arbitrage_bot.db',
+        max_block_range: int = 2000,
+        confirmations: int = 5,
+        registry: Optional[TokenRegistry] = None,
+        quote_prices: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.web3 = web3
+        self.factories = factories
+        self.db_path = db_path
+        self.db_pool = get_database_pool(db_path)
+        self.max_block_range = max_block_range
+        self.confirmations = confirmations
+        # Token decimals for depth pricing; fetched on-chain once and cached
+        self.registry = registry or get_token_registry()
+        self.quote_prices = {
+            Web3.to_checksum_address(token): price
+            for token, price in (quote_prices or DEFAULT_QUOTE_PRICES).items()
+        }
+        self._topics = {
+            kind: Web3.keccak(text=layout['signature'])
+            for kind, layout in FACTORY_EVENTS.items()
+        }
+        self._fees_bps = {f.dex: f.fee_bps for f in factories if f.fee_bps is not None}
+        self._init_database()
+
+    @classmethod
+    def from_config(cls, web3: Web3, config: Dict[str, Any], **kwargs: Any) -> 'PoolIndexer':
+        """Create an indexer from the 'factories' section of dex_config.json"""
+        factories = [
+            FactoryConfig(
+                dex=dex,
+                address=info['address'],
+                kind=info['kind'],
+                start_block=info.get('start_block', 0),
+                fee_bps=info.get('fee_bps')
+            )
+            for dex, info in config.get('factories', {}).items()
+        ]
+        return cls(web3, factories, **kwargs)
+
+    def get_db_connection(self) -> sqlite3.Connection:
+        """Get this thread's pooled read-only connection; writes go through db_pool.write()"""
+        return self.db_pool.reader()
+
+    def _init_database(self) -> None:
+        """Create index tables"""
+        with self.db_pool.write() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS indexed_pools (
+                    address TEXT PRIMARY KEY,
+                    dex TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    token0 TEXT NOT NULL,
+                    token1 TEXT NOT NULL,
+                    fee INTEGER,
+                    tick_spacing INTEGER,
+                    stable INTEGER,
+                    created_block INTEGER NOT NULL,
+                    liquidity REAL NOT NULL DEFAULT 0,
+                    liquidity_block INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_indexed_pools_tokens
+                ON indexed_pools(token0, token1);
+                CREATE TABLE IF NOT EXISTS pool_index_cursors (
+                    factory TEXT PRIMARY KEY,
+                    last_block INTEGER NOT NULL
+                );
+            ''')
+            # Depth columns were added after the first release of the index
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(indexed_pools)')}
+            for column in ('reserve0', 'reserve1', 'depth_usd'):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE indexed_pools ADD COLUMN {column} REAL NOT NULL DEFAULT 0')
+            conn.execute('DROP INDEX IF EXISTS idx_indexed_pools_liquidity')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_indexed_pools_depth ON indexed_pools(depth_usd DESC)')
+
+    def get_cursor(self, factory: FactoryConfig) -> int:
+        """Get the last fully scanned block for a factory"""
+        row = self.get_db_connection().execute(
+            'SELECT last_block FROM pool_index_cursors WHERE factory = ?',
+            (factory.address.lower(),)
+        ).fetchone()
+        return row['last_block'] if row else factory.start_block - 1
+
+    def scan(self) -> int:
+        """Scan all factories up to the confirmed head, returning new pool count"""
+        head = self.web3.eth.block_number - self.confirmations
+        total = 0
+        for factory in self.factories:
+            try:
+                total += self.scan_factory(factory, head)
+            except Exception as e:
+                logger.error(f"Error scanning {factory.dex} factory {factory.address}: {e}")
+        return total
+
+    def scan_factory(self, factory: FactoryConfig, to_block: int) -> int:
+        """Scan one factory from its cursor to to_block"""
+        from_block = self.get_cursor(factory) + 1
+        found = 0
+        chunk = self.max_block_range
+        while from_block <= to_block:
+            end_block = min(from_block + chunk - 1, to_block)
+            try:
+                logs = self.web3.eth.get_logs({
+                    'address': Web3.to_checksum_address(factory.address),
+                    'topics': [self._topics[factory.kind]],
+                    'fromBlock': from_block,
+                    'toBlock': end_block
+                })
+            except Exception as e:
+                # Providers cap getLogs ranges; shrink the window and retry
+                if chunk > 1:
+                    chunk = max(chunk // 2, 1)
+                    logger.debug(f"getLogs failed for {factory.dex}, retrying with {chunk} blocks: {e}")
+                    continue
+                raise
+
+            pools = []
+            for log in logs:
+                try:
+                    pools.append(decode_creation_log(log, factory))
+                except Exception as e:
+                    logger.warning(f"Skipping undecodable {factory.dex} log: {e}")
+            self._store(factory, pools, end_block)
+            found += len(pools)
+            from_block = end_block + 1
+
+        if found:
+            logger.info(f"Indexed {found} new {factory.dex} pools up to block {to_block}")
+        return found
+
+    def _store(self, factory: FactoryConfig, pools: List[IndexedPool], last_block: int) -> None:
+        """Persist pools and advance the cursor in one transaction"""
+        with self.db_pool.write() as conn:
+            conn.executemany('''
+                INSERT OR IGNORE INTO indexed_pools
+                (address, dex, kind, token0, token1, fee, tick_spacing, stable, created_block)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (p.address, p.dex, p.kind, p.token0, p.token1, p.fee, p.tick_spacing,
+                 None if p.stable is None else int(p.stable), p.created_block)
+                for p in pools
+            ])
+            conn.execute('''
+                INSERT INTO pool_index_cursors (factory, last_block) VALUES (?, ?)
+                ON CONFLICT(factory) DO UPDATE SET last_block = excluded.last_block
+            ''', (factory.address.lower(), last_block))
+
+    def _row_to_pool(self, row: sqlite3.Row) -> IndexedPool:
+        return IndexedPool(
+            address=row['address'],
+            dex=row['dex'],
+            kind=row['kind'],
+            token0=row['token0'],
+            token1=row['token1'],
+            fee=row['fee'],
+            tick_spacing=row['tick_spacing'],
+            stable=None if row['stable'] is None else bool(row['stable']),
+            created_block=row['created_block'],
+            liquidity=row['liquidity'],
+            liquidity_block=row['liquidity_block'],
+            reserve0=row['reserve0'],
+            reserve1=row['reserve1'],
+            depth_usd=row['depth_usd']
+        )
+
+    def get_pools(self, dex: Optional[str] = None) -> List[IndexedPool]:
+        """Get all indexed pools, optionally for one DEX"""
+        conn = self.get_db_connection()
+        if dex:
+            rows = conn.execute('SELECT * FROM indexed_pools WHERE dex = ?', (dex,)).fetchall()
+        else:
+            rows = conn.execute('SELECT * FROM indexed_pools').fetchall()
+        return [self._row_to_pool(row) for row in rows]
+
+    def _read_state(self, pool: IndexedPool) -> Tuple[float, float, float]:
+        """(liquidity, reserve0, reserve1) in raw token units"""
+        contract = self.web3.eth.contract(address=pool.address, abi=POOL_STATE_ABI)
+        if pool.kind in CONCENTRATED_KINDS:
+            liquidity = contract.functions.liquidity().call()
+            sqrt_price = contract.functions.slot0().call()[0]
+            if not sqrt_price:
+                return float(liquidity), 0.0, 0.0
+            # Virtual reserves at the current price: x = L / sqrtP, y = L * sqrtP
+            return float(liquidity), liquidity * Q96 / sqrt_price, liquidity * sqrt_price / Q96
+        reserve0, reserve1, _ = contract.functions.getReserves().call()
+        # Geometric mean of reserves is the constant-product L
+        return float(math.isqrt(reserve0 * reserve1)), float(reserve0), float(reserve1)
+
+    def _whole_units(self, token: str, raw: float) -> Optional[float]:
+        decimals = self.registry.get_decimals(token, self.web3)
+        return None if decimals is None else raw / 10 ** decimals
+
+    def price_tokens(self, pools: List[IndexedPool]) -> Dict[str, float]:
+        """USD prices for every token reachable from a quote asset
+
+        Each pass prices tokens paired with an already priced token, taking
+        the rate from the pool with the most USD on the priced side so thin
+        pools cannot set a price.
+        """
+        prices = dict(self.quote_prices)
+        while True:
+            candidates: Dict[str, Tuple[float, float]] = {}
+            for pool in pools:
+                for priced, other, priced_raw, other_raw in (
+                    (pool.token0, pool.token1, pool.reserve0, pool.reserve1),
+                    (pool.token1, pool.token0, pool.reserve1, pool.reserve0)
+                ):
+                    if priced not in prices or other in prices or not other_raw:
+                        continue
+                    priced_amount = self._whole_units(priced, priced_raw)
+                    other_amount = self._whole_units(other, other_raw)
+                    if not priced_amount or not other_amount:
+                        continue
+                    value = priced_amount * prices[priced]
+                    if value > candidates.get(other, (0.0, 0.0))[0]:
+                        candidates[other] = (value, value / other_amount)
+            if not candidates:
+                return prices
+            for token, (_, price) in candidates.items():
+                prices[token] = price
+
+    def _depth_usd(self, pool: IndexedPool, prices: Dict[str, float]) -> float:
+        values = []
+        for token, raw in ((pool.token0, pool.reserve0), (pool.token1, pool.reserve1)):
+            amount = self._whole_units(token, raw) if token in prices else None
+            if amount is not None:
+                values.append(amount * prices[token])
+        if not values:
+            return 0.0
+        # Both sides of a pool hold equal value at its own price
+        return sum(values) if len(values) == 2 else 2 * values[0]
+
+    def update_depths(self) -> int:
+        """Recompute every pool's USD depth from its stored reserves"""
+        pools = [pool for pool in self.get_pools() if pool.reserve0 or pool.reserve1]
+        prices = self.price_tokens(pools)
+        updates = [(self._depth_usd(pool, prices), pool.address) for pool in pools]
+        with self.db_pool.write() as conn:
+            conn.executemany('UPDATE indexed_pools SET depth_usd = ? WHERE address = ?', updates)
+        return len(updates)
+
+    def refresh_liquidity(self, limit: Optional[int] = None) -> int:
+        """Refresh reserves for the least recently refreshed pools, then re-rank by depth"""
+        block = self.web3.eth.block_number
+        query = 'SELECT * FROM indexed_pools ORDER BY COALESCE(liquidity_block, -1) ASC'
+        params: tuple = ()
+        if limit is not None:
+            query += ' LIMIT ?'
+            params = (limit,)
+        pools = [self._row_to_pool(row) for row in self.get_db_connection().execute(query, params).fetchall()]
+
+        updates = []
+        for pool in pools:
+            try:
+                updates.append(self._read_state(pool) + (block, pool.address))
+            except Exception as e:
+                logger.debug(f"Could not read liquidity for {pool.address}: {e}")
+                updates.append((0.0, 0.0, 0.0, block, pool.address))
+
+        with self.db_pool.write() as conn:
+            conn.executemany(
+                'UPDATE indexed_pools SET liquidity = ?, reserve0 = ?, reserve1 = ?, liquidity_block = ? '
+                'WHERE address = ?',
+                updates
+            )
+        self.update_depths()
+        return len(updates)
+
+    def get_top_pools(
+        self,
+        limit: int = 50,
+        dex: Optional[str] = None,
+        min_depth_usd: float = 0.0,
+        max_age_blocks: Optional[int] = None
+    ) -> List[IndexedPool]:
+        """Get pools ranked by their most recently observed USD depth"""
+        query = 'SELECT * FROM indexed_pools WHERE depth_usd > ?'
+        params: List[Any] = [min_depth_usd]
+        if dex:
+            query += ' AND dex = ?'
+            params.append(dex)
+        if max_age_blocks is not None:
+            query += ' AND liquidity_block >= ?'
+            params.append(self.web3.eth.block_number - max_age_blocks)
+        query += ' ORDER BY depth_usd DESC LIMIT ?'
+        params.append(limit)
+
+        return [self._row_to_pool(row) for row in self.get_db_connection().execute(query, params).fetchall()]
+
+    def fee_bps(self, pool: IndexedPool) -> int:
+        """Swap fee of a pool in basis points"""
+        if pool.fee is not None:
+            # Fee tiers are in hundredths of a basis point
+            return pool.fee // 100
+        if pool.stable:
+            return STABLE_FEE_BPS
+        return self._fees_bps.get(pool.dex, DEFAULT_FEE_BPS.get(pool.kind, 30))
+
+    def _fetch_block_ref(self, number: int) -> Optional[BlockRef]:
+        """Canonical hash and parent hash for a block number"""
+        try:
+            return BlockRef.from_block(self.web3.eth.get_block(number))
+        except Exception as e:
+            logger.error(f"Error fetching block {number}: {e}")
+            return None
+
+    def create_state_cache(self, max_depth: int = 64) -> VersionedStateCache:
+        """Empty reorg-aware cache on this indexer's chain, for load_pool_state"""
+        return VersionedStateCache(fetch_block=self._fetch_block_ref, max_depth=max_depth)
+
+    def load_pool_state(self, cache: VersionedStateCache, limit: int = 200, **kwargs: Any) -> int:
+        """Read reserves of the top constant-product pools into a state cache
+
+        Reserves are read at a single block and stored under
+        ('pool', address), versioned by that block, for RouteGraph.
+        """
+        block = BlockRef.from_block(self.web3.eth.get_block('latest'))
+        cache.advance(block)
+        loaded = 0
+        for pool in self.get_top_pools(limit=limit, **kwargs):
+            # Concentrated and stable-swap pools do not follow x*y=k
+            if pool.kind in CONCENTRATED_KINDS or pool.stable:
+                continue
+            try:
+                contract = self.web3.eth.contract(address=pool.address, abi=POOL_STATE_ABI)
+                reserve0, reserve1, _ = contract.functions.getReserves().call(block_identifier=block.number)
+            except Exception as e:
+                logger.debug(f"Could not read reserves for {pool.address}: {e}")
+                continue
+            reserves = PoolReserves(
+                address=pool.address,
+                dex=pool.dex,
+                token0=pool.token0,
+                token1=pool.token1,
+                reserve0=reserve0,
+                reserve1=reserve1,
+                fee_bps=self.fee_bps(pool)
+            )
+            if cache.set((POOL_STATE_PREFIX, pool.address), reserves, block=block):
+                loaded += 1
+        return loaded
+
+    def sync_registry(self, registry: TokenRegistry, limit: int = 50, **kwargs: Any) -> int:
+        """Register the top ranked pools in the token registry"""
+        pools = self.get_top_pools(limit=limit, **kwargs)
+        for pool in pools:
+            registry.add_pool(
+                dex=pool.dex,
+                address=pool.address,
+                token0=pool.token0,
+                token1=pool.token1,
+                fee=pool.fee,
+                dex_type=pool.kind,
+                tick_spacing=pool.tick_spacing,
+                stable=pool.stable
+            )
+        return len(pools)
+
+    def refresh(
+        self,
+        liquidity_batch: int = 200,
+        registry: Optional[TokenRegistry] = None,
+        registry_limit: int = 50,
+        cache: Optional[VersionedStateCache] = None,
+        cache_limit: int = 200
+    ) -> None:
+        """One indexing round: new pools, stale reserves, then the top pools into the registry and cache"""
+        self.scan()
+        self.refresh_liquidity(limit=liquidity_batch)
+        if registry is not None:
+            self.sync_registry(registry, limit=registry_limit)
+        if cache is not None:
+            self.load_pool_state(cache, limit=cache_limit)
+
+    def run(
+        self,
+        interval: float = 60.0,
+        liquidity_batch: int = 200,
+        stop_event: Optional[threading.Event] = None,
+        **kwargs: Any
+    ) -> None:
+        """Continuously scan for new pools and refresh liquidity; kwargs go to refresh()"""
+        logger.info("Starting pool indexer...")
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            try:
+                self.refresh(liquidity_batch=liquidity_batch, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in pool indexer loop: {e}")
+            stop_event.wait(interval)
+
+    def start(self, interval: float = 60.0, **kwargs: Any) -> threading.Thread:
+        """Run the indexing loop on a daemon thread"""
+        thread = threading.Thread(
+            target=self.run, args=(interval,), kwargs=kwargs, name='pool-indexer', daemon=True
+        )
+        thread.start()
+        return thread
+
+
+def main() -> None:
+    """Index pools for the factories in configs/dex_config.json"""
+    import os
+    logging.basicConfig(level=logging.INFO)
+    with open('configs/dex_config.json', 'r') as f:
+        config = json.load(f)
+    web3 = get_shared_web3('base', [os.getenv('BASE_RPC_URL', 'https://mainnet.base.org')])
+    PoolIndexer.from_config(web3, config).run()
+
+
+if __name__ == "__main__":
+    main()
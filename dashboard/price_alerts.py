@@ -3,60 +3,57 @@ Price Alert System
 Monitors prices and triggers alerts based on user-defined conditions
 """
 
-import sqlite3
 import logging
 from datetime import datetime
 
+from .db_pool import get_database_pool
+
 logger = logging.getLogger(__name__)
 
 class PriceAlertSystem:
     def __init__(self, db_path='arbitrage_bot.db'):
         """Initialize alert system with database connection"""
         self.db_path = db_path
+        self.db_pool = get_database_pool(db_path)
         self.setup_database()
         
     def get_db_connection(self):
-        """Create a database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled read-only connection; writes go through db_pool.write()"""
+        return self.db_pool.reader()
         
     def setup_database(self):
         """Set up alerts database tables"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Create alerts table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS price_alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    token TEXT NOT NULL,
-                    condition TEXT NOT NULL,
-                    price REAL NOT NULL,
-                    active BOOLEAN DEFAULT 1,
-                    created_at INTEGER NOT NULL
-                )
-            ''')
-            
-            # Create alert history table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS alert_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    alert_id INTEGER NOT NULL,
-                    trigger_price REAL NOT NULL,
-                    triggered_at INTEGER NOT NULL,
-                    FOREIGN KEY (alert_id) REFERENCES price_alerts (id)
-                )
-            ''')
-            
-            conn.commit()
+            with self.db_pool.write() as conn:
+                cursor = conn.cursor()
+            
+                # Create alerts table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS price_alerts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        token TEXT NOT NULL,
+                        condition TEXT NOT NULL,
+                        price REAL NOT NULL,
+                        active BOOLEAN DEFAULT 1,
+                        created_at INTEGER NOT NULL
+                    )
+                ''')
+            
+                # Create alert history table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS alert_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        alert_id INTEGER NOT NULL,
+                        trigger_price REAL NOT NULL,
+                        triggered_at INTEGER NOT NULL,
+                        FOREIGN KEY (alert_id) REFERENCES price_alerts (id)
+                    )
+                ''')
+
             logger.info("Alert tables initialized successfully")
             
         except Exception as e:
             logger.error(f"Error setting up alert tables: {str(e)}")
-        finally:
-            conn.close()
             
     def add_alert(self, token, condition, price):
         """
@@ -64,78 +61,72 @@ class PriceAlertSystem:
         condition: 'above' or 'below'
         """
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO price_alerts (token, condition, price, created_at)
-                VALUES (?, ?, ?, ?)
-            ''', (token, condition, price, int(datetime.now().timestamp())))
+            with self.db_pool.write() as conn:
+                cursor = conn.cursor()
             
-            alert_id = cursor.lastrowid
-            conn.commit()
+                cursor.execute('''
+                    INSERT INTO price_alerts (token, condition, price, created_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (token, condition, price, int(datetime.now().timestamp())))
             
+                alert_id = cursor.lastrowid
+
             logger.info(f"Added new alert for {token} {condition} {price}")
             return alert_id
             
         except Exception as e:
             logger.error(f"Error adding alert: {str(e)}")
             return None
-        finally:
-            conn.close()
             
     def check_alerts(self, token, current_price):
         """Check if any alerts should be triggered for the current price"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
+            with self.db_pool.write() as conn:
+                cursor = conn.cursor()
             
-            # Get active alerts for token
-            cursor.execute('''
-                SELECT * FROM price_alerts 
-                WHERE token = ? AND active = 1
-            ''', (token,))
+                # Get active alerts for token
+                cursor.execute('''
+                    SELECT * FROM price_alerts 
+                    WHERE token = ? AND active = 1
+                ''', (token,))
             
-            alerts = cursor.fetchall()
-            triggered = []
+                alerts = cursor.fetchall()
+                triggered = []
             
-            for alert in alerts:
-                should_trigger = False
+                for alert in alerts:
+                    should_trigger = False
                 
-                if alert['condition'] == 'above' and current_price >= alert['price']:
-                    should_trigger = True
-                elif alert['condition'] == 'below' and current_price <= alert['price']:
-                    should_trigger = True
-                    
-                if should_trigger:
-                    # Record trigger in history
-                    cursor.execute('''
-                        INSERT INTO alert_history (alert_id, trigger_price, triggered_at)
-                        VALUES (?, ?, ?)
-                    ''', (alert['id'], current_price, int(datetime.now().timestamp())))
+                    if alert['condition'] == 'above' and current_price >= alert['price']:
+                        should_trigger = True
+                    elif alert['condition'] == 'below' and current_price <= alert['price']:
+                        should_trigger = True
                     
-                    # Deactivate the alert
-                    cursor.execute('''
-                        UPDATE price_alerts SET active = 0
-                        WHERE id = ?
-                    ''', (alert['id'],))
+                    if should_trigger:
+                        # Record trigger in history
+                        cursor.execute('''
+                            INSERT INTO alert_history (alert_id, trigger_price, triggered_at)
+                            VALUES (?, ?, ?)
+                        ''', (alert['id'], current_price, int(datetime.now().timestamp())))
                     
-                    triggered.append({
-                        'id': alert['id'],
-                        'token': token,
-                        'condition': alert['condition'],
-                        'target_price': alert['price'],
-                        'trigger_price': current_price
-                    })
+                        # Deactivate the alert
+                        cursor.execute('''
+                            UPDATE price_alerts SET active = 0
+                            WHERE id = ?
+                        ''', (alert['id'],))
                     
-            conn.commit()
+                        triggered.append({
+                            'id': alert['id'],
+                            'token': token,
+                            'condition': alert['condition'],
+                            'target_price': alert['price'],
+                            'trigger_price': current_price
+                        })
+
             return triggered
             
         except Exception as e:
             logger.error(f"Error checking alerts: {str(e)}")
             return []
-        finally:
-            conn.close()
             
     def get_active_alerts(self):
         """Get all active alerts"""
@@ -188,19 +179,16 @@ class PriceAlertSystem:
     def delete_alert(self, alert_id):
         """Delete an alert"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                DELETE FROM price_alerts
-                WHERE id = ?
-            ''', (alert_id,))
+            with self.db_pool.write() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
+                cursor.execute('''
+                    DELETE FROM price_alerts
+                    WHERE id = ?
+                ''', (alert_id,))
+
             return True
             
         except Exception as e:
             logger.error(f"Error deleting alert: {str(e)}")
             return False
-        finally:
-            conn.close()
@@ -1,34 +1,31 @@
-<<<<<<< HEAD
-"""Enhanced Price Analysis Module with Real-time Integration and Price Impact Calculation"""
-=======
-"nk ""Real-time Price Analysis Module with DEX Integration"""
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
+"""Real-time Price Analysis Module with DEX Integration and Price Impact Calculation"""
 
-from web3 import Web3
 import logging
-<<<<<<< HEAD
-from typing import Dict, Deque, Optional, Tuple
+import numpy as np
+import time
+import sqlite3
+from typing import Dict, Deque, Optional, Tuple, TypedDict
 from decimal import Decimal
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
-=======
-import time
 from datetime import datetime, timedelta
-import sqlite3
-from typing import Dict, Any, Optional, List, TypedDict, cast, Union
-from decimal import Decimal
-import statistics
-import os
 from .web3_utils import get_web3_manager
 from .dex_interface import get_dex_interface
+from .token_registry import get_token_registry
+from .provider_registry import get_shared_web3
+from .spread_matrix import pairwise_spread_percent
+from .db_pool import get_database_pool
+from .write_behind import get_write_behind_writer
+from .tick_store import TickColumns, TickStore, Timestamp
+from .rolling_stats import RollingStatsEngine
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
+class HistoricalPerformance(TypedDict):
+    total_opportunities: int
+    average_spread: float
+    average_profit: float
+    total_profit: float
+    executed_trades: int
+    timeframe_minutes: int
 
 @dataclass
 class PricePoint:
@@ -41,14 +38,25 @@ class VolumeData:
     timestamp: datetime
 
 class PriceAnalyzer:
-<<<<<<< HEAD
-    def __init__(self, db_path: str = 'arbitrage_bot.db', history_window: int = 3600) -> None:
+    """Price analysis with multi-DEX support and Uniswap V3 price impact"""
+    
+    def __init__(
+        self,
+        db_path: str = 'arbitrage_bot.db',
+        history_window: int = 3600,
+        tick_store: Optional[TickStore] = None
+    ) -> None:
         self.db_path = db_path
+        # Full tick history goes to the columnar store; the deques only keep the live window
+        self.tick_store = tick_store
         # Use Infura endpoint for Base network
         infura_url = "https://base-mainnet.infura.io/v3/863c326dab1a444dba3f41ae7a07ccce"
-        self.w3 = Web3(Web3.HTTPProvider(infura_url, request_kwargs={'timeout': 60}))
+        self.w3 = get_shared_web3('base', [infura_url])
         self.last_prices: Dict[str, Decimal] = {}
         self.price_history: Dict[str, Deque[PricePoint]] = {}
+        # Absolute % change between consecutive points, with a running sum for get_volatility
+        self.price_changes: Dict[str, Deque[Optional[Decimal]]] = {}
+        self.price_change_totals: Dict[str, Tuple[Decimal, int]] = {}
         self.volume_history: Dict[str, Deque[VolumeData]] = {}
         self.history_window = history_window  # Keep 1 hour of history
         self.last_block_number = None
@@ -63,7 +71,19 @@ class PriceAnalyzer:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
 
-        # Verified working pool addresses on Base
+        # DEX interface and database for multi-DEX monitoring and price records
+        self.web3_manager = get_web3_manager()
+        self.dex_interface = get_dex_interface()
+        self.db_pool = get_database_pool(db_path)
+        self._init_database()
+        # Price ticks are batched into a few transactions by a background writer
+        self.price_writer = get_write_behind_writer(db_path)
+        # Statistics are maintained per tick instead of rescanning dex_prices
+        self.stats_engine = RollingStatsEngine(db_path)
+
+        # Pools are resolved through the token registry; these verified Base
+        # addresses are only used for pairs the registry does not know about
+        self.token_registry = get_token_registry()
         self.POOL_ADDRESSES = {
             'ETH/USDC/0.05%': '0x4C36388bE6F416A29C8d8Eee81C771cE6bE14B18',
             'WETH/USDC/0.05%': '0x4C36388bE6F416A29C8d8Eee81C771cE6bE14B18',
@@ -104,7 +124,9 @@ class PriceAnalyzer:
         """Get current token price and calculate price impact"""
         try:
             pair_name = f"{token_in}/{token_out}/{fee_tier}"
-            pool_address = self.POOL_ADDRESSES.get(pair_name)
+            fee = int(Decimal(fee_tier.rstrip('%')) * Decimal('10000'))
+            pool = self.token_registry.get_pool(token_in, token_out, 'uniswap_v3', fee)
+            pool_address = pool.address if pool else self.POOL_ADDRESSES.get(pair_name)
             
             if not pool_address:
                 return None
@@ -140,88 +162,53 @@ class PriceAnalyzer:
             }
             
             # Update history
-            self._update_price_history(pair_name, price)
+            self._update_price_history(pair_name, price, liquidity)
             
             return price, price_change, price_impacts
             
         except Exception as e:
             self.logger.error(f"Error getting price for {token_in}/{token_out}: {str(e)}")
-=======
-    """Price analysis with multi-DEX support"""
-    
-    def __init__(self, db_path: str = 'arbitrage_bot.db'):
-        self.db_path = db_path
-        self.logger = logging.getLogger('PriceAnalyzer')
-        
-        # Initialize components
-        self.web3_manager = get_web3_manager()
-        self.dex_interface = get_dex_interface()
-        
-        self._init_database()
+            return None
 
     def _init_database(self) -> None:
         """Initialize database tables"""
-        conn: Optional[sqlite3.Connection] = None
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
+            with self.db_pool.write() as conn:
+                cursor = conn.cursor()
             
-            # Create indices for better query performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_dex_prices_token_pair 
-                ON dex_prices(token_pair)
-            ''')
+                # Create indices for better query performance
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_dex_prices_token_pair 
+                    ON dex_prices(token_pair)
+                ''')
             
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_dex_prices_dex 
-                ON dex_prices(dex)
-            ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_dex_prices_dex 
+                    ON dex_prices(dex)
+                ''')
             
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_trades_token_pair 
-                ON trades(token_pair)
-            ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_trades_token_pair 
+                    ON trades(token_pair)
+                ''')
             
-            conn.commit()
             self.logger.info("Database initialized successfully")
             
         except Exception as e:
             self.logger.error(f"Error initializing database: {str(e)}")
             raise
-        finally:
-            if conn:
-                conn.close()
 
     def get_db_connection(self) -> sqlite3.Connection:
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled read-only connection; writes go through db_pool.write()"""
+        return self.db_pool.reader()
 
     def get_price_statistics(self, token_pair: str, exchange: str, 
                            timeframe_minutes: int = 60) -> Optional[Dict[str, float]]:
         """Get price statistics for a token pair on a specific exchange"""
-        conn = None
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Calculate time window
-            cutoff_time = datetime.now() - timedelta(minutes=timeframe_minutes)
-            
-            # Query price data
-            cursor.execute('''
-                SELECT price
-                FROM dex_prices
-                WHERE token_pair = ? 
-                AND dex = ?
-                AND timestamp > ?
-                ORDER BY timestamp DESC
-            ''', (token_pair, exchange, int(cutoff_time.timestamp())))
-            
-            prices = [row['price'] for row in cursor.fetchall()]
+            stats = self.stats_engine.statistics(f"{exchange}:{token_pair}", timeframe_minutes * 60)
             
-            if not prices:
+            if stats is None:
                 # Get current price from DEX
                 current_price = self.dex_interface.get_price(exchange, token_pair)
                 if current_price is None:
@@ -237,60 +224,20 @@ class PriceAnalyzer:
                     'samples': 1
                 }
             
-            # Calculate statistics
-            current_price = prices[0]
-            mean_price = statistics.mean(prices)
-            min_price = min(prices)
-            max_price = max(prices)
-            std_dev = statistics.stdev(prices) if len(prices) > 1 else 0
-            
-            # Calculate volatility (standard deviation / mean * 100)
-            volatility = (std_dev / mean_price * 100) if mean_price > 0 else 0
-            
-            return {
-                'current_price': current_price,
-                'mean_price': mean_price,
-                'min_price': min_price,
-                'max_price': max_price,
-                'volatility': volatility,
-                'std_dev': std_dev,
-                'samples': len(prices)
-            }
+            return stats
             
         except Exception as e:
             self.logger.error(f"Error getting price statistics: {e}")
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
             return None
 
-<<<<<<< HEAD
     def get_volatility(self, pair_name: str) -> Decimal:
         """Calculate volatility as average absolute percentage change"""
         try:
-            if pair_name not in self.price_history:
+            total, count = self.price_change_totals.get(pair_name, (Decimal('0'), 0))
+            if not count:
                 return Decimal('0')
             
-            history = list(self.price_history[pair_name])
-            if len(history) < 2:
-                return Decimal('0')
-            
-            # Calculate percentage changes
-            changes = []
-            for i in range(1, len(history)):
-                prev_price = history[i-1].price
-                curr_price = history[i].price
-                
-                if prev_price != 0:
-                    pct_change = abs((curr_price - prev_price) / prev_price * Decimal('100'))
-                    changes.append(pct_change)
-            
-            if not changes:
-                return Decimal('0')
-            
-            # Calculate average of changes
-            total = sum(changes)
-            count = Decimal(str(len(changes)))
-            
-            return total / count
+            return total / Decimal(str(count))
             
         except Exception as e:
             self.logger.error(f"Error calculating volatility: {str(e)}")
@@ -327,41 +274,77 @@ class PriceAnalyzer:
         
         return min(impact, Decimal('100'))
 
-    def _update_price_history(self, pair_name: str, price: Decimal) -> None:
+    def _update_price_history(self, pair_name: str, price: Decimal, liquidity: Decimal = Decimal('0')) -> None:
         """Update price history for a token pair"""
         if pair_name not in self.price_history:
             self.price_history[pair_name] = deque(maxlen=self.history_window)
+            self.price_changes[pair_name] = deque(maxlen=max(self.history_window - 1, 1))
+            self.price_change_totals[pair_name] = (Decimal('0'), 0)
+        
+        history = self.price_history[pair_name]
+        if history:
+            changes = self.price_changes[pair_name]
+            total, count = self.price_change_totals[pair_name]
+            # The change leaving the window is dropped from the running total
+            if len(changes) == changes.maxlen and changes[0] is not None:
+                total -= changes[0]
+                count -= 1
+            prev_price = history[-1].price
+            change = None
+            if prev_price != 0:
+                change = abs((price - prev_price) / prev_price * Decimal('100'))
+                total += change
+                count += 1
+            changes.append(change)
+            self.price_change_totals[pair_name] = (total, count)
         
+        now = datetime.now()
         self.price_history[pair_name].append(
-            PricePoint(price=price, timestamp=datetime.now())
+            PricePoint(price=price, timestamp=now)
         )
+        if self.tick_store is not None:
+            self.tick_store.append(pair_name, now, float(price), float(liquidity), venue='uniswap_v3')
+
+    def get_tick_history(
+        self,
+        pair_name: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None
+    ) -> Optional[TickColumns]:
+        """Stored ticks for a pair as NumPy columns, beyond the in-memory window"""
+        if self.tick_store is None:
+            return None
+        try:
+            return self.tick_store.read_range(pair_name, start, end)
+        except Exception as e:
+            self.logger.error(f"Error reading tick history for {pair_name}: {str(e)}")
+            return None
 
     def check_arbitrage_opportunity(self, prices: Dict[str, Decimal], min_spread_percent: float = 0.1) -> Optional[dict]:
         """Check for arbitrage opportunities between pairs"""
-=======
-    def get_historical_performance(self, timeframe_minutes: int = 1440) -> HistoricalPerformance:
-        """Get historical performance metrics"""
-        conn = None
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
         try:
-            opportunities = []
             min_spread = Decimal(str(min_spread_percent))
             
-<<<<<<< HEAD
-            for pair1, price1 in prices.items():
-                for pair2, price2 in prices.items():
-                    if pair1 != pair2:
-                        spread = abs(price1 - price2) / price1 * Decimal('100')
-                        if spread > min_spread:
-                            opportunities.append({
-                                'pair1': pair1,
-                                'pair2': pair2,
-                                'spread_percent': float(spread),
-                                'estimated_profit': float(abs(price1 - price2)),
-                                'confidence_score': float(self._calculate_arb_confidence(spread))
-                            })
-            
-            return max(opportunities, key=lambda x: x['spread_percent']) if opportunities else None
+            names = list(prices)
+            if len(names) < 2:
+                return None
+
+            # All ordered pairs at once; only the widest spread is evaluated
+            spreads = pairwise_spread_percent([float(price) for price in prices.values()])
+            if not (spreads > float(min_spread)).any():
+                return None
+            i, j = np.unravel_index(np.nanargmax(spreads), spreads.shape)
+            price1, price2 = prices[names[i]], prices[names[j]]
+            spread = abs(price1 - price2) / price1 * Decimal('100')
+            if spread <= min_spread:
+                return None
+            return {
+                'pair1': names[i],
+                'pair2': names[j],
+                'spread_percent': float(spread),
+                'estimated_profit': float(abs(price1 - price2)),
+                'confidence_score': float(self._calculate_arb_confidence(spread))
+            }
             
         except Exception as e:
             self.logger.error(f"Error checking arbitrage: {str(e)}")
@@ -378,7 +361,12 @@ class PriceAnalyzer:
             base_score -= Decimal('0.1')
         
         return min(base_score, Decimal('1.0'))
-=======
+
+    def get_historical_performance(self, timeframe_minutes: int = 1440) -> HistoricalPerformance:
+        """Get historical performance metrics"""
+        try:
+            cursor = self.get_db_connection().cursor()
+            
             # Calculate time window
             cutoff_time = int((datetime.now() - timedelta(minutes=timeframe_minutes)).timestamp())
             
@@ -433,33 +421,26 @@ class PriceAnalyzer:
                 'executed_trades': 0,
                 'timeframe_minutes': timeframe_minutes
             }
-        finally:
-            if conn:
-                conn.close()
 
     def add_price_record(self, token_pair: str, exchange: str, price: float, 
                         volume: Optional[float] = None) -> bool:
-        """Record real-time price data"""
-        conn = None
+        """Queue real-time price data for the write-behind writer"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            now = time.time()
+            self.stats_engine.update(f"{exchange}:{token_pair}", price, now)
+            return self.price_writer.submit('''
                 INSERT INTO dex_prices 
                 (token_pair, dex, price, timestamp)
                 VALUES (?, ?, ?, ?)
-            ''', (token_pair, exchange, price, int(time.time())))
-            
-            conn.commit()
-            return True
+            ''', (token_pair, exchange, price, int(now)))
             
         except Exception as e:
             self.logger.error(f"Error adding price record: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
+
+    def flush_price_records(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued price record is committed"""
+        return self.price_writer.flush(timeout)
 
     def monitor_prices(self) -> None:
         """Continuous price monitoring across all configured DEXes"""
@@ -490,6 +471,12 @@ class PriceAnalyzer:
         except Exception as e:
             self.logger.error(f"Error in price monitoring loop: {e}")
             raise
+        finally:
+            stats = self.price_writer.get_stats()
+            self.logger.info(
+                f"Price writer: {stats['rows_written']} rows at {stats['rows_per_second']:.1f} rows/s, "
+                f"avg flush {stats['avg_flush_ms']:.2f} ms"
+            )
 
 def main() -> None:
     """Example usage of price analyzer"""
@@ -503,4 +490,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
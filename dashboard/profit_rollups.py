@@ -0,0 +1,243 @@
+"""Materialized hourly/daily profit rollups per pair and network, maintained by triggers on trades"""
+
+import logging
+import sqlite3
+import textwrap
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_PERIODS: Dict[str, int] = {'hour': 3600, 'day': 86400}
+
+# NUMERIC keeps integer (wei) sums exact; REAL inputs stay REAL
+ROLLUP_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS profit_rollups (
+        period TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        pair TEXT NOT NULL,
+        network TEXT NOT NULL,
+        total_profit NUMERIC NOT NULL DEFAULT 0,
+        trade_count INTEGER NOT NULL DEFAULT 0,
+        success_count INTEGER NOT NULL DEFAULT 0,
+        gas_used_sum NUMERIC NOT NULL DEFAULT 0,
+        gas_cost_sum NUMERIC NOT NULL DEFAULT 0,
+        PRIMARY KEY (period, bucket, pair, network)
+    )
+'''
+
+# One row once profit_rollups has been rebuilt from trades; install_profit_rollups
+# and schema.sql both check it, so whichever runs first backfills and the other
+# does not, whatever triggers the database already has
+ROLLUP_BACKFILL_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS profit_rollups_backfill (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        backfilled_at INTEGER NOT NULL
+    )
+'''
+
+ROLLUP_TRIGGERS = ('trades_rollup_insert', 'trades_rollup_delete', 'trades_rollup_update')
+
+# Column expressions over a trades row; {row} becomes NEW, OLD or trades
+TRADES_COLUMNS: Dict[str, str] = {
+    'pair': "{row}.token_in || '/' || {row}.token_out",
+    'network': "{row}.network",
+    'profit': "COALESCE({row}.profit, 0)",
+    'success': "CASE WHEN {row}.success THEN 1 ELSE 0 END",
+    'gas_used': "COALESCE({row}.gas_used, 0)",
+    'gas_cost': "COALESCE({row}.gas_used * {row}.gas_price, 0)"
+}
+
+# schema.sql's trades table has no network, success or gas_price column; the dashboard runs on Base
+SCHEMA_SQL_COLUMNS: Dict[str, str] = {**TRADES_COLUMNS, 'network': "'base'", 'success': '1', 'gas_cost': '0'}
+
+
+def _upserts(columns: Dict[str, str], row: str, sign: str) -> str:
+    """One upsert per period adding (sign '+') or removing (sign '-') a trade"""
+    expr = {name: value.format(row=row) for name, value in columns.items()}
+    statements = []
+    for period, seconds in ROLLUP_PERIODS.items():
+        statements.append(f'''
+            INSERT INTO profit_rollups
+                (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+            VALUES (
+                '{period}', CAST({row}.timestamp AS INTEGER) / {seconds} * {seconds},
+                COALESCE({expr['pair']}, ''), COALESCE({expr['network']}, ''),
+                {sign}({expr['profit']}), {sign}1, {sign}({expr['success']}),
+                {sign}({expr['gas_used']}), {sign}({expr['gas_cost']})
+            )
+            ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+                total_profit = total_profit + excluded.total_profit,
+                trade_count = trade_count + excluded.trade_count,
+                success_count = success_count + excluded.success_count,
+                gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+                gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;''')
+    return ''.join(statements)
+
+
+def rollup_triggers(columns: Optional[Dict[str, str]] = None) -> List[str]:
+    """CREATE TRIGGER statements keeping profit_rollups in step with trades
+
+    The triggers run inside the statement that changes trades, so a
+    rollup is committed or rolled back together with its trade, including
+    batched executemany inserts.
+    """
+    columns = columns or TRADES_COLUMNS
+    return [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trades_rollup_insert AFTER INSERT ON trades
+        WHEN NEW.timestamp IS NOT NULL
+        BEGIN{_upserts(columns, 'NEW', '')}
+        END''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trades_rollup_delete AFTER DELETE ON trades
+        WHEN OLD.timestamp IS NOT NULL
+        BEGIN{_upserts(columns, 'OLD', '-')}
+        END''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trades_rollup_update AFTER UPDATE ON trades
+        WHEN OLD.timestamp IS NOT NULL AND NEW.timestamp IS NOT NULL
+        BEGIN{_upserts(columns, 'OLD', '-')}{_upserts(columns, 'NEW', '')}
+        END'''
+    ]
+
+
+def rollup_backfill(columns: Optional[Dict[str, str]] = None) -> List[str]:
+    """INSERT ... SELECT ... GROUP BY statements rebuilding profit_rollups from trades
+
+    They only run while profit_rollups_backfill is empty and then fill it.
+    Rows are replaced with full aggregates, so trades the triggers already
+    counted are not counted twice.
+    """
+    expr = {name: value.format(row='trades') for name, value in (columns or TRADES_COLUMNS).items()}
+    statements = [
+        f'''
+        INSERT OR REPLACE INTO profit_rollups
+            (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+        SELECT '{period}', CAST(timestamp AS INTEGER) / {seconds} * {seconds},
+               COALESCE({expr['pair']}, ''), COALESCE({expr['network']}, ''),
+               SUM({expr['profit']}), COUNT(*), SUM({expr['success']}),
+               SUM({expr['gas_used']}), SUM({expr['gas_cost']})
+        FROM trades
+        WHERE timestamp IS NOT NULL AND NOT EXISTS (SELECT 1 FROM profit_rollups_backfill)
+        GROUP BY 2, 3, 4'''
+        for period, seconds in ROLLUP_PERIODS.items()
+    ]
+    statements.append('''
+        INSERT OR IGNORE INTO profit_rollups_backfill (id, backfilled_at)
+        VALUES (1, CAST(strftime('%s', 'now') AS INTEGER))''')
+    return statements
+
+
+def rollup_statements(columns: Optional[Dict[str, str]] = None) -> List[str]:
+    """Tables, triggers and the one-time backfill, in the order they must run"""
+    return [ROLLUP_SCHEMA, ROLLUP_BACKFILL_SCHEMA] + rollup_triggers(columns) + rollup_backfill(columns)
+
+
+def schema_sql() -> str:
+    """The generated profit rollup section of dashboard/schema.sql"""
+    return '\n'.join(textwrap.dedent(statement).strip() + ';\n' for statement in rollup_statements(SCHEMA_SQL_COLUMNS))
+
+
+def install_profit_rollups(conn: sqlite3.Connection, columns: Optional[Dict[str, str]] = None) -> None:
+    """Create the rollup table and triggers, backfilling from existing trades once
+
+    columns overrides TRADES_COLUMNS for trades tables without some of
+    those columns (e.g. "'base'" for network). Triggers are always
+    recreated, so ones left by schema.sql or an older install are
+    replaced; the backfill is keyed on profit_rollups_backfill, not on
+    the triggers. Call with a writer connection; the caller commits.
+    """
+    for name in ROLLUP_TRIGGERS:
+        conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+    for statement in rollup_statements(columns):
+        conn.execute(statement)
+
+
+def _filters(period: str, since: Optional[int], until: Optional[int],
+             pair: Optional[str], network: Optional[str]) -> Any:
+    clauses = ['period = ?']
+    params: List[Any] = [period]
+    if since is not None:
+        clauses.append('bucket >= ?')
+        params.append(since)
+    if until is not None:
+        clauses.append('bucket < ?')
+        params.append(until)
+    if pair is not None:
+        clauses.append('pair = ?')
+        params.append(pair)
+    if network is not None:
+        clauses.append('network = ?')
+        params.append(network)
+    return ' AND '.join(clauses), params
+
+
+def get_profit_buckets(
+    conn: sqlite3.Connection,
+    period: str = 'hour',
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    pair: Optional[str] = None,
+    network: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Per-bucket profit, oldest first; since/until are unix bucket bounds"""
+    where, params = _filters(period, since, until, pair, network)
+    rows = conn.execute(f'''
+        SELECT bucket,
+               SUM(total_profit) AS total_profit,
+               SUM(trade_count) AS trade_count,
+               SUM(success_count) AS successful_trades,
+               SUM(gas_used_sum) AS gas_used,
+               SUM(gas_cost_sum) AS total_gas_cost
+        FROM profit_rollups
+        WHERE {where}
+        GROUP BY bucket
+        HAVING SUM(trade_count) > 0
+        ORDER BY bucket
+    ''', params).fetchall()
+    return [
+        {
+            'bucket': row[0],
+            'total_profit': row[1],
+            'trade_count': row[2],
+            'successful_trades': row[3],
+            'avg_gas_used': row[4] / row[2],
+            'total_gas_cost': row[5]
+        }
+        for row in rows
+    ]
+
+
+def get_profit_totals(
+    conn: sqlite3.Connection,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    pair: Optional[str] = None,
+    network: Optional[str] = None,
+    group_by: Optional[str] = None
+) -> Dict[str, Dict[str, float]]:
+    """Totals from the daily rollups, keyed by pair or network when grouped ('' otherwise)"""
+    if group_by not in (None, 'pair', 'network'):
+        raise ValueError(f"Cannot group profit totals by {group_by}")
+    where, params = _filters('day', since, until, pair, network)
+    key = group_by or "''"
+    rows = conn.execute(f'''
+        SELECT {key}, SUM(total_profit), SUM(trade_count), SUM(success_count), SUM(gas_cost_sum)
+        FROM profit_rollups
+        WHERE {where}
+        GROUP BY 1
+        HAVING SUM(trade_count) > 0
+    ''', params).fetchall()
+    return {
+        row[0]: {
+            'total_profit': row[1],
+            'total_trades': row[2],
+            'successful_trades': row[3],
+            'total_gas_cost': row[4]
+        }
+        for row in rows
+    }
+
+
+if __name__ == "__main__":
+    print(schema_sql())
@@ -0,0 +1,286 @@
+"""Process-wide registry of shared Web3 providers with keep-alive HTTP sessions"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.types import RPCEndpoint
+
+from .batch_provider import BatchingHTTPProvider
+from .call_cache import BlockCallCache, BlockCallCacheMiddleware
+from .rpc_pool import RPCProviderPool
+
+logger = logging.getLogger(__name__)
+
+RPC_ENDPOINTS_PATH = 'configs/networks/rpc_endpoints.json'
+
+
+def normalize_chain(chain: str) -> str:
+    """Canonical registry key: 'Ethereum Sepolia' -> 'ethereum_sepolia'"""
+    return chain.strip().lower().replace(' ', '_').replace('-', '_')
+
+
+class KeepAliveHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider that posts through a session shared by every thread
+
+    The stock provider caches one requests.Session per thread and endpoint,
+    so each worker thread opens its own sockets and pays its own TLS
+    handshake. requests.Session is safe for concurrent posts once its
+    adapters are mounted, so all threads here share one urllib3 pool.
+    """
+
+    def __init__(self, endpoint_uri: str, session: requests.Session, **kwargs: Any) -> None:
+        kwargs.setdefault('exception_retry_configuration', None)
+        super().__init__(endpoint_uri, **kwargs)
+        self.session = session
+
+    def _make_request(self, method: RPCEndpoint, request_data: bytes) -> bytes:
+        kwargs = dict(self.get_request_kwargs())
+        kwargs.setdefault('timeout', 30)
+        with self.session.post(self.endpoint_uri, data=request_data, **kwargs) as response:
+            response.raise_for_status()
+            return response.content
+
+
+class ProviderRegistry:
+    """Hands out one shared provider and Web3 instance per chain
+
+    Every chain's endpoints go through a single requests.Session whose
+    adapter keeps up to `pool_maxsize` idle keep-alive connections per
+    host, so TCP and TLS setup is paid once per process rather than once
+    per module or thread. Each chain's Web3 also memoizes eth_call results
+    for the current block through a shared BlockCallCache. With
+    `batch_size` above 1, concurrent calls to an endpoint are coalesced
+    into JSON-RPC batches of up to that many requests.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 16,
+        pool_maxsize: int = 32,
+        timeout: int = 30,
+        endpoints_path: str = RPC_ENDPOINTS_PATH,
+        call_cache_head_ttl: float = 1.0,
+        batch_size: int = 0,
+        batch_linger: float = 0.002
+    ) -> None:
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.batch_linger = batch_linger
+        self.call_cache_head_ttl = call_cache_head_ttl
+        self.endpoints_path = endpoints_path
+        self.session = requests.Session()
+        # Retries are handled by RPCProviderPool failing over, not by urllib3
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._chain_urls: Dict[str, List[str]] = {}
+        self._chain_hedge: Dict[str, bool] = {}
+        self._chain_timeout: Dict[str, int] = {}
+        self._providers: Dict[str, RPCProviderPool] = {}
+        self._web3: Dict[str, Web3] = {}
+        self._call_caches: Dict[str, BlockCallCache] = {}
+        self._lock = threading.RLock()
+
+    def _configured_urls(self, chain: str) -> List[str]:
+        """Endpoints from <CHAIN>_RPC_URL / <CHAIN>_BACKUP_RPC_n, then rpc_endpoints.json"""
+        prefix = chain.upper()
+        urls = [
+            os.getenv(f'{prefix}_RPC_URL', ''),
+            os.getenv(f'{prefix}_BACKUP_RPC_1', ''),
+            os.getenv(f'{prefix}_BACKUP_RPC_2', '')
+        ]
+        urls = [url for url in urls if url]
+        if urls:
+            return urls
+        try:
+            with open(self.endpoints_path, 'r') as f:
+                endpoints = json.load(f).get(chain, {}).get('mainnet', {})
+            return [endpoints[key] for key in ('primary', 'secondary', 'fallback') if endpoints.get(key)]
+        except (OSError, ValueError) as e:
+            logger.debug(f"No RPC endpoint config for {chain}: {e}")
+            return []
+
+    def register_chain(
+        self,
+        chain: str,
+        urls: List[str],
+        hedge: bool = False,
+        timeout: Optional[int] = None
+    ) -> None:
+        """Set the endpoints for a chain; replaces any provider already built for it"""
+        key = normalize_chain(chain)
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            raise ValueError(f"At least one RPC endpoint is required for {chain}")
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if (
+                self._chain_urls.get(key) == urls and self._chain_hedge.get(key) == hedge
+                and self._chain_timeout.get(key, self.timeout) == timeout
+            ):
+                return
+            self._chain_urls[key] = urls
+            self._chain_hedge[key] = hedge
+            self._chain_timeout[key] = timeout
+            self._providers.pop(key, None)
+            self._web3.pop(key, None)
+            self._call_caches.pop(key, None)
+
+    def get_provider(self, chain: str) -> RPCProviderPool:
+        """Get the shared provider for a chain, building it on first use"""
+        key = normalize_chain(chain)
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is not None:
+                return provider
+            urls = self._chain_urls.get(key) or self._configured_urls(key)
+            if not urls:
+                raise ConnectionError(f"No RPC endpoints configured for {chain}")
+            self._chain_urls[key] = urls
+            timeout = self._chain_timeout.get(key, self.timeout)
+            providers = [self._build_http_provider(url, timeout) for url in urls]
+            provider = RPCProviderPool(urls, hedge=self._chain_hedge.get(key, False), providers=providers)
+            self._providers[key] = provider
+            logger.info(f"Shared provider for {key}: {', '.join(urls)}")
+            return provider
+
+    def _build_http_provider(self, url: str, timeout: int) -> Web3.HTTPProvider:
+        request_kwargs = {'timeout': timeout}
+        if self.batch_size > 1:
+            return BatchingHTTPProvider(
+                url,
+                self.session,
+                max_batch_size=self.batch_size,
+                linger=self.batch_linger,
+                request_kwargs=request_kwargs
+            )
+        return KeepAliveHTTPProvider(url, self.session, request_kwargs=request_kwargs)
+
+    def get_web3(
+        self,
+        chain: str,
+        urls: Optional[List[str]] = None,
+        hedge: bool = False,
+        timeout: Optional[int] = None
+    ) -> Web3:
+        """Get the shared Web3 instance for a chain
+
+        `urls`, `hedge` and `timeout` register the chain if it has no
+        endpoints yet; callers that pass different settings for an already
+        registered chain share the first registration, with a warning.
+        """
+        key = normalize_chain(chain)
+        with self._lock:
+            if urls and key not in self._chain_urls:
+                self.register_chain(key, urls, hedge=hedge, timeout=timeout)
+            elif urls:
+                self._warn_on_conflict(key, urls, hedge, timeout)
+            w3 = self._web3.get(key)
+            if w3 is None:
+                w3 = Web3(self.get_provider(key))
+                w3.middleware_onion.add(
+                    BlockCallCacheMiddleware.build(self.get_call_cache(key)),
+                    'block_call_cache'
+                )
+                self._web3[key] = w3
+            return w3
+
+    def _warn_on_conflict(self, key: str, urls: List[str], hedge: bool, timeout: Optional[int]) -> None:
+        """Log when a later caller asks for settings the chain was not registered with"""
+        registered_timeout = self._chain_timeout.get(key, self.timeout)
+        registered = (self._chain_urls[key], self._chain_hedge.get(key, False), registered_timeout)
+        requested = (
+            list(dict.fromkeys(url for url in urls if url)),
+            hedge,
+            registered_timeout if timeout is None else timeout
+        )
+        if requested != registered:
+            logger.warning(
+                f"Ignoring conflicting registration for {key}: "
+                f"(urls, hedge, timeout) {requested} requested, keeping {registered}"
+            )
+
+    def get_call_cache(self, chain: str) -> BlockCallCache:
+        """Get the block-scoped eth_call cache for a chain"""
+        key = normalize_chain(chain)
+        with self._lock:
+            cache = self._call_caches.get(key)
+            if cache is None:
+                cache = BlockCallCache(head_ttl=self.call_cache_head_ttl)
+                self._call_caches[key] = cache
+            return cache
+
+    def get_call_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get eth_call hit, coalescing and dedupe ratio figures per chain"""
+        with self._lock:
+            caches = dict(self._call_caches)
+        return {chain: cache.get_metrics() for chain, cache in caches.items()}
+
+    def get_w3_connections(self, chains: List[str]) -> Dict[str, Web3]:
+        """Map chain names to shared Web3 instances, skipping unconfigured chains"""
+        connections: Dict[str, Web3] = {}
+        for chain in chains:
+            try:
+                connections[chain] = self.get_web3(chain)
+            except ConnectionError as e:
+                logger.warning(f"Skipping {chain}: {e}")
+        return connections
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get HTTP requests sent, connections opened and the reuse ratio
+
+        Counts come from the urllib3 pools behind the shared adapter.
+        """
+        requests_sent = 0
+        connections_opened = 0
+        pools = self.adapter.poolmanager.pools
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        reuse_ratio = 1 - connections_opened / requests_sent if requests_sent else 0.0
+        return {
+            'chains': sorted(self._providers),
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'reuse_ratio': reuse_ratio
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            self._providers.clear()
+            self._web3.clear()
+            self._call_caches.clear()
+            self.session.close()
+
+
+_registry: Optional[ProviderRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get or create the process-wide ProviderRegistry instance"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ProviderRegistry(batch_size=int(os.getenv('RPC_BATCH_SIZE', '0')))
+    return _registry
+
+
+def get_shared_web3(chain: str, urls: Optional[List[str]] = None) -> Web3:
+    """Shortcut for get_provider_registry().get_web3(chain, urls)"""
+    return get_provider_registry().get_web3(chain, urls)
@@ -0,0 +1,230 @@
+"""Incremental data retention: bounded rowid-range deletes, incremental vacuum and partition rotation"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from .db_pool import get_database_pool
+
+logger = logging.getLogger(__name__)
+
+# Day partitions are named <base>_YYYYMMDD
+PARTITION_SUFFIX = re.compile(r'^(?P<base>.+)_(?P<day>\d{8})$')
+
+
+@dataclass
+class RetentionPolicy:
+    """Keep rows of one table for max_age_days, by a unix-seconds column"""
+    table: str
+    max_age_days: float
+    timestamp_column: str = 'timestamp'
+
+
+@dataclass
+class RetentionReport:
+    """What one retention pass removed and how long it held the writer"""
+    rows_deleted: Dict[str, int] = field(default_factory=dict)
+    partitions_dropped: List[str] = field(default_factory=list)
+    batches: int = 0
+    pages_vacuumed: int = 0
+    max_stall_ms: float = 0.0
+    total_stall_ms: float = 0.0
+    duration_s: float = 0.0
+
+    def stall(self, seconds: float) -> None:
+        self.max_stall_ms = max(self.max_stall_ms, seconds * 1000)
+        self.total_stall_ms += seconds * 1000
+
+
+def partition_name(base: str, timestamp: float) -> str:
+    """Daily partition table holding a unix timestamp, e.g. dex_prices_20261018"""
+    return f"{base}_{datetime.fromtimestamp(timestamp, timezone.utc):%Y%m%d}"
+
+
+class RetentionManager:
+    """Removes expired rows without holding the database for long
+
+    Expired rows are deleted in rowid ranges of at most batch_size rows,
+    each in its own short writer lease, with a pause between batches so
+    the bot's writes interleave. The batch size adapts to keep each lease
+    under target_stall_ms. Freed pages are returned to the OS a few at a
+    time with incremental_vacuum instead of a full VACUUM, which rewrites
+    the whole file under an exclusive lock. Day-partitioned tables are
+    dropped whole. Every pass reports the longest single writer stall.
+    """
+
+    def __init__(
+        self,
+        db_path: str = 'arbitrage_bot.db',
+        batch_size: int = 2000,
+        pause: float = 0.05,
+        vacuum_pages: int = 256,
+        target_stall_ms: float = 50.0
+    ) -> None:
+        self.db_path = db_path
+        self.pool = get_database_pool(db_path)
+        self.batch_size = batch_size
+        self.min_batch_size = 100
+        self.max_batch_size = batch_size * 8
+        self.pause = pause
+        self.vacuum_pages = vacuum_pages
+        self.target_stall_ms = target_stall_ms
+        self.last_report: Optional[RetentionReport] = None
+
+    def _tables(self) -> List[str]:
+        rows = self.pool.reader().execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        return [row[0] for row in rows]
+
+    def auto_vacuum_mode(self) -> int:
+        """0 = NONE, 1 = FULL, 2 = INCREMENTAL"""
+        return self.pool.reader().execute('PRAGMA auto_vacuum').fetchone()[0]
+
+    def enable_incremental_vacuum(self) -> bool:
+        """Switch an existing file to auto_vacuum=INCREMENTAL
+
+        Files created through the pool already have it. Older files need
+        one full VACUUM to convert, which is the only long lock this class
+        ever takes; run it during maintenance, not while trading.
+        """
+        if self.auto_vacuum_mode() == 2:
+            return False
+        start = time.perf_counter()
+        with self.pool.write() as conn:
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('VACUUM')
+        logger.info(f"Converted {self.db_path} to incremental vacuum in {time.perf_counter() - start:.1f}s")
+        return True
+
+    def _delete_range(self, policy: RetentionPolicy, lo: int, hi: int, cutoff: int,
+                      report: RetentionReport) -> int:
+        start = time.perf_counter()
+        with self.pool.write() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM {policy.table} WHERE rowid >= ? AND rowid < ? AND {policy.timestamp_column} < ?",
+                (lo, hi, cutoff)
+            )
+        elapsed = time.perf_counter() - start
+        report.stall(elapsed)
+        report.batches += 1
+
+        # Aim each lease at the stall budget
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms > self.target_stall_ms:
+            self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+        elif elapsed_ms < self.target_stall_ms / 4:
+            self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+        return cursor.rowcount
+
+    def purge(self, policy: RetentionPolicy, now: Optional[float] = None,
+              report: Optional[RetentionReport] = None) -> int:
+        """Delete rows older than the policy allows; returns rows deleted"""
+        report = report or RetentionReport()
+        cutoff = int((time.time() if now is None else now) - policy.max_age_days * 86400)
+        reader = self.pool.reader()
+        # Rows arrive in time order, so expired rows sit below the first row
+        # still kept. Finding it is a read and does not touch the writer.
+        lo, last = reader.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {policy.table}").fetchone()
+        if lo is None:
+            return 0
+        keep = reader.execute(
+            # Unary + keeps the planner on the rowid scan instead of a timestamp index
+            f"SELECT rowid FROM {policy.table} WHERE +{policy.timestamp_column} >= ? ORDER BY rowid LIMIT 1",
+            (cutoff,)
+        ).fetchone()
+        end = keep[0] if keep else last + 1
+
+        deleted = 0
+        while lo < end:
+            hi = min(lo + self.batch_size, end)
+            deleted += self._delete_range(policy, lo, hi, cutoff, report)
+            lo = hi
+            if lo < end:
+                time.sleep(self.pause)
+        report.rows_deleted[policy.table] = report.rows_deleted.get(policy.table, 0) + deleted
+        return deleted
+
+    def rotate_partitions(self, base: str, max_age_days: float, now: Optional[float] = None,
+                          report: Optional[RetentionReport] = None) -> List[str]:
+        """Drop whole <base>_YYYYMMDD tables older than max_age_days"""
+        report = report or RetentionReport()
+        oldest_kept = partition_name(base, (time.time() if now is None else now) - max_age_days * 86400)
+        dropped = []
+        for table in sorted(self._tables()):
+            match = PARTITION_SUFFIX.match(table)
+            if not match or match.group('base') != base or table >= oldest_kept:
+                continue
+            start = time.perf_counter()
+            with self.pool.write() as conn:
+                conn.execute(f"DROP TABLE {table}")
+            report.stall(time.perf_counter() - start)
+            dropped.append(table)
+            time.sleep(self.pause)
+        report.partitions_dropped.extend(dropped)
+        return dropped
+
+    def vacuum_step(self, pages: Optional[int] = None, report: Optional[RetentionReport] = None) -> int:
+        """Return up to pages free pages to the OS; returns pages freed"""
+        pages = self.vacuum_pages if pages is None else pages
+        start = time.perf_counter()
+        with self.pool.write() as conn:
+            before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if before:
+                # executescript steps the pragma to completion; execute() frees a single page
+                conn.executescript(f'PRAGMA incremental_vacuum({pages})')
+            after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        if report is not None:
+            report.stall(time.perf_counter() - start)
+            report.pages_vacuumed += before - after
+        return before - after
+
+    def run(
+        self,
+        policies: Iterable[RetentionPolicy],
+        partitions: Optional[Dict[str, float]] = None,
+        now: Optional[float] = None,
+        max_vacuum_steps: int = 64
+    ) -> RetentionReport:
+        """One full pass: purge every policy, rotate partitions, then reclaim pages"""
+        started = time.perf_counter()
+        report = RetentionReport()
+        tables = set(self._tables())
+        for policy in policies:
+            if policy.table not in tables:
+                continue
+            try:
+                self.purge(policy, now, report)
+            except Exception as e:
+                logger.error(f"Error purging {policy.table}: {e}")
+        for base, max_age_days in (partitions or {}).items():
+            try:
+                self.rotate_partitions(base, max_age_days, now, report)
+            except Exception as e:
+                logger.error(f"Error rotating {base} partitions: {e}")
+
+        if self.auto_vacuum_mode() == 2:
+            for _ in range(max_vacuum_steps):
+                if not self.vacuum_step(report=report):
+                    break
+                time.sleep(self.pause)
+
+        report.duration_s = time.perf_counter() - started
+        self.last_report = report
+        logger.info(
+            f"Retention pass: {sum(report.rows_deleted.values())} rows in {report.batches} batches, "
+            f"{len(report.partitions_dropped)} partitions, {report.pages_vacuumed} pages reclaimed, "
+            f"max writer stall {report.max_stall_ms:.1f} ms"
+        )
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        report = self.last_report
+        return {
+            'batch_size': self.batch_size,
+            'auto_vacuum': self.auto_vacuum_mode(),
+            'last_rows_deleted': sum(report.rows_deleted.values()) if report else 0,
+            'last_max_stall_ms': report.max_stall_ms if report else 0.0,
+            'last_duration_s': report.duration_s if report else 0.0
+        }
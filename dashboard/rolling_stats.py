@@ -0,0 +1,377 @@
+"""Incremental price statistics: windowed Welford moments, monotonic min/max, EWMA volatility and OHLC rollups"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .db_pool import get_database_pool
+from .write_behind import get_write_behind_writer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVALS: Tuple[int, ...] = (60, 300, 3600)  # 1m / 5m / 1h bars
+
+OHLC_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS ohlc_bars (
+        series TEXT NOT NULL,
+        interval INTEGER NOT NULL,
+        start INTEGER NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        count INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        m2 REAL NOT NULL,
+        PRIMARY KEY (series, interval, start)
+    )
+'''
+UPSERT_BAR_SQL = '''
+    INSERT OR REPLACE INTO ohlc_bars
+    (series, interval, start, open, high, low, close, count, mean, m2)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+BAR_COLUMNS = 'start, open, high, low, close, count, mean, m2'
+
+
+class WindowedStats:
+    """Mean, variance, min and max over the last window seconds
+
+    Each value is added once and removed once as it leaves the window, so
+    updates are O(1) amortized. Moments use Welford's update and its
+    inverse; min and max come from monotonic deques whose heads are the
+    current extremes.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._values: Deque[Tuple[float, float]] = deque()
+        self._min: Deque[Tuple[float, float]] = deque()
+        self._max: Deque[Tuple[float, float]] = deque()
+
+    def add(self, value: float, timestamp: float) -> None:
+        self.evict(timestamp)
+        self._values.append((timestamp, value))
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+
+    def evict(self, now: float) -> None:
+        """Drop values at or before now - window"""
+        cutoff = now - self.window
+        while self._values and self._values[0][0] <= cutoff:
+            _, value = self._values.popleft()
+            self.count -= 1
+            if self.count == 0:
+                self.mean = self.m2 = 0.0
+                continue
+            delta = value - self.mean
+            self.mean -= delta / self.count
+            self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+        while self._min and self._min[0][0] <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= cutoff:
+            self._max.popleft()
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1), matching statistics.variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+
+class EwmaVolatility:
+    """Exponentially weighted volatility of log returns (RiskMetrics style)
+
+    variance <- decay * variance + (1 - decay) * r^2 on every tick, so
+    recent moves dominate without keeping any history.
+    """
+
+    def __init__(self, decay: float = 0.94) -> None:
+        self.decay = decay
+        self.variance = 0.0
+        self.last_price: Optional[float] = None
+        self.samples = 0
+
+    def add(self, price: float) -> None:
+        if self.last_price and price > 0:
+            r = math.log(price / self.last_price)
+            if self.samples == 0:
+                self.variance = r * r
+            else:
+                self.variance = self.decay * self.variance + (1 - self.decay) * r * r
+            self.samples += 1
+        self.last_price = price
+
+    @property
+    def volatility(self) -> float:
+        """Per-tick return volatility in percent"""
+        return math.sqrt(self.variance) * 100
+
+
+@dataclass
+class OhlcBar:
+    """One interval of ticks with its open/high/low/close and moments"""
+    start: int
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int = 1
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def first(cls, start: int, price: float) -> 'OhlcBar':
+        return cls(start, price, price, price, price, 1, price, 0.0)
+
+    def add(self, price: float) -> None:
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.close = price
+        self.count += 1
+        delta = price - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (price - self.mean)
+
+
+def merge_bars(bars: Sequence[OhlcBar]) -> Optional[OhlcBar]:
+    """Combine consecutive bars into one, merging moments with Chan's formula"""
+    if not bars:
+        return None
+    merged = OhlcBar(bars[0].start, bars[0].open, bars[0].high, bars[0].low, bars[0].close,
+                     bars[0].count, bars[0].mean, bars[0].m2)
+    for bar in bars[1:]:
+        total = merged.count + bar.count
+        delta = bar.mean - merged.mean
+        merged.m2 += bar.m2 + delta * delta * merged.count * bar.count / total
+        merged.mean += delta * bar.count / total
+        merged.count = total
+        merged.high = max(merged.high, bar.high)
+        merged.low = min(merged.low, bar.low)
+        merged.close = bar.close
+    return merged
+
+
+class SeriesStats:
+    """Every incremental statistic for one price series"""
+
+    def __init__(self, window: float, intervals: Iterable[int], decay: float, keep_bars: int) -> None:
+        self.window = WindowedStats(window)
+        self.ewma = EwmaVolatility(decay)
+        self.intervals = tuple(intervals)
+        self.open_bars: Dict[int, OhlcBar] = {}
+        self.closed_bars: Dict[int, Deque[OhlcBar]] = {i: deque(maxlen=keep_bars) for i in self.intervals}
+        self.first_seen: Optional[float] = None
+        self.last_price: Optional[float] = None
+        self.last_seen: Optional[float] = None
+
+    def update(self, price: float, timestamp: float) -> List[Tuple[int, OhlcBar]]:
+        """Apply one tick; returns the (interval, bar) pairs it closed"""
+        if self.first_seen is None:
+            self.first_seen = timestamp
+        self.last_price = price
+        self.last_seen = timestamp
+        self.window.add(price, timestamp)
+        self.ewma.add(price)
+
+        closed = []
+        for interval in self.intervals:
+            start = int(timestamp) // interval * interval
+            bar = self.open_bars.get(interval)
+            if bar is not None and bar.start == start:
+                bar.add(price)
+                continue
+            if bar is not None:
+                self.closed_bars[interval].append(bar)
+                closed.append((interval, bar))
+            self.open_bars[interval] = OhlcBar.first(start, price)
+        return closed
+
+
+class RollingStatsEngine:
+    """Per-series statistics kept current tick by tick
+
+    update() is O(1) per tick. The trailing window (default one hour) is
+    answered straight from the windowed moments; other timeframes merge
+    at most a few hundred OHLC bars instead of rescanning ticks. Closed
+    bars are upserted into the ohlc_bars table through the write-behind
+    writer when a db_path is given, and a recent tail of them stays in
+    memory, so statistics survive restarts and the common queries never
+    touch SQLite at all.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        window: float = 3600,
+        intervals: Iterable[int] = DEFAULT_INTERVALS,
+        decay: float = 0.94,
+        keep_bars: int = 1440,
+        max_bars_per_query: int = 500
+    ) -> None:
+        self.db_path = db_path
+        self.window = window
+        self.intervals = tuple(sorted(intervals))
+        self.decay = decay
+        self.keep_bars = keep_bars
+        self.max_bars_per_query = max_bars_per_query
+        self._series: Dict[str, SeriesStats] = {}
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.bars_closed = 0
+        self.writer = None
+        if db_path:
+            with get_database_pool(db_path).write() as conn:
+                conn.execute(OHLC_SCHEMA)
+            self.writer = get_write_behind_writer(db_path)
+
+    def _persist(self, series: str, interval: int, bar: OhlcBar) -> None:
+        if self.writer is not None:
+            self.writer.submit(UPSERT_BAR_SQL, (
+                series, interval, bar.start, bar.open, bar.high, bar.low,
+                bar.close, bar.count, bar.mean, bar.m2
+            ))
+
+    def _load_bars(self, series: str, interval: int, start: int, end: Optional[int] = None) -> List[OhlcBar]:
+        if not self.db_path:
+            return []
+        self.writer.flush()
+        query = f'SELECT {BAR_COLUMNS} FROM ohlc_bars WHERE series = ? AND interval = ? AND start >= ?'
+        params: List[Any] = [series, interval, start]
+        if end is not None:
+            query += ' AND start < ?'
+            params.append(end)
+        rows = get_database_pool(self.db_path).reader().execute(query + ' ORDER BY start', params).fetchall()
+        return [OhlcBar(*tuple(row)) for row in rows]
+
+    def _resume(self, series: str, stats: SeriesStats, timestamp: float) -> None:
+        """Continue bars that a previous run left open in the current buckets"""
+        for interval in self.intervals:
+            start = int(timestamp) // interval * interval
+            stored = self._load_bars(series, interval, start, start + interval)
+            if stored:
+                stats.open_bars[interval] = stored[0]
+
+    def update(self, series: str, price: float, timestamp: Optional[float] = None) -> None:
+        """Apply one tick (timestamp in epoch seconds, default now)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        stats = self._series.get(series)
+        if stats is None:
+            # Flushing the writer and reading SQLite happen before taking the
+            # lock so ticks for other series are not held up behind them
+            loaded = SeriesStats(self.window, self.intervals, self.decay, self.keep_bars)
+            try:
+                self._resume(series, loaded, timestamp)
+            except Exception as e:
+                logger.error(f"Error loading open bars for {series}: {str(e)}")
+        with self._lock:
+            if stats is None:
+                # Another thread may have started the series meanwhile; its copy wins
+                stats = self._series.setdefault(series, loaded)
+            for interval, bar in stats.update(price, timestamp):
+                self._persist(series, interval, bar)
+                self.bars_closed += 1
+            self.ticks += 1
+
+    def bars(self, series: str, interval: int, since: float, include_open: bool = True) -> List[OhlcBar]:
+        """Bars of one interval starting at or after since, oldest first"""
+        start = int(since) // interval * interval
+        with self._lock:
+            stats = self._series.get(series)
+            recent = list(stats.closed_bars.get(interval, ())) if stats else []
+            open_bar = stats.open_bars.get(interval) if stats else None
+        memory = [b for b in recent if b.start >= start]
+        # Memory only holds the recent tail; older bars come from the table
+        oldest = recent[0].start if recent else (open_bar.start if open_bar else None)
+        if oldest is None or oldest > start:
+            memory = self._load_bars(series, interval, start, oldest) + memory
+        if include_open and open_bar is not None and open_bar.start >= start:
+            memory = [b for b in memory if b.start != open_bar.start] + [open_bar]
+        return memory
+
+    def statistics(self, series: str, timeframe: float, now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Current, mean, min, max, std dev and volatility over the last timeframe seconds"""
+        now = time.time() if now is None else now
+        with self._lock:
+            stats = self._series.get(series)
+            if stats is not None:
+                stats.window.evict(now)
+                live = (
+                    timeframe == self.window and stats.window.count
+                    and stats.first_seen is not None and stats.first_seen <= now - timeframe
+                )
+                if live:
+                    return self._summary(
+                        stats.last_price, stats.window.mean, stats.window.min, stats.window.max,
+                        stats.window.std_dev, stats.window.count, stats.ewma.volatility
+                    )
+            ewma = stats.ewma.volatility if stats is not None else 0.0
+
+        # Finest interval that keeps the merge small
+        interval = next(
+            (i for i in self.intervals if timeframe / i <= self.max_bars_per_query),
+            self.intervals[-1]
+        )
+        merged = merge_bars(self.bars(series, interval, now - timeframe))
+        if merged is None:
+            return None
+        std_dev = math.sqrt(merged.m2 / (merged.count - 1)) if merged.count > 1 else 0.0
+        return self._summary(merged.close, merged.mean, merged.low, merged.high, std_dev, merged.count, ewma)
+
+    @staticmethod
+    def _summary(current: float, mean: float, low: float, high: float, std_dev: float,
+                 samples: int, ewma: float) -> Dict[str, float]:
+        return {
+            'current_price': current,
+            'mean_price': mean,
+            'min_price': low,
+            'max_price': high,
+            'volatility': (std_dev / mean * 100) if mean > 0 else 0,
+            'ewma_volatility': ewma,
+            'std_dev': std_dev,
+            'samples': samples
+        }
+
+    def flush(self) -> None:
+        """Persist open bars so a restart resumes them"""
+        with self._lock:
+            pending = [(s, i, b) for s, stats in self._series.items() for i, b in stats.open_bars.items()]
+        for series, interval, bar in pending:
+            self._persist(series, interval, bar)
+        if self.writer is not None:
+            self.writer.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'series': len(self._series),
+                'ticks': self.ticks,
+                'bars_closed': self.bars_closed,
+                'intervals': list(self.intervals)
+            }
@@ -0,0 +1,352 @@
+"""Off-chain arbitrage route search over cached pool reserves"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .state_cache import VersionedStateCache
+
+logger = logging.getLogger(__name__)
+
+# State cache keys for pool reserves are ('pool', address)
+POOL_STATE_PREFIX = 'pool'
+
+BASIS_POINTS = 10000
+DEFAULT_SWAP_GAS = 120000
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int) -> int:
+    """Exact constant-product output, rounded down like UniswapV2Library"""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (BASIS_POINTS - fee_bps)
+    return (amount_in_with_fee * reserve_out) // (reserve_in * BASIS_POINTS + amount_in_with_fee)
+
+
+@dataclass(frozen=True)
+class PoolReserves:
+    """Constant-product pool state at one block"""
+    address: str
+    dex: str
+    token0: str
+    token1: str
+    reserve0: int
+    reserve1: int
+    fee_bps: int = 30
+    gas_estimate: int = DEFAULT_SWAP_GAS
+
+    def reserves_for(self, token_in: str) -> Tuple[int, int]:
+        if token_in == self.token0:
+            return self.reserve0, self.reserve1
+        return self.reserve1, self.reserve0
+
+
+@dataclass(frozen=True)
+class SwapEdge:
+    """One direction of a pool; weight is -log of the marginal rate"""
+    token_in: str
+    token_out: str
+    pool: PoolReserves
+    weight: float
+
+    def quote(self, amount_in: int) -> int:
+        reserve_in, reserve_out = self.pool.reserves_for(self.token_in)
+        return get_amount_out(amount_in, reserve_in, reserve_out, self.pool.fee_bps)
+
+
+@dataclass
+class ArbitrageRoute:
+    """Cycle confirmed with exact AMM math at a trade size"""
+    tokens: List[str]
+    pools: List[str]
+    dexes: List[str]
+    amount_in: int
+    amount_out: int
+    gas_estimate: int
+    log_weight: float
+    amounts: List[int] = field(default_factory=list)
+
+    @property
+    def profit(self) -> int:
+        return self.amount_out - self.amount_in
+
+    @property
+    def route_key(self) -> str:
+        return '>'.join(self.pools)
+
+
+class RouteGraph:
+    """Token graph with one directed edge per pool direction
+
+    Marginal rates are turned into -log(rate) weights so a profitable cycle
+    is one whose weights sum below zero. Candidate cycles through a start
+    token are enumerated with a bounded-depth DFS over simple paths, which
+    is the same search space PathFinder.findBestPath covers with its
+    on-chain BFS, and each candidate is then quoted exactly at the trade
+    size. Because AMM output is concave in the input, a cycle that is not
+    profitable at the marginal rate cannot be profitable at any size, so
+    pruning on weight never drops a route the exact quote would accept.
+    """
+
+    def __init__(self, max_hops: int = 3) -> None:
+        self.max_hops = max_hops
+        self.edges: Dict[str, List[SwapEdge]] = {}
+        self.pools: Dict[str, PoolReserves] = {}
+
+    @classmethod
+    def from_pools(cls, pools: List[PoolReserves], max_hops: int = 3) -> 'RouteGraph':
+        graph = cls(max_hops=max_hops)
+        for pool in pools:
+            graph.add_pool(pool)
+        return graph
+
+    @classmethod
+    def from_state_cache(cls, cache: VersionedStateCache, max_hops: int = 3) -> 'RouteGraph':
+        """Build from the PoolReserves entries in a state cache"""
+        pools = [
+            value for key, value in cache.items()
+            if isinstance(key, tuple) and key[0] == POOL_STATE_PREFIX and isinstance(value, PoolReserves)
+        ]
+        return cls.from_pools(pools, max_hops=max_hops)
+
+    def add_pool(self, pool: PoolReserves) -> bool:
+        """Add a pool or replace its reserves; True if the pool is new to the graph"""
+        if pool.reserve0 <= 0 or pool.reserve1 <= 0:
+            self.remove_pool(pool.address)
+            return False
+        address = pool.address.lower()
+        is_new = address not in self.pools
+        self.pools[address] = pool
+        fee = 1 - pool.fee_bps / BASIS_POINTS
+        for token_in, token_out, rate in (
+            (pool.token0, pool.token1, pool.reserve1 / pool.reserve0),
+            (pool.token1, pool.token0, pool.reserve0 / pool.reserve1)
+        ):
+            edge = SwapEdge(token_in, token_out, pool, -math.log(rate * fee))
+            edges = self.edges.setdefault(token_in.lower(), [])
+            # Replace in place so cycle enumeration order stays stable
+            index = next((i for i, e in enumerate(edges) if e.pool.address.lower() == address), None)
+            if index is None:
+                edges.append(edge)
+            else:
+                edges[index] = edge
+        return is_new
+
+    def remove_pool(self, pool_address: str) -> None:
+        address = pool_address.lower()
+        pool = self.pools.pop(address, None)
+        if pool is None:
+            return
+        for token in (pool.token0.lower(), pool.token1.lower()):
+            self.edges[token] = [e for e in self.edges.get(token, []) if e.pool.address.lower() != address]
+
+    def get_edge(self, token_in: str, pool_address: str) -> Optional[SwapEdge]:
+        address = pool_address.lower()
+        return next((e for e in self.edges.get(token_in.lower(), []) if e.pool.address.lower() == address), None)
+
+    def find_cycles(self, start: str, profitable_only: bool = True) -> Iterator[Tuple[List[SwapEdge], float]]:
+        """Yield simple cycles through start whose marginal weight is negative
+
+        With profitable_only=False every simple cycle is yielded, which is
+        how incremental detection indexes the cycle structure once.
+        """
+        start = start.lower()
+        path: List[SwapEdge] = []
+        visited = {start}
+
+        def walk(token: str, weight: float) -> Iterator[Tuple[List[SwapEdge], float]]:
+            for edge in self.edges.get(token, []):
+                total = weight + edge.weight
+                token_out = edge.token_out.lower()
+                if token_out == start:
+                    if path and (total < 0 or not profitable_only):
+                        yield path + [edge], total
+                    continue
+                if token_out in visited or len(path) + 2 > self.max_hops:
+                    continue
+                visited.add(token_out)
+                path.append(edge)
+                yield from walk(token_out, total)
+                path.pop()
+                visited.discard(token_out)
+
+        yield from walk(start, 0.0)
+
+    @staticmethod
+    def quote_cycle(edges: List[SwapEdge], amount_in: int) -> List[int]:
+        """Amounts after each hop, starting with amount_in"""
+        amounts = [amount_in]
+        for edge in edges:
+            amounts.append(edge.quote(amounts[-1]))
+        return amounts
+
+    def confirm(self, edges: List[SwapEdge], weight: float, amount_in: int) -> ArbitrageRoute:
+        amounts = self.quote_cycle(edges, amount_in)
+        return ArbitrageRoute(
+            tokens=[edges[0].token_in] + [edge.token_out for edge in edges],
+            pools=[edge.pool.address for edge in edges],
+            dexes=[edge.pool.dex for edge in edges],
+            amount_in=amount_in,
+            amount_out=amounts[-1],
+            gas_estimate=sum(edge.pool.gas_estimate for edge in edges),
+            log_weight=weight,
+            amounts=amounts
+        )
+
+    def find_best_routes(self, start: str, amounts: List[int]) -> Dict[int, ArbitrageRoute]:
+        """Most profitable confirmed route per trade size
+
+        The cycle enumeration runs once and every candidate is quoted at
+        each size, so adding sizes costs only integer math.
+        """
+        best: Dict[int, ArbitrageRoute] = {}
+        for edges, weight in self.find_cycles(start):
+            for amount_in in amounts:
+                route = self.confirm(edges, weight, amount_in)
+                if route.profit > 0 and (amount_in not in best or route.profit > best[amount_in].profit):
+                    best[amount_in] = route
+        return best
+
+    def find_best_route(self, start: str, amount_in: int) -> Optional[ArbitrageRoute]:
+        """Off-chain equivalent of PathFinder.findBestPath"""
+        return self.find_best_routes(start, [amount_in]).get(amount_in)
+
+    def quote_pools(self, tokens: List[str], pools: List[str], amount_in: int) -> Optional[int]:
+        """Re-quote a known route; None if one of its pools is no longer in the graph"""
+        amount = amount_in
+        for token_in, address in zip(tokens, pools):
+            edge = self.get_edge(token_in, address)
+            if edge is None:
+                return None
+            amount = edge.quote(amount)
+        return amount
+
+    def mid_value(self, token: str, amount: int, quote: str) -> Optional[int]:
+        """Value of amount of token in quote units at the mid price of the deepest direct pool"""
+        token, quote = token.lower(), quote.lower()
+        if token == quote:
+            return amount
+        deepest: Optional[Tuple[int, int]] = None
+        for edge in self.edges.get(token, []):
+            if edge.token_out.lower() != quote:
+                continue
+            reserves = edge.pool.reserves_for(edge.token_in)
+            if deepest is None or reserves[1] > deepest[1]:
+                deepest = reserves
+        if deepest is None:
+            return None
+        return amount * deepest[1] // deepest[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'tokens': len(self.edges),
+            'pools': len(self.pools),
+            'edges': sum(len(edges) for edges in self.edges.values()),
+            'max_hops': self.max_hops
+        }
+
+
+# (start token, pool addresses in order); all lowercase
+CycleKey = Tuple[str, Tuple[str, ...]]
+
+
+class IncrementalRouteDetector:
+    """Keeps profitable routes current by re-evaluating only dirty cycles
+
+    The simple cycles through each start token are indexed once by the
+    pools they use. update() takes the pools whose state changed since the
+    last call and re-quotes only the cycles touching them; every other
+    cycle keeps its cached result. Cycles are only re-enumerated when a
+    pool is added, so per-block work follows the number of pools that
+    traded rather than the size of the universe.
+
+    amounts is either one list of trade sizes for every start token or a
+    mapping of start token to sizes in that token's own base units.
+    """
+
+    def __init__(
+        self,
+        start_tokens: Iterable[str],
+        amounts: Union[List[int], Dict[str, List[int]]],
+        max_hops: int = 3
+    ) -> None:
+        self.start_tokens = [token.lower() for token in start_tokens]
+        if isinstance(amounts, dict):
+            self.amounts = {token.lower(): list(sizes) for token, sizes in amounts.items()}
+        else:
+            self.amounts = {token: list(amounts) for token in self.start_tokens}
+        self.graph = RouteGraph(max_hops=max_hops)
+        self.cycles: Dict[CycleKey, List[Tuple[str, str]]] = {}
+        self.cycles_by_pool: Dict[str, Set[CycleKey]] = {}
+        self.candidates: Dict[CycleKey, Dict[int, ArbitrageRoute]] = {}
+        self.last_evaluated = 0
+        self.total_evaluated = 0
+
+    def _index_cycles(self, new_pools: Set[str]) -> Set[CycleKey]:
+        added: Set[CycleKey] = set()
+        for start in self.start_tokens:
+            for edges, _ in self.graph.find_cycles(start, profitable_only=False):
+                pools = tuple(edge.pool.address.lower() for edge in edges)
+                key = (start, pools)
+                if key in self.cycles or new_pools.isdisjoint(pools):
+                    continue
+                self.cycles[key] = [(edge.token_in, edge.pool.address) for edge in edges]
+                for address in pools:
+                    self.cycles_by_pool.setdefault(address, set()).add(key)
+                added.add(key)
+        return added
+
+    def _evaluate(self, key: CycleKey) -> None:
+        edges = [self.graph.get_edge(token_in, address) for token_in, address in self.cycles[key]]
+        self.candidates.pop(key, None)
+        if any(edge is None for edge in edges):
+            return
+        weight = sum(edge.weight for edge in edges)
+        # Concave AMM output: not profitable at the margin means not at any size
+        if weight >= 0:
+            return
+        routes = {}
+        for amount_in in self.amounts.get(key[0], []):
+            route = self.graph.confirm(edges, weight, amount_in)
+            if route.profit > 0:
+                routes[amount_in] = route
+        if routes:
+            self.candidates[key] = routes
+
+    def update(self, changed_pools: Iterable[PoolReserves]) -> Set[CycleKey]:
+        """Apply changed pool states and re-evaluate the cycles they touch"""
+        dirty: Set[CycleKey] = set()
+        new_pools: Set[str] = set()
+        for pool in changed_pools:
+            if self.graph.add_pool(pool):
+                new_pools.add(pool.address.lower())
+            dirty |= self.cycles_by_pool.get(pool.address.lower(), set())
+        if new_pools:
+            dirty |= self._index_cycles(new_pools)
+        for key in dirty:
+            self._evaluate(key)
+        self.last_evaluated = len(dirty)
+        self.total_evaluated += len(dirty)
+        return dirty
+
+    def get_best_routes(self, start: str) -> Dict[int, ArbitrageRoute]:
+        """Most profitable cached route per trade size for one start token"""
+        start = start.lower()
+        best: Dict[int, ArbitrageRoute] = {}
+        for key, routes in self.candidates.items():
+            if key[0] != start:
+                continue
+            for amount_in, route in routes.items():
+                if amount_in not in best or route.profit > best[amount_in].profit:
+                    best[amount_in] = route
+        return best
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'cycles': len(self.cycles),
+            'candidates': len(self.candidates),
+            'last_evaluated': self.last_evaluated,
+            'total_evaluated': self.total_evaluated,
+            **self.graph.get_stats()
+        }
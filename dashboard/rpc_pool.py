@@ -0,0 +1,294 @@
+"""Latency-aware multi-endpoint RPC provider with hedged reads and circuit breakers"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, FrozenSet, List, Optional
+
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+logger = logging.getLogger(__name__)
+
+# Read-only methods that are safe to send to two endpoints at once
+DEFAULT_HEDGED_METHODS: FrozenSet[str] = frozenset({
+    'eth_call',
+    'eth_blockNumber',
+    'eth_getBlockByNumber',
+    'eth_getBalance',
+    'eth_gasPrice',
+    'eth_estimateGas',
+    'eth_getTransactionCount',
+})
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when every endpoint's circuit breaker is open"""
+    pass
+
+
+class EndpointState:
+    """Outcome-driven health tracking for one RPC endpoint
+
+    Latency and error rate are exponentially weighted moving averages over
+    real calls. The circuit breaker opens after `failure_threshold`
+    consecutive transport failures and lets a single trial call through
+    once `cooldown` seconds have passed; the cooldown doubles on each
+    failed trial up to `max_cooldown`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        provider: JSONBaseProvider,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown: float = 5.0,
+        max_cooldown: float = 120.0,
+        latency_window: int = 200
+    ) -> None:
+        self.url = url
+        self.provider = provider
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.open_until = 0.0
+        self.cooldown = cooldown
+        self.last_used = time.time()
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Circuit breaker state: closed, open or half_open"""
+        if self.consecutive_failures < self.failure_threshold:
+            return 'closed'
+        return 'open' if time.time() < self.open_until else 'half_open'
+
+    def acquire(self) -> bool:
+        """Check whether a call may be sent to this endpoint now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(latency)
+            self.ewma_latency = (
+                latency if self.ewma_latency is None
+                else self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+            )
+            self.error_rate *= (1 - self.alpha)
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+            self.consecutive_failures += 1
+            if self._trial_in_flight:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._trial_in_flight = False
+            if self.consecutive_failures >= self.failure_threshold:
+                if self.consecutive_failures == self.failure_threshold or self.open_until <= time.time():
+                    logger.warning(f"Circuit open for {self.url} for {self.cooldown:.1f}s")
+                self.open_until = time.time() + self.cooldown
+
+    def score(self, default_latency: float) -> float:
+        """Lower is better: expected latency inflated by the error rate"""
+        latency = self.ewma_latency if self.ewma_latency is not None else default_latency
+        return latency * (1 + 10 * self.error_rate)
+
+    def p95_latency(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'state': self.state,
+            'ewma_latency': self.ewma_latency,
+            'p95_latency': self.p95_latency(),
+            'error_rate': self.error_rate,
+            'requests': self.requests,
+            'failures': self.failures
+        }
+
+
+class RPCProviderPool(JSONBaseProvider):
+    """Web3 provider that routes each call to the fastest healthy endpoint
+
+    Failed transport calls fail over to the next best endpoint. JSON-RPC
+    error responses (reverts, bad params) are valid answers and do not
+    count against an endpoint. When hedging is enabled, reads listed in
+    `hedged_methods` are re-sent to the runner-up endpoint if the first
+    has not answered within its p95 latency, and the first answer wins.
+    """
+
+    def __init__(
+        self,
+        endpoint_uris: List[str],
+        request_kwargs: Optional[Dict[str, Any]] = None,
+        hedge: bool = False,
+        hedged_methods: FrozenSet[str] = DEFAULT_HEDGED_METHODS,
+        min_hedge_delay: float = 0.05,
+        default_hedge_delay: float = 0.5,
+        warm_interval: float = 30.0,
+        providers: Optional[List[JSONBaseProvider]] = None,
+        **endpoint_kwargs: Any
+    ) -> None:
+        super().__init__()
+        if not endpoint_uris:
+            raise ValueError("At least one RPC endpoint is required")
+        if providers is None:
+            providers = [
+                # Retries are handled here by failing over, not inside each provider
+                Web3.HTTPProvider(
+                    uri,
+                    request_kwargs=request_kwargs or {'timeout': 30},
+                    exception_retry_configuration=None
+                )
+                for uri in endpoint_uris
+            ]
+        self.endpoints = [
+            EndpointState(uri, provider, **endpoint_kwargs)
+            for uri, provider in zip(endpoint_uris, providers)
+        ]
+        self.hedge = hedge
+        self.hedged_methods = hedged_methods
+        self.min_hedge_delay = min_hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.warm_interval = warm_interval
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2 * len(self.endpoints), 4),
+            thread_name_prefix='rpc-hedge'
+        )
+
+    def __str__(self) -> str:
+        return f"RPC provider pool {[e.url for e in self.endpoints]}"
+
+    def _ranked(self) -> List[EndpointState]:
+        """Endpoints ordered best first; open circuits go last, soonest to recover first
+
+        Unmeasured endpoints rank first so every endpoint gets a latency
+        sample, and an endpoint idle for longer than warm_interval is moved
+        to the front once so its statistics stay current from real traffic.
+        """
+        now = time.time()
+        closed = [e for e in self.endpoints if e.state != 'open']
+        opened = [e for e in self.endpoints if e.state == 'open']
+        closed.sort(key=lambda e: e.score(0.0))
+        opened.sort(key=lambda e: e.open_until)
+        if len(closed) > 1:
+            idle = min(closed[1:], key=lambda e: e.last_used)
+            if now - idle.last_used >= self.warm_interval:
+                idle.last_used = now
+                closed.remove(idle)
+                closed.insert(0, idle)
+        return closed + opened
+
+    def _call(
+        self,
+        endpoint: EndpointState,
+        method: RPCEndpoint,
+        params: Any,
+        force: bool = False
+    ) -> RPCResponse:
+        if not force and not endpoint.acquire():
+            raise CircuitOpenError(f"Circuit open for {endpoint.url}")
+        endpoint.last_used = time.time()
+        start = time.perf_counter()
+        try:
+            response = endpoint.provider.make_request(method, params)
+        except Exception:
+            endpoint.record_failure()
+            raise
+        endpoint.record_success(time.perf_counter() - start)
+        return response
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        ranked = self._ranked()
+        candidates = [e for e in ranked if e.state != 'open']
+        if not candidates:
+            # Every circuit is open: try the one closest to recovery rather than fail
+            return self._call(ranked[0], method, params, force=True)
+
+        if self.hedge and method in self.hedged_methods and len(candidates) > 1:
+            return self._hedged_request(candidates, method, params)
+
+        last_error: Optional[Exception] = None
+        for endpoint in candidates:
+            try:
+                return self._call(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+                logger.debug(f"RPC {method} failed on {endpoint.url}: {e}")
+        raise last_error or CircuitOpenError("No RPC endpoints available")
+
+    def _hedged_request(
+        self,
+        candidates: List[EndpointState],
+        method: RPCEndpoint,
+        params: Any
+    ) -> RPCResponse:
+        primary, backup = candidates[0], candidates[1]
+        delay = primary.p95_latency()
+        delay = max(delay if delay is not None else self.default_hedge_delay, self.min_hedge_delay)
+
+        futures = {self._executor.submit(self._call, primary, method, params): primary}
+        done, _ = wait(futures, timeout=delay)
+        first = next(iter(done), None)
+        if first is not None and first.exception() is None:
+            return first.result()
+
+        self.hedged_requests += 1
+        futures[self._executor.submit(self._call, backup, method, params)] = backup
+        pending = set(futures)
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if futures[future] is backup:
+                        self.hedge_wins += 1
+                    return future.result()
+                last_error = future.exception()
+
+        # Both hedged calls failed; fall back to the remaining endpoints in order
+        for endpoint in candidates[2:]:
+            try:
+                return self._call(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+        raise last_error  # type: ignore[misc]
+
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Get latency, error rate and breaker state per endpoint"""
+        return [endpoint.get_stats() for endpoint in self.endpoints]
+
+    def get_hedge_stats(self) -> Dict[str, int]:
+        """Get how often hedged requests were sent and won"""
+        return {'hedged_requests': self.hedged_requests, 'hedge_wins': self.hedge_wins}
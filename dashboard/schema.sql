@@ -36,6 +36,21 @@ CREATE TABLE IF NOT EXISTS price_history (
     price DECIMAL(18,8) NOT NULL
 );
 
+-- Incremental OHLC rollups per price series (1m/5m/1h), with per-bar mean and M2
+CREATE TABLE IF NOT EXISTS ohlc_bars (
+    series TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    PRIMARY KEY (series, interval, start)
+);
+
 -- Create bot_status table
 CREATE TABLE IF NOT EXISTS bot_status (
     id INTEGER PRIMARY KEY,
@@ -51,23 +66,205 @@ CREATE INDEX IF NOT EXISTS idx_gas_history_timestamp ON gas_history(timestamp);
 CREATE INDEX IF NOT EXISTS idx_price_history_timestamp ON price_history(timestamp);
 CREATE INDEX IF NOT EXISTS idx_price_history_token ON price_history(token_address);
 
--- Create views for common queries
-CREATE VIEW IF NOT EXISTS hourly_profits AS
-SELECT 
-    strftime('%Y-%m-%d %H:00:00', datetime(timestamp, 'unixepoch')) as hour,
-    SUM(profit) as total_profit,
-    COUNT(*) as trade_count,
-    AVG(gas_used) as avg_gas_used
+-- Materialized profit rollups per hour/day, pair and network. The triggers
+-- keep them current inside the same transaction as each trade, so the views
+-- never scan trades; existing trades are backfilled once, recorded in
+-- profit_rollups_backfill. Generated by dashboard/profit_rollups.py
+-- (python -m dashboard.profit_rollups) with network 'base', since this trades
+-- table has no network, success or gas_price column.
+-- BEGIN profit_rollups
+CREATE TABLE IF NOT EXISTS profit_rollups (
+    period TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    pair TEXT NOT NULL,
+    network TEXT NOT NULL,
+    total_profit NUMERIC NOT NULL DEFAULT 0,
+    trade_count INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    gas_used_sum NUMERIC NOT NULL DEFAULT 0,
+    gas_cost_sum NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, bucket, pair, network)
+);
+
+CREATE TABLE IF NOT EXISTS profit_rollups_backfill (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    backfilled_at INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS trades_rollup_insert AFTER INSERT ON trades
+WHEN NEW.timestamp IS NOT NULL
+BEGIN
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'hour', CAST(NEW.timestamp AS INTEGER) / 3600 * 3600,
+        COALESCE(NEW.token_in || '/' || NEW.token_out, ''), COALESCE('base', ''),
+        (COALESCE(NEW.profit, 0)), 1, (1),
+        (COALESCE(NEW.gas_used, 0)), (0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'day', CAST(NEW.timestamp AS INTEGER) / 86400 * 86400,
+        COALESCE(NEW.token_in || '/' || NEW.token_out, ''), COALESCE('base', ''),
+        (COALESCE(NEW.profit, 0)), 1, (1),
+        (COALESCE(NEW.gas_used, 0)), (0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trades_rollup_delete AFTER DELETE ON trades
+WHEN OLD.timestamp IS NOT NULL
+BEGIN
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'hour', CAST(OLD.timestamp AS INTEGER) / 3600 * 3600,
+        COALESCE(OLD.token_in || '/' || OLD.token_out, ''), COALESCE('base', ''),
+        -(COALESCE(OLD.profit, 0)), -1, -(1),
+        -(COALESCE(OLD.gas_used, 0)), -(0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'day', CAST(OLD.timestamp AS INTEGER) / 86400 * 86400,
+        COALESCE(OLD.token_in || '/' || OLD.token_out, ''), COALESCE('base', ''),
+        -(COALESCE(OLD.profit, 0)), -1, -(1),
+        -(COALESCE(OLD.gas_used, 0)), -(0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trades_rollup_update AFTER UPDATE ON trades
+WHEN OLD.timestamp IS NOT NULL AND NEW.timestamp IS NOT NULL
+BEGIN
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'hour', CAST(OLD.timestamp AS INTEGER) / 3600 * 3600,
+        COALESCE(OLD.token_in || '/' || OLD.token_out, ''), COALESCE('base', ''),
+        -(COALESCE(OLD.profit, 0)), -1, -(1),
+        -(COALESCE(OLD.gas_used, 0)), -(0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'day', CAST(OLD.timestamp AS INTEGER) / 86400 * 86400,
+        COALESCE(OLD.token_in || '/' || OLD.token_out, ''), COALESCE('base', ''),
+        -(COALESCE(OLD.profit, 0)), -1, -(1),
+        -(COALESCE(OLD.gas_used, 0)), -(0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'hour', CAST(NEW.timestamp AS INTEGER) / 3600 * 3600,
+        COALESCE(NEW.token_in || '/' || NEW.token_out, ''), COALESCE('base', ''),
+        (COALESCE(NEW.profit, 0)), 1, (1),
+        (COALESCE(NEW.gas_used, 0)), (0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+    INSERT INTO profit_rollups
+        (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+    VALUES (
+        'day', CAST(NEW.timestamp AS INTEGER) / 86400 * 86400,
+        COALESCE(NEW.token_in || '/' || NEW.token_out, ''), COALESCE('base', ''),
+        (COALESCE(NEW.profit, 0)), 1, (1),
+        (COALESCE(NEW.gas_used, 0)), (0)
+    )
+    ON CONFLICT (period, bucket, pair, network) DO UPDATE SET
+        total_profit = total_profit + excluded.total_profit,
+        trade_count = trade_count + excluded.trade_count,
+        success_count = success_count + excluded.success_count,
+        gas_used_sum = gas_used_sum + excluded.gas_used_sum,
+        gas_cost_sum = gas_cost_sum + excluded.gas_cost_sum;
+END;
+
+INSERT OR REPLACE INTO profit_rollups
+    (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+SELECT 'hour', CAST(timestamp AS INTEGER) / 3600 * 3600,
+       COALESCE(trades.token_in || '/' || trades.token_out, ''), COALESCE('base', ''),
+       SUM(COALESCE(trades.profit, 0)), COUNT(*), SUM(1),
+       SUM(COALESCE(trades.gas_used, 0)), SUM(0)
 FROM trades
-GROUP BY hour
-ORDER BY hour DESC;
+WHERE timestamp IS NOT NULL AND NOT EXISTS (SELECT 1 FROM profit_rollups_backfill)
+GROUP BY 2, 3, 4;
 
-CREATE VIEW IF NOT EXISTS daily_profits AS
-SELECT 
-    strftime('%Y-%m-%d', datetime(timestamp, 'unixepoch')) as date,
-    SUM(profit) as total_profit,
-    COUNT(*) as trade_count,
-    AVG(gas_used) as avg_gas_used
+INSERT OR REPLACE INTO profit_rollups
+    (period, bucket, pair, network, total_profit, trade_count, success_count, gas_used_sum, gas_cost_sum)
+SELECT 'day', CAST(timestamp AS INTEGER) / 86400 * 86400,
+       COALESCE(trades.token_in || '/' || trades.token_out, ''), COALESCE('base', ''),
+       SUM(COALESCE(trades.profit, 0)), COUNT(*), SUM(1),
+       SUM(COALESCE(trades.gas_used, 0)), SUM(0)
 FROM trades
-GROUP BY date
-ORDER BY date DESC;
+WHERE timestamp IS NOT NULL AND NOT EXISTS (SELECT 1 FROM profit_rollups_backfill)
+GROUP BY 2, 3, 4;
+
+INSERT OR IGNORE INTO profit_rollups_backfill (id, backfilled_at)
+VALUES (1, CAST(strftime('%s', 'now') AS INTEGER));
+-- END profit_rollups
+
+-- Create views for common queries (read from the rollups, O(buckets))
+DROP VIEW IF EXISTS hourly_profits;
+CREATE VIEW hourly_profits AS
+SELECT 
+    strftime('%Y-%m-%d %H:00:00', bucket, 'unixepoch') as hour,
+    SUM(total_profit) as total_profit,
+    SUM(trade_count) as trade_count,
+    CAST(SUM(gas_used_sum) AS REAL) / SUM(trade_count) as avg_gas_used
+FROM profit_rollups
+WHERE period = 'hour'
+GROUP BY bucket
+HAVING SUM(trade_count) > 0
+ORDER BY bucket DESC;
+
+DROP VIEW IF EXISTS daily_profits;
+CREATE VIEW daily_profits AS
+SELECT 
+    strftime('%Y-%m-%d', bucket, 'unixepoch') as date,
+    SUM(total_profit) as total_profit,
+    SUM(trade_count) as trade_count,
+    CAST(SUM(gas_used_sum) AS REAL) / SUM(trade_count) as avg_gas_used
+FROM profit_rollups
+WHERE period = 'day'
+GROUP BY bucket
+HAVING SUM(trade_count) > 0
+ORDER BY bucket DESC;
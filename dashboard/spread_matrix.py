@@ -0,0 +1,147 @@
+"""Vectorized cross-venue spread screening over a (token, venue) price matrix"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpreadCandidate:
+    """Buy on one venue and sell on another for the same token"""
+    token: str
+    buy_venue: str
+    sell_venue: str
+    buy_price: float
+    sell_price: float
+    spread_percent: float
+
+
+def pairwise_spread_percent(prices: Sequence[float]) -> np.ndarray:
+    """|p_i - p_j| / p_i * 100 for every ordered pair; the diagonal is NaN"""
+    values = np.asarray(prices, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spreads = np.abs(values[:, None] - values[None, :]) / values[:, None] * 100.0
+    np.fill_diagonal(spreads, np.nan)
+    return spreads
+
+
+class SpreadMatrix:
+    """Latest bid/ask per (token, venue) with a vectorized spread screen
+
+    Quotes live in dense token x venue arrays; missing quotes are NaN. The
+    screen computes, for every token at once, the net return of buying at
+    venue i's ask and selling at venue j's bid after both venues' fees,
+    as a token x venue x venue array, and returns only the entries above the
+    threshold. Detailed evaluation then runs on those few candidates
+    instead of every venue pair.
+    """
+
+    def __init__(self, initial_tokens: int = 16, initial_venues: int = 8) -> None:
+        self.tokens: Dict[str, int] = {}
+        self.venues: Dict[str, int] = {}
+        shape = (initial_tokens, initial_venues)
+        self.bid = np.full(shape, np.nan)
+        self.ask = np.full(shape, np.nan)
+        self.fee = np.zeros(shape)
+        self.updated_at = np.zeros(shape)
+
+    def _grow(self, tokens: int, venues: int) -> None:
+        rows, cols = self.bid.shape
+        if tokens <= rows and venues <= cols:
+            return
+        new_rows, new_cols = rows, cols
+        while new_rows < tokens:
+            new_rows *= 2
+        while new_cols < venues:
+            new_cols *= 2
+        shape = (new_rows, new_cols)
+        for name, fill in (('bid', np.nan), ('ask', np.nan), ('fee', 0.0), ('updated_at', 0.0)):
+            grown = np.full(shape, fill)
+            grown[:rows, :cols] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def _index(self, token: str, venue: str) -> Tuple[int, int]:
+        row = self.tokens.setdefault(token, len(self.tokens))
+        col = self.venues.setdefault(venue, len(self.venues))
+        self._grow(len(self.tokens), len(self.venues))
+        return row, col
+
+    def update(
+        self,
+        token: str,
+        venue: str,
+        bid: float,
+        ask: Optional[float] = None,
+        fee: float = 0.0,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Record a quote; venues that only report a mid price pass bid alone
+
+        fee is the venue's fraction taken per side (0.003 for 30 bps).
+        """
+        row, col = self._index(token, venue)
+        self.bid[row, col] = bid
+        self.ask[row, col] = bid if ask is None else ask
+        self.fee[row, col] = fee
+        self.updated_at[row, col] = time.time() if timestamp is None else timestamp
+
+    def update_many(self, quotes: Iterable[Tuple[str, str, float]], fee: float = 0.0) -> None:
+        """Record (token, venue, price) mid quotes"""
+        now = time.time()
+        for token, venue, price in quotes:
+            self.update(token, venue, price, fee=fee, timestamp=now)
+
+    def remove(self, token: str, venue: str) -> None:
+        row, col = self.tokens.get(token), self.venues.get(venue)
+        if row is not None and col is not None:
+            self.bid[row, col] = np.nan
+            self.ask[row, col] = np.nan
+
+    def spreads(self, max_age: Optional[float] = None) -> np.ndarray:
+        """Net spread percent [token, buy_venue, sell_venue]; NaN where not quoted"""
+        rows, cols = len(self.tokens), len(self.venues)
+        bid = self.bid[:rows, :cols]
+        ask = self.ask[:rows, :cols]
+        fee = self.fee[:rows, :cols]
+        if max_age is not None:
+            stale = self.updated_at[:rows, :cols] < time.time() - max_age
+            bid = np.where(stale, np.nan, bid)
+            ask = np.where(stale, np.nan, ask)
+        cost = ask * (1 + fee)
+        proceeds = bid * (1 - fee)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spreads = (proceeds[:, None, :] - cost[:, :, None]) / cost[:, :, None] * 100.0
+        diagonal = np.arange(cols)
+        spreads[:, diagonal, diagonal] = np.nan
+        return spreads
+
+    def screen(self, min_spread_percent: float, max_age: Optional[float] = None) -> List[SpreadCandidate]:
+        """Candidates whose net spread exceeds min_spread_percent, best first"""
+        if not self.tokens or len(self.venues) < 2:
+            return []
+        spreads = self.spreads(max_age)
+        # NaN compares False, so unquoted cells never pass
+        token_idx, buy_idx, sell_idx = np.nonzero(spreads > min_spread_percent)
+        if len(token_idx) == 0:
+            return []
+        values = spreads[token_idx, buy_idx, sell_idx]
+        order = np.argsort(-values, kind='stable')
+        token_idx, buy_idx, sell_idx = token_idx[order], buy_idx[order], sell_idx[order]
+        token_names = list(self.tokens)
+        venue_names = list(self.venues)
+        return [
+            SpreadCandidate(token_names[t], venue_names[b], venue_names[s], buy, sell, spread)
+            for t, b, s, buy, sell, spread in zip(
+                token_idx.tolist(),
+                buy_idx.tolist(),
+                sell_idx.tolist(),
+                self.ask[token_idx, buy_idx].tolist(),
+                self.bid[token_idx, sell_idx].tolist(),
+                values[order].tolist()
+            )
+        ]
@@ -0,0 +1,244 @@
+"""Reorg-aware versioned state cache keyed by block hash"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _hex(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    return str(value).lower()
+
+
+@dataclass(frozen=True)
+class BlockRef:
+    """Number, hash and parent hash identifying one block"""
+    number: int
+    hash: str
+    parent_hash: str
+
+    @classmethod
+    def from_block(cls, block: Any) -> 'BlockRef':
+        """Build from a web3 block or a raw JSON-RPC header"""
+        number = block['number']
+        return cls(
+            number=int(number, 16) if isinstance(number, str) else int(number),
+            hash=_hex(block['hash']),
+            parent_hash=_hex(block['parentHash'])
+        )
+
+
+@dataclass
+class ReorgEvent:
+    """Summary of one detected reorg"""
+    fork_block: int
+    old_head: BlockRef
+    new_head: BlockRef
+    depth: int
+    rolled_back: int
+    full_reset: bool = False
+
+
+class VersionedStateCache:
+    """Key/value cache whose entries are versioned by the block they were read at
+
+    Every write is recorded in an undo log under the head block at the
+    time of the write. `advance` checks each new head's parent hash
+    against the tracked chain; on a mismatch it walks back through
+    `fetch_block` to the last common block, undoes every write made after
+    it, and replays the replaced blocks through `load_updates`. Only the
+    last `max_depth` blocks keep undo logs; a deeper reorg clears the cache.
+    """
+
+    def __init__(
+        self,
+        fetch_block: Callable[[int], Optional[BlockRef]],
+        load_updates: Optional[Callable[[BlockRef], Dict[Hashable, Any]]] = None,
+        max_depth: int = 128
+    ) -> None:
+        self.fetch_block = fetch_block
+        self.load_updates = load_updates
+        self.max_depth = max_depth
+        self.reorgs: List[ReorgEvent] = []
+        self._values: Dict[Hashable, Tuple[Any, BlockRef]] = {}
+        self._blocks: 'OrderedDict[int, BlockRef]' = OrderedDict()
+        self._undo: Dict[int, List[Tuple[Hashable, Any]]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def head(self) -> Optional[BlockRef]:
+        with self._lock:
+            return next(reversed(self._blocks.values()), None)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._values.get(key)
+            return entry[0] if entry is not None else default
+
+    def get_versioned(self, key: Hashable) -> Optional[Tuple[Any, BlockRef]]:
+        """Get a value together with the block it was read at"""
+        with self._lock:
+            return self._values.get(key)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        with self._lock:
+            snapshot = [(key, value) for key, (value, _) in self._values.items()]
+        return iter(snapshot)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def is_canonical(self, block: BlockRef) -> bool:
+        with self._lock:
+            tracked = self._blocks.get(block.number)
+            return tracked is not None and tracked.hash == block.hash
+
+    def set(self, key: Hashable, value: Any, block: Optional[BlockRef] = None) -> bool:
+        """Store a value read at `block` (default: head)
+
+        Values read at a block that is no longer on the tracked chain are
+        rejected so a slow reader cannot write pre-reorg state back.
+        """
+        with self._lock:
+            head = self.head
+            if head is None:
+                return False
+            version = block or head
+            if not self.is_canonical(version):
+                return False
+            self._write(key, value, version, head.number)
+            return True
+
+    def _write(self, key: Hashable, value: Any, version: BlockRef, undo_block: int) -> None:
+        self._undo.setdefault(undo_block, []).append((key, self._values.get(key, _MISSING)))
+        self._values[key] = (value, version)
+
+    def _push(self, block: BlockRef, updates: Optional[Dict[Hashable, Any]]) -> None:
+        self._blocks[block.number] = block
+        for key, value in (updates or {}).items():
+            self._write(key, value, block, block.number)
+        while len(self._blocks) > self.max_depth:
+            number, _ = self._blocks.popitem(last=False)
+            self._undo.pop(number, None)
+
+    def _load(self, block: BlockRef) -> Optional[Dict[Hashable, Any]]:
+        return self.load_updates(block) if self.load_updates else None
+
+    def _rollback_to(self, fork_block: int) -> int:
+        """Undo every write recorded after fork_block, newest first"""
+        rolled_back = 0
+        for number in sorted((n for n in self._undo if n > fork_block), reverse=True):
+            for key, previous in reversed(self._undo.pop(number)):
+                if previous is _MISSING:
+                    self._values.pop(key, None)
+                else:
+                    self._values[key] = previous
+                rolled_back += 1
+        for number in [n for n in self._blocks if n > fork_block]:
+            del self._blocks[number]
+        return rolled_back
+
+    def _find_fork(self, header: BlockRef) -> Optional[int]:
+        """Last block number where the tracked chain and the node agree"""
+        canonical_hash = header.parent_hash
+        number = header.number - 1
+        while number in self._blocks:
+            if self._blocks[number].hash == canonical_hash:
+                return number
+            parent = self.fetch_block(number)
+            if parent is None:
+                return None
+            canonical_hash = parent.parent_hash
+            number -= 1
+        return None
+
+    def advance(self, header: BlockRef, updates: Optional[Dict[Hashable, Any]] = None) -> Optional[ReorgEvent]:
+        """Apply a new head and its updates, filling gaps and handling reorgs
+
+        Returns the last ReorgEvent raised while applying, if any.
+        """
+        with self._lock:
+            head = self.head
+            if head is None:
+                self._push(header, updates)
+                return None
+            if self.is_canonical(header):
+                return None
+            event: Optional[ReorgEvent] = None
+            for number in range(head.number + 1, header.number):
+                block = self.fetch_block(number)
+                if block is None:
+                    break
+                event = self._apply(block, self._load(block)) or event
+            return self._apply(header, updates) or event
+
+    def _apply(self, block: BlockRef, updates: Optional[Dict[Hashable, Any]]) -> Optional[ReorgEvent]:
+        head = self.head
+        event: Optional[ReorgEvent] = None
+        if head is not None and (
+            block.number <= head.number
+            or (block.number == head.number + 1 and block.parent_hash != head.hash)
+        ):
+            event = self._rewind(head, block)
+            # Replay only the blocks replaced between the fork point and this block
+            current = self.head
+            if current is not None:
+                for number in range(current.number + 1, block.number):
+                    replacement = self.fetch_block(number)
+                    if replacement is None:
+                        break
+                    self._push(replacement, self._load(replacement))
+        self._push(block, updates)
+        return event
+
+    def _rewind(self, old_head: BlockRef, header: BlockRef) -> ReorgEvent:
+        fork_block = self._find_fork(header)
+        if fork_block is None:
+            logger.warning(
+                f"Reorg at block {header.number} deeper than {self.max_depth} blocks; clearing state cache"
+            )
+            rolled_back = len(self._values)
+            self._values.clear()
+            self._blocks.clear()
+            self._undo.clear()
+            event = ReorgEvent(
+                fork_block=header.number - 1,
+                old_head=old_head,
+                new_head=header,
+                depth=old_head.number - header.number + 1,
+                rolled_back=rolled_back,
+                full_reset=True
+            )
+        else:
+            rolled_back = self._rollback_to(fork_block)
+            event = ReorgEvent(
+                fork_block=fork_block,
+                old_head=old_head,
+                new_head=header,
+                depth=old_head.number - fork_block,
+                rolled_back=rolled_back
+            )
+            logger.info(
+                f"Reorg detected: fork at {fork_block}, depth {event.depth}, "
+                f"{rolled_back} writes rolled back"
+            )
+        self.reorgs.append(event)
+        return event
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            head = self.head
+            return {
+                'head': head.number if head else None,
+                'entries': len(self._values),
+                'tracked_blocks': len(self._blocks),
+                'reorgs': len(self.reorgs),
+                'max_reorg_depth': max((r.depth for r in self.reorgs), default=0)
+            }
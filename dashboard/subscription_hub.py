@@ -0,0 +1,436 @@
+"""Per-chain WebSocket hub multiplexing newHeads, logs and pending transaction subscriptions"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+
+logger = logging.getLogger(__name__)
+
+HEADS = 'newHeads'
+LOGS = 'logs'
+PENDING = 'newPendingTransactions'
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(v).lower() for v in value]
+    return [str(value).lower()]
+
+
+class Subscription:
+    """One in-process subscriber fed through a bounded queue
+
+    When the queue is full the oldest event is dropped, so a slow consumer
+    sees the most recent events and `dropped` records how many it missed.
+    """
+
+    def __init__(
+        self,
+        hub: 'SubscriptionHub',
+        kind: str,
+        maxsize: int,
+        address: Any = None,
+        topics: Optional[List[Any]] = None
+    ) -> None:
+        self.hub = hub
+        self.kind = kind
+        self.addresses: Set[str] = set(_as_list(address))
+        self.topics: List[List[str]] = [_as_list(t) for t in (topics or [])]
+        self.queue: 'queue.Queue[Dict[str, Any]]' = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, log: Dict[str, Any]) -> bool:
+        """Check a log against this subscriber's own address and topic filter"""
+        if self.addresses and str(log.get('address', '')).lower() not in self.addresses:
+            return False
+        log_topics = [str(t).lower() for t in log.get('topics', [])]
+        for position, wanted in enumerate(self.topics):
+            if wanted and (position >= len(log_topics) or log_topics[position] not in wanted):
+                return False
+        return True
+
+    def put(self, event: Any) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Wait for the next event; None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self) -> List[Any]:
+        """Take every queued event without blocking"""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class SubscriptionHub:
+    """Single WebSocket connection per chain shared by every subscriber
+
+    Each subscription kind is requested from the node once: all log
+    subscribers share one `logs` subscription whose address and topic0
+    filter is the union of theirs, and events are matched back to each
+    subscriber locally. After a dropped connection the hub reconnects with
+    exponential backoff, resubscribes, and replays the heads and logs of
+    any blocks missed while disconnected (up to `max_backfill_blocks`).
+    Heads are deduplicated by block hash, so reorged heads at the same or
+    a lower height still reach subscribers. Pending transactions are not
+    replayed.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        queue_size: int = 1024,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        request_timeout: float = 10.0,
+        max_backfill_blocks: int = 256,
+        connect_fn: Callable[..., Any] = connect
+    ) -> None:
+        self.ws_url = ws_url
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.request_timeout = request_timeout
+        self.max_backfill_blocks = max_backfill_blocks
+        self.connect_fn = connect_fn
+        self.subscribers: Dict[str, List[Subscription]] = {HEADS: [], LOGS: [], PENDING: []}
+        self.last_head: Optional[int] = None
+        self.last_log_block: Optional[int] = None
+        self.reconnects = 0
+        self.backfilled_blocks = 0
+        self._remote: Dict[str, str] = {}
+        self._remote_kind: Dict[str, str] = {}
+        self._logs_filter: Optional[Dict[str, Any]] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._recent_heads: Deque[Any] = deque(maxlen=1024)
+        self._recent_head_hashes: Set[Any] = set()
+        self._recent_logs: Deque[Tuple[Any, Any]] = deque(maxlen=4096)
+        self._recent_log_keys: Set[Tuple[Any, Any]] = set()
+        self._buffer: Optional[List[Tuple[str, Any]]] = None
+        self._ws: Any = None
+        self._send_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- subscriber API --
+
+    def subscribe_heads(self, maxsize: Optional[int] = None) -> Subscription:
+        return self._add(Subscription(self, HEADS, maxsize or self.queue_size))
+
+    def subscribe_pending(self, maxsize: Optional[int] = None) -> Subscription:
+        return self._add(Subscription(self, PENDING, maxsize or self.queue_size))
+
+    def subscribe_logs(
+        self,
+        address: Any = None,
+        topics: Optional[List[Any]] = None,
+        maxsize: Optional[int] = None
+    ) -> Subscription:
+        return self._add(Subscription(self, LOGS, maxsize or self.queue_size, address, topics))
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self.subscribers[subscription.kind]:
+                self.subscribers[subscription.kind].remove(subscription)
+        if self._connected.is_set() and subscription.kind == LOGS:
+            self._sync_logs_subscription()
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self.subscribers[subscription.kind].append(subscription)
+        if self._connected.is_set():
+            try:
+                if subscription.kind == LOGS:
+                    self._sync_logs_subscription()
+                elif subscription.kind not in self._remote:
+                    self._remote_subscribe(subscription.kind)
+            except Exception as e:
+                # The reconnect path resubscribes everything
+                logger.warning(f"Deferred {subscription.kind} subscription: {e}")
+        return subscription
+
+    def merged_logs_filter(self) -> Optional[Dict[str, Any]]:
+        """Union of every log subscriber's addresses and topic0 values
+
+        A subscriber without an address (or topic0) widens the node-side
+        filter to all addresses (or all events); the local match narrows it
+        again per subscriber.
+        """
+        with self._lock:
+            subs = list(self.subscribers[LOGS])
+        if not subs:
+            return None
+        log_filter: Dict[str, Any] = {}
+        if all(s.addresses for s in subs):
+            log_filter['address'] = sorted(set().union(*(s.addresses for s in subs)))
+        if all(s.topics and s.topics[0] for s in subs):
+            log_filter['topics'] = [sorted(set().union(*(s.topics[0] for s in subs)))]
+        return log_filter
+
+    # -- lifecycle --
+
+    def start(self) -> 'SubscriptionHub':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='ws-hub', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._connected.wait(timeout)
+
+    def _run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                self._ws = self.connect_fn(self.ws_url)
+            except Exception as e:
+                logger.warning(f"WebSocket connect to {self.ws_url} failed: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            delay = self.reconnect_delay
+            reader = threading.Thread(target=self._read_loop, args=(self._ws,), name='ws-hub-reader', daemon=True)
+            reader.start()
+            try:
+                self._on_connect()
+            except Exception as e:
+                logger.warning(f"WebSocket resubscribe failed: {e}")
+                self._ws.close()
+            reader.join()
+            self._on_disconnect()
+            if not self._stop.is_set():
+                self.reconnects += 1
+                logger.info(f"WebSocket to {self.ws_url} lost, reconnecting")
+                self._stop.wait(delay)
+
+    def _on_connect(self) -> None:
+        with self._lock:
+            resume_head = self.last_head
+            resume_logs = self.last_log_block
+            # Hold live heads and logs until missed blocks have been replayed
+            self._buffer = [] if resume_head is not None else None
+        try:
+            self._remote_subscribe(HEADS)
+            if self.subscribers[PENDING]:
+                self._remote_subscribe(PENDING)
+            self._sync_logs_subscription()
+            self._connected.set()
+            if resume_head is not None:
+                self._backfill(resume_head, resume_logs)
+        finally:
+            with self._lock:
+                buffered, self._buffer = self._buffer or [], None
+            for kind, event in buffered:
+                self._dispatch(kind, event)
+
+    def _on_disconnect(self) -> None:
+        self._connected.clear()
+        with self._lock:
+            self._remote.clear()
+            self._remote_kind.clear()
+            self._logs_filter = None
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError("WebSocket closed"))
+
+    # -- JSON-RPC over the socket --
+
+    def request(self, method: str, params: List[Any]) -> Any:
+        """Send a JSON-RPC request over the hub's socket and wait for the result"""
+        request_id = next(self._ids)
+        future: Future = Future()
+        with self._lock:
+            ws = self._ws
+            self._pending[request_id] = future
+        if ws is None:
+            raise ConnectionError("WebSocket not connected")
+        with self._send_lock:
+            ws.send(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}))
+        response = future.result(timeout=self.request_timeout)
+        if 'error' in response:
+            raise ValueError(f"{method} failed: {response['error']}")
+        return response.get('result')
+
+    def _remote_subscribe(self, kind: str, params: Optional[Dict[str, Any]] = None) -> str:
+        args: List[Any] = [kind] if params is None else [kind, params]
+        subscription_id = self.request('eth_subscribe', args)
+        with self._lock:
+            self._remote[kind] = subscription_id
+            self._remote_kind[subscription_id] = kind
+        return subscription_id
+
+    def _sync_logs_subscription(self) -> None:
+        """Replace the node-side logs subscription when the merged filter changes"""
+        merged = self.merged_logs_filter()
+        with self._lock:
+            if merged == self._logs_filter and (merged is None or LOGS in self._remote):
+                return
+            old = self._remote.pop(LOGS, None)
+        # Subscribe the new filter before dropping the old one; overlap is deduped
+        if merged is not None:
+            self._remote_subscribe(LOGS, merged)
+        with self._lock:
+            self._logs_filter = merged
+        if old is not None:
+            try:
+                self.request('eth_unsubscribe', [old])
+            finally:
+                with self._lock:
+                    self._remote_kind.pop(old, None)
+
+    def _read_loop(self, ws: Any) -> None:
+        try:
+            for raw in ws:
+                message = json.loads(raw)
+                if 'id' in message and message.get('method') is None:
+                    with self._lock:
+                        future = self._pending.pop(message['id'], None)
+                    if future is not None:
+                        future.set_result(message)
+                    continue
+                params = message.get('params') or {}
+                with self._lock:
+                    kind = self._remote_kind.get(params.get('subscription'))
+                    if kind is not None and self._buffer is not None and kind != PENDING:
+                        self._buffer.append((kind, params.get('result')))
+                        continue
+                if kind is not None:
+                    self._dispatch(kind, params.get('result'))
+        except ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.error(f"WebSocket reader error: {e}")
+            ws.close()
+
+    # -- fan-out --
+
+    def _dispatch(self, kind: str, event: Any) -> None:
+        if kind == HEADS:
+            number = int(event['number'], 16)
+            block_hash = event.get('hash')
+            with self._lock:
+                # Replays overlap live heads; a new hash at an old height is a reorg
+                if block_hash in self._recent_head_hashes:
+                    return
+                if len(self._recent_heads) == self._recent_heads.maxlen:
+                    self._recent_head_hashes.discard(self._recent_heads[0])
+                self._recent_heads.append(block_hash)
+                self._recent_head_hashes.add(block_hash)
+                self.last_head = number
+        elif kind == LOGS:
+            key = (event.get('blockHash'), event.get('logIndex'))
+            with self._lock:
+                if key in self._recent_log_keys and not event.get('removed'):
+                    return
+                if len(self._recent_logs) == self._recent_logs.maxlen:
+                    self._recent_log_keys.discard(self._recent_logs[0])
+                self._recent_logs.append(key)
+                self._recent_log_keys.add(key)
+                block = int(event['blockNumber'], 16) if event.get('blockNumber') else None
+                if block is not None and (self.last_log_block is None or block > self.last_log_block):
+                    self.last_log_block = block
+        with self._lock:
+            subscribers = list(self.subscribers[kind])
+        for subscription in subscribers:
+            if kind != LOGS or subscription.matches(event):
+                subscription.put(event)
+
+    def _backfill(self, last_head: int, last_log_block: Optional[int]) -> None:
+        """Replay heads and logs for blocks produced while disconnected"""
+        head = int(self.request('eth_blockNumber', []), 16)
+        if head <= last_head:
+            return
+        start = max(last_head + 1, head - self.max_backfill_blocks + 1)
+        if start > last_head + 1:
+            logger.warning(f"Gap of {head - last_head} blocks exceeds backfill limit; replaying from {start}")
+        for number in range(start, head + 1):
+            block = self.request('eth_getBlockByNumber', [hex(number), False])
+            if block:
+                self._dispatch(HEADS, block)
+        self.backfilled_blocks += head - start + 1
+
+        log_filter = self.merged_logs_filter()
+        if log_filter is not None:
+            from_block = max(start, (last_log_block or last_head) + 1)
+            log_filter = dict(log_filter, fromBlock=hex(from_block), toBlock=hex(head))
+            for log in self.request('eth_getLogs', [log_filter]) or []:
+                self._dispatch(LOGS, log)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection state, subscriber counts and per-subscriber drops"""
+        with self._lock:
+            return {
+                'connected': self._connected.is_set(),
+                'last_head': self.last_head,
+                'reconnects': self.reconnects,
+                'backfilled_blocks': self.backfilled_blocks,
+                'remote_subscriptions': dict(self._remote),
+                'subscribers': {kind: len(subs) for kind, subs in self.subscribers.items()},
+                'dropped': sum(s.dropped for subs in self.subscribers.values() for s in subs)
+            }
+
+
+_hubs: Dict[str, SubscriptionHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def get_subscription_hub(chain: str = 'base', ws_url: Optional[str] = None) -> Optional[SubscriptionHub]:
+    """Get or start the shared hub for a chain; None when no WebSocket URL is configured
+
+    The URL defaults to the <CHAIN>_WS_URL environment variable.
+    """
+    key = chain.strip().lower().replace(' ', '_').replace('-', '_')
+    with _hubs_lock:
+        hub = _hubs.get(key)
+        if hub is None:
+            ws_url = ws_url or os.getenv(f'{key.upper()}_WS_URL', '')
+            if not ws_url:
+                return None
+            hub = SubscriptionHub(ws_url).start()
+            _hubs[key] = hub
+        return hub
@@ -0,0 +1,106 @@
+"""
+Tests for the JSON-RPC batching transport
+
+@CONTEXT: Test suite for BatchingHTTPProvider against a local JSON-RPC server
+          that accepts batch arrays and counts HTTP posts
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dashboard.batch_provider import BatchingHTTPProvider
+
+
+class BatchRPCServer:
+    """Local server echoing params[0] as the result; 'fail' returns an RPC error"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.posts = 0
+        self.batch_sizes = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                server.posts += 1
+                time.sleep(server.delay)
+                requests = body if isinstance(body, list) else [body]
+                server.batch_sizes.append(len(requests))
+                responses = [server.answer(request) for request in reversed(requests)]
+                payload = json.dumps(responses if isinstance(body, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def answer(request):
+        if request['params'] and request['params'][0] == 'fail':
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32000, 'message': 'boom'}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': request['params'][0]}
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestBatchingHTTPProvider(unittest.TestCase):
+    """Test cases for BatchingHTTPProvider class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.server = BatchRPCServer(delay=0.01)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.server.stop()
+
+    def test_concurrent_requests_share_batches(self):
+        """Test concurrent calls are batched and each gets its own response"""
+        provider = BatchingHTTPProvider(self.server.url, max_batch_size=16, linger=0.01)
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(
+                lambda i: provider.make_request('eth_echo', [hex(i)])['result'], range(64)
+            ))
+
+        self.assertEqual(results, [hex(i) for i in range(64)])
+        self.assertLess(self.server.posts, 64)
+        self.assertLessEqual(max(self.server.batch_sizes), 16)
+        self.assertEqual(provider.get_batch_stats()['requests'], 64)
+
+    def test_error_is_scoped_to_its_request(self):
+        """Test an RPC error response only reaches the request that caused it"""
+        provider = BatchingHTTPProvider(self.server.url, linger=0.05)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(provider.make_request, 'eth_echo', [arg]) for arg in ('a', 'fail', 'b')]
+            responses = [f.result() for f in futures]
+
+        self.assertEqual(responses[0]['result'], 'a')
+        self.assertEqual(responses[1]['error']['message'], 'boom')
+        self.assertEqual(responses[2]['result'], 'b')
+
+    def test_single_request_is_not_wrapped(self):
+        """Test a lone call is posted as a plain request object"""
+        provider = BatchingHTTPProvider(self.server.url, linger=0.0)
+        self.assertEqual(provider.make_request('eth_echo', ['x'])['result'], 'x')
+        self.assertEqual(self.server.batch_sizes, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
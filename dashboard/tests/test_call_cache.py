@@ -0,0 +1,107 @@
+"""
+Tests for block-scoped eth_call memoization
+
+@CONTEXT: Test suite for BlockCallCache and its Web3 middleware against an
+          in-process provider that counts upstream requests
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from web3 import Web3
+from web3.providers.base import BaseProvider
+from dashboard.call_cache import BlockCallCache, BlockCallCacheMiddleware
+
+POOL = Web3.to_checksum_address('0x00000000000000000000000000000000000000a1')
+SLOT0 = '0x3850c7bd'
+
+
+class CountingProvider(BaseProvider):
+    """Answers eth_blockNumber, eth_gasPrice and eth_call, counting each"""
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.head = 100
+        self.delay = delay
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def make_request(self, method, params):
+        with self._lock:
+            self.counts[method] = self.counts.get(method, 0) + 1
+        if method == 'eth_blockNumber':
+            return {'jsonrpc': '2.0', 'id': 1, 'result': hex(self.head)}
+        if method == 'eth_gasPrice':
+            return {'jsonrpc': '2.0', 'id': 1, 'result': hex(self.head * 10)}
+        time.sleep(self.delay)
+        return {'jsonrpc': '2.0', 'id': 1, 'result': '0x' + f'{self.head:064x}'}
+
+
+class TestBlockCallCache(unittest.TestCase):
+    """Test cases for BlockCallCache class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.provider = CountingProvider()
+        self.cache = BlockCallCache(head_ttl=60)
+        self.w3 = Web3(self.provider)
+        self.w3.middleware_onion.add(BlockCallCacheMiddleware.build(self.cache), 'block_call_cache')
+
+    def _slot0(self):
+        return self.w3.eth.call({'to': POOL, 'data': SLOT0})
+
+    def test_duplicate_calls_within_block_hit_cache(self):
+        """Test repeated calls in one block reach the provider once"""
+        results = [self._slot0() for _ in range(5)]
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(self.provider.counts['eth_call'], 1)
+        self.assertEqual(self.w3.eth.gas_price, self.w3.eth.gas_price)
+        self.assertEqual(self.provider.counts['eth_gasPrice'], 1)
+        self.assertAlmostEqual(self.cache.get_metrics()['dedupe_ratio'], 5 / 7)
+
+    def test_new_head_invalidates(self):
+        """Test a head advance drops memoized results"""
+        self._slot0()
+        self.provider.head = 101
+        self.assertEqual(self.w3.eth.block_number, 101)
+        self.assertEqual(int.from_bytes(self._slot0(), 'big'), 101)
+        self.assertEqual(self.provider.counts['eth_call'], 2)
+        self.assertEqual(self.cache.get_metrics()['invalidations'], 1)
+
+        # Explicit pending reads are never memoized
+        self.w3.eth.call({'to': POOL, 'data': SLOT0}, 'pending')
+        self.w3.eth.call({'to': POOL, 'data': SLOT0}, 'pending')
+        self.assertEqual(self.provider.counts['eth_call'], 4)
+
+    def test_latest_is_pinned_to_cached_head(self):
+        """Test 'latest' calls are forwarded for the head block the result is cached under"""
+        forwarded = []
+        make_request = self.provider.make_request
+
+        def record(method, params):
+            if method == 'eth_call':
+                forwarded.append(params[1])
+            return make_request(method, params)
+
+        self.provider.make_request = record
+        self.assertEqual(self.w3.eth.block_number, 100)
+        self.provider.head = 101  # node moves on before the cache sees the new head
+        self._slot0()
+        self.assertEqual(forwarded, [hex(100)])
+
+    def test_coalesces_in_flight_calls(self):
+        """Test concurrent identical calls share one upstream request"""
+        self.provider.delay = 0.1
+        self.w3.eth.block_number
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: self._slot0(), range(8)))
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(self.provider.counts['eth_call'], 1)
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics['coalesced'] + metrics['hits'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
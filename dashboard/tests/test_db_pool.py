@@ -0,0 +1,167 @@
+"""
+Tests for the pooled SQLite access layer
+
+@CONTEXT: Test suite for DatabasePool WAL setup, per-thread read-only
+          connections and the single leased writer
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import gc
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from dashboard.db_pool import DatabasePool, get_database_pool
+
+
+class TestDatabasePool(unittest.TestCase):
+    """Test cases for DatabasePool class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.pool = DatabasePool(self.db_path)
+        with self.pool.write() as conn:
+            conn.execute('CREATE TABLE trades (id INTEGER PRIMARY KEY, profit REAL)')
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.pool.close()
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def test_pragmas(self):
+        """Test WAL journaling and the tuned pragmas are applied"""
+        with self.pool.write() as writer:
+            self.assertEqual(writer.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(writer.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+            self.assertEqual(writer.execute('PRAGMA cache_size').fetchone()[0], -65536)
+        reader = self.pool.reader()
+        self.assertEqual(reader.execute('PRAGMA query_only').fetchone()[0], 1)
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute('INSERT INTO trades (profit) VALUES (1)')
+
+    def test_reader_per_thread_survives_close(self):
+        """Test each thread keeps one reader and close() does not drop it"""
+        reader = self.pool.reader()
+        reader.close()
+        self.assertIs(self.pool.reader(), reader)
+
+        other = []
+        seen = threading.Event()
+        release = threading.Event()
+
+        def read():
+            other.append(self.pool.reader())
+            seen.set()
+            release.wait()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        seen.wait()
+        self.assertIsNot(other[0], reader)
+        self.assertEqual(self.pool.get_stats()['readers'], 2)
+        release.set()
+        thread.join()
+
+    def test_readers_closed_when_threads_exit(self):
+        """Test short-lived threads do not leave their readers open"""
+        def read():
+            self.pool.reader().execute('SELECT COUNT(*) FROM trades').fetchone()
+
+        for _ in range(50):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        gc.collect()
+        self.assertEqual(self.pool.get_stats()['readers_opened'], 50)
+        self.assertEqual(self.pool.get_stats()['readers'], 0)
+
+    def test_open_read_does_not_stall_writer(self):
+        """Test a reader mid-query neither blocks commits nor sees them early"""
+        with self.pool.write() as writer:
+            writer.executemany('INSERT INTO trades (profit) VALUES (?)', [(i,) for i in range(100)])
+
+        reader = self.pool.reader()
+        cursor = reader.execute('SELECT profit FROM trades')
+        cursor.fetchone()  # read transaction now open on the old snapshot
+
+        start = time.perf_counter()
+        with self.pool.write() as writer:
+            writer.execute('INSERT INTO trades (profit) VALUES (-1)')
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        self.assertEqual(len(cursor.fetchall()), 99)
+        self.assertEqual(reader.execute('SELECT COUNT(*) FROM trades').fetchone()[0], 101)
+
+    def test_writer_is_leased_exclusively(self):
+        """Test threads take turns on the single writer and failed blocks are rolled back"""
+        def write(worker):
+            for i in range(50):
+                with self.pool.write() as conn:
+                    conn.execute('INSERT INTO trades (profit) VALUES (?)', (worker * 100 + i,))
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.write() as conn:
+                conn.execute('INSERT INTO trades (profit) VALUES (999)')
+                conn.execute('INSERT INTO missing_table VALUES (1)')
+
+        reader = self.pool.reader()
+        self.assertEqual(reader.execute('SELECT COUNT(*) FROM trades').fetchone()[0], 200)
+        self.assertEqual(self.pool.get_stats()['writer_leases'], 202)
+
+    def test_failed_write_in_thread_releases_lease(self):
+        """Test an exception inside a lease on another thread leaves the writer free"""
+        def fail():
+            try:
+                with self.pool.write() as conn:
+                    conn.execute('INSERT INTO trades (id, profit) VALUES (1, 1)')
+                    conn.execute('INSERT INTO trades (id, profit) VALUES (1, 2)')
+            except sqlite3.IntegrityError:
+                pass
+
+        thread = threading.Thread(target=fail)
+        thread.start()
+        thread.join()
+        self.assertTrue(self.pool._writer_lock.acquire(timeout=1))
+        self.pool._writer_lock.release()
+        self.assertTrue(self.pool.close(timeout=1))
+
+    def test_close_does_not_wait_forever_on_stuck_lease(self):
+        """Test close() with a timeout gives up on a writer leased by a stuck thread"""
+        leased = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with self.pool.write():
+                leased.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        leased.wait()
+        try:
+            self.assertFalse(self.pool.close(timeout=0.1))
+        finally:
+            release.set()
+            thread.join()
+
+    def test_shared_pool_per_file(self):
+        """Test the registry hands out one pool per absolute path"""
+        relative = os.path.relpath(self.db_path)
+        self.assertIs(get_database_pool(relative), get_database_pool(self.db_path))
+        get_database_pool(self.db_path).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
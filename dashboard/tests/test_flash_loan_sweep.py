@@ -0,0 +1,66 @@
+"""
+Tests for the vectorized flash loan size sweep
+
+@CONTEXT: Test suite for sweep_flash_loan_sizes and
+          AdvancedTradingStrategy.sweep_flash_loan_opportunity against a
+          scalar evaluation of the same two-pool round trip
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import unittest
+import numpy as np
+from dashboard.advanced_trading import AdvancedTradingStrategy, sweep_flash_loan_sizes
+
+# WETH -> USDC -> WETH through pools ~2% apart, 1000 WETH deep
+BUY_RESERVES = (1000.0, 2_000_000.0)
+SELL_RESERVES = (1_960_000.0, 1000.0)
+
+
+def scalar_profit(size, fee_rate=0.0009, gas_cost=0.0, fee_bps=30):
+    bought = size * (1 - fee_bps / 10000) * BUY_RESERVES[1] / (BUY_RESERVES[0] + size * (1 - fee_bps / 10000))
+    out = bought * (1 - fee_bps / 10000) * SELL_RESERVES[1] / (SELL_RESERVES[0] + bought * (1 - fee_bps / 10000))
+    return out - size * (1 + fee_rate) - gas_cost
+
+
+class TestFlashLoanSweep(unittest.TestCase):
+    """Test cases for the flash loan size sweep"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.sizes = np.linspace(0.001, 5.0, 1000)
+
+    def test_curve_matches_scalar_evaluation(self):
+        """Test every point on the curve equals the scalar round trip"""
+        sweep = sweep_flash_loan_sizes(self.sizes, BUY_RESERVES, SELL_RESERVES, gas_cost=0.0002)
+        expected = [scalar_profit(size, gas_cost=0.0002) for size in self.sizes]
+
+        np.testing.assert_allclose(sweep.profits, expected, rtol=1e-9, atol=1e-12)
+        self.assertEqual(sweep.best_index, int(np.argmax(expected)))
+        self.assertGreater(sweep.best_profit, 0)
+
+    def test_profit_peaks_at_interior_size(self):
+        """Test slippage makes the best size finite and gas shifts the curve down"""
+        sweep = sweep_flash_loan_sizes(self.sizes, BUY_RESERVES, SELL_RESERVES)
+        with_gas = sweep_flash_loan_sizes(self.sizes, BUY_RESERVES, SELL_RESERVES, gas_cost=0.001)
+
+        self.assertGreater(sweep.best_index, 0)
+        self.assertLess(sweep.best_index, len(self.sizes) - 1)
+        np.testing.assert_allclose(sweep.profits - with_gas.profits, 0.001)
+        self.assertTrue(np.all(np.diff(sweep.price_impacts) > 0))
+
+    def test_strategy_reports_curve_and_argmax(self):
+        """Test the strategy method returns the best size with the full curve"""
+        strategy = AdvancedTradingStrategy()
+        opportunity = strategy.sweep_flash_loan_opportunity(
+            'WETH', 'USDC', self.sizes, BUY_RESERVES, SELL_RESERVES
+        )
+
+        best = opportunity['best_index']
+        self.assertEqual(opportunity['flash_loan_amount'], self.sizes[best])
+        self.assertEqual(opportunity['expected_profit'], opportunity['profit_curve']['profits'][best])
+        self.assertEqual(len(opportunity['profit_curve']['sizes']), 1000)
+        self.assertTrue(opportunity['profitable'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests for the live data provider
+
+@CONTEXT: Test suite for LiveDataProvider quoting
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import unittest
+from unittest.mock import Mock
+from dashboard.data_providers.live_provider import LiveDataProvider
+from dashboard.token_registry import TokenRegistry
+
+WETH = '0x4200000000000000000000000000000000000006'
+USDC = '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913'
+QUOTER = '0x3d4e44Eb1374240CE5F1B871ab261CD16335B76a'
+
+CONFIG = {
+    'exchanges': {
+        'uniswap_v3': {
+            'quoter': QUOTER,
+            'fee_tiers': [100, 500, 3000, 10000]
+        }
+    },
+    'pairs': {
+        'WETH/USDC': {
+            'base_token': WETH,
+            'quote_token': USDC,
+            'max_slippage': 1.0,
+            'is_active': True
+        }
+    }
+}
+
+TIER_QUOTES = {100: 10, 500: 30, 3000: 20}
+
+
+class TestLiveDataProvider(unittest.TestCase):
+    """Test cases for LiveDataProvider class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.web3 = Mock()
+        self.quoted_tiers = []
+
+        def quote(params):
+            fee = params['fee']
+            self.quoted_tiers.append(fee)
+            call = Mock()
+            if fee in TIER_QUOTES:
+                call.call.return_value = (TIER_QUOTES[fee], 0, 0, 0)
+            else:
+                call.call.side_effect = Exception('no pool')
+            return call
+
+        quoter = self.web3.eth.contract.return_value
+        quoter.functions.quoteExactInputSingle.side_effect = quote
+        self.provider = LiveDataProvider(self.web3, CONFIG, token_registry=TokenRegistry(cache_path=None))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.provider.executor.shutdown()
+
+    def test_full_scan_picks_best_tier(self):
+        """Test the first quote scans all tiers and keeps the best"""
+        self.assertEqual(self.provider.get_v3_quote(WETH, USDC, 1), 30)
+        self.assertCountEqual(self.quoted_tiers, [100, 500, 3000, 10000])
+        self.assertEqual(self.provider.best_fee_tiers[f"{WETH}-{USDC}"], 500)
+
+    def test_steady_state_quotes_best_tier_only(self):
+        """Test refreshes reuse the remembered tier until a rescan is due"""
+        self.provider.get_v3_quote(WETH, USDC, 1)
+        self.quoted_tiers.clear()
+        self.assertEqual(self.provider.get_v3_quote(WETH, USDC, 1), 30)
+        self.assertEqual(self.quoted_tiers, [500])
+
+        self.provider.fee_tier_rescan_interval = 0
+        self.quoted_tiers.clear()
+        self.provider.get_v3_quote(WETH, USDC, 1)
+        self.assertEqual(len(self.quoted_tiers), 4)
+
+    def test_refresh_latency_exposed(self):
+        """Test per-pair refresh latency is recorded"""
+        self.provider.get_v3_quote(WETH, USDC, 1)
+        latency = self.provider.get_refresh_latency()
+        self.assertIn(f"{WETH}-{USDC}", latency)
+        self.assertGreaterEqual(latency[f"{WETH}-{USDC}"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+"""
+Tests for the pending swap decoder
+
+@CONTEXT: Test suite for router calldata decoding (Uniswap V2/V3, Aerodrome,
+          multicall) and PendingSwapStream dedupe, batching and publishing
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+from eth_abi import encode
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from dashboard.advanced_trading import AdvancedTradingStrategy
+from dashboard.mempool_decoder import PendingSwapStream, decode_swap_calldata
+
+WETH = '0x4200000000000000000000000000000000000006'
+USDC = '0x833589fcd6edb6e08f4c7c32d4f71b54bda02913'
+DAI = '0x50c5725949a6f0c72e6c4a641f24049a917db0cb'
+RECIPIENT = '0x1111111111111111111111111111111111111111'
+ROUTER = '0x2626664c2603336e57b271c5c0b26f421741e481'
+
+
+def calldata(signature, types, args):
+    return Web3.keccak(text=signature)[:4] + encode(types, args)
+
+
+def v2_swap(amount_in=10**18, amount_out_min=2000 * 10**6):
+    return calldata(
+        'swapExactTokensForTokens(uint256,uint256,address[],address,uint256)',
+        ['uint256', 'uint256', 'address[]', 'address', 'uint256'],
+        [amount_in, amount_out_min, [WETH, USDC], RECIPIENT, 1700000000]
+    )
+
+
+def raw_tx(tx_hash, data, to=ROUTER, value=0, gas_price=10**9):
+    return {
+        'hash': tx_hash, 'from': RECIPIENT, 'to': to, 'input': '0x' + data.hex(),
+        'value': hex(value), 'gasPrice': hex(gas_price), 'nonce': '0x1'
+    }
+
+
+class FakeProvider:
+    """Provider answering eth_getTransactionByHash batches from a dict"""
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.batches = []
+
+    def make_batch_request(self, requests):
+        self.batches.append(len(requests))
+        return [{'id': i, 'result': self.transactions.get(params[0])} for i, (_, params) in enumerate(requests)]
+
+
+class TestSwapCalldata(unittest.TestCase):
+    """Test cases for decode_swap_calldata"""
+
+    def test_v2_exact_input(self):
+        """Test V2 path, amounts and recipient are decoded"""
+        swap, = decode_swap_calldata(v2_swap())
+        self.assertEqual(swap['protocol'], 'uniswap_v2')
+        self.assertEqual(swap['tokens'], [WETH, USDC])
+        self.assertEqual((swap['amount_in'], swap['amount_out']), (10**18, 2000 * 10**6))
+        self.assertTrue(swap['exact_input'])
+        self.assertEqual(swap['recipient'], RECIPIENT)
+
+    def test_v2_eth_input_uses_value(self):
+        """Test ETH-in swaps take amount_in from the transaction value"""
+        data = calldata(
+            'swapExactETHForTokens(uint256,address[],address,uint256)',
+            ['uint256', 'address[]', 'address', 'uint256'],
+            [5, [WETH, DAI], RECIPIENT, 1]
+        )
+        swap, = decode_swap_calldata(data, value=3 * 10**17)
+        self.assertEqual(swap['amount_in'], 3 * 10**17)
+        self.assertEqual(swap['tokens'], [WETH, DAI])
+
+    def test_v3_packed_path_and_exact_output(self):
+        """Test V3 multi-hop paths decode with fees, reversed for exact output"""
+        path = bytes.fromhex(WETH[2:]) + (500).to_bytes(3, 'big') + bytes.fromhex(USDC[2:]) \
+            + (100).to_bytes(3, 'big') + bytes.fromhex(DAI[2:])
+        exact_in = calldata(
+            'exactInput((bytes,address,uint256,uint256))',
+            ['(bytes,address,uint256,uint256)'],
+            [(path, RECIPIENT, 10**18, 1)]
+        )
+        exact_out = calldata(
+            'exactOutput((bytes,address,uint256,uint256))',
+            ['(bytes,address,uint256,uint256)'],
+            [(path, RECIPIENT, 7, 10**18)]
+        )
+
+        forward, = decode_swap_calldata(exact_in)
+        self.assertEqual(forward['tokens'], [WETH, USDC, DAI])
+        self.assertEqual(forward['fees'], [500, 100])
+
+        backward, = decode_swap_calldata(exact_out)
+        self.assertEqual(backward['tokens'], [DAI, USDC, WETH])
+        self.assertEqual(backward['fees'], [100, 500])
+        self.assertFalse(backward['exact_input'])
+        self.assertEqual((backward['amount_in'], backward['amount_out']), (10**18, 7))
+
+    def test_aerodrome_routes_and_multicall(self):
+        """Test Aerodrome routes and swaps wrapped in a router multicall"""
+        aero = calldata(
+            'swapExactTokensForTokens(uint256,uint256,(address,address,bool,address)[],address,uint256)',
+            ['uint256', 'uint256', '(address,address,bool,address)[]', 'address', 'uint256'],
+            [100, 90, [(WETH, USDC, False, RECIPIENT), (USDC, DAI, True, RECIPIENT)], RECIPIENT, 1]
+        )
+        single = calldata(
+            'exactInputSingle((address,address,uint24,address,uint256,uint256,uint160))',
+            ['(address,address,uint24,address,uint256,uint256,uint160)'],
+            [(USDC, WETH, 3000, RECIPIENT, 50, 1, 0)]
+        )
+        wrapped = calldata('multicall(uint256,bytes[])', ['uint256', 'bytes[]'], [1, [single, v2_swap()]])
+
+        route, = decode_swap_calldata(aero)
+        self.assertEqual(route['protocol'], 'aerodrome')
+        self.assertEqual(route['tokens'], [WETH, USDC, DAI])
+        self.assertEqual(route['stable'], [False, True])
+
+        inner = decode_swap_calldata(wrapped)
+        self.assertEqual([s['protocol'] for s in inner], ['uniswap_v3', 'uniswap_v2'])
+        self.assertEqual(inner[0]['fees'], [3000])
+        self.assertEqual(decode_swap_calldata(b'\xa9\x05\x9c\xbb' + bytes(64)), [])
+
+
+class TestPendingSwapStream(unittest.TestCase):
+    """Test cases for PendingSwapStream class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.transactions = {
+            f'0x{i:064x}': raw_tx(f'0x{i:064x}', v2_swap(amount_in=i + 1)) for i in range(250)
+        }
+        # A plain transfer to a non-router
+        self.transactions['0x' + 'ab' * 32] = raw_tx('0x' + 'ab' * 32, b'', to=DAI, value=1)
+        self.provider = FakeProvider(self.transactions)
+        self.w3 = SimpleNamespace(provider=self.provider, eth=None)
+
+    def test_batches_dedupes_and_publishes(self):
+        """Test hashes are fetched in batches once and swaps reach subscribers"""
+        stream = PendingSwapStream(self.w3, batch_size=100)
+        published = []
+        stream.subscribe(published.append)
+
+        hashes = list(self.transactions)
+        intents = stream.ingest(hashes + hashes[:50] + ['0x' + 'ff' * 32])
+
+        self.assertEqual(len(intents), 250)
+        self.assertEqual(published, intents)
+        self.assertEqual(self.provider.batches, [100, 100, 52])
+        stats = stream.get_stats()
+        self.assertEqual(stats['duplicates'], 50)
+        self.assertEqual(stats['missing'], 1)
+        self.assertEqual(intents[0].token_in, WETH)
+        self.assertEqual(intents[0].gas_price, 10**9)
+
+        # Already seen hashes are not fetched again
+        self.assertEqual(stream.ingest(hashes[:10]), [])
+        self.assertEqual(len(self.provider.batches), 3)
+
+    def test_dedupe_window_is_bounded(self):
+        """Test the oldest hashes are forgotten once the window is full"""
+        stream = PendingSwapStream(self.w3, dedupe_size=100)
+        hashes = list(self.transactions)
+        stream.ingest(hashes)
+
+        self.assertEqual(stream.get_stats()['tracked_hashes'], 100)
+        self.assertEqual(len(stream.ingest(hashes[:5])), 5)
+
+    def test_full_bodies_and_router_filter(self):
+        """Test pushed bodies skip the fetch and unknown routers are ignored"""
+        stream = PendingSwapStream(self.w3, routers=[Web3.to_checksum_address(ROUTER)])
+        bodies = [
+            raw_tx('0x' + '01' * 32, v2_swap()),
+            raw_tx('0x' + '02' * 32, v2_swap(), to=DAI)
+        ]
+
+        intents = stream.ingest(bodies)
+        self.assertEqual([i.tx_hash for i in intents], ['0x' + '01' * 32])
+        self.assertEqual(self.provider.batches, [])
+
+    def test_falls_back_to_single_fetches(self):
+        """Test providers without batching are read one transaction at a time"""
+        known = {'0x' + '03' * 32: raw_tx('0x' + '03' * 32, v2_swap())}
+
+        def get_transaction(tx_hash):
+            if tx_hash not in known:
+                raise TransactionNotFound(tx_hash)
+            return known[tx_hash]
+
+        w3 = SimpleNamespace(provider=object(), eth=SimpleNamespace(get_transaction=get_transaction))
+        source = SimpleNamespace(drain=lambda: list(known) + ['0x' + '04' * 32])
+        stream = PendingSwapStream(w3, source=source)
+
+        self.assertEqual(len(stream.poll()), 1)
+        self.assertEqual(stream.get_stats()['missing'], 1)
+
+    def test_missing_hash_retried_when_announced_again(self):
+        """Test a hash whose body was not available yet is fetched on its next announcement"""
+        tx_hash = '0x' + 'cd' * 32
+        known = {}
+
+        def get_transaction(requested):
+            if requested not in known:
+                raise TransactionNotFound(requested)
+            return known[requested]
+
+        w3 = SimpleNamespace(provider=object(), eth=SimpleNamespace(get_transaction=get_transaction))
+        stream = PendingSwapStream(w3)
+        self.assertEqual(stream.ingest([tx_hash]), [])
+        known[tx_hash] = raw_tx(tx_hash, v2_swap())
+        self.assertEqual([i.tx_hash for i in stream.ingest([tx_hash])], [tx_hash])
+        self.assertEqual(stream.ingest([tx_hash]), [])
+        self.assertEqual(stream.get_stats()['duplicates'], 1)
+
+
+class TestPendingSwapPolling(unittest.TestCase):
+    """Test cases for AdvancedTradingStrategy pending swap polling"""
+
+    def test_pending_subscription_opened_on_first_poll(self):
+        """Test a strategy only subscribes to pending transactions once it polls them"""
+        hub = Mock()
+        hub.subscribe_pending.return_value.drain.return_value = []
+        strategy = AdvancedTradingStrategy(subscription_hub=hub)
+        hub.subscribe_pending.assert_not_called()
+
+        self.assertEqual(strategy.poll_pending_swaps(), [])
+        self.assertEqual(strategy.poll_pending_swaps(), [])
+        hub.subscribe_pending.assert_called_once_with(maxsize=4096)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the rolling MEV risk view
+
+@CONTEXT: Test suite for MevRiskView pair counters, searcher weighting,
+          window expiry and gas price percentiles
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import unittest
+from dashboard.mempool_decoder import SwapIntent
+from dashboard.mev_risk import MevRiskView, RollingHistogram
+
+WETH = '0x4200000000000000000000000000000000000006'
+USDC = '0x833589fcd6edb6e08f4c7c32d4f71b54bda02913'
+DAI = '0x50c5725949a6f0c72e6c4a641f24049a917db0cb'
+SEARCHER = '0x00000000000000000000000000000000000000aa'
+
+
+def swap(tokens, sender='0x' + '11' * 20, gas_price=10**9):
+    return SwapIntent(
+        tx_hash='0x' + '00' * 32, protocol='uniswap_v2', method='swapExactTokensForTokens',
+        router='0x' + '22' * 20, sender=sender, tokens=tokens, amount_in=1, amount_out=1,
+        exact_input=True, gas_price=gas_price
+    )
+
+
+class TestMevRiskView(unittest.TestCase):
+    """Test cases for MevRiskView class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.view = MevRiskView(window=60, risk_levels={'low': 2, 'medium': 4, 'high': 6}, searchers=[SEARCHER])
+
+    def test_pairs_are_direction_independent(self):
+        """Test swaps count against the pair whichever way they trade"""
+        self.view.record(swap([WETH, USDC]), now=1000)
+        self.view.record(swap([USDC, WETH]), now=1001)
+
+        assessment = self.view.assess_pair(USDC.upper(), WETH, now=1002)
+        self.assertEqual(assessment.competing_swaps, 2)
+        self.assertEqual(assessment.level, 'low')
+        self.assertTrue(assessment.allowed)
+
+    def test_route_uses_busiest_hop_and_searchers_weigh_double(self):
+        """Test route risk follows its busiest pair with searcher swaps counted twice"""
+        self.view.record(swap([WETH, USDC, DAI]), now=1000)
+        for _ in range(2):
+            self.view.record(swap([USDC, DAI], sender=SEARCHER), now=1000)
+
+        assessment = self.view.assess_route([WETH, USDC, DAI], now=1001)
+        self.assertEqual(assessment.pairs[1], MevRiskView.pair_key(USDC, DAI))
+        self.assertEqual((assessment.competing_swaps, assessment.searcher_swaps), (3, 2))
+        self.assertEqual(assessment.score, 5)
+        self.assertEqual(assessment.level, 'medium')
+        self.assertFalse(assessment.allowed)
+        self.assertEqual(self.view.assess_pair(WETH, DAI, now=1001).level, 'none')
+
+    def test_default_levels_count_every_swap_on_the_pair(self):
+        """Test the default levels tolerate ordinary traffic on a busy pair"""
+        view = MevRiskView(window=60)
+        for t in range(20):
+            view.record(swap([WETH, USDC]), now=1000 + t)
+        self.assertEqual(view.assess_pair(WETH, USDC, now=1030).level, 'none')
+        for t in range(30):
+            view.record(swap([WETH, USDC]), now=1030 + t)
+        self.assertEqual(view.assess_pair(WETH, USDC, now=1059).level, 'medium')
+
+    def test_window_expiry(self):
+        """Test swaps older than the window stop counting"""
+        for t in range(0, 60, 10):
+            self.view.record(swap([WETH, USDC]), now=1000 + t)
+
+        self.assertEqual(self.view.assess_pair(WETH, USDC, now=1055).competing_swaps, 6)
+        self.assertEqual(self.view.assess_pair(WETH, USDC, now=1075).competing_swaps, 4)
+        self.assertEqual(self.view.assess_pair(WETH, USDC, now=1200).competing_swaps, 0)
+
+    def test_gas_percentiles(self):
+        """Test rolling gas percentiles land within one 5% bucket"""
+        for gwei in range(1, 101):
+            self.view.record(swap([WETH, USDC], gas_price=gwei * 10**9), now=1000)
+
+        assessment = self.view.assess_pair(WETH, USDC, now=1001)
+        self.assertAlmostEqual(assessment.gas_p50 / 50e9, 1, delta=0.06)
+        self.assertAlmostEqual(assessment.gas_p90 / 90e9, 1, delta=0.06)
+
+        histogram = RollingHistogram(window=10)
+        histogram.add(5 * 10**9, now=0)
+        self.assertIsNone(histogram.percentile(50, now=20))
+        self.assertEqual(histogram.size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the opportunity scheduler
+
+@CONTEXT: Test suite for OpportunityQueue ordering, route dedupe and
+          per-chain block expiry
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import threading
+import unittest
+from dashboard.opportunity_queue import OpportunityQueue
+
+
+class TestOpportunityQueue(unittest.TestCase):
+    """Test cases for OpportunityQueue class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.queue = OpportunityQueue(default_ttl_blocks=2)
+        self.queue.on_block(100)
+
+    def test_orders_by_expected_value_per_gas(self):
+        """Test the best (profit x probability) / gas entry is popped first"""
+        self.queue.push('a', {}, expected_profit=10.0, gas_cost=5.0)                           # 2.0
+        self.queue.push('b', {}, expected_profit=10.0, gas_cost=1.0, success_probability=0.3)  # 3.0
+        self.queue.push('c', {}, expected_profit=4.0, gas_cost=1.0)                            # 4.0
+
+        self.assertEqual([self.queue.pop().route_key for _ in range(3)], ['c', 'b', 'a'])
+        self.assertIsNone(self.queue.pop())
+
+    def test_route_key_dedupe_keeps_latest(self):
+        """Test re-pushing a route replaces its earlier entry"""
+        self.queue.push('route', {'v': 1}, expected_profit=50.0, gas_cost=1.0)
+        self.queue.push('other', {}, expected_profit=20.0, gas_cost=1.0)
+        self.queue.push('route', {'v': 2}, expected_profit=5.0, gas_cost=1.0)
+
+        self.assertEqual(len(self.queue), 2)
+        self.assertEqual(self.queue.pop().route_key, 'other')
+        entry = self.queue.pop()
+        self.assertEqual(entry.opportunity, {'v': 2})
+        self.assertIsNone(self.queue.pop())
+
+    def test_block_expiry_per_chain(self):
+        """Test entries drop out once their chain's head passes the TTL"""
+        self.queue.on_block(5000, chain='polygon')
+        self.queue.push('base-short', {}, expected_profit=9.0, gas_cost=1.0, ttl_blocks=1)
+        self.queue.push('base-long', {}, expected_profit=1.0, gas_cost=1.0, ttl_blocks=5)
+        self.queue.push('polygon', {}, expected_profit=5.0, gas_cost=1.0, chain='polygon')
+        # Seen at an already expired block
+        self.assertFalse(self.queue.push('stale', {}, expected_profit=9.0, gas_cost=1.0, block_number=90))
+
+        self.assertEqual(self.queue.on_block(101), 0)
+        self.assertEqual(self.queue.on_block(102), 1)
+        self.assertEqual(self.queue.pop().route_key, 'polygon')
+        self.assertEqual(self.queue.on_block(5003, chain='polygon'), 0)
+        self.assertEqual(self.queue.pop().route_key, 'base-long')
+        self.assertEqual(self.queue.get_stats()['expired'], 1)
+
+    def test_worker_blocks_until_push(self):
+        """Test pop with a timeout wakes when an opportunity arrives"""
+        results = []
+        worker = threading.Thread(target=lambda: results.append(self.queue.pop(timeout=2.0)))
+        worker.start()
+        self.queue.push('late', {}, expected_profit=1.0, gas_cost=1.0)
+        worker.join()
+        self.assertEqual(results[0].route_key, 'late')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for the sharded process-pool evaluator
+
+@CONTEXT: Test suite for ParallelEvaluator sharding, result ordering and
+          worker state, using the flash loan profit math as the workload
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import unittest
+from decimal import Decimal
+from dashboard.advanced_trading import evaluate_flash_loan
+from dashboard.parallel_eval import ParallelEvaluator, get_worker_state
+
+
+def scaled_by_worker_state(value):
+    return value * get_worker_state()['scale']
+
+
+def flash_tasks():
+    tasks = []
+    for i in range(60):
+        price = Decimal('1') + Decimal(i % 7) / Decimal('100')
+        for amount in (Decimal('1'), Decimal('5'), Decimal('25')):
+            tasks.append((
+                'WETH', 'USDC', amount, price, Decimal(i % 5) / Decimal('1000'),
+                Decimal('0.0009'), Decimal('0.002')
+            ))
+    return tasks
+
+
+class TestParallelEvaluator(unittest.TestCase):
+    """Test cases for ParallelEvaluator class"""
+
+    def test_shards_are_contiguous_and_balanced(self):
+        """Test sharding keeps task order and near-equal sizes"""
+        shards = ParallelEvaluator.shard(list(range(10)), 3)
+        self.assertEqual(shards, [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(ParallelEvaluator.shard([1, 2], 8), [[1], [2]])
+
+    def test_results_match_serial_evaluation(self):
+        """Test a multi-process sweep returns the serial results in task order"""
+        tasks = flash_tasks()
+        expected = [evaluate_flash_loan(*task) for task in tasks]
+
+        with ParallelEvaluator(max_workers=2, shards_per_worker=2) as evaluator:
+            first = evaluator.map(evaluate_flash_loan, tasks)
+            second = evaluator.map(evaluate_flash_loan, tasks)
+            timings = evaluator.last_timings
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual(len(timings), 4)
+        self.assertEqual(sum(t.tasks for t in timings), len(tasks))
+        self.assertEqual([t.shard for t in timings], [0, 1, 2, 3])
+
+    def test_worker_state_is_installed(self):
+        """Test read-only worker state reaches the evaluated function"""
+        for workers in (1, 2):
+            with ParallelEvaluator(max_workers=workers, worker_state={'scale': 3}) as evaluator:
+                self.assertEqual(
+                    evaluator.map(scaled_by_worker_state, [(i,) for i in range(5)]), [0, 3, 6, 9, 12]
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Tests for factory log pool discovery
+
+@CONTEXT: Test suite for PoolIndexer against an in-memory chain that emits the
+          same logs as contracts/mocks/MockPoolFactories.sol
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest.mock import Mock
+from eth_abi import encode
+from web3 import Web3
+from dashboard.db_pool import get_database_pool
+from dashboard.pool_indexer import FACTORY_EVENTS, FactoryConfig, PoolIndexer
+from dashboard.token_registry import TokenRegistry
+
+WETH = '0x4200000000000000000000000000000000000006'
+USDC = '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913'
+JUNK = '0x9000000000000000000000000000000000000009'
+V3_FACTORY = '0x1000000000000000000000000000000000000001'
+V2_FACTORY = '0x2000000000000000000000000000000000000002'
+
+
+def _topic(value):
+    return int(value, 16).to_bytes(32, 'big') if isinstance(value, str) else value.to_bytes(32, 'big')
+
+
+class FakeChain:
+    """Minimal eth namespace serving getLogs and pool state"""
+
+    def __init__(self):
+        self.block_number = 0
+        self.logs = []
+        self.liquidity = {}
+        self.reserves = {}
+        self.get_logs_calls = []
+
+    def add_log(self, factory, kind, topic3, data_types, data_values, token0=WETH, token1=USDC):
+        self.block_number += 1
+        topics = [Web3.keccak(text=FACTORY_EVENTS[kind]['signature']), _topic(token0), _topic(token1)]
+        if topic3 is not None:
+            topics.append(_topic(topic3))
+        self.logs.append({
+            'address': factory,
+            'topics': topics,
+            'data': encode(data_types, data_values),
+            'blockNumber': self.block_number
+        })
+
+    def get_logs(self, params):
+        self.get_logs_calls.append((params['fromBlock'], params['toBlock']))
+        return [
+            log for log in self.logs
+            if log['address'] == params['address']
+            and log['topics'][0] == params['topics'][0]
+            and params['fromBlock'] <= log['blockNumber'] <= params['toBlock']
+        ]
+
+    def get_block(self, number):
+        number = self.block_number if number == 'latest' else number
+        return {'number': number, 'hash': f'0x{number:064x}', 'parentHash': f'0x{max(number - 1, 0):064x}'}
+
+    def contract(self, address, abi):
+        contract = Mock()
+        contract.functions.liquidity.return_value.call.return_value = self.liquidity.get(address, 0)
+        contract.functions.slot0.return_value.call.return_value = (2 ** 96, 0)
+        reserve0, reserve1 = self.reserves.get(address, (0, 0))
+        contract.functions.getReserves.return_value.call.return_value = (reserve0, reserve1, 0)
+        return contract
+
+
+class TestPoolIndexer(unittest.TestCase):
+    """Test cases for PoolIndexer class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.chain = FakeChain()
+        self.registry = TokenRegistry(cache_path=None)
+        self.registry.add_token('WETH', WETH, 18)
+        self.registry.add_token('USDC', USDC, 6)
+        self.registry.add_token('JUNK', JUNK, 18)
+        self.web3 = Mock()
+        self.web3.eth = self.chain
+        self.factories = [
+            FactoryConfig(dex='uniswap_v3', address=V3_FACTORY, kind='uniswap_v3'),
+            FactoryConfig(dex='baseswap', address=V2_FACTORY, kind='uniswap_v2', fee_bps=25)
+        ]
+        self.indexer = PoolIndexer(
+            self.web3,
+            self.factories,
+            db_path=os.path.join(self.tmpdir.name, 'pools.db'),
+            max_block_range=3,
+            confirmations=0,
+            registry=self.registry
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        get_database_pool(self.indexer.db_path).close()
+        self.tmpdir.cleanup()
+
+    def _create_v3_pool(self, pool, fee, tick_spacing):
+        self.chain.add_log(V3_FACTORY, 'uniswap_v3', fee, ['int24', 'address'], [tick_spacing, pool])
+
+    def _create_v2_pair(self, pair, token0=WETH, token1=USDC):
+        self.chain.add_log(V2_FACTORY, 'uniswap_v2', None, ['address', 'uint256'], [pair, 1], token0, token1)
+
+    def test_decodes_pools(self):
+        """Test creation events are decoded with fee and tick spacing"""
+        pool = '0x00000000000000000000000000000000000000a1'
+        pair = '0x00000000000000000000000000000000000000b2'
+        self._create_v3_pool(pool, 500, 10)
+        self._create_v2_pair(pair)
+
+        self.assertEqual(self.indexer.scan(), 2)
+        v3 = self.indexer.get_pools('uniswap_v3')[0]
+        self.assertEqual(v3.address, Web3.to_checksum_address(pool))
+        self.assertEqual((v3.token0, v3.token1), (WETH, USDC))
+        self.assertEqual((v3.fee, v3.tick_spacing), (500, 10))
+        self.assertEqual(self.indexer.get_pools('baseswap')[0].fee, None)
+
+    def test_incremental_scan_from_cursor(self):
+        """Test rescans only request blocks past the persisted cursor"""
+        self._create_v3_pool('0x00000000000000000000000000000000000000a1', 500, 10)
+        self.indexer.scan()
+        head = self.chain.block_number
+        self.assertEqual(self.indexer.get_cursor(self.factories[0]), head)
+
+        self._create_v3_pool('0x00000000000000000000000000000000000000a2', 3000, 60)
+        self.chain.get_logs_calls.clear()
+        reopened = PoolIndexer(
+            self.web3, self.factories, db_path=self.indexer.db_path, confirmations=0, registry=self.registry
+        )
+        self.assertEqual(reopened.scan(), 1)
+        self.assertTrue(all(start > head for start, _ in self.chain.get_logs_calls))
+        self.assertEqual(len(reopened.get_pools()), 2)
+
+    def test_ranks_by_liquidity_and_syncs_registry(self):
+        """Test pools are ranked by refreshed liquidity and registered"""
+        low = Web3.to_checksum_address('0x00000000000000000000000000000000000000a1')
+        high = Web3.to_checksum_address('0x00000000000000000000000000000000000000a2')
+        self._create_v3_pool(low, 500, 10)
+        self._create_v3_pool(high, 3000, 60)
+        self.chain.liquidity = {low: 10, high: 1000}
+        self.indexer.scan()
+        self.indexer.refresh_liquidity()
+
+        top = self.indexer.get_top_pools(limit=1)
+        self.assertEqual([p.address for p in top], [high])
+
+        self.assertEqual(self.indexer.sync_registry(self.registry, limit=2), 2)
+        self.assertEqual(self.registry.get_pool(WETH, USDC, 'uniswap_v3', 3000).tick_spacing, 60)
+
+    def test_ranks_by_usd_depth_across_pairs(self):
+        """Test a deep WETH/USDC pair outranks a junk pair with far more raw liquidity"""
+        usdc_pair = Web3.to_checksum_address('0x00000000000000000000000000000000000000b1')
+        junk_pair = Web3.to_checksum_address('0x00000000000000000000000000000000000000b2')
+        self._create_v2_pair(usdc_pair)
+        self._create_v2_pair(junk_pair, WETH, JUNK)
+        self.chain.reserves = {
+            usdc_pair: (10 * 10 ** 18, 30000 * 10 ** 6),  # 10 WETH / 30,000 USDC
+            junk_pair: (10 ** 17, 10 ** 24)               # 0.1 WETH / 1,000,000 JUNK
+        }
+        self.indexer.scan()
+        self.indexer.refresh_liquidity()
+
+        pools = {pool.address: pool for pool in self.indexer.get_pools()}
+        self.assertGreater(pools[junk_pair].liquidity, pools[usdc_pair].liquidity)
+        self.assertAlmostEqual(pools[usdc_pair].depth_usd, 60000.0)
+        self.assertAlmostEqual(pools[junk_pair].depth_usd, 600.0)  # WETH priced at 3,000 from the USDC pair
+        self.assertEqual([p.address for p in self.indexer.get_top_pools(limit=2)], [usdc_pair, junk_pair])
+
+    def test_load_pool_state_uses_pool_fees(self):
+        """Test cached reserves carry the factory's configured fee instead of a flat 30 bps"""
+        pair = Web3.to_checksum_address('0x00000000000000000000000000000000000000d1')
+        self._create_v2_pair(pair)
+        self.chain.reserves = {pair: (10 * 10 ** 18, 30000 * 10 ** 6)}
+        self.indexer.scan()
+        self.indexer.refresh_liquidity()
+
+        cache = self.indexer.create_state_cache()
+        self.assertEqual(self.indexer.load_pool_state(cache), 1)
+        reserves = cache.get(('pool', pair))
+        self.assertEqual((reserves.reserve0, reserves.fee_bps), (10 * 10 ** 18, 25))
+        self.assertEqual(cache.head.number, self.chain.block_number)
+
+        pools = {pool.dex: pool for pool in self.indexer.get_pools()}
+        self.assertEqual(self.indexer.fee_bps(replace(pools['baseswap'], dex='other_v2')), 30)
+        self.assertEqual(self.indexer.fee_bps(replace(pools['baseswap'], fee=500)), 5)
+        self.assertEqual(self.indexer.fee_bps(replace(pools['baseswap'], kind='aerodrome', stable=True)), 5)
+
+    def test_feeless_pools_all_registered(self):
+        """Test Aerodrome volatile and stable pools for one pair both reach the registry"""
+        factory = FactoryConfig(dex='aerodrome', address=V2_FACTORY, kind='aerodrome')
+        indexer = PoolIndexer(self.web3, [factory], db_path=self.indexer.db_path, confirmations=0,
+                              registry=self.registry)
+        volatile = Web3.to_checksum_address('0x00000000000000000000000000000000000000c1')
+        stable = Web3.to_checksum_address('0x00000000000000000000000000000000000000c2')
+        for pool, is_stable in ((volatile, 0), (stable, 1)):
+            self.chain.add_log(V2_FACTORY, 'aerodrome', is_stable, ['address', 'uint256'], [pool, 1])
+        self.chain.reserves = {volatile: (10 ** 18, 3000 * 10 ** 6), stable: (10 ** 17, 300 * 10 ** 6)}
+        indexer.scan()
+        indexer.refresh_liquidity()
+
+        self.assertEqual(indexer.sync_registry(self.registry), 2)
+        self.assertEqual(len(self.registry.get_pools(WETH, USDC, 'aerodrome')), 2)
+        self.assertEqual(self.registry.get_pool(WETH, USDC, 'aerodrome', stable=True).address, stable)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the price analyzer
+
+@CONTEXT: Test suite for PriceAnalyzer price records, rolling statistics,
+          running volatility and the vectorized spread check
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from dashboard.db_pool import get_database_pool
+from dashboard.init_db import init_database
+from dashboard.price_analysis import PriceAnalyzer
+
+
+class TestPriceAnalyzer(unittest.TestCase):
+    """Test cases for PriceAnalyzer class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        init_database(self.db_path)
+        with patch('dashboard.price_analysis.get_web3_manager'), \
+                patch('dashboard.price_analysis.get_dex_interface'):
+            self.analyzer = PriceAnalyzer(self.db_path, history_window=3)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.analyzer.price_writer.close()
+        get_database_pool(self.db_path).close()
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def test_price_records_feed_statistics(self):
+        """Test queued price records are committed and answered from rolling statistics"""
+        for price in (2500.0, 2510.0, 2505.0):
+            self.assertTrue(self.analyzer.add_price_record('WETH/USDC', 'uniswap_v3', price))
+        self.assertTrue(self.analyzer.flush_price_records(timeout=5))
+
+        rows = self.analyzer.get_db_connection().execute('SELECT COUNT(*) FROM dex_prices').fetchone()[0]
+        self.assertEqual(rows, 3)
+        stats = self.analyzer.get_price_statistics('WETH/USDC', 'uniswap_v3')
+        self.assertEqual(stats['samples'], 3)
+        self.assertEqual(stats['current_price'], 2505.0)
+        self.assertAlmostEqual(stats['mean_price'], 2505.0)
+        self.assertEqual(self.analyzer.get_historical_performance()['executed_trades'], 0)
+
+    def test_volatility_over_window(self):
+        """Test volatility averages the changes still inside the history window"""
+        for price in ('100', '110', '99', '99'):
+            self.analyzer._update_price_history('ETH/USDC/0.05%', Decimal(price))
+        # The 100 -> 110 change has left the 3-point window
+        self.assertEqual(self.analyzer.get_volatility('ETH/USDC/0.05%'), Decimal('5'))
+        self.assertEqual(self.analyzer.get_volatility('missing'), Decimal('0'))
+
+    def test_arbitrage_check_picks_widest_spread(self):
+        """Test the spread check reports the widest pair above the threshold"""
+        prices = {'a': Decimal('100'), 'b': Decimal('101'), 'c': Decimal('103')}
+        opportunity = self.analyzer.check_arbitrage_opportunity(prices, min_spread_percent=0.5)
+        self.assertEqual((opportunity['pair1'], opportunity['pair2']), ('a', 'c'))
+        self.assertAlmostEqual(opportunity['spread_percent'], 3.0)
+        self.assertIsNone(self.analyzer.check_arbitrage_opportunity(prices, min_spread_percent=5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for materialized profit rollups
+
+@CONTEXT: Test suite for profit_rollups triggers, backfill, transactional
+          consistency and the schema.sql rollup views
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import random
+import sqlite3
+import unittest
+
+from dashboard.profit_rollups import (
+    ROLLUP_SCHEMA, SCHEMA_SQL_COLUMNS, get_profit_buckets, get_profit_totals, install_profit_rollups,
+    rollup_triggers, schema_sql
+)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'schema.sql')
+T0 = 1_790_000_000 // 86400 * 86400
+TRADES_TABLE = '''
+    CREATE TABLE trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, network TEXT, timestamp INTEGER,
+        token_in TEXT, token_out TEXT, amount_in INTEGER, amount_out INTEGER,
+        profit INTEGER, gas_used INTEGER, gas_price INTEGER, success BOOLEAN, tx_hash TEXT UNIQUE
+    )
+'''
+INSERT_TRADE = '''
+    INSERT INTO trades (network, timestamp, token_in, token_out, profit, gas_used, gas_price, success, tx_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def make_trades(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        (rng.choice(['base', 'arbitrum']), T0 + rng.randrange(0, 3 * 86400), 'WETH',
+         rng.choice(['USDC', 'DAI']), rng.randrange(-10**14, 10**15), rng.randrange(21000, 300000),
+         rng.randrange(1, 50) * 10**8, rng.random() < 0.8, f'0x{i:064x}')
+        for i in range(count)
+    ]
+
+
+class TestProfitRollups(unittest.TestCase):
+    """Test cases for the profit rollup triggers and queries"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute(TRADES_TABLE)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.conn.close()
+
+    def scan(self, where='1', params=()):
+        return self.conn.execute(f'''
+            SELECT COUNT(*), SUM(profit), SUM(CASE WHEN success THEN 1 ELSE 0 END), SUM(gas_used * gas_price)
+            FROM trades WHERE {where}
+        ''', params).fetchone()
+
+    def test_backfill_then_triggers_match_scans(self):
+        """Test rollups built from existing trades and kept by triggers equal full scans"""
+        trades = make_trades(600)
+        self.conn.executemany(INSERT_TRADE, trades[:300])
+        install_profit_rollups(self.conn)
+        self.conn.executemany(INSERT_TRADE, trades[300:])
+        self.conn.commit()
+
+        totals = get_profit_totals(self.conn, group_by='network')
+        for network in ('base', 'arbitrum'):
+            count, profit, successes, gas_cost = self.scan('network = ?', (network,))
+            self.assertEqual(totals[network]['total_trades'], count)
+            self.assertEqual(totals[network]['total_profit'], profit)  # integer wei stays exact
+            self.assertEqual(totals[network]['successful_trades'], successes)
+            self.assertEqual(totals[network]['total_gas_cost'], gas_cost)
+
+        hour = T0 + 5 * 3600
+        bucket = get_profit_buckets(self.conn, 'hour', since=hour, until=hour + 3600, network='base')
+        count, profit, _, _ = self.scan('network = ? AND timestamp >= ? AND timestamp < ?', ('base', hour, hour + 3600))
+        self.assertEqual((bucket[0]['trade_count'], bucket[0]['total_profit']), (count, profit))
+        self.assertEqual(len(get_profit_buckets(self.conn, 'day')), 3)
+        self.assertEqual(set(get_profit_totals(self.conn, group_by='pair')), {'WETH/USDC', 'WETH/DAI'})
+
+    def test_updates_deletes_and_rollbacks(self):
+        """Test rollups follow updates and deletes and roll back with their trade"""
+        install_profit_rollups(self.conn)
+        self.conn.executemany(INSERT_TRADE, make_trades(50))
+        self.conn.commit()
+
+        self.conn.execute('UPDATE trades SET success = 1, profit = profit + 7')
+        self.conn.execute('DELETE FROM trades WHERE id % 3 = 0')
+        self.conn.commit()
+        count, profit, successes, _ = self.scan()
+        totals = get_profit_totals(self.conn)['']
+        self.assertEqual((totals['total_trades'], totals['total_profit'], totals['successful_trades']),
+                         (count, profit, successes))
+
+        # A batch that fails part way leaves neither trades nor rollups behind
+        duplicate = make_trades(2, seed=9)
+        duplicate[1] = duplicate[1][:-1] + (duplicate[0][-1],)
+        with self.assertRaises(sqlite3.IntegrityError):
+            with self.conn:
+                self.conn.executemany(INSERT_TRADE, duplicate)
+        self.assertEqual(get_profit_totals(self.conn)['']['total_trades'], count)
+
+    def test_schema_views_read_rollups(self):
+        """Test the schema.sql hourly and daily views are served from the rollups"""
+        conn = sqlite3.connect(':memory:')
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+        conn.executemany(
+            'INSERT INTO trades (timestamp, token_in, token_out, amount_in, amount_out, profit, gas_used, tx_hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(T0 + 60, 'WETH', 'USDC', 1, 1, 2.5, 100, 'a'), (T0 + 120, 'WETH', 'USDC', 1, 1, 1.5, 301, 'b'),
+             (T0 + 7200, 'WETH', 'DAI', 1, 1, 1.0, 50, 'c')]
+        )
+        conn.execute("DELETE FROM trades WHERE tx_hash = 'c'")
+
+        self.assertEqual(conn.execute('SELECT total_profit, trade_count, avg_gas_used FROM hourly_profits').fetchall(),
+                         [(4.0, 2, 200.5)])
+        self.assertEqual(conn.execute('SELECT trade_count FROM daily_profits').fetchall(), [(2,)])
+        plan = ' '.join(row[-1] for row in conn.execute('EXPLAIN QUERY PLAN SELECT * FROM daily_profits'))
+        self.assertNotIn('trades', plan)
+        conn.close()
+
+    def test_install_over_schema_triggers_backfills(self):
+        """Test triggers already created by schema.sql do not stop install from backfilling"""
+        trades = make_trades(200)
+        self.conn.executemany(INSERT_TRADE, trades[:100])
+        self.conn.execute(ROLLUP_SCHEMA)
+        for trigger in rollup_triggers(SCHEMA_SQL_COLUMNS):
+            self.conn.execute(trigger)
+        install_profit_rollups(self.conn)
+        self.conn.executemany(INSERT_TRADE, trades[100:])
+        install_profit_rollups(self.conn)  # a second install does not backfill again
+        self.conn.commit()
+
+        totals = get_profit_totals(self.conn, group_by='network')
+        for network in ('base', 'arbitrum'):
+            count, profit, _, gas_cost = self.scan('network = ?', (network,))
+            self.assertEqual((totals[network]['total_trades'], totals[network]['total_profit']), (count, profit))
+            self.assertEqual(totals[network]['total_gas_cost'], gas_cost)
+
+    def test_schema_sql_backfills_and_tracks_updates(self):
+        """Test schema.sql backfills trades that predate the rollups once and follows updates"""
+        with open(SCHEMA_PATH) as f:
+            schema = f.read()
+        conn = sqlite3.connect(':memory:')
+        conn.executescript(schema.split('-- BEGIN profit_rollups')[0])
+        conn.executemany(
+            'INSERT INTO trades (timestamp, token_in, token_out, amount_in, amount_out, profit, gas_used, tx_hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(T0 + 60, 'WETH', 'USDC', 1, 1, 2.5, 100, 'a'), (T0 + 7200, 'WETH', 'DAI', 1, 1, 1.0, 50, 'b')]
+        )
+        conn.executescript(schema)
+        conn.executescript(schema)
+        conn.execute("UPDATE trades SET profit = 4.0, timestamp = ? WHERE tx_hash = 'b'", (T0 + 90,))
+
+        self.assertEqual(conn.execute('SELECT total_profit, trade_count, avg_gas_used FROM hourly_profits').fetchall(),
+                         [(6.5, 2, 75.0)])
+        self.assertEqual(conn.execute('SELECT total_profit, trade_count FROM daily_profits').fetchall(), [(6.5, 2)])
+        conn.close()
+
+    def test_schema_sql_matches_generator(self):
+        """Test the rollup section of schema.sql is the one profit_rollups generates"""
+        with open(SCHEMA_PATH) as f:
+            schema = f.read()
+        section = schema.split('-- BEGIN profit_rollups\n')[1].split('-- END profit_rollups')[0]
+        self.assertEqual(section, schema_sql())
+
+
+if __name__ == '__main__':
+    unittest.main()
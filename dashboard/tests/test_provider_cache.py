@@ -0,0 +1,123 @@
+"""
+Tests for the stale-while-revalidate provider cache
+
+@CONTEXT: Test suite for StaleWhileRevalidateCache
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import threading
+import time
+import unittest
+from dashboard.data_providers.cache import StaleWhileRevalidateCache
+
+
+class TestStaleWhileRevalidateCache(unittest.TestCase):
+    """Test cases for StaleWhileRevalidateCache class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.cache = StaleWhileRevalidateCache(max_size=2, default_ttl=60)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.cache.shutdown()
+
+    def test_lru_bound(self):
+        """Test least recently used entries are evicted"""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(self.cache.get_metrics()['evictions'], 1)
+
+    def test_per_key_ttl(self):
+        """Test entries expire according to their own TTL"""
+        self.cache.set('short', 1, ttl=0)
+        self.cache.set('long', 2)
+        self.assertIsNone(self.cache.get('short'))
+        self.assertEqual(self.cache.get('short', allow_stale=True), 1)
+        self.assertEqual(self.cache.get('long'), 2)
+
+    def test_stale_served_while_one_refresh_runs(self):
+        """Test expired entries are served immediately and refreshed once"""
+        self.cache.set('price', 'old', ttl=0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return 'new'
+
+        self.assertEqual(self.cache.get_or_load('price', loader), 'old')
+        self.assertEqual(self.cache.get_or_load('price', loader), 'old')
+        started.wait(1)
+        release.set()
+
+        deadline = time.time() + 1
+        while self.cache.get('price') != 'new' and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.cache.get('price'), 'new')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.get_metrics()['stale_serves'], 2)
+
+    def test_concurrent_misses_coalesce(self):
+        """Test concurrent misses on one key make a single loader call"""
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(1)
+            return 42
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_load('k', loader)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.get_metrics()['coalesced'], 4)
+
+    def test_entries_past_max_stale_are_misses(self):
+        """Test entries too far past their TTL are evicted instead of served"""
+        cache = StaleWhileRevalidateCache(default_ttl=60, max_stale=0.05)
+        self.addCleanup(cache.shutdown)
+        cache.set('a', 'old', ttl=0)
+        cache.set('b', 'old', ttl=0)
+        self.assertEqual(cache.get('a', allow_stale=True), 'old')
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get('a', allow_stale=True))
+        # get_or_load loads synchronously rather than serving the old value
+        self.assertEqual(cache.get_or_load('b', lambda: 'new'), 'new')
+        metrics = cache.get_metrics()
+        self.assertEqual(metrics['stale_evictions'], 2)
+        self.assertEqual(metrics['misses'], 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_loader_errors_propagate_on_miss(self):
+        """Test loader exceptions reach the caller and nothing is cached"""
+        def loader():
+            raise ValueError('rpc down')
+
+        with self.assertRaises(ValueError):
+            self.cache.get_or_load('k', loader)
+        self.assertIsNone(self.cache.get('k'))
+
+
+if __name__ == '__main__':
+    unittest.main()
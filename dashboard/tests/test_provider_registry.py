@@ -0,0 +1,115 @@
+"""
+Tests for the shared provider registry
+
+@CONTEXT: Test suite for ProviderRegistry against a local keep-alive JSON-RPC
+          server, checking instance sharing and connection reuse
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dashboard.provider_registry import ProviderRegistry, normalize_chain
+
+
+class KeepAliveRPCServer:
+    """Local HTTP/1.1 JSON-RPC server that counts accepted connections"""
+
+    def __init__(self, block_number):
+        self.block_number = block_number
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                payload = json.dumps({
+                    'jsonrpc': '2.0',
+                    'id': body['id'],
+                    'result': hex(server.block_number)
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestProviderRegistry(unittest.TestCase):
+    """Test cases for ProviderRegistry class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.server = KeepAliveRPCServer(7)
+        self.registry = ProviderRegistry(pool_maxsize=4)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.registry.close()
+        self.server.stop()
+
+    def test_shares_one_web3_per_chain(self):
+        """Test every lookup of a chain returns the same Web3 and provider"""
+        w3 = self.registry.get_web3('Base', [self.server.url])
+        self.assertIs(self.registry.get_web3('base'), w3)
+        self.assertIs(self.registry.get_provider('BASE'), w3.provider)
+        self.assertEqual(normalize_chain('Ethereum Sepolia'), 'ethereum_sepolia')
+
+    def test_reuses_connections_across_threads(self):
+        """Test threads share keep-alive connections instead of opening their own"""
+        w3 = self.registry.get_web3('base', [self.server.url])
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: w3.eth.block_number, range(200)))
+
+        self.assertEqual(set(results), {7})
+        stats = self.registry.get_connection_stats()
+        self.assertEqual(stats['requests'], 200)
+        self.assertLessEqual(stats['connections_opened'], 4)
+        self.assertLessEqual(self.server.connections, 4)
+        self.assertGreaterEqual(stats['reuse_ratio'], 0.98)
+
+    def test_timeout_and_conflicts(self):
+        """Test the registering caller's timeout is used and later conflicting settings are logged"""
+        w3 = self.registry.get_web3('base', [self.server.url], timeout=5)
+        self.assertTrue(all(e.provider._request_kwargs['timeout'] == 5 for e in w3.provider.endpoints))
+
+        with self.assertLogs('dashboard.provider_registry', level='WARNING') as logs:
+            self.assertIs(self.registry.get_web3('base', [self.server.url], hedge=True), w3)
+            self.assertIs(self.registry.get_web3('base', ['http://127.0.0.1:1'], timeout=5), w3)
+        self.assertEqual(len(logs.records), 2)
+        self.assertFalse(w3.provider.hedge)
+
+        with self.assertNoLogs('dashboard.provider_registry', level='WARNING'):
+            self.registry.get_web3('base', [self.server.url], timeout=5)
+
+    def test_unconfigured_chain_is_skipped(self):
+        """Test chains without endpoints are left out of connection maps"""
+        self.registry.endpoints_path = '/nonexistent/rpc_endpoints.json'
+        self.registry.register_chain('base', [self.server.url])
+        connections = self.registry.get_w3_connections(['base', 'no_such_chain'])
+        self.assertEqual(list(connections), ['base'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Tests for incremental data retention
+
+@CONTEXT: Test suite for RetentionManager batched purges, incremental
+          vacuum, partition rotation and the DatabaseCleaner wrapper
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from dashboard.data_cleanup import DatabaseCleaner
+from dashboard.db_pool import get_database_pool
+from dashboard.retention import RetentionManager, RetentionPolicy, partition_name
+
+NOW = 1_790_000_000
+DAY = 86400
+
+
+class TestRetentionManager(unittest.TestCase):
+    """Test cases for RetentionManager class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.pool = get_database_pool(self.db_path)
+        with self.pool.write() as conn:
+            conn.execute('CREATE TABLE dex_prices (id INTEGER PRIMARY KEY AUTOINCREMENT, token_pair TEXT, '
+                         'dex TEXT, price REAL, timestamp INTEGER NOT NULL)')
+            conn.execute('CREATE INDEX idx_dex_prices_timestamp ON dex_prices(timestamp)')
+            # Ten days of ticks, oldest first, each row padded to spread over many pages
+            conn.executemany(
+                'INSERT INTO dex_prices (token_pair, dex, price, timestamp) VALUES (?, ?, ?, ?)',
+                [('WETH/USDC' + 'x' * 200, 'uniswap', 2500.0, NOW - 10 * DAY + i * 30) for i in range(10 * DAY // 30)]
+            )
+        self.manager = RetentionManager(self.db_path, batch_size=1000, pause=0.001)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.pool.close()
+        shutil.rmtree(self.temp_dir)
+
+    def count(self, where='1'):
+        return self.pool.reader().execute(f'SELECT COUNT(*) FROM dex_prices WHERE {where}').fetchone()[0]
+
+    def test_purge_in_batches(self):
+        """Test only expired rows go, over many short writer leases"""
+        kept = self.count(f'timestamp >= {NOW - 7 * DAY}')
+        report = self.manager.run([RetentionPolicy('dex_prices', 7), RetentionPolicy('missing_table', 1)], now=NOW)
+
+        self.assertEqual(self.count(), kept)
+        self.assertEqual(report.rows_deleted, {'dex_prices': 3 * DAY // 30})
+        self.assertGreater(report.batches, 1)
+        self.assertGreater(report.max_stall_ms, 0)
+        self.assertLess(report.max_stall_ms, 1000)
+        self.assertEqual(self.manager.run([RetentionPolicy('dex_prices', 7)], now=NOW).batches, 0)
+
+    def test_incremental_vacuum_reclaims_pages(self):
+        """Test new pool files use incremental vacuum and freed pages are returned"""
+        self.assertEqual(self.manager.auto_vacuum_mode(), 2)
+        pages_before = self.pool.reader().execute('PRAGMA page_count').fetchone()[0]
+
+        report = self.manager.run([RetentionPolicy('dex_prices', 2)], now=NOW)
+        self.assertGreater(report.pages_vacuumed, 0)
+        self.assertEqual(self.pool.reader().execute('PRAGMA freelist_count').fetchone()[0], 0)
+        self.assertLess(self.pool.reader().execute('PRAGMA page_count').fetchone()[0], pages_before)
+
+    def test_writers_interleave_with_purge(self):
+        """Test another writer keeps getting the connection while a purge runs"""
+        waits = []
+        done = threading.Event()
+
+        def trade_writer():
+            while not done.is_set():
+                start = time.perf_counter()
+                with self.pool.write() as conn:
+                    conn.execute('INSERT INTO dex_prices (token_pair, dex, price, timestamp) VALUES (?, ?, ?, ?)',
+                                 ('WETH/USDC', 'aerodrome', 2501.0, NOW))
+                waits.append(time.perf_counter() - start)
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=trade_writer)
+        thread.start()
+        try:
+            report = self.manager.run([RetentionPolicy('dex_prices', 1)], now=NOW)
+        finally:
+            done.set()
+            thread.join()
+
+        self.assertGreater(len(waits), 1)
+        self.assertLess(max(waits) * 1000, report.max_stall_ms + 250)
+        self.assertEqual(self.count('dex = "aerodrome"'), len(waits))
+
+    def test_rotate_partitions(self):
+        """Test day partitions past retention are dropped whole"""
+        with self.pool.write() as conn:
+            for days_ago in range(5):
+                conn.execute(f'CREATE TABLE {partition_name("ticks", NOW - days_ago * DAY)} (price REAL)')
+
+        report = self.manager.run([], partitions={'ticks': 2}, now=NOW)
+        self.assertEqual(report.partitions_dropped, [partition_name('ticks', NOW - d * DAY) for d in (4, 3)])
+        self.assertIn(partition_name('ticks', NOW - 2 * DAY), self.manager._tables())
+        self.assertIn('dex_prices', self.manager._tables())
+
+
+class TestDatabaseCleaner(unittest.TestCase):
+    """Test cases for DatabaseCleaner class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+
+    def tearDown(self):
+        """Clean up test environment"""
+        get_database_pool(self.db_path).close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_cleanup_keeps_recent_unix_rows(self):
+        """Test cleanup compares unix timestamps and skips tables that do not exist"""
+        cleaner = DatabaseCleaner(self.db_path)
+        now = int(time.time())
+        with cleaner.db_pool.write() as conn:
+            conn.execute('CREATE TABLE dex_prices (id INTEGER PRIMARY KEY, price REAL, timestamp INTEGER)')
+            conn.execute('CREATE TABLE system_logs (id INTEGER PRIMARY KEY, message TEXT, timestamp INTEGER)')
+            conn.executemany('INSERT INTO dex_prices (price, timestamp) VALUES (?, ?)',
+                             [(1.0, now - 30 * DAY), (2.0, now - 60)])
+            conn.executemany('INSERT INTO system_logs (message, timestamp) VALUES (?, ?)',
+                             [('old', now - 20 * DAY), ('new', now)])
+
+        report = cleaner.cleanup_old_data()
+        self.assertEqual(report.rows_deleted, {'dex_prices': 1, 'system_logs': 1})
+        reader = cleaner.get_db_connection()
+        self.assertEqual([row[0] for row in reader.execute('SELECT price FROM dex_prices')], [2.0])
+        cleaner.optimize_database()
+
+
+if __name__ == '__main__':
+    unittest.main()
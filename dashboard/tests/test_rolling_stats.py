@@ -0,0 +1,169 @@
+"""
+Tests for the incremental statistics engine
+
+@CONTEXT: Test suite for WindowedStats, EwmaVolatility, OHLC bar rollups
+          and RollingStatsEngine persistence
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import unittest
+
+from dashboard.db_pool import get_database_pool
+from dashboard.ml_strategy import NetworkVolatilityTracker
+from dashboard.rolling_stats import EwmaVolatility, RollingStatsEngine, WindowedStats
+
+T0 = 1_790_000_000 // 3600 * 3600
+
+
+class TestWindowedStats(unittest.TestCase):
+    """Test cases for WindowedStats class"""
+
+    def test_matches_full_recompute(self):
+        """Test windowed moments and extremes match a rescan of the window"""
+        rng = random.Random(7)
+        stats = WindowedStats(window=50)
+        ticks = []
+        t = T0
+        for i in range(1000):
+            t += rng.uniform(0.5, 1.5)
+            price = 2500 + rng.gauss(0, 5)
+            stats.add(price, t)
+            ticks.append((t, price))
+            if i % 97 == 1 or i == 999:
+                window = [p for ts, p in ticks if ts > t - 50]
+                self.assertEqual(stats.count, len(window))
+                self.assertAlmostEqual(stats.mean, statistics.mean(window), places=6)
+                self.assertAlmostEqual(stats.std_dev, statistics.stdev(window), places=6)
+                self.assertEqual(stats.min, min(window))
+                self.assertEqual(stats.max, max(window))
+
+        stats.evict(t + 100)
+        self.assertEqual((stats.count, stats.min, stats.max), (0, None, None))
+
+    def test_ewma_volatility(self):
+        """Test EWMA volatility reacts to a burst of moves and then decays"""
+        ewma = EwmaVolatility(decay=0.9)
+        for _ in range(50):
+            ewma.add(100.0)
+        self.assertEqual(ewma.volatility, 0.0)
+        ewma.add(101.0)
+        spike = ewma.volatility
+        self.assertGreater(spike, 0)
+        for _ in range(20):
+            ewma.add(101.0)
+        self.assertLess(ewma.volatility, spike / 2)
+
+
+class TestRollingStatsEngine(unittest.TestCase):
+    """Test cases for RollingStatsEngine class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+
+    def tearDown(self):
+        """Clean up test environment"""
+        get_database_pool(self.db_path).close()
+        shutil.rmtree(self.temp_dir)
+
+    def feed(self, engine, seconds, step=5):
+        prices = []
+        for i in range(0, seconds, step):
+            price = 100 + (i % 600) / 60
+            engine.update('uniswap:WETH/USDC', price, T0 + i)
+            prices.append(price)
+        return prices
+
+    def test_live_window_and_bar_rollups(self):
+        """Test the trailing window and bar-merged timeframes match the raw ticks"""
+        engine = RollingStatsEngine(window=3600)
+        prices = self.feed(engine, 2 * 3600)
+        now = T0 + 2 * 3600 - 1
+
+        live = engine.statistics('uniswap:WETH/USDC', 3600, now=now)
+        last_hour = prices[-720:]
+        self.assertEqual(live['samples'], 720)
+        self.assertAlmostEqual(live['mean_price'], statistics.mean(last_hour), places=9)
+        self.assertAlmostEqual(live['std_dev'], statistics.stdev(last_hour), places=9)
+        self.assertEqual(live['current_price'], prices[-1])
+
+        # 90 minutes is not the live window, so 1m bars are merged
+        rolled = engine.statistics('uniswap:WETH/USDC', 5400, now=T0 + 7200)
+        tail = prices[-1080:]
+        self.assertEqual(rolled['samples'], len(tail))
+        self.assertAlmostEqual(rolled['mean_price'], statistics.mean(tail), places=9)
+        self.assertAlmostEqual(rolled['std_dev'], statistics.stdev(tail), places=9)
+        self.assertEqual((rolled['min_price'], rolled['max_price']), (min(tail), max(tail)))
+
+        hourly = engine.bars('uniswap:WETH/USDC', 3600, T0)
+        self.assertEqual([bar.start for bar in hourly], [T0, T0 + 3600])
+        self.assertEqual((hourly[1].open, hourly[1].close), (prices[720], prices[-1]))
+        self.assertIsNone(engine.statistics('missing', 3600, now=now))
+
+    def test_bars_persist_across_restart(self):
+        """Test closed and open bars are stored and resumed by a new engine"""
+        engine = RollingStatsEngine(self.db_path)
+        first = self.feed(engine, 1800)
+        engine.flush()
+
+        restarted = RollingStatsEngine(self.db_path)
+        stats = restarted.statistics('uniswap:WETH/USDC', 3600, now=T0 + 1800)
+        self.assertEqual(stats['samples'], len(first))
+        self.assertAlmostEqual(stats['mean_price'], statistics.mean(first), places=9)
+
+        restarted.update('uniswap:WETH/USDC', 200.0, T0 + 1801)
+        hourly = restarted.bars('uniswap:WETH/USDC', 3600, T0)
+        self.assertEqual(len(hourly), 1)
+        self.assertEqual((hourly[0].count, hourly[0].high, hourly[0].open), (len(first) + 1, 200.0, first[0]))
+
+    def test_open_bars_loaded_outside_lock(self):
+        """Test a new series reads its open bars without holding the engine lock"""
+        engine = RollingStatsEngine(self.db_path)
+        load_bars = engine._load_bars
+        held = []
+
+        def checked_load_bars(*args, **kwargs):
+            held.append(engine._lock.locked())
+            return load_bars(*args, **kwargs)
+
+        engine._load_bars = checked_load_bars
+        engine.update('uniswap:WETH/USDC', 100.0, T0)
+        engine.update('uniswap:WETH/USDC', 101.0, T0 + 1)
+        self.assertEqual(held, [False] * len(engine.intervals))
+        self.assertEqual(engine.bars('uniswap:WETH/USDC', 60, T0)[0].count, 2)
+
+
+class TestNetworkVolatilityTracker(unittest.TestCase):
+    """Test cases for NetworkVolatilityTracker class"""
+
+    def test_update_matches_batch(self):
+        """Test per-price updates give the batch volatility over the prices in the window"""
+        rng = random.Random(3)
+        prices = [100 + rng.uniform(-1, 1) * i for i in range(1, 200)]
+        tracker = NetworkVolatilityTracker(window=1000)
+        for i, price in enumerate(prices):
+            volatility = tracker.update_price('WETH', 'base', price, timestamp=T0 + i)
+        batch = NetworkVolatilityTracker().calculate_volatility('WETH', 'base', prices)
+        self.assertAlmostEqual(volatility, batch, places=9)
+        self.assertEqual(tracker.get_volatility('WETH', 'base'), volatility)
+
+    def test_update_forgets_returns_outside_window(self):
+        """Test only returns from the last window seconds count"""
+        rng = random.Random(5)
+        prices = [100 + rng.uniform(-1, 1) * i for i in range(1, 200)]
+        tracker = NetworkVolatilityTracker(window=50)
+        for i, price in enumerate(prices):
+            volatility = tracker.update_price('WETH', 'base', price, timestamp=T0 + i)
+        # Returns at T0+149..T0+198 are the last 50 price changes
+        batch = NetworkVolatilityTracker().calculate_volatility('WETH', 'base', prices[-51:])
+        self.assertAlmostEqual(volatility, batch, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
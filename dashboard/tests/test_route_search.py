@@ -0,0 +1,246 @@
+"""
+Tests for the off-chain arbitrage route search
+
+@CONTEXT: Test suite for RouteGraph and IncrementalRouteDetector, cross-checked
+          against a Python port of the PathFinder.findBestPath BFS and a full
+          re-search over randomly priced pools
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import random
+import unittest
+from unittest.mock import Mock
+from dataclasses import replace
+from dashboard.advanced_arbitrage_detector import AdvancedArbitrageDetector
+from dashboard.route_search import (
+    POOL_STATE_PREFIX, IncrementalRouteDetector, PoolReserves, RouteGraph, get_amount_out
+)
+from dashboard.state_cache import BlockRef, VersionedStateCache
+from dashboard.token_registry import TokenRegistry
+
+MAX_SEARCH_DEPTH = 3
+TOKENS = [f"0x{i:040x}" for i in range(1, 7)]
+
+
+def reference_find_best_path(pools, start, amount_in):
+    """Port of PathFinder.findBestPath: BFS over simple paths, best closing loop by profit"""
+    queue = [(start, amount_in, [], [])]
+    best = None
+    while queue:
+        token, amount, previous_tokens, previous_pools = queue.pop(0)
+        if len(previous_tokens) >= MAX_SEARCH_DEPTH:
+            continue
+        for pool in pools:
+            if token not in (pool.token0, pool.token1):
+                continue
+            target = pool.token1 if token == pool.token0 else pool.token0
+            reserve_in, reserve_out = pool.reserves_for(token)
+            output = get_amount_out(amount, reserve_in, reserve_out, pool.fee_bps)
+            if target == start:
+                profit = output - amount_in
+                if profit > 0 and (best is None or profit > best[0]):
+                    best = (profit, previous_pools + [pool.address])
+                continue
+            if target != token and target not in previous_tokens:
+                queue.append((target, output, previous_tokens + [token], previous_pools + [pool.address]))
+    return best
+
+
+def random_pools(rng, count):
+    pools = []
+    for i in range(count):
+        token0, token1 = rng.sample(TOKENS, 2)
+        reserve0 = rng.randint(10 ** 20, 10 ** 22)
+        # Prices roughly consistent with a hidden valuation so most cycles are close to break-even
+        reserve1 = int(reserve0 * rng.uniform(0.9, 1.1) * (TOKENS.index(token1) + 1) / (TOKENS.index(token0) + 1))
+        pools.append(PoolReserves(
+            address=f"0x{0xabc000 + i:040x}",
+            dex=rng.choice(['uniswap_v2', 'aerodrome']),
+            token0=token0,
+            token1=token1,
+            reserve0=reserve0,
+            reserve1=reserve1,
+            fee_bps=rng.choice([5, 30])
+        ))
+    return pools
+
+
+class TestRouteGraph(unittest.TestCase):
+    """Test cases for RouteGraph class"""
+
+    def test_matches_find_best_path(self):
+        """Test the local search finds the same best route as the on-chain BFS"""
+        rng = random.Random(7)
+        checked = 0
+        for _ in range(25):
+            pools = random_pools(rng, 14)
+            graph = RouteGraph.from_pools(pools, max_hops=MAX_SEARCH_DEPTH)
+            for start in TOKENS:
+                for amount in (10 ** 15, 10 ** 18, 5 * 10 ** 19):
+                    expected = reference_find_best_path(pools, start, amount)
+                    route = graph.find_best_route(start, amount)
+                    if expected is None:
+                        self.assertIsNone(route)
+                        continue
+                    checked += 1
+                    self.assertIsNotNone(route)
+                    self.assertEqual(route.profit, expected[0])
+                    self.assertEqual(route.tokens[0], start)
+                    self.assertEqual(route.tokens[-1], start)
+        self.assertGreater(checked, 0)
+
+    def test_route_profit_is_exact(self):
+        """Test a confirmed route re-quotes to the same output"""
+        pools = [
+            PoolReserves('0xp1', 'uniswap_v2', TOKENS[0], TOKENS[1], 10 ** 21, 2 * 10 ** 21),
+            PoolReserves('0xp2', 'aerodrome', TOKENS[1], TOKENS[2], 10 ** 21, 10 ** 21),
+            PoolReserves('0xp3', 'uniswap_v2', TOKENS[2], TOKENS[0], 10 ** 21, 6 * 10 ** 20)
+        ]
+        graph = RouteGraph.from_pools(pools)
+        route = graph.find_best_route(TOKENS[0], 10 ** 18)
+
+        self.assertEqual(route.pools, ['0xp1', '0xp2', '0xp3'])
+        self.assertLess(route.log_weight, 0)
+        self.assertEqual(graph.quote_pools(route.tokens, route.pools, 10 ** 18), route.amount_out)
+        # Far beyond the pools' depth the same cycle loses money
+        self.assertIsNone(graph.find_best_route(TOKENS[0], 10 ** 21))
+
+    def test_detector_uses_cached_pool_state(self):
+        """Test detect_arbitrage searches cached reserves without a PathFinder contract"""
+        cache = VersionedStateCache(fetch_block=lambda number: None)
+        block = BlockRef(100, '0x100', '0x99')
+        cache.advance(block)
+        pools = [
+            PoolReserves(f"0x{0xa1:040x}", 'uniswap_v2', TOKENS[0], TOKENS[1], 10 ** 21, 2 * 10 ** 21),
+            PoolReserves(f"0x{0xa2:040x}", 'aerodrome', TOKENS[1], TOKENS[0], 2 * 10 ** 21, 11 * 10 ** 20)
+        ]
+        for pool in pools:
+            cache.set((POOL_STATE_PREFIX, pool.address), pool)
+
+        registry = TokenRegistry(cache_path=None)
+        registry.add_token('WETH', TOKENS[0], 18)
+        detector = AdvancedArbitrageDetector(
+            ['Ethereum Sepolia'], {}, {'SUPPORTED_TOKENS': [TOKENS[0]], 'WETH_ADDRESS': TOKENS[0]},
+            pool_state=cache, token_registry=registry
+        )
+        opportunities = detector.detect_arbitrage({}, {})
+
+        self.assertEqual(len(opportunities), 3)
+        self.assertTrue(all(o['profit'] > 0 for o in opportunities))
+        self.assertTrue(detector.validate_opportunity(opportunities[0]))
+        # One queued entry per route, at its most profitable size
+        self.assertEqual(len(detector.opportunity_queue), 1)
+        self.assertEqual(detector.next_opportunity().opportunity['amount'], 0.005)
+
+    def test_detector_scales_probes_and_values_profit_in_eth(self):
+        """Test probe sizes follow token decimals and profit is reported in ETH"""
+        weth, other, usdc, unknown = TOKENS[0], TOKENS[1], TOKENS[2], TOKENS[3]
+        cache = VersionedStateCache(fetch_block=lambda number: None)
+        cache.advance(BlockRef(100, '0x100', '0x99'))
+        pools = [
+            PoolReserves(f"0x{0xb1:040x}", 'uniswap_v2', usdc, other, 10 ** 12, 2 * 10 ** 24),
+            PoolReserves(f"0x{0xb2:040x}", 'aerodrome', other, usdc, 2 * 10 ** 24, 11 * 10 ** 11),
+            # 2500 USDC per WETH, only used to value the profit
+            PoolReserves(f"0x{0xb3:040x}", 'uniswap_v2', weth, usdc, 10 ** 21, 25 * 10 ** 11)
+        ]
+        for pool in pools:
+            cache.set((POOL_STATE_PREFIX, pool.address), pool)
+        registry = TokenRegistry(cache_path=None)
+        registry.add_token('WETH', weth, 18)
+        registry.add_token('USDC', usdc, 6)
+
+        detector = AdvancedArbitrageDetector(
+            ['Ethereum Sepolia'], {}, {'SUPPORTED_TOKENS': [usdc, unknown], 'WETH_ADDRESS': weth},
+            pool_state=cache, token_registry=registry
+        )
+        opportunities = detector.detect_arbitrage({}, {})
+
+        self.assertEqual(detector.route_detector.amounts, {usdc: [1000, 2000, 5000]})
+        self.assertEqual(sorted(o['amount'] for o in opportunities), [0.001, 0.002, 0.005])
+        for opportunity in opportunities:
+            self.assertGreater(opportunity['token_profit'], 0)
+            self.assertAlmostEqual(opportunity['profit'] * 2500 / opportunity['token_profit'], 1.0)
+        self.assertTrue(detector.validate_opportunity(opportunities[0]))
+
+    def test_detector_starts_pool_indexer(self):
+        """Test the detector keeps the pool universe growing from factory logs once started"""
+        indexer = Mock()
+        detector = AdvancedArbitrageDetector(
+            ['Ethereum Sepolia'], {}, {'POOL_UNIVERSE_SIZE': 20}, pool_indexer=indexer
+        )
+        self.assertIs(detector.pool_indexer, indexer)
+        self.assertIs(detector.pool_state, indexer.create_state_cache.return_value)
+        # Construction makes no RPC calls and starts no thread
+        indexer.load_pool_state.assert_not_called()
+        indexer.start.assert_not_called()
+
+        detector.start()
+        detector.start()
+        # Reserves of the top pools are cached before the first search, then reloaded every round
+        indexer.load_pool_state.assert_called_once_with(detector.pool_state, limit=200)
+        indexer.start.assert_called_once()
+        self.assertEqual(indexer.start.call_args.kwargs['registry_limit'], 20)
+        self.assertIs(indexer.start.call_args.kwargs['cache'], detector.pool_state)
+        # Without a Base connection there is nothing to index
+        self.assertIsNone(AdvancedArbitrageDetector(['Ethereum Sepolia'], {}, {}).pool_indexer)
+
+
+class TestIncrementalRouteDetector(unittest.TestCase):
+    """Test cases for IncrementalRouteDetector class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.rng = random.Random(11)
+        self.amounts = [10 ** 15, 10 ** 18, 5 * 10 ** 19]
+        self.pools = {pool.address: pool for pool in random_pools(self.rng, 20)}
+        self.detector = IncrementalRouteDetector(TOKENS, self.amounts)
+        self.detector.update(self.pools.values())
+
+    def assert_matches_full_search(self):
+        graph = RouteGraph.from_pools(list(self.pools.values()))
+        for start in TOKENS:
+            expected = graph.find_best_routes(start, self.amounts)
+            actual = self.detector.get_best_routes(start)
+            self.assertEqual(
+                {amount: route.profit for amount, route in actual.items()},
+                {amount: route.profit for amount, route in expected.items()}
+            )
+
+    def test_only_dirty_cycles_are_evaluated(self):
+        """Test each block re-quotes only cycles through the pools that traded"""
+        self.assert_matches_full_search()
+        total_cycles = self.detector.get_stats()['cycles']
+
+        for _ in range(30):
+            changed = []
+            for address in self.rng.sample(list(self.pools), 2):
+                pool = self.pools[address]
+                pool = replace(pool, reserve0=int(pool.reserve0 * self.rng.uniform(0.97, 1.03)))
+                self.pools[address] = pool
+                changed.append(pool)
+            dirty = self.detector.update(changed)
+
+            self.assertEqual(
+                dirty,
+                set().union(*(self.detector.cycles_by_pool.get(p.address.lower(), set()) for p in changed))
+            )
+            self.assertLess(self.detector.last_evaluated, total_cycles)
+            self.assert_matches_full_search()
+
+    def test_added_and_drained_pools(self):
+        """Test new pools are indexed and drained pools leave the candidate set"""
+        new_pool = PoolReserves('0xnew', 'uniswap_v2', TOKENS[0], TOKENS[5], 10 ** 21, 10 ** 22)
+        self.pools[new_pool.address] = new_pool
+        self.detector.update([new_pool])
+        self.assertIn('0xnew', self.detector.cycles_by_pool)
+        self.assert_matches_full_search()
+
+        drained = replace(new_pool, reserve0=0, reserve1=0)
+        del self.pools[new_pool.address]
+        self.detector.update([drained])
+        self.assertTrue(all('0xnew' not in key[1] for key in self.detector.candidates))
+        self.assert_matches_full_search()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for the multi-endpoint RPC provider pool
+
+@CONTEXT: Test suite for RPCProviderPool against local fake JSON-RPC servers
+          that inject latency and errors
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from web3 import Web3
+from dashboard.rpc_pool import RPCProviderPool
+
+
+class FakeRPCServer:
+    """Local JSON-RPC server answering eth_blockNumber with a fixed value"""
+
+    def __init__(self, block_number, delay=0.0, fail=False):
+        self.block_number = block_number
+        self.delay = delay
+        self.fail = fail
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                server.requests += 1
+                time.sleep(server.delay)
+                if server.fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                payload = json.dumps({
+                    'jsonrpc': '2.0',
+                    'id': body['id'],
+                    'result': hex(server.block_number)
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestRPCProviderPool(unittest.TestCase):
+    """Test cases for RPCProviderPool class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.servers = []
+
+    def tearDown(self):
+        """Clean up test environment"""
+        for server in self.servers:
+            server.stop()
+
+    def _server(self, block_number, delay=0.0, fail=False):
+        server = FakeRPCServer(block_number, delay=delay, fail=fail)
+        self.servers.append(server)
+        return server
+
+    def test_routes_to_fastest_endpoint(self):
+        """Test calls converge on the lowest latency endpoint"""
+        slow = self._server(1, delay=0.1)
+        fast = self._server(2)
+        w3 = Web3(RPCProviderPool([slow.url, fast.url]))
+
+        # First calls try the unmeasured endpoints, then latency decides
+        for _ in range(10):
+            w3.eth.block_number
+        slow_requests = slow.requests
+        for _ in range(10):
+            self.assertEqual(w3.eth.block_number, 2)
+        self.assertEqual(slow.requests, slow_requests)
+
+    def test_fails_over_and_opens_circuit(self):
+        """Test failing endpoints are skipped once their breaker opens"""
+        broken = self._server(1, fail=True)
+        healthy = self._server(2, delay=0.02)
+        pool = RPCProviderPool([broken.url, healthy.url], failure_threshold=2, cooldown=60)
+        w3 = Web3(pool)
+
+        for _ in range(5):
+            self.assertEqual(w3.eth.block_number, 2)
+        stats = {s['url']: s for s in pool.get_endpoint_stats()}
+        self.assertEqual(stats[broken.url]['state'], 'open')
+        self.assertLessEqual(broken.requests, 2)
+
+    def test_half_open_trial_closes_circuit(self):
+        """Test a recovered endpoint is let back in after the cooldown"""
+        flaky = self._server(1, fail=True)
+        pool = RPCProviderPool([flaky.url], failure_threshold=1, cooldown=0.05)
+        w3 = Web3(pool)
+
+        with self.assertRaises(Exception):
+            w3.eth.block_number
+        self.assertEqual(pool.endpoints[0].state, 'open')
+        flaky.fail = False
+        time.sleep(0.06)
+        self.assertEqual(w3.eth.block_number, 1)
+        self.assertEqual(pool.endpoints[0].state, 'closed')
+
+    def test_hedged_read_beats_stalled_endpoint(self):
+        """Test hedged reads return from the backup when the primary stalls"""
+        primary = self._server(1, delay=0.01)
+        backup = self._server(2, delay=0.01)
+        pool = RPCProviderPool([primary.url, backup.url], hedge=True, min_hedge_delay=0.02)
+        w3 = Web3(pool)
+        for _ in range(6):
+            w3.eth.block_number
+
+        best = pool._ranked()[0]
+        stalled = primary if best.url == primary.url else backup
+        stalled.delay = 1.0
+        start = time.perf_counter()
+        w3.eth.block_number
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreaterEqual(pool.get_hedge_stats()['hedge_wins'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
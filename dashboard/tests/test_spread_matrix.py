@@ -0,0 +1,118 @@
+"""
+Tests for the vectorized spread matrix
+
+@CONTEXT: Test suite for SpreadMatrix, checking the vectorized screen against
+          a nested-loop evaluation of every venue pair
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import random
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+from dashboard.dex_interface import DexInterface
+from dashboard.spread_matrix import SpreadMatrix, pairwise_spread_percent
+
+
+def nested_loop_spreads(quotes, min_spread_percent):
+    """Reference: net spread of every (token, buy venue, sell venue) above threshold"""
+    found = {}
+    for token, venues in quotes.items():
+        for buy_venue, (_, ask, fee_buy) in venues.items():
+            for sell_venue, (bid, _, fee_sell) in venues.items():
+                if buy_venue == sell_venue:
+                    continue
+                cost = ask * (1 + fee_buy)
+                spread = (bid * (1 - fee_sell) - cost) / cost * 100
+                if spread > min_spread_percent:
+                    found[(token, buy_venue, sell_venue)] = spread
+    return found
+
+
+class TestSpreadMatrix(unittest.TestCase):
+    """Test cases for SpreadMatrix class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.matrix = SpreadMatrix(initial_tokens=2, initial_venues=2)
+
+    def test_screen_matches_nested_loops(self):
+        """Test the vectorized screen returns exactly the nested-loop candidates"""
+        rng = random.Random(3)
+        quotes = {}
+        for t in range(40):
+            token = f"TOKEN{t}/USDC"
+            quotes[token] = {}
+            for v in range(rng.randint(1, 12)):
+                mid = 100.0 * (1 + rng.uniform(-0.02, 0.02))
+                half = mid * rng.uniform(0.0, 0.002)
+                fee = rng.choice([0.0005, 0.003])
+                quotes[token][f"dex{v}"] = (mid - half, mid + half, fee)
+                self.matrix.update(token, f"dex{v}", mid - half, mid + half, fee=fee)
+
+        expected = nested_loop_spreads(quotes, 0.5)
+        candidates = self.matrix.screen(0.5)
+
+        self.assertEqual(
+            {(c.token, c.buy_venue, c.sell_venue) for c in candidates}, set(expected)
+        )
+        for candidate in candidates:
+            key = (candidate.token, candidate.buy_venue, candidate.sell_venue)
+            self.assertAlmostEqual(candidate.spread_percent, expected[key], places=9)
+        spreads = [c.spread_percent for c in candidates]
+        self.assertEqual(spreads, sorted(spreads, reverse=True))
+
+    def test_unquoted_and_stale_cells_are_ignored(self):
+        """Test missing and stale quotes never produce candidates"""
+        self.matrix.update('WETH/USDC', 'uniswap_v3', 3000.0, timestamp=0)
+        self.matrix.update('WETH/USDC', 'aerodrome', 3100.0)
+        self.matrix.update('WETH/DAI', 'aerodrome', 3000.0)
+
+        self.assertEqual(len(self.matrix.screen(1.0)), 1)
+        self.assertEqual(self.matrix.screen(1.0, max_age=60), [])
+        self.matrix.remove('WETH/USDC', 'aerodrome')
+        self.assertEqual(self.matrix.screen(1.0), [])
+
+    def test_pairwise_spread_percent(self):
+        """Test the single-token helper matches the scalar formula"""
+        spreads = pairwise_spread_percent([100.0, 102.0, 99.0])
+        self.assertTrue(np.isnan(spreads[1, 1]))
+        self.assertAlmostEqual(spreads[0, 1], 2.0)
+        self.assertAlmostEqual(spreads[1, 2], 3 / 102 * 100)
+
+
+class TestDexInterfaceScreen(unittest.TestCase):
+    """Test cases for DexInterface.check_arbitrage_opportunities"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.dex = DexInterface.__new__(DexInterface)
+        self.dex.dex_config = {
+            'dexes': {
+                'uniswap_v3': {'pools': {'WETH/USDC': {'fee': 500}}},
+                'aerodrome': {'pools': {'WETH/USDC': {}}}
+            },
+            'pairs': [{'name': 'WETH/USDC', 'min_profit_threshold': '0.002'}]
+        }
+
+    def check(self, uniswap_price, aerodrome_price):
+        prices = {'uniswap_v3': {'WETH/USDC': uniswap_price}, 'aerodrome': {'WETH/USDC': aerodrome_price}}
+        with patch.object(DexInterface, 'get_all_prices', return_value=prices):
+            return self.dex.check_arbitrage_opportunities()
+
+    def test_threshold_is_a_fraction_after_fees(self):
+        """Test a 0.002 threshold means 0.2% net of both pools' swap fees"""
+        self.assertEqual(self.dex._swap_fee('uniswap_v3', 'WETH/USDC'), 0.0005)
+        self.assertEqual(self.dex._swap_fee('aerodrome', 'WETH/USDC'), 0.003)
+
+        # 0.5% gross clears 0.2% before fees but not after 0.35% of fees
+        self.assertEqual(self.check(Decimal('3000'), Decimal('3015')), {})
+
+        opportunity = self.check(Decimal('3000'), Decimal('3020'))['WETH/USDC']
+        self.assertEqual((opportunity['buy_dex'], opportunity['sell_dex']), ('uniswap_v3', 'aerodrome'))
+        self.assertAlmostEqual(opportunity['price_difference_percent'], (3020 * 0.997 / (3000 * 1.0005) - 1) * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for the reorg-aware versioned state cache
+
+@CONTEXT: Test suite for VersionedStateCache against a simulated chain that
+          can fork and replace its most recent blocks
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import unittest
+from dashboard.state_cache import BlockRef, VersionedStateCache
+
+
+class SimulatedChain:
+    """Canonical chain of blocks whose tip can be replaced by a competing fork
+
+    Each block carries a pool price so replays can be checked against the
+    branch that finally won.
+    """
+
+    def __init__(self):
+        self.blocks = [BlockRef(0, '0x0-genesis', '0x')]
+        self.prices = {self.blocks[0].hash: 1000}
+        self.fetches = []
+
+    @property
+    def head(self):
+        return self.blocks[-1]
+
+    def mine(self, price, branch='a'):
+        parent = self.head
+        block = BlockRef(parent.number + 1, f"0x{parent.number + 1}-{branch}", parent.hash)
+        self.blocks.append(block)
+        self.prices[block.hash] = price
+        return block
+
+    def fork(self, depth, prices, branch='b'):
+        """Drop the last `depth` blocks and mine a competing branch in their place"""
+        del self.blocks[-depth:]
+        return [self.mine(price, branch) for price in prices]
+
+    def fetch_block(self, number):
+        self.fetches.append(number)
+        return self.blocks[number] if number < len(self.blocks) else None
+
+    def load_updates(self, block):
+        return {'pool:WETH/USDC': self.prices[block.hash]}
+
+
+class TestVersionedStateCache(unittest.TestCase):
+    """Test cases for VersionedStateCache class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.chain = SimulatedChain()
+        self.cache = VersionedStateCache(
+            fetch_block=self.chain.fetch_block,
+            load_updates=self.chain.load_updates,
+            max_depth=8
+        )
+        self.cache.advance(self.chain.head, self.chain.load_updates(self.chain.head))
+
+    def _mine(self, price):
+        block = self.chain.mine(price)
+        return self.cache.advance(block, self.chain.load_updates(block))
+
+    def test_linear_chain_versions_values(self):
+        """Test values carry the block they were read at"""
+        for price in (1001, 1002, 1003):
+            self.assertIsNone(self._mine(price))
+        value, version = self.cache.get_versioned('pool:WETH/USDC')
+        self.assertEqual(value, 1003)
+        self.assertEqual(version, self.chain.head)
+        self.assertEqual(self.chain.fetches, [])
+
+    def test_reorg_rolls_back_and_replays_fork(self):
+        """Test a two-block reorg rewinds to the fork point and replays the new branch"""
+        for price in (1001, 1002, 1003):
+            self._mine(price)
+        self.cache.set('balance:bot', 5)
+
+        new_blocks = self.chain.fork(2, [990, 995, 997])
+        event = self.cache.advance(new_blocks[-1], self.chain.load_updates(new_blocks[-1]))
+
+        self.assertIsNotNone(event)
+        self.assertEqual(event.fork_block, 1)
+        self.assertEqual(event.depth, 2)
+        self.assertEqual(self.cache.head, self.chain.head)
+        self.assertEqual(self.cache.get('pool:WETH/USDC'), 997)
+        # Written on the orphaned head, so it is gone
+        self.assertIsNone(self.cache.get('balance:bot'))
+        # Only the replaced range was fetched again
+        self.assertTrue(all(n >= 1 for n in self.chain.fetches))
+        for number in range(1, self.chain.head.number + 1):
+            self.assertTrue(self.cache.is_canonical(self.chain.blocks[number]))
+
+    def test_stale_write_rejected(self):
+        """Test values read at an orphaned block cannot be stored"""
+        self._mine(1001)
+        orphan = self.chain.head
+        new_blocks = self.chain.fork(1, [1100, 1101])
+        self.cache.advance(new_blocks[-1], self.chain.load_updates(new_blocks[-1]))
+
+        self.assertFalse(self.cache.set('pool:WETH/USDC', 1001, block=orphan))
+        self.assertEqual(self.cache.get('pool:WETH/USDC'), 1101)
+
+    def test_reorg_deeper_than_window_resets(self):
+        """Test a reorg past the undo window clears the cache"""
+        for price in range(1001, 1011):
+            self._mine(price)
+        new_blocks = self.chain.fork(9, [900] * 9)
+        event = self.cache.advance(new_blocks[-1], self.chain.load_updates(new_blocks[-1]))
+
+        self.assertTrue(event.full_reset)
+        self.assertEqual(self.cache.get('pool:WETH/USDC'), 900)
+        self.assertEqual(self.cache.head, self.chain.head)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+"""
+Tests for the WebSocket subscription hub
+
+@CONTEXT: Test suite for SubscriptionHub against a local WebSocket JSON-RPC
+          stub that emits heads, logs and pending transactions and can drop
+          connections
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import json
+import threading
+import time
+import unittest
+from websockets.sync.server import serve
+from dashboard.subscription_hub import SubscriptionHub
+
+POOL_A = '0x00000000000000000000000000000000000000a1'
+POOL_B = '0x00000000000000000000000000000000000000b2'
+SWAP = '0x' + 'c4' * 32
+
+
+class WebSocketNodeStub:
+    """Local node answering eth_subscribe, eth_blockNumber, eth_getBlockByNumber and eth_getLogs"""
+
+    def __init__(self):
+        self.head = 10
+        self.logs = []
+        self.connections = []
+        self.connection_count = 0
+        self.subscribe_requests = []
+        self._ids = 0
+        self._lock = threading.Lock()
+        self.server = serve(self._handler, '127.0.0.1', 0)
+        self.url = f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def _handler(self, ws):
+        state = {'ws': ws, 'subs': {}}
+        with self._lock:
+            self.connections.append(state)
+            self.connection_count += 1
+        for raw in ws:
+            request = json.loads(raw)
+            method, params = request['method'], request['params']
+            if method == 'eth_subscribe':
+                with self._lock:
+                    self._ids += 1
+                    sub_id = hex(self._ids)
+                    state['subs'][sub_id] = params
+                    self.subscribe_requests.append(params)
+                result = sub_id
+            elif method == 'eth_unsubscribe':
+                result = state['subs'].pop(params[0], None) is not None
+            elif method == 'eth_blockNumber':
+                result = hex(self.head)
+            elif method == 'eth_getBlockByNumber':
+                result = self._header(int(params[0], 16))
+            elif method == 'eth_getLogs':
+                log_filter = params[0]
+                start, end = int(log_filter['fromBlock'], 16), int(log_filter['toBlock'], 16)
+                result = [
+                    log for log in self.logs
+                    if start <= int(log['blockNumber'], 16) <= end and self._matches(log, log_filter)
+                ]
+            ws.send(json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'result': result}))
+
+    def _header(self, number):
+        return {'number': hex(number), 'hash': '0x' + f'{number:064x}'}
+
+    @staticmethod
+    def _matches(log, log_filter):
+        if 'address' in log_filter and log['address'] not in log_filter['address']:
+            return False
+        if 'topics' in log_filter and log['topics'][0] not in log_filter['topics'][0]:
+            return False
+        return True
+
+    def _notify(self, kind, result):
+        with self._lock:
+            connections = list(self.connections)
+        for state in connections:
+            for sub_id, params in list(state['subs'].items()):
+                if params[0] != kind:
+                    continue
+                if kind == 'logs' and not self._matches(result, params[1] if len(params) > 1 else {}):
+                    continue
+                try:
+                    state['ws'].send(json.dumps({
+                        'jsonrpc': '2.0',
+                        'method': 'eth_subscription',
+                        'params': {'subscription': sub_id, 'result': result}
+                    }))
+                except Exception:
+                    pass
+
+    def mine(self, log_addresses=(), notify=True):
+        self.head += 1
+        new_logs = [
+            {
+                'address': address,
+                'topics': [SWAP],
+                'blockNumber': hex(self.head),
+                'blockHash': '0x' + f'{self.head:064x}',
+                'logIndex': hex(index)
+            }
+            for index, address in enumerate(log_addresses)
+        ]
+        self.logs.extend(new_logs)
+        if notify:
+            self._notify('newHeads', self._header(self.head))
+            for log in new_logs:
+                self._notify('logs', log)
+
+    def pending(self, tx_hash):
+        self._notify('newPendingTransactions', tx_hash)
+
+    def drop_connections(self):
+        with self._lock:
+            connections, self.connections = self.connections, []
+        for state in connections:
+            state['ws'].close()
+
+    def stop(self):
+        self.drop_connections()
+        self.server.shutdown()
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSubscriptionHub(unittest.TestCase):
+    """Test cases for SubscriptionHub class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.node = WebSocketNodeStub()
+        self.hub = SubscriptionHub(self.node.url, reconnect_delay=0.05)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.hub.stop()
+        self.node.stop()
+
+    def _start(self):
+        self.hub.start()
+        self.assertTrue(self.hub.wait_connected(3))
+
+    def test_fans_out_over_one_connection(self):
+        """Test several subscribers share one socket and one node subscription per kind"""
+        heads_a = self.hub.subscribe_heads()
+        heads_b = self.hub.subscribe_heads()
+        pending = self.hub.subscribe_pending()
+        self._start()
+
+        self.node.mine()
+        self.node.pending('0x' + 'ab' * 32)
+        self.assertIsNotNone(heads_a.get(timeout=2))
+        self.assertIsNotNone(heads_b.get(timeout=2))
+        self.assertEqual(pending.get(timeout=2), '0x' + 'ab' * 32)
+        self.assertEqual(self.node.connection_count, 1)
+        self.assertEqual(len([p for p in self.node.subscribe_requests if p[0] == 'newHeads']), 1)
+
+    def test_merges_log_filters(self):
+        """Test log subscribers share a merged filter and only see their own logs"""
+        self._start()
+        logs_a = self.hub.subscribe_logs(address=POOL_A, topics=[SWAP])
+        logs_b = self.hub.subscribe_logs(address=POOL_B, topics=[SWAP])
+
+        remote = self.hub.merged_logs_filter()
+        self.assertEqual(remote['address'], [POOL_A, POOL_B])
+        self.assertEqual(remote['topics'], [[SWAP]])
+
+        self.node.mine(log_addresses=[POOL_A, POOL_B])
+        self.assertEqual(logs_a.get(timeout=2)['address'], POOL_A)
+        self.assertEqual(logs_b.get(timeout=2)['address'], POOL_B)
+        self.assertIsNone(logs_a.get(timeout=0.1))
+
+    def test_reconnect_backfills_gap(self):
+        """Test blocks mined while disconnected are replayed in order"""
+        heads = self.hub.subscribe_heads()
+        logs = self.hub.subscribe_logs(address=POOL_A)
+        self._start()
+        self.node.mine(log_addresses=[POOL_A])
+        self.assertTrue(_wait_for(lambda: self.hub.last_head == 11))
+
+        # Blocks the hub never hears about, then the connection drops
+        for _ in range(3):
+            self.node.mine(log_addresses=[POOL_A], notify=False)
+        self.node.drop_connections()
+        self.assertTrue(_wait_for(lambda: self.hub.last_head == 14))
+
+        numbers = [int(h['number'], 16) for h in heads.drain()]
+        self.assertEqual(numbers, [11, 12, 13, 14])
+        log_blocks = [int(log['blockNumber'], 16) for log in logs.drain()]
+        self.assertEqual(log_blocks, [11, 12, 13, 14])
+        self.assertEqual(self.hub.get_stats()['reconnects'], 1)
+
+    def test_reorged_heads_are_delivered_once(self):
+        """Test heads are deduplicated by hash, not dropped for not raising the height"""
+        heads = self.hub.subscribe_heads()
+        self._start()
+        self.node.mine()
+        self.node.mine()
+        self.assertTrue(_wait_for(lambda: self.hub.last_head == 12))
+
+        reorged = {'number': hex(12), 'hash': '0x' + 'ab' * 32}
+        self.node._notify('newHeads', reorged)
+        self.node._notify('newHeads', reorged)
+        self.node._notify('newHeads', {'number': hex(11), 'hash': '0x' + 'cd' * 32})
+        self.node._notify('newHeads', self.node._header(12))
+        hashes = []
+        self.assertTrue(_wait_for(lambda: hashes.extend(h['hash'] for h in heads.drain()) or len(hashes) >= 4))
+        time.sleep(0.05)
+        hashes.extend(h['hash'] for h in heads.drain())
+        self.assertEqual(self.hub.last_head, 11)
+        self.assertEqual(hashes, [
+            self.node._header(11)['hash'], self.node._header(12)['hash'], '0x' + 'ab' * 32, '0x' + 'cd' * 32
+        ])
+
+    def test_bounded_queue_drops_oldest(self):
+        """Test a slow subscriber keeps the newest events"""
+        heads = self.hub.subscribe_heads(maxsize=2)
+        self._start()
+        for _ in range(5):
+            self.node.mine()
+        self.assertTrue(_wait_for(lambda: self.hub.last_head == 15))
+        self.assertEqual([int(h['number'], 16) for h in heads.drain()], [14, 15])
+        self.assertEqual(heads.dropped, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
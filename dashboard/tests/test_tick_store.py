@@ -0,0 +1,157 @@
+"""
+Tests for the columnar tick store
+
+@CONTEXT: Test suite for TickStore day segmentation, ordered appends,
+          zero-copy range reads, reopening and SQLite import
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import resource
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+import numpy as np
+
+from dashboard.db_pool import get_database_pool
+from dashboard.tick_store import MAX_MAPPED_SEGMENTS, NS_PER_DAY, NS_PER_SECOND, TickStore, to_ns
+
+DAY0 = to_ns(datetime(2026, 10, 1, tzinfo=timezone.utc))
+
+
+class TestTickStore(unittest.TestCase):
+    """Test cases for TickStore class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = TickStore(os.path.join(self.temp_dir, 'ticks'))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def at(self, timestamp_ns):
+        return np.datetime64(int(timestamp_ns), 'ns')
+
+    def fill(self, series, days=3, per_day=1000):
+        timestamps = DAY0 + np.arange(days * per_day, dtype=np.int64) * (NS_PER_DAY // per_day)
+        prices = np.arange(len(timestamps), dtype=np.float64)
+        venues = np.full(len(timestamps), self.store.venue_id('uniswap_v3'), dtype=np.int32)
+        self.assertEqual(self.store.append_many(series, timestamps, prices, prices * 10, venues), len(timestamps))
+        return timestamps
+
+    def test_segments_by_day(self):
+        """Test a block spanning days is split into one segment per UTC day"""
+        self.fill('ETH/USDC/0.05%', days=3)
+        self.assertEqual(self.store.days('ETH/USDC/0.05%'), ['2026-10-01', '2026-10-02', '2026-10-03'])
+        self.assertEqual(self.store.series(), ['ETH/USDC/0.05%'])
+        size = os.path.getsize(os.path.join(self.store._day_dir('ETH/USDC/0.05%', '2026-10-02'), 'timestamp.bin'))
+        self.assertEqual(size, 1000 * 8)
+
+    def test_range_reads(self):
+        """Test time range reads within a day are views and across days are exact"""
+        timestamps = self.fill('WETH/USDC')
+
+        within = self.store.read_range('WETH/USDC', self.at(timestamps[100]), self.at(timestamps[200]))
+        self.assertEqual(len(within), 100)
+        self.assertIsInstance(within.price, np.memmap)
+        self.assertFalse(within.price.flags.writeable)
+        np.testing.assert_array_equal(within.price, np.arange(100, 200))
+        np.testing.assert_array_equal(within.liquidity, np.arange(100, 200) * 10.0)
+
+        across = self.store.read_range('WETH/USDC', self.at(timestamps[900]), self.at(timestamps[2100]))
+        np.testing.assert_array_equal(across.price, np.arange(900, 2100))
+        self.assertEqual(across.datetimes()[0], self.at(timestamps[900]))
+        self.assertEqual(len(self.store.read_range('WETH/USDC')), 3000)
+        self.assertEqual(len(self.store.read_range('WETH/USDC', self.at(DAY0 + 10 * NS_PER_DAY))), 0)
+        self.assertEqual(len(self.store.read_range('missing')), 0)
+
+        latest = self.store.latest('WETH/USDC', 1500)
+        np.testing.assert_array_equal(latest.price, np.arange(1500, 3000))
+
+    def test_months_of_history_within_fd_limit(self):
+        """Test reading more day segments than the open file limit could keep mapped"""
+        series_names = ['WETH/USDC', 'WBTC/USDC', 'cbETH/WETH']
+        for series in series_names:
+            self.fill(series, days=90, per_day=4)
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (256, hard))  # 3 series x 90 days x 4 columns > 256
+        try:
+            for series in series_names:
+                for day in range(90):
+                    start, end = DAY0 + day * NS_PER_DAY, DAY0 + (day + 1) * NS_PER_DAY
+                    self.assertEqual(len(self.store.read_range(series, self.at(start), self.at(end))), 4)
+                ticks = self.store.read_range(series)
+                np.testing.assert_array_equal(ticks.price, np.arange(360))
+                self.assertEqual(len(self.store.latest(series, 300)), 300)
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+        self.assertEqual(self.store.get_stats()['mapped_segments'], MAX_MAPPED_SEGMENTS)
+
+    def test_single_appends_and_ordering(self):
+        """Test per-tick appends are readable at once and older ticks are rejected"""
+        start = DAY0 / NS_PER_SECOND
+        self.assertTrue(self.store.append('ETH/USDC', start, 2500.0, 1e6, venue='aerodrome'))
+        self.assertTrue(self.store.append('ETH/USDC', datetime(2026, 10, 1, 0, 0, 1, tzinfo=timezone.utc), 2501.0))
+        self.assertFalse(self.store.append('ETH/USDC', start, 2499.0))
+
+        ticks = self.store.read_range('ETH/USDC')
+        np.testing.assert_array_equal(ticks.price, [2500.0, 2501.0])
+        np.testing.assert_array_equal(ticks.venue, [self.store.venue_id('aerodrome'), -1])
+        self.assertEqual(self.store.get_stats()['ticks_rejected'], 1)
+
+        with self.assertRaises(ValueError):
+            self.store.append_many('ETH/USDC', np.array([DAY0 + NS_PER_DAY]), np.array([1.0, 2.0]))
+
+    def test_reopen_and_torn_append(self):
+        """Test a reopened store sees stored ticks and venues and ignores partial rows"""
+        timestamps = self.fill('WETH/USDC', days=1, per_day=10)
+        self.store.close()
+        day_dir = self.store._day_dir('WETH/USDC', '2026-10-01')
+        with open(os.path.join(day_dir, 'price.bin'), 'ab') as f:
+            f.write(np.float64(99.0).tobytes())  # price written, other columns lost
+
+        reopened = TickStore(self.store.root_dir)
+        self.assertEqual(reopened.venue_id('uniswap_v3'), 0)
+        self.assertEqual(len(reopened.read_range('WETH/USDC')), 10)
+        self.assertFalse(reopened.append('WETH/USDC', self.at(timestamps[0]), 1.0))
+
+        # Appending after the torn row keeps every column aligned
+        self.assertTrue(reopened.append('WETH/USDC', self.at(timestamps[-1] + 1), 42.0, 7.0))
+        reopened.flush()
+        columns = reopened.read_range('WETH/USDC')
+        self.assertEqual(len(columns), 11)
+        self.assertEqual(columns.timestamp[-1], timestamps[-1] + 1)
+        self.assertEqual(columns.price[-1], 42.0)
+        self.assertEqual(columns.price[-2], 9.0)
+        self.assertEqual(os.path.getsize(os.path.join(day_dir, 'price.bin')), 11 * 8)
+        reopened.close()
+
+    def test_import_price_history(self):
+        """Test the SQLite price_history table imports once per token"""
+        db_path = os.path.join(self.temp_dir, 'test.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE price_history (id INTEGER PRIMARY KEY, timestamp INTEGER, token_address TEXT, price DECIMAL(18,8))')
+        base = DAY0 // NS_PER_SECOND
+        rows = [(base + i, token, 1.0 + i) for i in range(50) for token in ('0xaaa', '0xbbb')]
+        conn.executemany('INSERT INTO price_history (timestamp, token_address, price) VALUES (?, ?, ?)', rows)
+        conn.commit()
+        conn.close()
+
+        try:
+            self.assertEqual(self.store.import_price_history(db_path, batch_size=30), 100)
+            self.assertEqual(self.store.import_price_history(db_path), 0)
+            ticks = self.store.read_range('0xbbb')
+            np.testing.assert_array_equal(ticks.timestamp // NS_PER_SECOND, base + np.arange(50))
+        finally:
+            get_database_pool(db_path).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the token and pool registry
+
+@CONTEXT: Test suite for TokenRegistry lookups and metadata cache
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+from dashboard.token_registry import TokenRegistry
+
+WETH = '0x4200000000000000000000000000000000000006'
+USDC = '0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913'
+POOL = '0xb2cc224c1c9feE385f8ad6a55b4d94E92359DC59'
+
+DEX_CONFIG = {
+    'dexes': {
+        'uniswap_v3': {
+            'type': 'UniswapV3',
+            'pools': {
+                'WETH/USDC': {
+                    'address': POOL,
+                    'token0': WETH,
+                    'token1': USDC,
+                    'fee': 100
+                }
+            }
+        }
+    },
+    'tokens': {
+        'WETH': {'address': WETH, 'decimals': 18},
+        'USDC': {'address': USDC, 'decimals': 6}
+    }
+}
+
+
+class TestTokenRegistry(unittest.TestCase):
+    """Test cases for TokenRegistry class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmpdir.name, 'tokens.json')
+        self.registry = TokenRegistry(cache_path=self.cache_path)
+        self.registry.load_dex_config(DEX_CONFIG)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.registry.flush()
+        self.tmpdir.cleanup()
+
+    def test_token_lookups(self):
+        """Test symbol and address lookups with any casing"""
+        self.assertEqual(self.registry.get_by_symbol('weth').address, WETH)
+        self.assertEqual(self.registry.get_by_address(USDC.lower()).symbol, 'USDC')
+        self.assertEqual(self.registry.get_token('USDC').decimals, 6)
+        self.assertIsNone(self.registry.get_by_symbol('DAI'))
+
+    def test_addresses_are_interned(self):
+        """Test that equal addresses resolve to the same object"""
+        first = self.registry.intern(USDC.lower())
+        second = self.registry.intern(USDC.upper().replace('0X', '0x'))
+        self.assertEqual(first, USDC)
+        self.assertIs(first, second)
+
+    def test_pool_lookup_either_order(self):
+        """Test pool lookup by pair, DEX and fee"""
+        pool = self.registry.get_pool('WETH', 'USDC', 'uniswap_v3', 100)
+        self.assertEqual(pool.address, POOL)
+        self.assertIs(self.registry.get_pool(USDC, WETH, 'uniswap_v3', 100), pool)
+        self.assertIs(self.registry.get_pool_by_address(POOL.lower()), pool)
+        self.assertIsNone(self.registry.get_pool('WETH', 'USDC', 'uniswap_v3', 500))
+
+    def test_feeless_pools_keyed_by_stable_and_tick_spacing(self):
+        """Test Aerodrome pools without a fee tier do not overwrite each other"""
+        volatile = '0x00000000000000000000000000000000000000a1'
+        stable = '0x00000000000000000000000000000000000000a2'
+        cl_1 = '0x00000000000000000000000000000000000000a3'
+        cl_100 = '0x00000000000000000000000000000000000000a4'
+        self.registry.add_pool('aerodrome', volatile, WETH, USDC, stable=False)
+        self.registry.add_pool('aerodrome', stable, WETH, USDC, stable=True)
+        self.registry.add_pool('aerodrome_cl', cl_1, WETH, USDC, tick_spacing=1)
+        self.registry.add_pool('aerodrome_cl', cl_100, WETH, USDC, tick_spacing=100)
+
+        self.assertEqual(self.registry.get_pool('WETH', 'USDC', 'aerodrome', stable=True).address.lower(), stable)
+        self.assertEqual(self.registry.get_pool('WETH', 'USDC', 'aerodrome', stable=False).address.lower(), volatile)
+        self.assertEqual(
+            self.registry.get_pool(USDC, WETH, 'aerodrome_cl', tick_spacing=100).address.lower(), cl_100
+        )
+        self.assertEqual(len(self.registry.get_pools('WETH', 'USDC')), 5)
+        self.assertEqual(len(self.registry.get_pools('WETH', 'USDC', 'aerodrome_cl')), 2)
+
+    def test_decimals_fetched_once_and_persisted(self):
+        """Test on-chain metadata is fetched once and cached to disk"""
+        token = '0x50c5725949A6F0c72E6C4a641F24049A917DB0Cb'
+        web3 = Mock()
+        functions = web3.eth.contract.return_value.functions
+        functions.symbol.return_value.call.return_value = 'DAI'
+        functions.decimals.return_value.call.return_value = 18
+
+        self.assertEqual(self.registry.get_decimals(token, web3), 18)
+        self.assertEqual(self.registry.get_decimals(token, web3), 18)
+        self.assertEqual(functions.decimals.return_value.call.call_count, 1)
+
+        self.registry.flush()
+        with open(self.cache_path) as f:
+            cached = json.load(f)
+        self.assertEqual(cached['tokens'][token]['symbol'], 'DAI')
+
+        reloaded = TokenRegistry(cache_path=self.cache_path)
+        self.assertEqual(reloaded.get_decimals(token), 18)
+        self.assertEqual(reloaded.get_symbol(token), 'DAI')
+
+    def test_cache_saved_once_per_batch(self):
+        """Test fetching many tokens rewrites the cache file once"""
+        web3 = Mock()
+        functions = web3.eth.contract.return_value.functions
+        functions.symbol.return_value.call.return_value = 'TKN'
+        functions.decimals.return_value.call.return_value = 18
+        tokens = [f"0x{i:040x}" for i in range(1, 21)]
+
+        with patch.object(self.registry, 'save_cache', wraps=self.registry.save_cache) as save:
+            for token in tokens:
+                self.registry.get_decimals(token, web3)
+            self.assertFalse(os.path.exists(self.cache_path))
+            self.registry.flush()
+            self.registry.flush()
+        self.assertEqual(save.call_count, 1)
+        with open(self.cache_path) as f:
+            self.assertEqual(len(json.load(f)['tokens']), len(tokens) + 2)
+
+    def test_decimals_kept_when_symbol_fails(self):
+        """Test a reverting symbol() does not lose the token's decimals"""
+        token = '0x50c5725949A6F0c72E6C4a641F24049A917DB0Cb'
+        web3 = Mock()
+        functions = web3.eth.contract.return_value.functions
+        functions.symbol.return_value.call.side_effect = ValueError('execution reverted')
+        functions.decimals.return_value.call.return_value = 8
+
+        self.assertEqual(self.registry.get_decimals(token, web3), 8)
+        self.assertEqual(self.registry.get_symbol(token), token)
+
+    def test_failed_fetches_not_retried_within_ttl(self):
+        """Test addresses whose decimals cannot be fetched are negatively cached"""
+        token = '0x50c5725949A6F0c72E6C4a641F24049A917DB0Cb'
+        web3 = Mock()
+        decimals_call = web3.eth.contract.return_value.functions.decimals.return_value.call
+        decimals_call.side_effect = ValueError('not a contract')
+
+        self.assertIsNone(self.registry.get_decimals(token, web3))
+        self.assertIsNone(self.registry.get_decimals(token, web3))
+        self.assertEqual(decimals_call.call_count, 1)
+
+        decimals_call.side_effect = None
+        decimals_call.return_value = 18
+        with patch('dashboard.token_registry.time.time', return_value=time.time() + 301):
+            self.assertEqual(self.registry.get_decimals(token, web3), 18)
+
+
+if __name__ == '__main__':
+    unittest.main()
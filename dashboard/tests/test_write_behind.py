@@ -0,0 +1,156 @@
+"""
+Tests for the write-behind SQLite writer
+
+@CONTEXT: Test suite for WriteBehindWriter batching, flush and shutdown
+          guarantees, and queue backpressure
+@LAST_POINT: 2026-10-18 - Initial test implementation
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from dashboard.db_pool import get_database_pool
+from dashboard.write_behind import WriteBehindWriter
+
+INSERT_PRICE = 'INSERT INTO dex_prices (token_pair, dex, price, timestamp) VALUES (?, ?, ?, ?)'
+INSERT_TRADE = 'INSERT INTO trades (tx_hash, profit) VALUES (?, ?)'
+
+
+class TestWriteBehindWriter(unittest.TestCase):
+    """Test cases for WriteBehindWriter class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE dex_prices (token_pair TEXT, dex TEXT, price REAL, timestamp INTEGER)')
+        conn.execute('CREATE TABLE trades (tx_hash TEXT, profit REAL)')
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        get_database_pool(self.db_path).close()
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def count(self, table):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_many_producers_few_transactions(self):
+        """Test rows from concurrent producers land in batched transactions"""
+        writer = WriteBehindWriter(self.db_path, max_batch=200, flush_interval=0.05)
+
+        def produce(worker):
+            for i in range(500):
+                writer.submit(INSERT_PRICE, (f'PAIR{worker}', 'dex', float(i), i))
+            writer.submit(INSERT_TRADE, (f'0x{worker}', 1.5))
+
+        threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual(self.count('dex_prices'), 2000)
+        self.assertEqual(self.count('trades'), 4)
+        stats = writer.get_stats()
+        self.assertEqual(stats['rows_written'], 2004)
+        self.assertLess(stats['flushes'], 100)
+        self.assertGreater(stats['rows_per_second'], 0)
+        writer.close()
+
+    def test_flush_interval_bounds_latency(self):
+        """Test a lone row is committed without waiting for a full batch"""
+        writer = WriteBehindWriter(self.db_path, max_batch=1000, flush_interval=0.02)
+        writer.submit(INSERT_TRADE, ('0x1', 2.0))
+        self.assertTrue(writer.flush(timeout=2))
+        self.assertEqual(self.count('trades'), 1)
+        self.assertLess(writer.get_stats()['max_queue_delay_ms'], 1000)
+        writer.close()
+
+    def test_close_drains_queue(self):
+        """Test close writes every queued row and later submits are refused"""
+        writer = WriteBehindWriter(self.db_path, max_batch=50, flush_interval=10)
+        for i in range(120):
+            writer.submit(INSERT_TRADE, (f'0x{i}', float(i)))
+        writer.close()
+
+        self.assertEqual(self.count('trades'), 120)
+        self.assertFalse(writer.submit(INSERT_TRADE, ('0xlate', 0.0)))
+
+    def test_row_accepted_while_closing_is_written(self):
+        """Test a submit() that passed the closed check before close() still lands"""
+        writer = WriteBehindWriter(self.db_path, flush_interval=10)
+        put = writer._queue.put
+        in_submit = threading.Event()
+        release = threading.Event()
+        accepted = []
+
+        def slow_put(item, *args, **kwargs):
+            if item[0] is not None:
+                in_submit.set()
+                release.wait(5)
+            return put(item, *args, **kwargs)
+
+        writer._queue.put = slow_put
+        producer = threading.Thread(target=lambda: accepted.append(writer.submit(INSERT_TRADE, ('0xrace', 0.0))))
+        producer.start()
+        in_submit.wait(5)
+        closer = threading.Thread(target=writer.close)
+        closer.start()
+        # close() waits for the in-progress submit rather than stopping the writer under it
+        closer.join(0.2)
+        release.set()
+        producer.join()
+        closer.join()
+
+        self.assertEqual(accepted, [True])
+        self.assertEqual(self.count('trades'), 1)
+
+    def test_bad_row_does_not_lose_batch(self):
+        """Test a failing batch is retried row by row and only the bad row is dropped"""
+        writer = WriteBehindWriter(self.db_path, max_batch=1000, flush_interval=10)
+        for i in range(10):
+            writer.submit(INSERT_TRADE, (f'0x{i}', float(i)))
+        writer.submit(INSERT_TRADE, ('0xbad',))  # wrong number of bindings
+        writer.submit(INSERT_PRICE, ('WETH/USDC', 'dex', 1.0, 1))
+        with self.assertLogs('dashboard.write_behind', level='ERROR') as logs:
+            self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual(self.count('trades'), 10)
+        self.assertEqual(self.count('dex_prices'), 1)
+        stats = writer.get_stats()
+        self.assertEqual(stats['rows_written'], 11)
+        self.assertEqual(stats['rows_failed'], 1)
+        self.assertIn('0xbad', logs.output[0])
+        writer.close()
+
+    def test_backpressure_drops_when_full(self):
+        """Test a stalled writer fills the bounded queue and excess rows are dropped"""
+        blocker = sqlite3.connect(self.db_path)
+        blocker.execute('BEGIN EXCLUSIVE')
+        writer = WriteBehindWriter(self.db_path, max_batch=1, flush_interval=0, max_queue=5, put_timeout=0.01)
+
+        accepted = sum(writer.submit(INSERT_TRADE, (f'0x{i}', 0.0)) for i in range(20))
+        blocker.rollback()
+        blocker.close()
+        writer.close()
+
+        stats = writer.get_stats()
+        self.assertLess(accepted, 20)
+        self.assertEqual(stats['rows_dropped'], 20 - accepted)
+        self.assertEqual(self.count('trades'), accepted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,457 @@
+"""Append-only columnar tick store segmented by day into memory-mapped NumPy column files"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from .db_pool import get_database_pool
+
+logger = logging.getLogger(__name__)
+
+# One file per column per day; the row count is implied by the file size
+TICK_COLUMNS: Dict[str, np.dtype] = {
+    'timestamp': np.dtype('<i8'),   # nanoseconds since the Unix epoch (UTC)
+    'price': np.dtype('<f8'),
+    'liquidity': np.dtype('<f8'),
+    'venue': np.dtype('<i4')
+}
+TICK_DTYPE = np.dtype([(name, dtype) for name, dtype in TICK_COLUMNS.items()])
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86400 * NS_PER_SECOND
+UNKNOWN_VENUE = -1
+# Each mapped column holds a file descriptor, so only this many day segments stay mapped
+MAX_MAPPED_SEGMENTS = 32
+
+Timestamp = Union[datetime, float, int, np.datetime64]
+
+
+def to_ns(timestamp: Timestamp) -> int:
+    """Epoch nanoseconds from a datetime, a datetime64 or epoch seconds (time.time())
+
+    Plain numbers are always seconds; wrap raw nanosecond values as
+    np.datetime64(value, 'ns').
+    """
+    if isinstance(timestamp, np.datetime64):
+        return int(timestamp.astype('datetime64[ns]').astype(np.int64))
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp() * 1_000_000) * 1000
+    return int(round(float(timestamp) * NS_PER_SECOND))
+
+
+def day_of(timestamp_ns: int) -> str:
+    """UTC day segment (YYYY-MM-DD) holding a nanosecond timestamp"""
+    return str(np.datetime64(timestamp_ns // NS_PER_DAY, 'D'))
+
+
+@dataclass
+class TickColumns:
+    """Parallel tick columns for one series over a time range
+
+    Reads within a single day are read-only views straight onto the
+    memory-mapped files; ranges spanning days are concatenated once.
+    """
+    timestamp: np.ndarray
+    price: np.ndarray
+    liquidity: np.ndarray
+    venue: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def empty(cls) -> 'TickColumns':
+        return cls(*(np.empty(0, dtype=dtype) for dtype in TICK_COLUMNS.values()))
+
+    @classmethod
+    def concat(cls, parts: List['TickColumns']) -> 'TickColumns':
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(*(np.concatenate([getattr(p, name) for p in parts]) for name in TICK_COLUMNS))
+
+    def copy(self) -> 'TickColumns':
+        """In-memory copy that no longer references the mapped files"""
+        return TickColumns(*(np.array(getattr(self, name)) for name in TICK_COLUMNS))
+
+    def datetimes(self) -> np.ndarray:
+        """Timestamps as datetime64[ns] (a view, no copy)"""
+        return self.timestamp.view('datetime64[ns]')
+
+    def to_records(self) -> np.ndarray:
+        """Rows as a TICK_DTYPE structured array (copies)"""
+        records = np.empty(len(self), dtype=TICK_DTYPE)
+        for name in TICK_COLUMNS:
+            records[name] = getattr(self, name)
+        return records
+
+
+class TickStore:
+    """Per-series price ticks stored as fixed-dtype columns on disk
+
+    Layout is <root>/<series>/<YYYY-MM-DD>/<column>.bin, one raw
+    little-endian array per column (see TICK_COLUMNS), plus venues.json
+    mapping venue names to their int32 ids. Appends go to the end of the
+    day's files and must be in timestamp order per series, so reads locate
+    a time range with a binary search over the mapped timestamp column and
+    never parse rows. The most recently read day segments stay mapped (up
+    to max_mapped_segments, least recently used first out, since every
+    mapped column holds a file descriptor); the current day is remapped
+    when it has grown. Reads spanning days copy each day as they go, so a
+    long range never holds more than one day's maps open.
+    """
+
+    def __init__(
+        self,
+        root_dir: str = os.path.join('data', 'ticks'),
+        max_mapped_segments: int = MAX_MAPPED_SEGMENTS
+    ) -> None:
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._handles: Dict[str, Tuple[str, Dict[str, BinaryIO]]] = {}
+        self._last_ts: Dict[str, int] = {}
+        self.max_mapped_segments = max_mapped_segments
+        self._maps: 'OrderedDict[Tuple[str, str], Tuple[int, TickColumns]]' = OrderedDict()
+        self._venues_path = os.path.join(root_dir, 'venues.json')
+        self._venues: Dict[str, int] = {}
+        if os.path.exists(self._venues_path):
+            with open(self._venues_path) as f:
+                self._venues = json.load(f)
+        self.ticks_appended = 0
+        self.ticks_rejected = 0
+
+    # ------------------------------------------------------------------
+    # Layout helpers
+    # ------------------------------------------------------------------
+
+    def _series_dir(self, series: str) -> str:
+        return os.path.join(self.root_dir, quote(series, safe=''))
+
+    def _day_dir(self, series: str, day: str) -> str:
+        return os.path.join(self._series_dir(series), day)
+
+    def series(self) -> List[str]:
+        """Every series with at least one day on disk"""
+        return sorted(
+            unquote(name) for name in os.listdir(self.root_dir)
+            if os.path.isdir(os.path.join(self.root_dir, name))
+        )
+
+    def days(self, series: str) -> List[str]:
+        """Day segments of a series in chronological order"""
+        path = self._series_dir(series)
+        if not os.path.isdir(path):
+            return []
+        return sorted(os.listdir(path))
+
+    # ------------------------------------------------------------------
+    # Venues
+    # ------------------------------------------------------------------
+
+    def venue_id(self, venue: Optional[str]) -> int:
+        """Stable int32 id for a venue name, registering it on first use"""
+        if venue is None:
+            return UNKNOWN_VENUE
+        with self._lock:
+            venue_id = self._venues.get(venue)
+            if venue_id is None:
+                venue_id = self._venues[venue] = len(self._venues)
+                tmp_path = self._venues_path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._venues, f)
+                os.replace(tmp_path, self._venues_path)
+            return venue_id
+
+    def venue_name(self, venue_id: int) -> Optional[str]:
+        for name, known_id in self._venues.items():
+            if known_id == venue_id:
+                return name
+        return None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _last_timestamp(self, series: str) -> Optional[int]:
+        last = self._last_ts.get(series)
+        if last is None:
+            days = self.days(series)
+            if days:
+                columns = self._map_day(series, days[-1])
+                if len(columns):
+                    last = self._last_ts[series] = int(columns.timestamp[-1])
+        return last
+
+    def _day_handles(self, series: str, day: str) -> Dict[str, BinaryIO]:
+        current = self._handles.get(series)
+        if current is not None and current[0] == day:
+            return current[1]
+        if current is not None:
+            for handle in current[1].values():
+                handle.close()
+        path = self._day_dir(series, day)
+        os.makedirs(path, exist_ok=True)
+        # Cut a torn row off every column first, or the next append would shift the columns out of step
+        rows = self._whole_rows(path)
+        handles = {}
+        for name, dtype in TICK_COLUMNS.items():
+            handle = handles[name] = open(os.path.join(path, f'{name}.bin'), 'ab')
+            handle.truncate(rows * dtype.itemsize)
+        self._handles[series] = (day, handles)
+        return handles
+
+    def append(
+        self,
+        series: str,
+        timestamp: Timestamp,
+        price: float,
+        liquidity: float = 0.0,
+        venue: Optional[str] = None
+    ) -> bool:
+        """Append one tick; False if it is older than the series' last tick"""
+        return self.append_many(
+            series,
+            np.array([to_ns(timestamp)], dtype=np.int64),
+            np.array([price], dtype=np.float64),
+            np.array([liquidity], dtype=np.float64),
+            np.array([self.venue_id(venue)], dtype=np.int32)
+        ) == 1
+
+    def append_many(
+        self,
+        series: str,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        liquidity: Optional[np.ndarray] = None,
+        venues: Optional[np.ndarray] = None
+    ) -> int:
+        """Append a time-ordered block of ticks (timestamps in epoch ns)
+
+        Returns the number of ticks written. A block that is unsorted or
+        starts before the series' last tick is rejected whole.
+        """
+        timestamps = np.ascontiguousarray(timestamps, dtype=TICK_COLUMNS['timestamp'])
+        n = len(timestamps)
+        if n == 0:
+            return 0
+        columns = {
+            'timestamp': timestamps,
+            'price': np.ascontiguousarray(prices, dtype=TICK_COLUMNS['price']),
+            'liquidity': (np.zeros(n) if liquidity is None
+                          else np.ascontiguousarray(liquidity, dtype=TICK_COLUMNS['liquidity'])),
+            'venue': (np.full(n, UNKNOWN_VENUE, dtype=TICK_COLUMNS['venue']) if venues is None
+                      else np.ascontiguousarray(venues, dtype=TICK_COLUMNS['venue']))
+        }
+        if any(len(column) != n for column in columns.values()):
+            raise ValueError("Tick columns must all have the same length")
+
+        with self._lock:
+            last = self._last_timestamp(series)
+            if (last is not None and timestamps[0] < last) or np.any(np.diff(timestamps) < 0):
+                self.ticks_rejected += n
+                logger.warning(f"Rejected {n} out-of-order ticks for {series}")
+                return 0
+
+            day_numbers = timestamps // NS_PER_DAY
+            # Split points where the UTC day changes; each run goes to its own segment
+            bounds = np.flatnonzero(np.diff(day_numbers)) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [n]))
+            for start, end in zip(starts, ends):
+                handles = self._day_handles(series, day_of(int(timestamps[start])))
+                for name, column in columns.items():
+                    handles[name].write(column[start:end].tobytes())
+            for handle in handles.values():
+                handle.flush()
+
+            self._last_ts[series] = int(timestamps[-1])
+            self.ticks_appended += n
+            return n
+
+    def flush(self) -> None:
+        with self._lock:
+            for _, handles in self._handles.values():
+                for handle in handles.values():
+                    handle.flush()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _whole_rows(path: str) -> int:
+        sizes = []
+        for name, dtype in TICK_COLUMNS.items():
+            file_path = os.path.join(path, f'{name}.bin')
+            sizes.append(os.path.getsize(file_path) // dtype.itemsize if os.path.exists(file_path) else 0)
+        # A torn append can leave columns of different lengths; only whole rows count
+        return min(sizes)
+
+    def _map_day(self, series: str, day: str) -> TickColumns:
+        path = self._day_dir(series, day)
+        rows = self._whole_rows(path)
+
+        key = (series, day)
+        with self._lock:
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == rows:
+                self._maps.move_to_end(key)
+                return cached[1]
+            if rows == 0:
+                return TickColumns.empty()
+            columns = TickColumns(**{
+                name: np.memmap(os.path.join(path, f'{name}.bin'), dtype=dtype, mode='r', shape=(rows,))
+                for name, dtype in TICK_COLUMNS.items()
+            })
+            self._maps[key] = (rows, columns)
+            self._maps.move_to_end(key)
+            # Evicted maps close once no returned view still references them
+            while len(self._maps) > self.max_mapped_segments:
+                self._maps.popitem(last=False)
+            return columns
+
+    def iter_range(
+        self,
+        series: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None
+    ) -> Iterator[TickColumns]:
+        """Zero-copy per-day views of ticks with start <= timestamp < end"""
+        start_ns = to_ns(start) if start is not None else None
+        end_ns = to_ns(end) if end is not None else None
+        first_day = day_of(start_ns) if start_ns is not None else None
+        last_day = day_of(end_ns) if end_ns is not None else None
+
+        with self._lock:
+            handles = self._handles.get(series)
+            if handles is not None:
+                for handle in handles[1].values():
+                    handle.flush()
+            days = self.days(series)
+
+        for day in days:
+            if (first_day is not None and day < first_day) or (last_day is not None and day > last_day):
+                continue
+            columns = self._map_day(series, day)
+            timestamps = columns.timestamp
+            lo = int(np.searchsorted(timestamps, start_ns, 'left')) if start_ns is not None else 0
+            hi = int(np.searchsorted(timestamps, end_ns, 'left')) if end_ns is not None else len(timestamps)
+            if hi > lo:
+                yield TickColumns(*(getattr(columns, name)[lo:hi] for name in TICK_COLUMNS))
+
+    def read_range(
+        self,
+        series: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None
+    ) -> TickColumns:
+        """Ticks with start <= timestamp < end as parallel columns"""
+        parts: List[TickColumns] = []
+        for part in self.iter_range(series, start, end):
+            # Spanning days means concatenating anyway; copying each day now lets its maps close
+            if len(parts) == 1:
+                parts[0] = parts[0].copy()
+            parts.append(part.copy() if parts else part)
+        return TickColumns.concat(parts)
+
+    def latest(self, series: str, count: int) -> TickColumns:
+        """The last count ticks of a series"""
+        parts: List[TickColumns] = []
+        remaining = count
+        for day in reversed(self.days(series)):
+            if remaining <= 0:
+                break
+            columns = self._map_day(series, day)
+            take = min(remaining, len(columns))
+            if take:
+                part = TickColumns(*(getattr(columns, name)[-take:] for name in TICK_COLUMNS))
+                if len(parts) == 1:
+                    parts[0] = parts[0].copy()
+                parts.append(part.copy() if parts else part)
+                remaining -= take
+        return TickColumns.concat(parts[::-1])
+
+    def import_price_history(self, db_path: str, batch_size: int = 100000) -> int:
+        """Copy the SQLite price_history table (one series per token) into the store
+
+        Rows older than a series' last stored tick are skipped, so a repeated
+        import only adds what arrived since.
+        """
+        conn = get_database_pool(db_path).reader()
+        cursor = conn.execute(
+            'SELECT token_address, timestamp, price FROM price_history ORDER BY token_address, timestamp'
+        )
+        imported = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            tokens = [row[0] for row in rows]
+            timestamps = np.array([row[1] for row in rows], dtype=np.int64) * NS_PER_SECOND
+            prices = np.array([float(row[2]) for row in rows], dtype=np.float64)
+            start = 0
+            for end in range(1, len(rows) + 1):
+                if end < len(rows) and tokens[end] == tokens[start]:
+                    continue
+                token = tokens[start]
+                last = self._last_timestamp(token)
+                block = slice(start, end)
+                if last is not None:
+                    skip = int(np.searchsorted(timestamps[block], last, 'right'))
+                    block = slice(start + skip, end)
+                imported += self.append_many(token, timestamps[block], prices[block])
+                start = end
+        return imported
+
+    def close(self) -> None:
+        """Close append handles and drop cached maps"""
+        with self._lock:
+            for _, handles in self._handles.values():
+                for handle in handles.values():
+                    handle.close()
+            self._handles.clear()
+            self._maps.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'root_dir': self.root_dir,
+                'series': len(self.series()),
+                'venues': len(self._venues),
+                'open_segments': len(self._handles),
+                'mapped_segments': len(self._maps),
+                'ticks_appended': self.ticks_appended,
+                'ticks_rejected': self.ticks_rejected
+            }
+
+
+_stores: Dict[str, TickStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_tick_store(root_dir: str = os.path.join('data', 'ticks')) -> TickStore:
+    """Get the shared store for a directory (keyed by absolute path)"""
+    key = os.path.abspath(root_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = TickStore(key)
+        return store
+
+
+@atexit.register
+def close_all_stores() -> None:
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.close()
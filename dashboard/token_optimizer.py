@@ -1,27 +1,21 @@
 """Token price optimization and caching"""
 
-import time
-from typing import Dict, Any, Optional, Union
-import json
+from typing import Any, Dict, Optional
+from .data_providers.cache import StaleWhileRevalidateCache
 
 class TokenOptimizer:
-    def __init__(self, db_path: str):
-        self.cache: Dict[str, Dict[str, Union[Any, float]]] = {}
+    def __init__(self, db_path: str, max_size: int = 4096):
         self.cache_duration = 300  # 5 minutes
+        self.cache = StaleWhileRevalidateCache(max_size=max_size, default_ttl=self.cache_duration)
         
-    def store(self, key: str, value: Any) -> None:
-        """Store value in cache with timestamp"""
-        self.cache[key] = {
-            'value': value,
-            'timestamp': time.time()
-        }
+    def store(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value in cache with an optional per-key TTL"""
+        self.cache.set(key, value, ttl)
         
     def retrieve(self, key: str) -> Optional[Any]:
         """Retrieve value from cache if not expired"""
-        if key in self.cache:
-            cache_entry = self.cache[key]
-            if time.time() - cache_entry['timestamp'] < self.cache_duration:
-                return cache_entry['value']
-            else:
-                del self.cache[key]
-        return None
+        return self.cache.get(key)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache hit, miss and stale-serve counters"""
+        return self.cache.get_metrics()
@@ -0,0 +1,416 @@
+"""Token and pool registry with O(1) lookups and persisted token metadata"""
+
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = 'configs/dex_config.json'
+DEFAULT_CACHE_PATH = 'configs/token_metadata_cache.json'
+
+# Minimal ERC20 ABI for metadata lookups
+ERC20_METADATA_ABI = [
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "symbol",
+        "outputs": [{"name": "", "type": "string"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# (token_a, token_b, dex, fee, stable, tick_spacing); Aerodrome pools have no fee
+# and are told apart by stable (v2-style) or tick_spacing (CL)
+PoolKey = Tuple[str, str, str, Optional[int], Optional[bool], Optional[int]]
+
+
+@dataclass(frozen=True)
+class TokenInfo:
+    """Registered token metadata"""
+    address: str
+    symbol: str
+    decimals: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PoolInfo:
+    """Registered pool metadata"""
+    address: str
+    token0: str
+    token1: str
+    dex: str
+    fee: Optional[int] = None
+    name: Optional[str] = None
+    dex_type: Optional[str] = None
+    tick_spacing: Optional[int] = None
+    stable: Optional[bool] = None
+
+
+class TokenRegistry:
+    """In-memory token and pool registry keyed for constant time lookups.
+
+    Addresses are checksummed once and interned, so every module that goes
+    through the registry shares the same string objects. Token decimals and
+    symbols fetched on-chain are written to a local cache file and never
+    fetched again. The file is rewritten at most once per save_delay
+    seconds however many tokens are fetched, and addresses whose metadata
+    could not be fetched are not retried for failure_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        save_delay: float = 5.0,
+        failure_ttl: float = 300.0
+    ) -> None:
+        self.cache_path = cache_path
+        self.save_delay = save_delay
+        self.failure_ttl = failure_ttl
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        # Address -> time after which a failed metadata fetch may be retried
+        self._failed: Dict[str, float] = {}
+        self._addresses: Dict[str, str] = {}
+        self._by_symbol: Dict[str, TokenInfo] = {}
+        self._by_address: Dict[str, TokenInfo] = {}
+        self._pools: Dict[PoolKey, PoolInfo] = {}
+        self._pools_by_pair: Dict[Tuple[str, str], List[PoolInfo]] = {}
+        self._pools_by_address: Dict[str, PoolInfo] = {}
+        self._load_cache()
+
+    # Address handling
+
+    def intern(self, address: str) -> str:
+        """Return the interned checksummed form of an address"""
+        key = address.lower()
+        cached = self._addresses.get(key)
+        if cached is not None:
+            return cached
+        checksummed = sys.intern(Web3.to_checksum_address(address))
+        with self._lock:
+            return self._addresses.setdefault(key, checksummed)
+
+    def resolve(self, symbol_or_address: str) -> Optional[str]:
+        """Resolve a symbol or address to a checksummed address"""
+        if Web3.is_address(symbol_or_address):
+            return self.intern(symbol_or_address)
+        token = self._by_symbol.get(symbol_or_address.upper())
+        return token.address if token else None
+
+    # Tokens
+
+    def add_token(self, symbol: str, address: str, decimals: Optional[int] = None) -> TokenInfo:
+        """Register a token, keeping any previously known decimals"""
+        checksummed = self.intern(address)
+        with self._lock:
+            existing = self._by_address.get(checksummed)
+            if decimals is None and existing is not None:
+                decimals = existing.decimals
+            token = TokenInfo(address=checksummed, symbol=symbol, decimals=decimals)
+            self._by_address[checksummed] = token
+            self._by_symbol[symbol.upper()] = token
+            return token
+
+    def get_by_symbol(self, symbol: str) -> Optional[TokenInfo]:
+        """Get token by symbol"""
+        return self._by_symbol.get(symbol.upper())
+
+    def get_by_address(self, address: str) -> Optional[TokenInfo]:
+        """Get token by address (any casing)"""
+        return self._by_address.get(self.intern(address))
+
+    def get_token(self, symbol_or_address: str) -> Optional[TokenInfo]:
+        """Get token by symbol or address"""
+        if Web3.is_address(symbol_or_address):
+            return self.get_by_address(symbol_or_address)
+        return self.get_by_symbol(symbol_or_address)
+
+    def get_decimals(self, address: str, web3: Optional[Web3] = None) -> Optional[int]:
+        """Get token decimals, fetching and persisting them on first use"""
+        token = self.get_by_address(address)
+        if token is not None and token.decimals is not None:
+            return token.decimals
+        if web3 is None:
+            return None
+        self._fetch_metadata(self.intern(address), web3)
+        token = self.get_by_address(address)
+        return token.decimals if token else None
+
+    def get_symbol(self, address: str, web3: Optional[Web3] = None) -> Optional[str]:
+        """Get token symbol, fetching and persisting it on first use"""
+        token = self.get_by_address(address)
+        if token is not None:
+            return token.symbol
+        if web3 is None:
+            return None
+        self._fetch_metadata(self.intern(address), web3)
+        token = self.get_by_address(address)
+        return token.symbol if token else None
+
+    def _fetch_metadata(self, address: str, web3: Web3) -> None:
+        """Fetch symbol and decimals on-chain and persist them"""
+        if self._failed.get(address, 0.0) > time.time():
+            return
+        contract = web3.eth.contract(address=address, abi=ERC20_METADATA_ABI)
+        existing = self._by_address.get(address)
+        symbol = existing.symbol if existing else None
+        if symbol is None:
+            # Some tokens return bytes32 or revert; decimals are still usable
+            try:
+                symbol = contract.functions.symbol().call()
+            except Exception as e:
+                logger.warning(f"Error fetching token symbol for {address}: {e}")
+        try:
+            decimals: Optional[int] = int(contract.functions.decimals().call())
+        except Exception as e:
+            logger.error(f"Error fetching token decimals for {address}: {e}")
+            decimals = None
+        if decimals is None:
+            self._failed[address] = time.time() + self.failure_ttl
+        else:
+            self._failed.pop(address, None)
+        if symbol is None and decimals is None:
+            return
+        self.add_token(symbol or address, address, decimals)
+        self._schedule_save()
+
+    # Pools
+
+    def _pair_key(self, token_a: str, token_b: str) -> Tuple[str, str]:
+        a = self.resolve(token_a) or token_a
+        b = self.resolve(token_b) or token_b
+        if a.lower() > b.lower():
+            a, b = b, a
+        return (a, b)
+
+    def _pool_key(
+        self,
+        token_a: str,
+        token_b: str,
+        dex: str,
+        fee: Optional[int],
+        stable: Optional[bool] = None,
+        tick_spacing: Optional[int] = None
+    ) -> PoolKey:
+        return self._pair_key(token_a, token_b) + (dex, fee, stable, tick_spacing)
+
+    def add_pool(
+        self,
+        dex: str,
+        address: str,
+        token0: str,
+        token1: str,
+        fee: Optional[int] = None,
+        name: Optional[str] = None,
+        dex_type: Optional[str] = None,
+        tick_spacing: Optional[int] = None,
+        stable: Optional[bool] = None
+    ) -> PoolInfo:
+        """Register a pool for a token pair on a DEX"""
+        pool = PoolInfo(
+            address=self.intern(address),
+            token0=self.resolve(token0) or token0,
+            token1=self.resolve(token1) or token1,
+            dex=dex,
+            fee=fee,
+            name=name,
+            dex_type=dex_type,
+            tick_spacing=tick_spacing,
+            stable=stable
+        )
+        key = self._pool_key(pool.token0, pool.token1, dex, fee, stable, tick_spacing)
+        with self._lock:
+            previous = self._pools.get(key)
+            self._pools[key] = pool
+            pair_pools = self._pools_by_pair.setdefault(key[:2], [])
+            if previous is not None and previous in pair_pools:
+                pair_pools[pair_pools.index(previous)] = pool
+            else:
+                pair_pools.append(pool)
+            self._pools_by_address[pool.address] = pool
+        return pool
+
+    def get_pool(
+        self,
+        token_a: str,
+        token_b: str,
+        dex: str,
+        fee: Optional[int] = None,
+        stable: Optional[bool] = None,
+        tick_spacing: Optional[int] = None
+    ) -> Optional[PoolInfo]:
+        """Get pool by token pair (either order), DEX and fee
+
+        stable and tick_spacing narrow the match; when left out, the first
+        registered pool with that DEX and fee is returned.
+        """
+        pool = self._pools.get(self._pool_key(token_a, token_b, dex, fee, stable, tick_spacing))
+        if pool is not None:
+            return pool
+        return next(
+            (
+                p for p in self.get_pools(token_a, token_b, dex)
+                if p.fee == fee
+                and (stable is None or p.stable == stable)
+                and (tick_spacing is None or p.tick_spacing == tick_spacing)
+            ),
+            None
+        )
+
+    def get_pools(self, token_a: str, token_b: str, dex: Optional[str] = None) -> List[PoolInfo]:
+        """Every registered pool for a token pair (either order), in registration order"""
+        pools = self._pools_by_pair.get(self._pair_key(token_a, token_b), [])
+        return [pool for pool in pools if dex is None or pool.dex == dex]
+
+    def get_pool_by_address(self, address: str) -> Optional[PoolInfo]:
+        """Get pool by its address"""
+        return self._pools_by_address.get(self.intern(address))
+
+    @property
+    def tokens(self) -> Dict[str, TokenInfo]:
+        """Registered tokens keyed by address"""
+        return dict(self._by_address)
+
+    @property
+    def pools(self) -> Dict[PoolKey, PoolInfo]:
+        """Registered pools keyed by (token_a, token_b, dex, fee, stable, tick_spacing)"""
+        return dict(self._pools)
+
+    # Loaders
+
+    def load_dex_config(self, config: Dict[str, Any]) -> None:
+        """Register tokens and pools from a dex_config.json style dict"""
+        for symbol, info in config.get('tokens', {}).items():
+            self.add_token(symbol, info['address'], info.get('decimals'))
+
+        for dex_name, dex_info in config.get('dexes', {}).items():
+            for pair_name, pool_info in dex_info.get('pools', {}).items():
+                if 'address' not in pool_info:
+                    continue
+                self.add_pool(
+                    dex=dex_name,
+                    address=pool_info['address'],
+                    token0=pool_info.get('token0') or pool_info['token0_symbol'],
+                    token1=pool_info.get('token1') or pool_info['token1_symbol'],
+                    fee=pool_info.get('fee'),
+                    name=pair_name,
+                    dex_type=dex_info.get('type')
+                )
+
+    def load_token_addresses(self, token_addresses: Dict[str, str]) -> None:
+        """Register tokens from a symbol -> address mapping"""
+        for symbol, address in token_addresses.items():
+            self.add_token(symbol, address)
+
+    def load_pools_information(self, pools_information: Dict[str, Dict[str, Any]], dex: str) -> None:
+        """Register pools from a pools_information.json style dict"""
+        for pool_name, info in pools_information.items():
+            self.add_pool(
+                dex=dex,
+                address=info['pool_address'],
+                token0=info['token0'],
+                token1=info['token1'],
+                fee=info.get('fee'),
+                name=pool_name
+            )
+
+    # Persistence
+
+    def _load_cache(self) -> None:
+        """Load persisted token metadata"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+            for address, info in cached.get('tokens', {}).items():
+                self.add_token(info['symbol'], address, info.get('decimals'))
+        except Exception as e:
+            logger.warning(f"Error loading token metadata cache: {e}")
+
+    def _schedule_save(self) -> None:
+        """Save the cache file once save_delay seconds after the first unsaved change"""
+        if not self.cache_path:
+            return
+        if self.save_delay <= 0:
+            self.save_cache()
+            return
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write any unsaved token metadata now"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty, self._dirty = self._dirty, False
+        if timer is not None:
+            timer.cancel()
+        if dirty:
+            self.save_cache()
+
+    def save_cache(self) -> None:
+        """Persist token metadata to the cache file"""
+        if not self.cache_path:
+            return
+        with self._lock:
+            data = {
+                'tokens': {
+                    address: {'symbol': token.symbol, 'decimals': token.decimals}
+                    for address, token in self._by_address.items()
+                }
+            }
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"Error saving token metadata cache: {e}")
+
+
+_registry: Optional[TokenRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_token_registry(config_path: str = DEFAULT_CONFIG_PATH) -> TokenRegistry:
+    """Get the process-wide registry, building it from configs/ on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = TokenRegistry()
+                try:
+                    with open(config_path, 'r') as f:
+                        registry.load_dex_config(json.load(f))
+                except Exception as e:
+                    logger.error(f"Error loading token registry config: {e}")
+                # Pending metadata is written on exit rather than lost with the timer
+                atexit.register(registry.flush)
+                _registry = registry
+    return _registry
@@ -1,6 +1,6 @@
 """Trading strategies implementation focusing on BaseSwap with enhanced price analysis"""
 
-from typing import List, Dict, Any, Optional, Union, Literal, cast, TypedDict, TypeVar
+from typing import List, Dict, Any, Optional, Tuple, Union, Literal, cast, TypedDict, TypeVar
 from enum import Enum
 import logging
 from web3 import Web3
@@ -8,12 +8,20 @@ from web3.contract import Contract
 import json
 import os
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from .price_normalizer import validate_normalized_price
 from .ml_strategy import MLOpportunityScorer
 from .price_analysis import PriceAnalyzer
+from .provider_registry import get_shared_web3
+from .spread_matrix import SpreadMatrix
+from .opportunity_queue import OpportunityQueue, ScheduledOpportunity
 
 NetworkNameType = Literal['ethereum', 'binance_smart_chain', 'polygon', 'base']
 
+# Swap fee per venue as a fraction of the amount traded
+SWAP_FEES: Dict[str, float] = {'baseswap': 0.0025, 'uniswap': 0.003, 'sushiswap': 0.003}
+DEFAULT_SWAP_FEE = 0.003
+
 T = TypeVar('T', bound='AbiDict')
 
 class AbiDict(TypedDict):
@@ -31,6 +39,8 @@ class OpportunityDict(TypedDict):
     spread_percent: float
     direction: str
     ml_score: float
+    potential_profit_usd: float
+    gas_cost_usd: float
 
 class NetworkName(Enum):
     ETHEREUM = 'ethereum'
@@ -63,7 +73,9 @@ def get_web3_client(network: NetworkNameType) -> Optional[Web3]:
         from configs.performance_optimized_loader import get_rpc_endpoint
         network_cast = cast(NetworkNameType, network)
         endpoint = get_rpc_endpoint(network_cast)
-        return Web3(Web3.HTTPProvider(endpoint)) if endpoint else None
+        if not endpoint:
+            return None
+        return get_shared_web3(network_cast, [endpoint])
     except ImportError:
         return None
 
@@ -219,82 +231,88 @@ class ArbitrageStrategy(TradingStrategy):
             ('WETH', 'DAI'),
             ('USDC', 'DAI')
         ]
-        
+
+        # Latest price per (token pair, dex); screened in one vectorized pass
+        matrix = SpreadMatrix(initial_tokens=len(token_pairs), initial_venues=len(self.exchanges))
+        prices: Dict[Tuple[str, str], Decimal] = {}
         for token_in, token_out in token_pairs:
-            prices: Dict[str, Optional[Decimal]] = {}
             for dex in self.exchanges:
                 price = self.get_token_price(dex, token_in, token_out)
                 if price is not None:
-                    prices[dex] = price
+                    prices[(f"{token_in}/{token_out}", dex)] = price
+                    matrix.update(
+                        f"{token_in}/{token_out}", dex, float(price), fee=SWAP_FEES.get(dex, DEFAULT_SWAP_FEE)
+                    )
+                    # Rolling return volatility per pair and venue for the ML score
+                    self.ml_scorer.volatility_tracker.update_price(
+                        f"{token_in}/{token_out}:{dex}", self.network.value, float(price)
+                    )
                 else:
                     self.logger.warning(f"Price not available from {dex} for {token_in}/{token_out}")
-            
-            if len(prices) < 2:
+
+        # Screen on the spread left after paying both venues' swap fees
+        for candidate in matrix.screen(0.5):
+            token_in, token_out = candidate.token.split('/')
+            dex_a, dex_b = sorted(
+                (candidate.buy_venue, candidate.sell_venue), key=self.exchanges.index
+            )
+            price_a = prices[(candidate.token, dex_a)]
+            price_b = prices[(candidate.token, dex_b)]
+            if not price_a or not price_b:
                 continue
-            
-            dex_list = list(prices.keys())
-            for i in range(len(dex_list)):
-                for j in range(i + 1, len(dex_list)):
-                    dex_a = dex_list[i]
-                    dex_b = dex_list[j]
-                    price_a = prices[dex_a]
-                    price_b = prices[dex_b]
-                    
-                    if price_a and price_b:
-                        price_diff = abs(price_a - price_b)
-                        avg_price = (price_a + price_b) / 2
-                        spread_percent = (price_diff / avg_price) * 100
-                        
-                        if spread_percent > 0.5:
-                            # Get price statistics for volatility calculation
-                            token_pair = f"{token_in}/{token_out}"
-                            stats_a = self.price_analyzer.get_price_statistics(token_pair, dex_a)
-                            stats_b = self.price_analyzer.get_price_statistics(token_pair, dex_b)
-                            
-                            # Calculate average volatility
-                            volatility = (
-                                (stats_a['volatility'] if stats_a else 0) +
-                                (stats_b['volatility'] if stats_b else 0)
-                            ) / 2 if stats_a or stats_b else 0
-                            
-                            # Estimate potential profit (simplified)
-                            amount_in_usd = 1000  # $1000 trade size
-                            potential_profit_usd = amount_in_usd * (spread_percent / 100)
-                            gas_cost_usd = 5  # Estimated gas cost in USD
-                            net_profit_usd = potential_profit_usd - gas_cost_usd
-                            
-                            # Record opportunity
-                            self.price_analyzer.add_opportunity(
-                                token_pair=token_pair,
-                                exchange_in=dex_a,
-                                exchange_out=dex_b,
-                                price_in=float(price_a),
-                                price_out=float(price_b),
-                                spread_percent=float(spread_percent),
-                                potential_profit_usd=float(potential_profit_usd),
-                                gas_cost_usd=gas_cost_usd,
-                                net_profit_usd=net_profit_usd
-                            )
-                            
-                            opportunity: OpportunityDict = {
-                                'token_in': token_in,
-                                'token_out': token_out,
-                                'dex_a_price': float(price_a),
-                                'dex_b_price': float(price_b),
-                                'spread_percent': float(spread_percent),
-                                'direction': f'{dex_a}_to_{dex_b}' if price_a < price_b else f'{dex_b}_to_{dex_a}',
-                                'ml_score': 0.0
-                            }
-                            
-                            # Calculate opportunity score using price analysis
-                            opportunity['ml_score'] = self.price_analyzer.calculate_opportunity_score(
-                                spread_percent=float(spread_percent),
-                                volatility=volatility,
-                                net_profit_usd=net_profit_usd
-                            )
-                            
-                            opportunities.append(opportunity)
-                            
+
+            price_diff = abs(price_a - price_b)
+            avg_price = (price_a + price_b) / 2
+            spread_percent = (price_diff / avg_price) * 100
+
+            if spread_percent > 0.5:
+                # Average windowed return volatility of the two venues
+                token_pair = f"{token_in}/{token_out}"
+                tracker = self.ml_scorer.volatility_tracker
+                volatility = (
+                    tracker.get_volatility(f"{token_pair}:{dex_a}", self.network.value) +
+                    tracker.get_volatility(f"{token_pair}:{dex_b}", self.network.value)
+                ) / 2
+
+                # Estimate potential profit (simplified)
+                amount_in_usd = 1000  # $1000 trade size
+                potential_profit_usd = amount_in_usd * (spread_percent / 100)
+                gas_cost_usd = 5  # Estimated gas cost in USD
+                net_profit_usd = potential_profit_usd - gas_cost_usd
+
+                # Record opportunity
+                self.price_analyzer.add_opportunity(
+                    token_pair=token_pair,
+                    exchange_in=dex_a,
+                    exchange_out=dex_b,
+                    price_in=float(price_a),
+                    price_out=float(price_b),
+                    spread_percent=float(spread_percent),
+                    potential_profit_usd=float(potential_profit_usd),
+                    gas_cost_usd=gas_cost_usd,
+                    net_profit_usd=net_profit_usd
+                )
+
+                opportunity: OpportunityDict = {
+                    'token_in': token_in,
+                    'token_out': token_out,
+                    'dex_a_price': float(price_a),
+                    'dex_b_price': float(price_b),
+                    'spread_percent': float(spread_percent),
+                    'direction': f'{dex_a}_to_{dex_b}' if price_a < price_b else f'{dex_b}_to_{dex_a}',
+                    'ml_score': 0.0,
+                    'potential_profit_usd': float(potential_profit_usd),
+                    'gas_cost_usd': float(gas_cost_usd)
+                }
+
+                # Score the spread against the tracked volatility
+                opportunity['ml_score'] = self.ml_scorer.score_opportunity({
+                    'spread_percent': float(spread_percent),
+                    'volatility': volatility
+                })
+
+                opportunities.append(opportunity)
+
         return sorted(opportunities, key=lambda x: x['ml_score'], reverse=True)
 
 class TradingStrategyManager:
@@ -315,19 +333,50 @@ class TradingStrategyManager:
                 else ['uniswap', 'sushiswap']
             )
             self.strategies.append(strategy)
-    
+
+        # Opportunities from every network, best expected value per gas first
+        self.opportunity_queue = OpportunityQueue(default_ttl_blocks=2)
+
+    def _scan_strategy(self, strategy: ArbitrageStrategy) -> int:
+        """Run one network's scan and queue what it finds"""
+        if not strategy.validate_network():
+            self.logger.warning(f"Strategy for {strategy.network.value} failed network validation")
+            return 0
+        self.logger.info(f"Strategy for {strategy.network.value} validated")
+        opportunities = strategy.find_arbitrage_opportunities()
+        block_number = strategy.get_network_params().get('block_number')
+        if block_number is None:
+            return 0
+        chain = strategy.network.value
+        self.opportunity_queue.on_block(block_number, chain=chain)
+        queued = 0
+        for opportunity in opportunities:
+            score = opportunity['ml_score']
+            queued += self.opportunity_queue.push(
+                f"{chain}:{opportunity['token_in']}/{opportunity['token_out']}:{opportunity['direction']}",
+                dict(opportunity),
+                expected_profit=opportunity['potential_profit_usd'],
+                gas_cost=opportunity['gas_cost_usd'],
+                success_probability=score if 0.0 < score <= 1.0 else 1.0,
+                block_number=block_number,
+                chain=chain
+            )
+        return queued
+
     def start_strategies(self) -> None:
         self.logger.info("Starting trading strategies...")
-        for strategy in self.strategies:
-            if strategy.validate_network():
-                self.logger.info(f"Strategy for {strategy.network.value} validated")
-                opportunities = strategy.find_arbitrage_opportunities()
-                if opportunities:
-                    self.logger.info(f"Found opportunities: {opportunities}")
-                else:
-                    self.logger.info("No arbitrage opportunities found")
-            else:
-                self.logger.warning(f"Strategy for {strategy.network.value} failed network validation")
+        # Networks are scanned concurrently instead of one after another
+        with ThreadPoolExecutor(max_workers=max(len(self.strategies), 1)) as executor:
+            queued = sum(executor.map(self._scan_strategy, self.strategies))
+        best = self.opportunity_queue.peek()
+        if best is not None:
+            self.logger.info(f"Queued {queued} opportunities; best: {best.route_key} (priority {best.priority:.4f})")
+        else:
+            self.logger.info("No arbitrage opportunities found")
+
+    def next_opportunity(self, timeout: Optional[float] = None) -> Optional[ScheduledOpportunity]:
+        """Best live opportunity across all networks for an execution worker"""
+        return self.opportunity_queue.pop(timeout=timeout)
     
     def stop_strategies(self) -> None:
         self.logger.info("Stopping trading strategies...")
@@ -2,53 +2,57 @@
 
 import time
 import logging
-from typing import Any, Optional, Callable, TypeVar, List
+from typing import Any, Dict, Optional, Callable, TypeVar, List
 from functools import wraps
 import os
 from web3 import Web3
 from web3.exceptions import BlockNotFound, ContractLogicError, TransactionNotFound
 from requests.exceptions import RequestException
+import threading
+from .rpc_pool import RPCProviderPool
+from .provider_registry import get_provider_registry
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
 class Web3Manager:
-    """Manages Web3 connections with retry mechanism"""
+    """Manages Web3 connections with retry mechanism
+
+    All RPC URLs are kept in an RPCProviderPool, which routes each call to
+    the fastest healthy endpoint and fails over on transport errors.
+    Endpoint health comes from call outcomes; no connectivity probes are
+    sent. The pool is the chain's shared provider from the process-wide
+    ProviderRegistry, so every manager for a chain reuses its connections.
+    """
     
     def __init__(
         self,
         rpc_urls: List[str],
         max_retries: int = 3,
         retry_delay: float = 1.0,
-        timeout: int = 30
+        timeout: int = 30,
+        hedge: bool = False,
+        chain: str = 'base'
     ):
         self.rpc_urls = rpc_urls
+        self.chain = chain
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.timeout = timeout
+        self.hedge = hedge
+        self.provider_pool: Optional[RPCProviderPool] = None
         self.w3: Optional[Web3] = None
         self._initialize_web3()
     
     def _initialize_web3(self) -> None:
-        """Initialize Web3 with the first working RPC endpoint"""
-        for url in self.rpc_urls:
-            try:
-                provider = Web3.HTTPProvider(
-                    url,
-                    request_kwargs={'timeout': self.timeout}
-                )
-                w3 = Web3(provider)
-                
-                if w3.is_connected():
-                    self.w3 = w3
-                    logger.info(f"Connected to RPC: {url}")
-                    return
-            except Exception as e:
-                logger.warning(f"Failed to connect to {url}: {e}")
-                continue
-        
-        raise ConnectionError("Failed to connect to any RPC endpoint")
+        """Initialize Web3 over the chain's shared pool of RPC endpoints"""
+        if not self.rpc_urls:
+            raise ConnectionError("Failed to connect to any RPC endpoint")
+        registry = get_provider_registry()
+        self.w3 = registry.get_web3(self.chain, self.rpc_urls, hedge=self.hedge, timeout=self.timeout)
+        self.provider_pool = registry.get_provider(self.chain)
+        logger.info(f"Using RPC endpoints: {', '.join(self.rpc_urls)}")
     
     def with_retry(self, func: Callable[..., T]) -> Callable[..., T]:
         """Decorator for Web3 calls with retry mechanism"""
@@ -58,20 +62,18 @@ class Web3Manager:
             
             for attempt in range(self.max_retries):
                 try:
-                    if not self.w3 or not self.w3.is_connected():
-                        self._initialize_web3()
                     return func(*args, **kwargs)
                 except (BlockNotFound, ContractLogicError, TransactionNotFound) as e:
                     # Don't retry these specific errors
                     raise e
                 except (RequestException, ConnectionError) as e:
+                    # The provider pool already failed over across endpoints
                     last_error = e
                     logger.warning(
                         f"Attempt {attempt + 1}/{self.max_retries} failed: {str(e)}"
                     )
                     if attempt < self.max_retries - 1:
                         time.sleep(self.retry_delay * (attempt + 1))
-                        self._initialize_web3()  # Try to reconnect
                     continue
                 except Exception as e:
                     last_error = e
@@ -85,6 +87,10 @@ class Web3Manager:
             raise last_error or Exception("All retry attempts failed")
         
         return wrapper
+
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Get latency, error rate and circuit state per RPC endpoint"""
+        return self.provider_pool.get_endpoint_stats() if self.provider_pool else []
     
     def get_contract(self, address: str, abi: Any) -> Any:
         """Get contract instance with retry mechanism"""
@@ -101,8 +107,15 @@ class Web3Manager:
             self._initialize_web3()
         return self.w3.eth
 
+_web3_manager: Optional[Web3Manager] = None
+_web3_manager_lock = threading.Lock()
+
 def get_web3_manager() -> Web3Manager:
-    """Get or create Web3Manager instance"""
+    """Get or create the shared Web3Manager instance"""
+    global _web3_manager
+    if _web3_manager is not None:
+        return _web3_manager
+
     # Try to get RPC URL from environment variables
     rpc_urls = [
         os.getenv('BASE_RPC_URL', ''),
@@ -117,7 +130,13 @@ def get_web3_manager() -> Web3Manager:
     if not rpc_urls:
         rpc_urls = ['https://mainnet.base.org']
     
-    return Web3Manager(rpc_urls)
+    with _web3_manager_lock:
+        if _web3_manager is None:
+            _web3_manager = Web3Manager(
+                rpc_urls,
+                hedge=os.getenv('RPC_HEDGE_READS', '').lower() == 'true'
+            )
+    return _web3_manager
 
 # Example usage:
 """
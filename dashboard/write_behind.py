@@ -0,0 +1,241 @@
+"""Write-behind SQLite writer that batches inserts from many producers into few transactions"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .db_pool import get_database_pool
+
+logger = logging.getLogger(__name__)
+
+# Queue item: (sql, params, enqueue time); a None sql carries a flush marker in params
+_Item = Tuple[Optional[str], Any, float]
+
+
+class WriteBehindWriter:
+    """Single writer thread flushing queued rows with executemany
+
+    submit() only enqueues, so producers never wait on SQLite. The writer
+    thread commits whatever has accumulated once max_batch rows are
+    queued or flush_interval seconds after the first row of a batch,
+    grouping rows per statement into one executemany and all statements
+    into one transaction. The queue is bounded: when it is full, submit
+    blocks for up to put_timeout seconds (backpressure) and then drops the
+    row. A batch that fails is retried row by row, so only the rows that
+    fail on their own are dropped (and logged). close() drains every row
+    accepted by submit() before returning, and every writer is closed at
+    interpreter exit. Rows are visible to other connections once flushed;
+    call flush() for read-your-writes.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_batch: int = 500,
+        flush_interval: float = 0.05,
+        max_queue: int = 10000,
+        put_timeout: float = 1.0
+    ) -> None:
+        self.db_path = db_path
+        self.pool = get_database_pool(db_path)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+        self.flush_time = 0.0
+        self.max_flush_time = 0.0
+        self.queue_delay = 0.0
+        self.max_queue_delay = 0.0
+        self.started_at = time.time()
+        self._queue: 'queue.Queue[_Item]' = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        # Counts submit() calls between their closed check and their put
+        self._submitting = 0
+        self._submit_done = threading.Condition()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: Sequence[Any]) -> bool:
+        """Queue one row; False if the writer is closed or the queue stayed full"""
+        with self._submit_done:
+            if self._closed:
+                return False
+            self._submitting += 1
+        try:
+            self._queue.put((sql, params, time.perf_counter()), timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.rows_dropped += 1
+            logger.warning(f"Write-behind queue full for {self.db_path}; dropping row")
+            return False
+        finally:
+            with self._submit_done:
+                self._submitting -= 1
+                self._submit_done.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every row submitted before this call is committed"""
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put((None, done, time.perf_counter()))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop accepting rows, write everything still queued and stop the thread"""
+        with self._submit_done:
+            if self._closed:
+                return
+            self._closed = True
+            # Rows already past the closed check are queued ahead of the stop marker
+            self._submit_done.wait_for(lambda: self._submitting == 0)
+        self._queue.put((None, None, time.perf_counter()))
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(f"Write-behind writer for {self.db_path} did not drain within {timeout}s")
+
+    def _collect(self, first: _Item) -> Tuple[List[_Item], List[threading.Event], bool]:
+        rows = []
+        markers = []
+        stop = False
+        item = first
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            sql, params, _ = item
+            if sql is not None:
+                rows.append(item)
+            elif params is None:
+                stop = True
+            else:
+                markers.append(params)
+            if stop or markers or len(rows) >= self.max_batch:
+                break
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return rows, markers, stop
+
+    def _write(self, rows: List[_Item]) -> None:
+        by_statement: Dict[str, List[Any]] = {}
+        for sql, params, _ in rows:
+            by_statement.setdefault(sql, []).append(params)
+
+        start = time.perf_counter()
+        try:
+            # Shares the pool's single writer connection with every other writer
+            with self.pool.write() as conn:
+                for sql, params in by_statement.items():
+                    conn.executemany(sql, params)
+        except Exception as e:
+            logger.warning(f"Write-behind flush of {len(rows)} rows to {self.db_path} failed, retrying row by row: {str(e)}")
+            rows = self._write_rows(rows)
+            if not rows:
+                return
+        end = time.perf_counter()
+
+        with self._lock:
+            self.rows_written += len(rows)
+            self.flushes += 1
+            self.flush_time += end - start
+            self.max_flush_time = max(self.max_flush_time, end - start)
+            oldest = min(enqueued for _, _, enqueued in rows)
+            self.queue_delay += sum(end - enqueued for _, _, enqueued in rows)
+            self.max_queue_delay = max(self.max_queue_delay, end - oldest)
+
+    def _write_rows(self, rows: List[_Item]) -> List[_Item]:
+        """Insert rows one at a time so only the bad ones are lost; returns the rows written"""
+        written = []
+        failed = 0
+        try:
+            with self.pool.write() as conn:
+                for item in rows:
+                    sql, params, _ = item
+                    try:
+                        conn.execute(sql, params)
+                    except Exception as e:
+                        failed += 1
+                        logger.error(f"Write-behind dropped row for {self.db_path}: {sql} {params!r}: {str(e)}")
+                    else:
+                        written.append(item)
+        except Exception as e:
+            failed = len(rows)
+            written = []
+            logger.error(f"Write-behind flush of {len(rows)} rows to {self.db_path} failed: {str(e)}")
+        with self._lock:
+            self.rows_failed += failed
+        return written
+
+    def _run(self) -> None:
+        while True:
+            rows, markers, stop = self._collect(self._queue.get())
+            if stop:
+                # Drain whatever producers queued before close()
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item[0] is not None:
+                        rows.append(item)
+                    elif item[1] is not None:
+                        markers.append(item[1])
+            if rows:
+                self._write(rows)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Rows written per second, flush latency and queue delay"""
+        with self._lock:
+            elapsed = max(time.time() - self.started_at, 1e-9)
+            return {
+                'queued': self._queue.qsize(),
+                'rows_written': self.rows_written,
+                'rows_failed': self.rows_failed,
+                'rows_dropped': self.rows_dropped,
+                'flushes': self.flushes,
+                'rows_per_second': self.rows_written / elapsed,
+                'avg_batch_size': self.rows_written / self.flushes if self.flushes else 0.0,
+                'avg_flush_ms': self.flush_time / self.flushes * 1000 if self.flushes else 0.0,
+                'max_flush_ms': self.max_flush_time * 1000,
+                'avg_queue_delay_ms': self.queue_delay / self.rows_written * 1000 if self.rows_written else 0.0,
+                'max_queue_delay_ms': self.max_queue_delay * 1000
+            }
+
+
+_writers: Dict[str, WriteBehindWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_write_behind_writer(db_path: str, **kwargs: Any) -> WriteBehindWriter:
+    """Get or start the shared writer for a database file
+
+    kwargs only apply when the writer is first created.
+    """
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None or writer._closed:
+            writer = _writers[db_path] = WriteBehindWriter(db_path, **kwargs)
+        return writer
+
+
+@atexit.register
+def close_all_writers() -> None:
+    """Flush and stop every shared writer"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
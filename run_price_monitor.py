@@ -1,14 +1,17 @@
-<<<<<<< HEAD
 """Enhanced Price Monitor Script with Advanced Arbitrage Detection"""
 
+import os
+import sys
 import time
 import logging
 from typing import Dict, List, Tuple
 from decimal import Decimal
 from web3 import Web3
+from dotenv import load_dotenv
 from dashboard.price_analysis import PriceAnalyzer
-from dashboard.advanced_trading import AdvancedTradingStrategy
+from dashboard.advanced_trading import AdvancedTradingStrategy, evaluate_flash_loan
 from dashboard.advanced_arbitrage_detector import AdvancedArbitrageDetector
+from dashboard.parallel_eval import ParallelEvaluator
 
 def format_opportunity(opp: Dict) -> str:
     """Format opportunity data in a clear, structured way"""
@@ -49,18 +52,30 @@ def format_opportunity(opp: Dict) -> str:
     
     return "\n".join(output)
 
-def main():
-    # Configure logging
+def setup_logging() -> None:
+    """Configure logging"""
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s'
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('price_monitor.log')
+        ]
     )
+
+def main():
+    setup_logging()
     logger = logging.getLogger(__name__)
 
+    # RPC endpoints for the DEX interface come from the environment
+    load_dotenv()
+
     # Initialize components
     price_analyzer = PriceAnalyzer(history_window=3600)
     trading_strategy = AdvancedTradingStrategy()
     arbitrage_detector = AdvancedArbitrageDetector()
+    # Flash loan profit math is CPU-bound; shard it across worker processes
+    evaluator = ParallelEvaluator(max_workers=int(os.getenv('PRICE_MONITOR_WORKERS', '0')) or None)
     
     # Token pairs and fee tiers to monitor (expanded list)
     pairs: List[Tuple[str, str, str]] = [
@@ -145,6 +160,9 @@ def main():
                 "Multi-Hop": [],
                 "Pattern-Based": []
             }
+            # (pair, amount) combinations evaluated in one parallel sweep after the price pass
+            flash_tasks: List[Tuple] = []
+            flash_tiers: List[str] = []
             
             for token_in, token_out, fee_tier in pairs:
                 pair_name = f"{token_in}/{token_out}/{fee_tier}"
@@ -169,16 +187,16 @@ def main():
                     logger.info(f"Volume (5min): ${volume:,.2f}")
                     
                     if volume > Decimal('50'):
-                        # 1. Check flash loan opportunities
+                        # 1. Queue flash loan combinations for the parallel sweep
                         for wallet_size, amounts in flash_loan_amounts.items():
                             for amount in amounts:
-                                flash_opp = trading_strategy.analyze_flash_loan_opportunity(
+                                flash_tasks.append((
                                     token_in, token_out, amount, price,
-                                    Decimal(str(price_impacts[Decimal('1')]/100))
-                                )
-                                if flash_opp and flash_opp['confidence_score'] > 0.8:
-                                    flash_opp['wallet_tier'] = wallet_size
-                                    opportunities["Flash Loan"].append(flash_opp)
+                                    Decimal(str(price_impacts[Decimal('1')]/100)),
+                                    trading_strategy.FLASH_LOAN_FEE,
+                                    trading_strategy.MIN_PROFIT_THRESHOLD
+                                ))
+                                flash_tiers.append(wallet_size)
                         
                         # 2. Check cross-DEX opportunities
                         cross_dex_opps = arbitrage_detector.find_cross_dex_opportunities(f"{token_in}/{token_out}")
@@ -199,6 +217,16 @@ def main():
                 except Exception as e:
                     logger.error(f"Error processing {pair_name}: {str(e)}")
             
+            # Results come back in task order, so the report is the same for any worker count
+            try:
+                for wallet_size, flash_opp in zip(flash_tiers, evaluator.map(evaluate_flash_loan, flash_tasks)):
+                    if flash_opp and flash_opp['confidence_score'] > 0.8:
+                        flash_opp['wallet_tier'] = wallet_size
+                        opportunities["Flash Loan"].append(flash_opp)
+                logger.info(f"Flash loan sweep: {evaluator.get_timing_summary()}")
+            except Exception as e:
+                logger.error(f"Error in flash loan sweep: {str(e)}")
+            
             # Display opportunities by strategy
             logger.info("\n" + "="*30 + " Trading Opportunities " + "="*30)
             
@@ -216,51 +244,8 @@ def main():
         logger.info("\nStopping monitor...")
     except Exception as e:
         logger.error(f"Error in monitor: {str(e)}")
-=======
-"""Price monitoring entry point script"""
-
-import os
-import sys
-import logging
-from dotenv import load_dotenv
-from dashboard.price_analysis import PriceAnalyzer
-
-def setup_logging() -> None:
-    """Configure logging"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('price_monitor.log')
-        ]
-    )
-
-def main() -> None:
-    """Main entry point"""
-    setup_logging()
-    logger = logging.getLogger(__name__)
-    
-    try:
-        # Load environment variables
-        load_dotenv()
-        
-        # Ensure RPC URL is set
-        if not os.getenv('BASE_RPC_URL'):
-            logger.error("BASE_RPC_URL environment variable not set")
-            sys.exit(1)
-            
-        # Initialize and run price monitor
-        logger.info("Starting price monitoring...")
-        analyzer = PriceAnalyzer()
-        analyzer.monitor_prices()
-        
-    except KeyboardInterrupt:
-        logger.info("\nPrice monitoring stopped by user")
-    except Exception as e:
-        logger.error(f"Error in price monitoring: {str(e)}")
-        sys.exit(1)
->>>>>>> 245fdac14b0b9bc65ffd42e3056011a2ab2b4d30
+    finally:
+        evaluator.close()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,6 @@
 import json
 import logging
-from web3 import Web3
+from dashboard.provider_registry import get_shared_web3
 from .opportunity_predictor import OpportunityPredictor
 from .ml_predictor import MLPredictor
 from datetime import datetime
@@ -10,7 +10,7 @@ class ArbitrageBot:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        self.w3 = Web3(Web3.HTTPProvider(self.config['base_rpc_url']))
+        self.w3 = get_shared_web3('base', [self.config['base_rpc_url']])
         self.opportunity_predictor = OpportunityPredictor(config_path)
         self.ml_predictor = MLPredictor(config_path)
         
@@ -0,0 +1,83 @@
+"""
+Benchmark the vectorized flash loan size sweep against per-size evaluation
+
+Prices a WETH -> USDC -> WETH round trip through two constant-product
+pools for a grid of loan sizes, once by calling evaluate_flash_loan per
+size (with the slippage for that size) and once with a single
+sweep_flash_loan_sizes pass, and reports the cost of one scalar call
+for reference.
+
+    python -m scripts.benchmark_flash_loan_sweep --sizes 1000
+"""
+import argparse
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from configs.logging_config import get_logger
+from dashboard.advanced_trading import amm_output_curve, evaluate_flash_loan, sweep_flash_loan_sizes
+
+logger = get_logger(__name__)
+
+BUY_RESERVES = (1000.0, 2_000_000.0)
+SELL_RESERVES = (1_960_000.0, 1000.0)
+FLASH_LOAN_FEE = Decimal('0.0009')
+MIN_PROFIT = Decimal('0.002')
+
+
+def scalar_sweep(sizes: np.ndarray) -> int:
+    """One evaluate_flash_loan call per size; returns the index of the best profit"""
+    spot = (BUY_RESERVES[1] / BUY_RESERVES[0]) * (SELL_RESERVES[1] / SELL_RESERVES[0])
+    best_index, best_profit = 0, None
+    for i, size in enumerate(sizes.tolist()):
+        bought = amm_output_curve(np.float64(size), *BUY_RESERVES, 30)
+        output = float(amm_output_curve(bought, *SELL_RESERVES, 30))
+        impact = 1 - output / (size * spot)
+        result = evaluate_flash_loan(
+            'WETH', 'WETH', Decimal(str(size)), Decimal(str(spot)), Decimal(str(impact)), FLASH_LOAN_FEE, MIN_PROFIT
+        )
+        profit = result['expected_profit'] if result else None
+        if profit is not None and (best_profit is None or profit > best_profit):
+            best_index, best_profit = i, profit
+    return best_index
+
+
+def main(count: int, rounds: int) -> None:
+    sizes = np.linspace(0.01, 10.0, count)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        scalar_sweep(sizes[:1])
+    one_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        scalar_best = scalar_sweep(sizes)
+    loop_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        sweep = sweep_flash_loan_sizes(sizes, BUY_RESERVES, SELL_RESERVES)
+    sweep_us = (time.perf_counter() - start) / rounds * 1e6
+
+    # evaluate_flash_loan prices the whole loan at one post-impact rate, so its
+    # argmax can sit a few grid points away from the exact AMM curve's
+    logger.debug(f"Best size: loop #{scalar_best}, sweep #{sweep.best_index}")
+
+    print(f"\nFlash loan sizing over {count} sizes")
+    print(f"  one scalar call      {one_us:12.1f} us")
+    print(f"  scalar loop          {loop_us:12.1f} us")
+    print(f"  vectorized sweep     {sweep_us:12.1f} us")
+    print(f"  speedup              {loop_us / sweep_us:12.1f}x")
+    print(f"  best size {sweep.best_size:.4f} WETH (scalar loop: {sizes[scalar_best]:.4f}), "
+          f"profit {sweep.best_profit:.6f} WETH")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized flash loan sizing")
+    parser.add_argument('--sizes', type=int, default=1000, help="Loan sizes in the grid")
+    parser.add_argument('--rounds', type=int, default=20, help="Sweeps to average")
+    args = parser.parse_args()
+
+    main(args.sizes, args.rounds)
@@ -0,0 +1,154 @@
+"""
+Benchmark the batching JSON-RPC transport against the stock HTTPProvider
+
+Measures requests per second for concurrent eth_getLogs reads and the time
+spent decoding hex-heavy responses. By default a local JSON-RPC server with
+simulated round-trip latency is used so runs are repeatable; pass --url to
+measure against a real node instead.
+
+    python -m scripts.benchmark_rpc_transport --requests 2000 --threads 32
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+from configs.logging_config import get_logger
+from dashboard.batch_provider import ORJSON_AVAILABLE, BatchingHTTPProvider, decode_json
+
+logger = get_logger(__name__)
+
+SWAP_TOPIC = '0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67'
+
+
+def make_logs(count: int) -> List[Dict[str, Any]]:
+    """Synthetic Swap logs shaped like a real eth_getLogs response"""
+    return [
+        {
+            'address': '0x' + f'{i % 50:040x}',
+            'topics': [SWAP_TOPIC, '0x' + f'{i:064x}', '0x' + f'{i + 1:064x}'],
+            'data': '0x' + f'{i:064x}' * 5,
+            'blockNumber': hex(20_000_000 + i // 10),
+            'blockHash': '0x' + f'{i // 10:064x}',
+            'transactionHash': '0x' + f'{i:064x}',
+            'transactionIndex': hex(i % 200),
+            'logIndex': hex(i % 10),
+            'removed': False
+        }
+        for i in range(count)
+    ]
+
+
+def start_local_node(logs_per_response: int, latency: float) -> Tuple[ThreadingHTTPServer, str]:
+    """Keep-alive JSON-RPC server answering every request with the same logs"""
+    result = make_logs(logs_per_response)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            time.sleep(latency)
+            if isinstance(body, list):
+                payload: Any = [{'jsonrpc': '2.0', 'id': r['id'], 'result': result} for r in body]
+            else:
+                payload = {'jsonrpc': '2.0', 'id': body['id'], 'result': result}
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def measure_throughput(
+    make_request: Callable[[str, Any], Any],
+    total: int,
+    threads: int
+) -> float:
+    params = [{'address': '0x' + '00' * 20, 'fromBlock': 'latest', 'toBlock': 'latest'}]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: make_request('eth_getLogs', params), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def measure_decode(raw: bytes, iterations: int) -> Dict[str, float]:
+    """Average milliseconds to decode one response per codec"""
+    stock = Web3.HTTPProvider('http://127.0.0.1')
+    timings = {}
+    for name, decode in (
+        ('web3 decode_rpc_response', stock.decode_rpc_response),
+        ('json.loads', json.loads),
+        ('orjson.loads' if ORJSON_AVAILABLE else 'json.loads (orjson missing)', decode_json)
+    ):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            decode(raw)
+        timings[name] = (time.perf_counter() - start) / iterations * 1000
+    return timings
+
+
+def main(
+    url: Optional[str],
+    total: int,
+    threads: int,
+    logs_per_response: int,
+    latency: float,
+    batch_size: int,
+    linger: float
+) -> None:
+    httpd = None
+    if url is None:
+        httpd, url = start_local_node(logs_per_response, latency)
+        logger.info(f"Local node at {url}: {logs_per_response} logs per response, {latency * 1000:.1f} ms latency")
+
+    try:
+        stock = Web3.HTTPProvider(url, exception_retry_configuration=None)
+        batching = BatchingHTTPProvider(url, max_batch_size=batch_size, linger=linger)
+
+        stock_rps = measure_throughput(stock.make_request, total, threads)
+        batch_rps = measure_throughput(batching.make_request, total, threads)
+        stats = batching.get_batch_stats()
+
+        raw = json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': make_logs(logs_per_response)}).encode()
+        decode_ms = measure_decode(raw, iterations=50)
+
+        print(f"\nThroughput ({total} eth_getLogs requests, {threads} threads)")
+        print(f"  stock HTTPProvider     {stock_rps:10.1f} req/s")
+        print(f"  BatchingHTTPProvider   {batch_rps:10.1f} req/s  "
+              f"({stats['batches']} posts, avg batch {stats['avg_batch_size']:.1f}, codec {stats['codec']})")
+        print(f"  speedup                {batch_rps / stock_rps:10.2f}x")
+        print(f"\nDecode time per response ({len(raw) / 1024:.0f} KiB)")
+        for name, ms in decode_ms.items():
+            print(f"  {name:<28} {ms:8.3f} ms")
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON-RPC batching transport")
+    parser.add_argument('--url', default=None, help="RPC endpoint; defaults to a local simulated node")
+    parser.add_argument('--requests', type=int, default=1000, help="Total requests per provider")
+    parser.add_argument('--threads', type=int, default=32, help="Concurrent callers")
+    parser.add_argument('--logs', type=int, default=200, help="Logs per simulated response")
+    parser.add_argument('--latency', type=float, default=0.02, help="Simulated round trip in seconds")
+    parser.add_argument('--batch-size', type=int, default=50, help="Maximum requests per batch")
+    parser.add_argument('--linger', type=float, default=0.002, help="Seconds to wait for a batch to fill")
+    args = parser.parse_args()
+
+    main(args.url, args.requests, args.threads, args.logs, args.latency, args.batch_size, args.linger)
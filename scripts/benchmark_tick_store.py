@@ -0,0 +1,98 @@
+"""
+Benchmark range reads from the columnar tick store against SQLite price_history
+
+Writes the same synthetic ticks (one every --interval seconds for --days
+days) to a price_history table and to a TickStore, then times loading a
+full-range and a one-day window into NumPy arrays from each.
+
+    python -m scripts.benchmark_tick_store --days 30 --interval 5
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+from configs.logging_config import get_logger
+from dashboard.tick_store import NS_PER_SECOND, TickStore
+
+logger = get_logger(__name__)
+
+TOKEN = '0x4200000000000000000000000000000000000006'
+START = 1_790_000_000 // 86400 * 86400
+
+
+def load_sqlite(db_path: str, start: int, end: int) -> np.ndarray:
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            'SELECT timestamp, price FROM price_history WHERE token_address = ? '
+            'AND timestamp >= ? AND timestamp < ? ORDER BY timestamp',
+            (TOKEN, start, end)
+        ).fetchall()
+        return np.array([price for _, price in rows], dtype=np.float64)
+    finally:
+        conn.close()
+
+
+def main(days: int, interval: int, rounds: int) -> None:
+    work_dir = tempfile.mkdtemp()
+    try:
+        seconds = np.arange(START, START + days * 86400, interval, dtype=np.int64)
+        prices = 2500.0 + np.cumsum(np.random.default_rng(1).normal(0, 0.5, len(seconds)))
+
+        db_path = os.path.join(work_dir, 'bench.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE price_history (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp INTEGER NOT NULL, '
+                     'token_address TEXT NOT NULL, price DECIMAL(18,8) NOT NULL)')
+        conn.execute('CREATE INDEX idx_price_history_timestamp ON price_history(timestamp)')
+        conn.execute('CREATE INDEX idx_price_history_token ON price_history(token_address)')
+        conn.executemany('INSERT INTO price_history (timestamp, token_address, price) VALUES (?, ?, ?)',
+                         ((int(t), TOKEN, float(p)) for t, p in zip(seconds, prices)))
+        conn.commit()
+        conn.close()
+
+        store = TickStore(os.path.join(work_dir, 'ticks'))
+        start = time.perf_counter()
+        store.append_many(TOKEN, seconds * NS_PER_SECOND, prices)
+        write_ms = (time.perf_counter() - start) * 1000
+
+        windows = {
+            f'{days} days': (START, START + days * 86400),
+            '1 day': (START + (days // 2) * 86400, START + (days // 2 + 1) * 86400)
+        }
+        print(f"\nTick range reads over {len(seconds):,} ticks ({days} days, one per {interval}s)")
+        print(f"  tick store append  {write_ms:10.1f} ms")
+        for label, (lo, hi) in windows.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                expected = load_sqlite(db_path, lo, hi)
+            sqlite_ms = (time.perf_counter() - start) / rounds * 1000
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                ticks = store.read_range(TOKEN, np.datetime64(lo * NS_PER_SECOND, 'ns'),
+                                         np.datetime64(hi * NS_PER_SECOND, 'ns'))
+                total = float(ticks.price.sum())  # touch every page
+            store_ms = (time.perf_counter() - start) / rounds * 1000
+
+            if len(ticks) != len(expected) or not np.isclose(total, expected.sum()):
+                logger.warning(f"{label}: tick store returned {len(ticks)} ticks, SQLite {len(expected)}")
+            print(f"  {label:<10} SQLite {sqlite_ms:10.2f} ms   tick store {store_ms:8.3f} ms   "
+                  f"speedup {sqlite_ms / store_ms:8.1f}x")
+        store.close()
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark columnar tick store range reads")
+    parser.add_argument('--days', type=int, default=30, help="Days of synthetic history")
+    parser.add_argument('--interval', type=int, default=5, help="Seconds between ticks")
+    parser.add_argument('--rounds', type=int, default=5, help="Reads to average per window")
+    args = parser.parse_args()
+
+    main(args.days, args.interval, args.rounds)
@@ -2,6 +2,7 @@
 Check gas prices and estimate deployment costs on Ethereum mainnet
 """
 from web3 import Web3
+from dashboard.provider_registry import get_shared_web3
 from web3.exceptions import Web3Exception
 from web3.types import Wei, ChecksumAddress, BlockData
 from typing import Dict, Optional, Tuple, Union, List, TypedDict, cast
@@ -203,7 +204,7 @@ def main() -> None:
             logger.error(str(e))
             return
             
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        w3 = get_shared_web3('ethereum', [rpc_url])
         if not w3.is_connected():
             logger.error("Failed to connect to mainnet")
             return
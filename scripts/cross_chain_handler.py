@@ -2,18 +2,29 @@
 Cross-Chain Handler for managing cross-chain arbitrage opportunities.
 """
 
-from typing import Dict, List, Optional
-import ccxt
+import asyncio
+from typing import Any, Dict, List, Optional, Set
 import logging
 
+from .market_data import MarketData, create_exchange
+
 logger = logging.getLogger(__name__)
 
 
 class CrossChainHandler:
-    def __init__(self, cross_chain_config: Dict):
+    def __init__(self, cross_chain_config: Dict, market_data: Optional[MarketData] = None):
         self.enabled = cross_chain_config['enabled']
         self.bridges = cross_chain_config['bridges']
-        self.exchanges: Dict[str, ccxt.Exchange] = {}
+        self.market_data = market_data or MarketData()
+        self.exchanges: Dict[str, Any] = self.market_data.exchanges
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _run(self, coro):
+        # Async exchanges keep their HTTP session on the loop that created
+        # it, so every cycle runs on the same loop
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
 
     def initialize_exchanges(self, exchange_configs: List[Dict]) -> None:
         """Initialize exchange connections."""
@@ -21,11 +32,11 @@ class CrossChainHandler:
             try:
                 exchange_name = exchange_config['name']
                 if exchange_config['type'] == 'cex':
-                    exchange_class = getattr(ccxt, exchange_name)
-                    self.exchanges[exchange_name] = exchange_class({
-                        'apiKey': exchange_config.get('api_key'),
-                        'secret': exchange_config.get('api_secret'),
-                    })
+                    self.exchanges[exchange_name] = create_exchange(
+                        exchange_name,
+                        exchange_config.get('api_key'),
+                        exchange_config.get('api_secret'),
+                    )
                 else:
                     logger.warning(
                         f"Unsupported exchange type for {exchange_name}"
@@ -41,6 +52,12 @@ class CrossChainHandler:
             logger.info("Cross-chain arbitrage is disabled")
             return
 
+        # Fetch every ticker this cycle needs up front; the pair checks
+        # below read them from the cycle cache
+        self._run(self.market_data.refresh(
+            self._cycle_symbols(config), self._price_exchanges()
+        ))
+
         for bridge in self.bridges:
             supported_networks = bridge['supported_networks']
             for i, network1 in enumerate(supported_networks):
@@ -90,20 +107,40 @@ class CrossChainHandler:
                         err_msg.format(token, network1, network2, str(e))
                     )
 
+    def _cycle_symbols(self, config: Dict) -> Set[str]:
+        """Symbols priced by _check_pair_opportunity across all bridges."""
+        symbols = set()
+        for bridge in self.bridges:
+            networks = bridge['supported_networks']
+            for i, network1 in enumerate(networks):
+                for network2 in networks[i+1:]:
+                    for token in config['tokens'].get(network1, {}):
+                        if token in config['tokens'].get(network2, {}):
+                            symbols.add(f"{token}/USDT")
+        return symbols
+
+    def _price_exchanges(self) -> List[str]:
+        # Prices come from the first configured exchange (see _get_token_price)
+        return list(self.exchanges)[:1]
+
     def _get_token_price(self, network: str, token: str) -> Optional[float]:
         """Get the price of a token on a specific network."""
         try:
             # This is a placeholder. In a real-world scenario,
             # you'd fetch the actual price from an exchange or price feed.
             # For demonstration, we're using a random exchange:
-            exchange = next(iter(self.exchanges.values()))
-            ticker = exchange.fetch_ticker(f"{token}/USDT")
-            return ticker['last']
-        except ccxt.NetworkError as e:
-            logger.error(f"Network error fetching price for {token}: {str(e)}")
-        except ccxt.ExchangeError as e:
-            logger.error(f"Exchange error fetching price for {token}: {str(e)}")
+            exchange_name = next(iter(self.exchanges))
+            ticker = self._run(
+                self.market_data.fetch_ticker(exchange_name, f"{token}/USDT")
+            )
+            return ticker['last'] if ticker else None
         except Exception as e:
             err_msg = "Unexpected error fetching price for {}: {}"
             logger.error(err_msg.format(token, str(e)))
         return None
+
+    def close(self) -> None:
+        """Close exchange sessions and the handler's event loop."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.market_data.close())
+            self._loop.close()
@@ -4,90 +4,103 @@ Database module for arbitrage bot
 import sqlite3
 import os
 
+from dashboard.db_pool import get_database_pool
+from dashboard.profit_rollups import get_profit_buckets, install_profit_rollups
+from dashboard.write_behind import get_write_behind_writer
+
 
 DB_FILE = 'arbitrage_bot.db'
 
+INSERT_TRADE_SQL = """INSERT INTO trades 
+                 (network, timestamp, token_in, token_out,
+                  amount_in, amount_out, profit,
+                  gas_used, gas_price, success, tx_hash) 
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
 
 def get_db_connection():
-    """Get database connection with row factory"""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get this thread's pooled read-only connection with row factory"""
+    return get_database_pool(DB_FILE).reader()
+
+
+def write_connection():
+    """Lease the pooled writer: `with write_connection() as conn:` commits, or rolls back on error"""
+    return get_database_pool(DB_FILE).write()
 
 
 def init_db():
     """Initialize database with required tables"""
     # Remove old database if it exists
-    if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
-    
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    # Create trades table with all necessary fields
-    c.execute('''CREATE TABLE IF NOT EXISTS trades
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  network TEXT,
-                  timestamp INTEGER,
-                  token_in TEXT,
-                  token_out TEXT,
-                  amount_in INTEGER,
-                  amount_out INTEGER,
-                  profit INTEGER,
-                  gas_used INTEGER,
-                  gas_price INTEGER,
-                  success BOOLEAN,
-                  tx_hash TEXT)''')
-    
-    # Create token pairs table
-    c.execute('''CREATE TABLE IF NOT EXISTS token_pairs
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  network TEXT,
-                  symbol TEXT,
-                  token_a TEXT,
-                  token_b TEXT,
-                  UNIQUE(network, symbol))''')
-    
-    # Create risk metrics table
-    c.execute('''CREATE TABLE IF NOT EXISTS risk_metrics
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  timestamp INTEGER,
-                  gas_price INTEGER,
-                  profit_multiplier REAL,
-                  gas_multiplier REAL,
-                  daily_volume INTEGER,
-                  daily_trades INTEGER,
-                  daily_profit INTEGER,
-                  daily_losses INTEGER)''')
-    
-    conn.commit()
-    conn.close()
+    get_database_pool(DB_FILE).close()
+    for path in (DB_FILE, DB_FILE + '-wal', DB_FILE + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    with write_connection() as conn:
+        c = conn.cursor()
+    
+        # Create trades table with all necessary fields
+        c.execute('''CREATE TABLE IF NOT EXISTS trades
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      network TEXT,
+                      timestamp INTEGER,
+                      token_in TEXT,
+                      token_out TEXT,
+                      amount_in INTEGER,
+                      amount_out INTEGER,
+                      profit INTEGER,
+                      gas_used INTEGER,
+                      gas_price INTEGER,
+                      success BOOLEAN,
+                      tx_hash TEXT)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_trades_network_timestamp
+                     ON trades(network, timestamp)''')
+    
+        # Hourly/daily profit per pair and network, updated by triggers with each trade
+        install_profit_rollups(conn)
+    
+        # Create token pairs table
+        c.execute('''CREATE TABLE IF NOT EXISTS token_pairs
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      network TEXT,
+                      symbol TEXT,
+                      token_a TEXT,
+                      token_b TEXT,
+                      UNIQUE(network, symbol))''')
+    
+        # Create risk metrics table
+        c.execute('''CREATE TABLE IF NOT EXISTS risk_metrics
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      timestamp INTEGER,
+                      gas_price INTEGER,
+                      profit_multiplier REAL,
+                      gas_multiplier REAL,
+                      daily_volume INTEGER,
+                      daily_trades INTEGER,
+                      daily_profit INTEGER,
+                      daily_losses INTEGER)''')
 
 
 def store_trade(trade_data):
-    """Store trade data to database"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    c.execute("""INSERT INTO trades 
-                 (network, timestamp, token_in, token_out,
-                  amount_in, amount_out, profit,
-                  gas_used, gas_price, success, tx_hash) 
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-              (trade_data['network'],
-               trade_data['timestamp'],
-               trade_data['token_in'],
-               trade_data['token_out'],
-               trade_data['amount_in'],
-               trade_data['amount_out'],
-               trade_data['profit'],
-               trade_data.get('gas_used', 0),
-               trade_data.get('gas_price', 0),
-               trade_data.get('success', False),
-               trade_data.get('tx_hash', '')))
-    
-    conn.commit()
-    conn.close()
+    """Queue trade data for the write-behind writer"""
+    return get_write_behind_writer(DB_FILE).submit(
+        INSERT_TRADE_SQL,
+        (trade_data['network'],
+         trade_data['timestamp'],
+         trade_data['token_in'],
+         trade_data['token_out'],
+         trade_data['amount_in'],
+         trade_data['amount_out'],
+         trade_data['profit'],
+         trade_data.get('gas_used', 0),
+         trade_data.get('gas_price', 0),
+         trade_data.get('success', False),
+         trade_data.get('tx_hash', '')))
+
+
+def flush_trades(timeout=None):
+    """Wait until every queued trade is committed"""
+    return get_write_behind_writer(DB_FILE).flush(timeout)
 
 
 def get_token_pairs(network=None):
@@ -109,24 +122,20 @@ def get_token_pairs(network=None):
 
 def add_token_pair(network, symbol, token_a, token_b):
     """Add a new token pair"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
     try:
-        c.execute("""INSERT INTO token_pairs 
-                     (network, symbol, token_a, token_b) 
-                     VALUES (?, ?, ?, ?)""",
-                  (network, symbol, token_a, token_b))
-        conn.commit()
+        with write_connection() as conn:
+            conn.execute("""INSERT INTO token_pairs 
+                            (network, symbol, token_a, token_b) 
+                            VALUES (?, ?, ?, ?)""",
+                         (network, symbol, token_a, token_b))
         print(f"Added new token pair: {symbol} on {network}")
     except sqlite3.IntegrityError:
         print(f"Token pair {symbol} already exists on {network}")
-    finally:
-        conn.close()
 
 
 def get_trades_in_time_period(network, start_time, end_time):
     """Get trades within specified time period"""
+    flush_trades()
     conn = get_db_connection()
     c = conn.cursor()
     
@@ -143,47 +152,77 @@ def get_trades_in_time_period(network, start_time, end_time):
 
 
 def get_trade_stats(network, start_time, end_time):
-    """Get trade statistics for specified period"""
+    """Get trade statistics for specified period
+    
+    Whole hours inside the period come from the profit rollups; only the
+    partial hours at either end read trades rows.
+    """
+    flush_trades()
     conn = get_db_connection()
     c = conn.cursor()
     
-    c.execute("""SELECT 
-                   COUNT(*) as total_trades,
-                   SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful_trades,
-                   SUM(profit) as total_profit,
-                   SUM(gas_used * gas_price) as total_gas_cost
-                 FROM trades 
-                 WHERE network = ? 
-                 AND timestamp >= ? 
-                 AND timestamp <= ?""",
-              (network, start_time, end_time))
+    first_hour = -(-start_time // 3600) * 3600  # first hour starting inside the period
+    end_hour = (end_time + 1) // 3600 * 3600     # end_time is inclusive
+    stats = {'total_trades': 0, 'successful_trades': 0, 'total_profit': 0, 'total_gas_cost': 0}
+    
+    edges = [(start_time, end_time)]
+    if first_hour < end_hour:
+        for bucket in get_profit_buckets(conn, 'hour', since=first_hour, until=end_hour, network=network):
+            stats['total_trades'] += bucket['trade_count']
+            stats['successful_trades'] += bucket['successful_trades']
+            stats['total_profit'] += bucket['total_profit']
+            stats['total_gas_cost'] += bucket['total_gas_cost']
+        edges = [(start_time, first_hour - 1), (end_hour, end_time)]
+    
+    for edge_start, edge_end in edges:
+        if edge_start > edge_end:
+            continue
+        c.execute("""SELECT 
+                       COUNT(*) as total_trades,
+                       SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful_trades,
+                       SUM(profit) as total_profit,
+                       SUM(gas_used * gas_price) as total_gas_cost
+                     FROM trades 
+                     WHERE network = ? 
+                     AND timestamp >= ? 
+                     AND timestamp <= ?""",
+                  (network, edge_start, edge_end))
+        for key, value in dict(c.fetchone()).items():
+            stats[key] += value or 0
     
-    stats = dict(c.fetchone())
     conn.close()
+    if not stats['total_trades']:
+        # Match SUM() over no rows
+        stats.update(successful_trades=None, total_profit=None, total_gas_cost=None)
     return stats
 
 
+def get_profit_history(network=None, period='hour', start_time=None, end_time=None):
+    """Per-hour or per-day profit buckets from the rollups, oldest first"""
+    flush_trades()
+    conn = get_db_connection()
+    try:
+        return get_profit_buckets(conn, period, since=start_time, until=end_time, network=network)
+    finally:
+        conn.close()
+
+
 def store_risk_metrics(metrics):
     """Store risk management metrics"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    c.execute("""INSERT INTO risk_metrics 
-                 (timestamp, gas_price, profit_multiplier,
-                  gas_multiplier, daily_volume, daily_trades,
-                  daily_profit, daily_losses)
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-              (metrics['timestamp'],
-               metrics['gas_price'],
-               metrics['profit_multiplier'],
-               metrics['gas_multiplier'],
-               metrics['daily_volume'],
-               metrics['daily_trades'],
-               metrics['daily_profit'],
-               metrics['daily_losses']))
-    
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute("""INSERT INTO risk_metrics 
+                        (timestamp, gas_price, profit_multiplier,
+                         gas_multiplier, daily_volume, daily_trades,
+                         daily_profit, daily_losses)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                     (metrics['timestamp'],
+                      metrics['gas_price'],
+                      metrics['profit_multiplier'],
+                      metrics['gas_multiplier'],
+                      metrics['daily_volume'],
+                      metrics['daily_trades'],
+                      metrics['daily_profit'],
+                      metrics['daily_losses']))
 
 
 # Initialize the database
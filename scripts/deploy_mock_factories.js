@@ -0,0 +1,51 @@
+const hre = require("hardhat");
+
+// Deploys mock DEX factories to a local node and creates a handful of pools
+// so dashboard/pool_indexer.py can be run against them:
+//   npx hardhat node
+//   npx hardhat run scripts/deploy_mock_factories.js --network localhost
+async function main() {
+    const [deployer] = await hre.ethers.getSigners();
+    console.log("Deploying mock factories with:", deployer.address);
+
+    const deploy = async (name) => {
+        const Factory = await hre.ethers.getContractFactory(name);
+        const contract = await Factory.deploy();
+        await contract.deployed();
+        console.log(`${name} deployed to:`, contract.address);
+        return contract;
+    };
+
+    const v3Factory = await deploy("MockUniswapV3Factory");
+    const aerodromeFactory = await deploy("MockAerodromeFactory");
+    const aerodromeClFactory = await deploy("MockAerodromeCLFactory");
+    const v2Factory = await deploy("MockUniswapV2Factory");
+
+    // Arbitrary token addresses; the indexer never calls into the tokens
+    const WETH = "0x4200000000000000000000000000000000000006";
+    const USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913";
+    const DAI = "0x50c5725949A6F0c72E6C4a641F24049A917DB0Cb";
+
+    await (await v3Factory.createPool(WETH, USDC, 500)).wait();
+    await (await v3Factory.createPool(WETH, USDC, 3000)).wait();
+    await (await aerodromeFactory.createPool(WETH, USDC, false)).wait();
+    await (await aerodromeFactory.createPool(USDC, DAI, true)).wait();
+    await (await aerodromeClFactory.createPool(WETH, USDC, 100)).wait();
+    await (await v2Factory.createPair(WETH, DAI)).wait();
+
+    const factories = {
+        uniswap_v3: { address: v3Factory.address, kind: "uniswap_v3", start_block: 0 },
+        aerodrome: { address: aerodromeFactory.address, kind: "aerodrome", start_block: 0 },
+        aerodrome_cl: { address: aerodromeClFactory.address, kind: "aerodrome_cl", start_block: 0 },
+        baseswap: { address: v2Factory.address, kind: "uniswap_v2", start_block: 0 }
+    };
+    console.log("\nFactories config:");
+    console.log(JSON.stringify({ factories }, null, 2));
+}
+
+main()
+    .then(() => process.exit(0))
+    .catch((error) => {
+        console.error(error);
+        process.exit(1);
+    });
@@ -0,0 +1,183 @@
+"""
+Async market data layer for fetching exchange tickers concurrently.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import ccxt.async_support as ccxt_async
+    CCXT_AVAILABLE = True
+except ImportError:
+    ccxt_async = None
+    CCXT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# ccxt's default spacing between requests when an exchange doesn't declare one
+DEFAULT_RATE_LIMIT_MS = 1000
+
+
+class AsyncRateLimiter:
+    """Spaces out requests to one exchange by its minimum interval
+
+    Every caller reserves the next free slot under a lock and then sleeps
+    outside it, so concurrent tasks queue up evenly instead of bursting.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# One limiter per exchange id, shared by every MarketData instance in the process
+_limiters: Dict[str, AsyncRateLimiter] = {}
+
+
+def get_rate_limiter(exchange_id: str, rate_limit_ms: Optional[float] = None) -> AsyncRateLimiter:
+    """Shared limiter for an exchange; rate_limit_ms is ccxt's Exchange.rateLimit"""
+    limiter = _limiters.get(exchange_id)
+    if limiter is None:
+        interval = (rate_limit_ms if rate_limit_ms is not None else DEFAULT_RATE_LIMIT_MS) / 1000
+        limiter = _limiters[exchange_id] = AsyncRateLimiter(interval)
+    return limiter
+
+
+def create_exchange(name: str, api_key: Optional[str] = None, secret: Optional[str] = None) -> Any:
+    """Instantiate a ccxt.async_support exchange by name"""
+    if not CCXT_AVAILABLE:
+        raise ImportError("ccxt is not installed")
+    exchange_class = getattr(ccxt_async, name)
+    # Throttling is done by the shared limiter, not per instance
+    return exchange_class({'apiKey': api_key, 'secret': secret, 'enableRateLimit': False})
+
+
+class MarketData:
+    """Per-cycle ticker cache over a set of async exchanges
+
+    refresh() fetches every requested symbol from every exchange at once:
+    exchanges are queried concurrently, each with one bulk fetch_tickers
+    call when it supports it, or one fetch_ticker per symbol (all in
+    flight together, paced by the exchange's shared limiter) when it
+    doesn't. A cycle therefore costs roughly the slowest exchange rather
+    than the sum. Results are kept until the next refresh, so every
+    method that needs a ticker in the same cycle reads the cache.
+    """
+
+    def __init__(self, exchanges: Optional[Dict[str, Any]] = None):
+        self.exchanges: Dict[str, Any] = exchanges or {}
+        self.tickers: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.cycle = 0
+        self.cycle_started = 0.0
+        self.last_fetch_seconds = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def _limiter(self, name: str, exchange: Any) -> AsyncRateLimiter:
+        return get_rate_limiter(getattr(exchange, 'id', name), getattr(exchange, 'rateLimit', None))
+
+    def _supports_bulk(self, exchange: Any) -> bool:
+        has = getattr(exchange, 'has', None) or {}
+        return bool(has.get('fetchTickers'))
+
+    async def _fetch_one(self, name: str, exchange: Any, symbol: str) -> Optional[Dict[str, Any]]:
+        await self._limiter(name, exchange).acquire()
+        self.requests += 1
+        try:
+            return await exchange.fetch_ticker(symbol)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error fetching {symbol} on {name}: {str(e)}")
+            return None
+
+    async def _fetch_exchange(self, name: str, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        exchange = self.exchanges[name]
+        if self._supports_bulk(exchange):
+            await self._limiter(name, exchange).acquire()
+            self.requests += 1
+            try:
+                tickers = await exchange.fetch_tickers(symbols)
+                return {symbol: tickers[symbol] for symbol in symbols if symbol in tickers}
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Bulk ticker fetch failed on {name}, falling back per symbol: {str(e)}")
+
+        results = await asyncio.gather(*(self._fetch_one(name, exchange, symbol) for symbol in symbols))
+        return {symbol: ticker for symbol, ticker in zip(symbols, results) if ticker is not None}
+
+    async def refresh(self, symbols: Iterable[str], exchange_names: Optional[Iterable[str]] = None) -> int:
+        """Start a new cycle and fetch symbols from the given (default: all) exchanges
+
+        Returns the number of tickers cached.
+        """
+        symbols = sorted(set(symbols))
+        names = list(exchange_names) if exchange_names is not None else list(self.exchanges)
+        self.cycle += 1
+        self.cycle_started = time.time()
+        self.tickers = {}
+        if not symbols or not names:
+            return 0
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._fetch_exchange(name, symbols) for name in names), return_exceptions=True
+        )
+        self.last_fetch_seconds = time.perf_counter() - start
+
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                self.errors += 1
+                logger.error(f"Error fetching tickers from {name}: {str(result)}")
+                continue
+            for symbol, ticker in result.items():
+                self.tickers[(name, symbol)] = ticker
+        logger.debug(
+            f"Cycle {self.cycle}: {len(self.tickers)} tickers from {len(names)} exchanges "
+            f"in {self.last_fetch_seconds * 1000:.1f} ms"
+        )
+        return len(self.tickers)
+
+    def get_ticker(self, exchange_name: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """Ticker cached in the current cycle, if any"""
+        return self.tickers.get((exchange_name, symbol))
+
+    async def fetch_ticker(self, exchange_name: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached ticker, fetching and caching it on a miss"""
+        ticker = self.get_ticker(exchange_name, symbol)
+        if ticker is None and exchange_name in self.exchanges:
+            ticker = await self._fetch_one(exchange_name, self.exchanges[exchange_name], symbol)
+            if ticker is not None:
+                self.tickers[(exchange_name, symbol)] = ticker
+        return ticker
+
+    async def close(self) -> None:
+        for name, exchange in self.exchanges.items():
+            close = getattr(exchange, 'close', None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.error(f"Error closing {name}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'cycle': self.cycle,
+            'cached_tickers': len(self.tickers),
+            'last_fetch_ms': self.last_fetch_seconds * 1000,
+            'requests': self.requests,
+            'errors': self.errors
+        }
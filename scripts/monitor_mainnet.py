@@ -11,7 +11,7 @@ import json
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
-from web3 import Web3
+from dashboard.provider_registry import get_shared_web3
 import yaml
 from datetime import datetime, timedelta
 
@@ -39,7 +39,7 @@ class MainnetMonitor:
     def __init__(self, config_path: str = 'dashboard/config/trading_config.yaml'):
         """Initialize monitor with configuration"""
         self.config = self._load_config(config_path)
-        self.w3 = Web3(Web3.HTTPProvider(self.config['network']['rpc_url']))
+        self.w3 = get_shared_web3('mainnet', [self.config['network']['rpc_url']])
         self.last_block = 0
         self.block_times: list = []
         self.gas_prices: list = []
@@ -1,7 +1,7 @@
 import asyncio
 import json
 import logging
-from web3 import Web3
+from dashboard.provider_registry import get_shared_web3
 from decimal import Decimal
 from typing import Dict, List, Tuple
 
@@ -20,7 +20,7 @@ with open('config.json', 'r') as f:
     config = json.load(f)
 
 # Connect to Base
-w3 = Web3(Web3.HTTPProvider(config['base_rpc_url']))
+w3 = get_shared_web3('base', [config['base_rpc_url']])
 
 # Load contracts
 with open('deployments/MarketMonitor.json', 'r') as f:
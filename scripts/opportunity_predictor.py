@@ -3,7 +3,7 @@ import json
 import logging
 import pandas as pd  # type: ignore
 import numpy as np
-from web3 import Web3
+from dashboard.provider_registry import get_shared_web3
 from datetime import datetime
 from .ml_predictor import MLPredictor
 from typing import Dict, List, Any, Optional
@@ -13,7 +13,7 @@ class OpportunityPredictor:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        self.w3 = Web3(Web3.HTTPProvider(self.config['base_rpc_url']))
+        self.w3 = get_shared_web3('base', [self.config['base_rpc_url']])
         self.ml_predictor = MLPredictor(config_path)
         
         # Initialize history storage
@@ -8,14 +8,20 @@ class PerformanceTracker:
     def __init__(self):
         self.trades: List[Dict] = []
         self.daily_profits: Dict[str, float] = {}
+        # Running totals, updated with each trade so reports never rescan self.trades
+        self.total_profit = 0
+        self.pair_profits: Dict[str, float] = {}
 
     def add_trade(self, trade: Dict):
         self.trades.append(trade)
         trade_date = time.strftime("%Y-%m-%d", time.localtime(trade['timestamp']))
         self.daily_profits[trade_date] = self.daily_profits.get(trade_date, 0) + trade['profit']
+        self.total_profit += trade['profit']
+        pair = trade['pair']
+        self.pair_profits[pair] = self.pair_profits.get(pair, 0) + trade['profit']
 
     def get_total_profit(self) -> float:
-        return sum(trade['profit'] for trade in self.trades)
+        return self.total_profit
 
     def get_average_profit(self) -> float:
         if not self.trades:
@@ -28,11 +34,7 @@ class PerformanceTracker:
     def get_most_profitable_pair(self) -> str:
         if not self.trades:
             return "No trades yet"
-        pair_profits = {}
-        for trade in self.trades:
-            pair = trade['pair']
-            pair_profits[pair] = pair_profits.get(pair, 0) + trade['profit']
-        return max(pair_profits, key=pair_profits.get)
+        return max(self.pair_profits, key=self.pair_profits.get)
 
     def get_performance_report(self) -> Dict:
         return {
@@ -1,10 +1,15 @@
 """
 Enhanced risk management module for arbitrage bot
 """
+import logging
 import time
 from typing import Dict, List, Tuple
 from eth_typing import ChecksumAddress
-from web3.exceptions import TransactionNotFound
+
+from dashboard.mempool_decoder import PendingSwapStream
+from dashboard.mev_risk import DEFAULT_COMPETING_SWAP_LEVELS, MevRiskView
+
+logger = logging.getLogger(__name__)
 
 
 class RiskManager:
@@ -12,12 +17,22 @@ class RiskManager:
         self,
         w3,
         config: Dict,
-        monitor
+        monitor,
+        subscription_hub=None
     ):
         self.w3 = w3
         self.config = config
         self.monitor = monitor
         
+        # Pending hashes are pushed by the shared WebSocket hub when one is given;
+        # otherwise a single pending filter is created lazily and reused
+        self.pending_subscription = (
+            subscription_hub.subscribe_pending(maxsize=4096) if subscription_hub else None
+        )
+        self.mempool_filter = None
+        # Decoded pending swaps feed a rolling per-pair risk view
+        self.pending_stream = PendingSwapStream(w3, source=self.pending_subscription)
+        
         # Risk parameters
         self.max_trade_size = config['security']['max_trade_size']
         self.min_profit_threshold = config['security']['min_profit_threshold']
@@ -31,12 +46,24 @@ class RiskManager:
         
         # MEV protection parameters
         self.mev_time_window = config['security'].get('mev_time_window', 60)  # Default to 60 seconds
-        self.mev_similarity_threshold = config['security'].get('mev_similarity_threshold', 0.8)  # Default to 80% similarity
-        self.mev_risk_levels = config['security'].get('mev_risk_levels', {
-            'low': 5,
-            'medium': 10,
-            'high': 20
-        })
+        # Competing pending swaps on the route's busiest pair (searcher swaps count twice)
+        # within mev_time_window; these replace the old per-transaction similarity levels
+        if 'mev_risk_levels' in config['security'] or 'mev_similarity_threshold' in config['security']:
+            logger.warning(
+                "security.mev_risk_levels and mev_similarity_threshold are no longer used; "
+                "set security.mev_competing_swap_levels instead"
+            )
+        self.mev_competing_swap_levels = config['security'].get(
+            'mev_competing_swap_levels', dict(DEFAULT_COMPETING_SWAP_LEVELS)
+        )
+        self.mev_risk = MevRiskView(
+            window=self.mev_time_window,
+            risk_levels=self.mev_competing_swap_levels,
+            searchers=config['security'].get('known_searchers', [])
+        )
+        self.pending_stream.subscribe(self.mev_risk.record)
+        if self.pending_subscription is not None:
+            self.pending_stream.start()
         
         # Flash loan parameters
         self.flash_loan_enabled = config['flash_loan']['enabled']
@@ -50,79 +77,31 @@ class RiskManager:
         self.daily_trade_count = 0
         self.trade_count_reset_time = int(time.time())
         self.pending_similar_trades = {}
-        self.recent_transactions = []
-
-    def calculate_transaction_similarity(
-        self,
-        tx: Dict,
-        token_path: List[ChecksumAddress],
-        amount: int
-    ) -> float:
-        """Calculate the similarity between a transaction and our intended trade"""
-        similarity_score = 0.0
-        
-        # Check if the transaction involves any of our token path
-        if tx['to'] in token_path:
-            similarity_score += 0.5
-        
-        # Check if the transaction amount is similar (within 20%)
-        if 'value' in tx:
-            value_diff = abs(tx['value'] - amount) / max(amount, 1)
-            if value_diff <= 0.2:
-                similarity_score += 0.3 * (1 - value_diff / 0.2)
-        
-        # Check if the gas price is similar (within 30%)
-        if 'gasPrice' in tx and self.w3.eth.gas_price > 0:
-            gas_diff = abs(tx['gasPrice'] - self.w3.eth.gas_price) / self.w3.eth.gas_price
-            if gas_diff <= 0.3:
-                similarity_score += 0.2 * (1 - gas_diff / 0.3)
-        
-        # Add a small constant to ensure medium similarity is strictly greater than 0.5
-        return similarity_score + 0.01
 
-    def check_mev_protection(
-        self,
-        token_path: List[ChecksumAddress],
-        amount: int
-    ) -> Tuple[bool, str]:
-        """Check for potential MEV attacks with enhanced detection"""
+    def check_mev_protection(self, token_path: List[ChecksumAddress]) -> Tuple[bool, str]:
+        """Check for potential MEV attacks on a route from the rolling pending-swap view"""
         try:
-            current_time = int(time.time())
-            
-            # Get pending transactions for this path
-            mempool_filter = self.w3.eth.filter('pending')
-            pending_txs = mempool_filter.get_new_entries()
-            
-            # Analyze transactions
-            similar_txs = []
-            for tx_hash in pending_txs:
-                try:
-                    tx = self.w3.eth.get_transaction(tx_hash)
-                    similarity = self.calculate_transaction_similarity(tx, token_path, amount)
-                    if similarity >= self.mev_similarity_threshold:
-                        similar_txs.append((tx_hash, similarity, current_time))
-                except TransactionNotFound:
-                    continue
-            
-            # Add to recent transactions
-            self.recent_transactions.extend(similar_txs)
-            
-            # Remove old transactions outside the time window
-            self.recent_transactions = [
-                tx for tx in self.recent_transactions
-                if current_time - tx[2] <= self.mev_time_window
-            ]
+            # With a subscription the stream is consumed continuously in the
+            # background; otherwise pull what the pending filter collected
+            if not self.pending_stream.running:
+                if self.pending_stream.source is None:
+                    self.mempool_filter = self.w3.eth.filter('pending')
+                    self.pending_stream.source = self.mempool_filter
+                self.pending_stream.poll()
             
-            # Count recent similar transactions
-            recent_similar_count = len(self.recent_transactions)
+            assessment = self.mev_risk.assess_route(token_path)
+            detail = (
+                f"{assessment.competing_swaps} competing swaps, "
+                f"{assessment.searcher_swaps} from known searchers"
+            )
             
             # Determine MEV risk level
-            if recent_similar_count >= self.mev_risk_levels['high']:
-                return False, f"High MEV risk: {recent_similar_count} similar transactions detected"
-            elif recent_similar_count >= self.mev_risk_levels['medium']:
-                return False, f"Medium MEV risk: {recent_similar_count} similar transactions detected"
-            elif recent_similar_count >= self.mev_risk_levels['low']:
-                return True, f"Low MEV risk: {recent_similar_count} similar transactions detected"
+            if assessment.level == 'high':
+                return False, f"High MEV risk: {detail}"
+            elif assessment.level == 'medium':
+                return False, f"Medium MEV risk: {detail}"
+            elif assessment.level == 'low':
+                return True, f"Low MEV risk: {detail}"
             
             return True, "No significant MEV risk detected"
             
@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from scripts.cross_chain_handler import CrossChainHandler
+from scripts.market_data import MarketData, get_rate_limiter
+
+_ids = itertools.count()
+
+
+class FakeExchange:
+    """Local stand-in for a ccxt.async_support exchange"""
+
+    def __init__(self, latency, bulk=True, rate_limit=0, prices=None, fail_bulk=False):
+        self.id = f"fake{next(_ids)}"
+        self.rateLimit = rate_limit
+        self.has = {'fetchTickers': bulk}
+        self.latency = latency
+        self.prices = prices or {'ETH/USDT': 2000.0, 'BTC/USDT': 60000.0, 'LINK/USDT': 15.0}
+        self.fail_bulk = fail_bulk
+        self.calls = []
+        self.closed = False
+
+    async def fetch_ticker(self, symbol):
+        self.calls.append(('fetch_ticker', symbol, time.monotonic()))
+        await asyncio.sleep(self.latency)
+        if symbol not in self.prices:
+            raise ValueError(f"unknown symbol {symbol}")
+        return {'symbol': symbol, 'last': self.prices[symbol]}
+
+    async def fetch_tickers(self, symbols):
+        self.calls.append(('fetch_tickers', tuple(symbols), time.monotonic()))
+        await asyncio.sleep(self.latency)
+        if self.fail_bulk:
+            raise ConnectionError("bulk endpoint down")
+        return {s: {'symbol': s, 'last': self.prices[s]} for s in symbols if s in self.prices}
+
+    async def close(self):
+        self.closed = True
+
+
+SYMBOLS = ['ETH/USDT', 'BTC/USDT', 'LINK/USDT']
+
+
+def test_cycle_costs_slowest_exchange_not_sum():
+    exchanges = {
+        'a': FakeExchange(0.2),
+        'b': FakeExchange(0.3, bulk=False),
+        'c': FakeExchange(0.1),
+    }
+    market_data = MarketData(exchanges)
+
+    start = time.perf_counter()
+    cached = asyncio.run(market_data.refresh(SYMBOLS))
+    elapsed = time.perf_counter() - start
+
+    assert cached == 9
+    # Serial would be 0.2 + 3 * 0.3 + 0.1 = 1.2s
+    assert elapsed < 0.5
+    assert [c[0] for c in exchanges['a'].calls] == ['fetch_tickers']
+    assert sorted(c[1] for c in exchanges['b'].calls) == sorted(SYMBOLS)
+    assert market_data.get_ticker('b', 'BTC/USDT')['last'] == 60000.0
+
+
+def test_shared_limiter_spaces_requests():
+    exchange = FakeExchange(0.0, bulk=False, rate_limit=50)
+    market_data = MarketData({'slow': exchange})
+    other = MarketData({'slow': exchange})
+
+    async def both():
+        await asyncio.gather(market_data.refresh(SYMBOLS), other.refresh(SYMBOLS))
+
+    asyncio.run(both())
+
+    starts = sorted(c[2] for c in exchange.calls)
+    assert len(starts) == 6
+    # Slots are reserved at exact multiples of the interval; a late wakeup can
+    # only push a call later, so measure against the first start, not neighbours
+    interval, eps = 0.05, 0.02
+    assert all(start >= starts[0] + k * interval - eps for k, start in enumerate(starts))
+    assert get_rate_limiter(exchange.id).interval == 0.05
+
+
+def test_bulk_failure_falls_back_and_errors_are_isolated():
+    exchange = FakeExchange(0.0, fail_bulk=True, prices={'ETH/USDT': 2000.0})
+    market_data = MarketData({'x': exchange})
+
+    assert asyncio.run(market_data.refresh(SYMBOLS)) == 1
+    assert market_data.get_ticker('x', 'ETH/USDT')['last'] == 2000.0
+    assert market_data.get_ticker('x', 'BTC/USDT') is None
+    # One failed bulk call, then two missing symbols
+    assert market_data.get_stats()['errors'] == 3
+
+
+def test_handler_fetches_each_ticker_once_per_cycle():
+    exchange = FakeExchange(0.01)
+    handler = CrossChainHandler(
+        {'enabled': True, 'bridges': [{'name': 'hop', 'supported_networks': ['base', 'arbitrum', 'optimism']}]},
+        market_data=MarketData({'fake': exchange})
+    )
+    config = {
+        'tokens': {'base': {'ETH': {}, 'LINK': {}}, 'arbitrum': {'ETH': {}, 'LINK': {}}, 'optimism': {'ETH': {}}},
+        'min_profit_percentage': 0.5,
+    }
+
+    handler.check_opportunities(config)
+    handler.check_opportunities(config)
+
+    assert [c[0] for c in exchange.calls] == ['fetch_tickers', 'fetch_tickers']
+    assert set(exchange.calls[0][1]) == {'ETH/USDT', 'LINK/USDT'}
+    assert handler.market_data.cycle == 2
+    assert handler._get_token_price('base', 'ETH') == 2000.0
+
+    handler.close()
+    assert exchange.closed
+
+
+@pytest.mark.parametrize('bulk', [True, False])
+def test_miss_is_fetched_and_cached(bulk):
+    exchange = FakeExchange(0.0, bulk=bulk)
+    market_data = MarketData({'x': exchange})
+
+    async def lookups():
+        await market_data.refresh([])
+        first = await market_data.fetch_ticker('x', 'ETH/USDT')
+        second = await market_data.fetch_ticker('x', 'ETH/USDT')
+        return first, second
+
+    first, second = asyncio.run(lookups())
+    assert first == second
+    assert len(exchange.calls) == 1